@@ -0,0 +1,178 @@
+"""Compare thread message-page latency: legacy events json_extract join vs messages.actor_id."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import ensure_channel, ensure_open_thread, ensure_system_state, ensure_user
+
+_VISIBLE = (
+    "(m.role='user' OR (m.role='assistant' AND ({actor} IS NULL OR {actor}='main')))"
+)
+_LEGACY_SQL = (
+    "SELECT m.id, m.role, m.content, m.created_at, e.actor_id AS actor_id "
+    "FROM messages m "
+    "LEFT JOIN events e ON e.thread_id = m.thread_id "
+    "AND e.event_type = 'agent.step.end' "
+    "AND json_extract(e.payload_json, '$.message_id') = m.id "
+    f"WHERE m.thread_id=? AND {_VISIBLE.format(actor='e.actor_id')} "
+    "{before}ORDER BY m.created_at DESC LIMIT ?"
+)
+_DENORMALIZED_SQL = (
+    "SELECT m.id, m.role, m.content, m.created_at, m.actor_id "
+    "FROM messages m "
+    f"WHERE m.thread_id=? AND {_VISIBLE.format(actor='m.actor_id')} "
+    "{before}ORDER BY m.created_at DESC LIMIT ?"
+)
+
+
+def _prepare_fixture(
+    conn: sqlite3.Connection, run_id: str, message_count: int, event_count: int
+) -> tuple[str, str]:
+    ensure_system_state(conn)
+    user_id = ensure_user(conn, f"message_list_benchmark_{run_id}")
+    channel_id = ensure_channel(conn, user_id, "web")
+    thread_id = ensure_open_thread(conn, user_id, channel_id)
+    start = datetime(2026, 2, 10, tzinfo=UTC)
+    messages = []
+    step_events = []
+    for idx in range(message_count):
+        message_id = f"msg_{run_id}_{idx:06d}"
+        created_at = (start + timedelta(seconds=idx)).isoformat()
+        role = "user" if idx % 2 == 0 else "assistant"
+        actor_id = None if role == "user" else ("main" if idx % 10 else "planner")
+        messages.append((message_id, thread_id, role, f"message {idx}", created_at, actor_id))
+        if actor_id is not None:
+            payload = json.dumps({"message_id": message_id, "lane": "default"})
+            step_events.append(
+                (f"evt_{run_id}_s{idx:06d}", "agent.step.end", actor_id, payload, created_at)
+            )
+    conn.executemany(
+        (
+            "INSERT INTO messages(id, thread_id, role, content, created_at, actor_id) "
+            "VALUES(?,?,?,?,?,?)"
+        ),
+        messages,
+    )
+    # The rest of the thread's event volume: tool calls, thoughts, model usage.
+    filler = [
+        (
+            f"evt_{run_id}_f{idx:06d}",
+            "agent.tool.call",
+            "main",
+            json.dumps({"tool": "exec_host", "step": idx}),
+            (start + timedelta(seconds=idx % max(1, message_count))).isoformat(),
+        )
+        for idx in range(max(0, event_count - len(step_events)))
+    ]
+    conn.executemany(
+        (
+            "INSERT INTO events(id, trace_id, span_id, parent_span_id, thread_id, event_type, "
+            "component, actor_type, actor_id, payload_json, payload_redacted_json, created_at) "
+            "VALUES(?,?,'spn_bench',NULL,?,?,'orchestrator','agent',?,?,?,?)"
+        ),
+        [
+            (event_id, f"trc_{run_id}", thread_id, event_type, actor, payload, payload, at)
+            for event_id, event_type, actor, payload, at in step_events + filler
+        ],
+    )
+    middle = messages[len(messages) // 2][4]
+    return thread_id, str(middle)
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+    return {
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[p95_index], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _time(fn: Callable[[], list[object]], iterations: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        default="docs/reports/retrieval/message_list_latest.json",
+        help="Path to write benchmark artifact JSON.",
+    )
+    parser.add_argument("--iterations", type=int, default=30, help="Timed runs per query path.")
+    parser.add_argument("--messages", type=int, default=10000, help="Messages in the thread.")
+    parser.add_argument("--events", type=int, default=100000, help="Events in the thread.")
+    parser.add_argument("--limit", type=int, default=50, help="Page size.")
+    args = parser.parse_args()
+
+    iterations = max(1, args.iterations)
+    message_count = max(100, args.messages)
+    event_count = max(message_count, args.events)
+    limit = max(1, args.limit)
+    run_id = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+
+    with get_conn() as conn:
+        thread_id, before = _prepare_fixture(conn, run_id, message_count, event_count)
+        conn.execute("ANALYZE")
+
+        def page(sql: str, with_before: bool) -> Callable[[], list[object]]:
+            statement = sql.format(before="AND m.created_at < ? " if with_before else "")
+            params = (thread_id, before, limit) if with_before else (thread_id, limit)
+            return lambda: conn.execute(statement, params).fetchall()
+
+        paths = {
+            page_name: {
+                "legacy_join": page(_LEGACY_SQL, page_name == "before_page"),
+                "actor_column": page(_DENORMALIZED_SQL, page_name == "before_page"),
+            }
+            for page_name in ("first_page", "before_page")
+        }
+        latency_ms = {
+            page_name: {name: _summary(_time(fn, iterations)) for name, fn in variants.items()}
+            for page_name, variants in paths.items()
+        }
+        results = {
+            page_name: {name: [row[0] for row in fn()] for name, fn in variants.items()}
+            for page_name, variants in paths.items()
+        }
+
+    artifact = {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "run_id": run_id,
+        "scenario": "thread_message_page_join_vs_actor_column",
+        "dataset": {"messages": message_count, "events": event_count, "limit": limit},
+        "runs": iterations,
+        "latency_ms": latency_ms,
+        "result_counts": {
+            page_name: {name: len(ids) for name, ids in variants.items()}
+            for page_name, variants in results.items()
+        },
+        "results_match": all(
+            variants["legacy_join"] == variants["actor_column"] for variants in results.values()
+        ),
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(artifact, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"wrote message list benchmark artifact: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
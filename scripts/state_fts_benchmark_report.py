@@ -0,0 +1,172 @@
+"""Compare lexical state/failure lookup latency: legacy LIKE scan vs bm25 FTS5 query."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import ensure_channel, ensure_open_thread, ensure_system_state, ensure_user
+from jarvis.memory.service import MemoryService
+
+_TOPICS = (
+    "redis postgres deploy timeout socket cache retry webhook schedule approval budget "
+    "latency rollback migration vector summary thread channel billing invoice release"
+).split()
+
+
+def _text(idx: int) -> str:
+    # Mostly long-tail vocabulary with one common topic word, like real state items.
+    rng = random.Random(idx)
+    words = [f"w{int(rng.paretovariate(1.1) * 10) % 5000:04d}" for _ in range(10)]
+    words.insert(rng.randrange(len(words)), _TOPICS[idx % len(_TOPICS)])
+    return f"item {idx}: " + " ".join(words)
+
+
+def _prepare_fixture(conn: sqlite3.Connection, run_id: str, item_count: int) -> str:
+    ensure_system_state(conn)
+    user_id = ensure_user(conn, f"state_fts_benchmark_{run_id}")
+    channel_id = ensure_channel(conn, user_id, "web")
+    thread_id = ensure_open_thread(conn, user_id, channel_id)
+    seen_at = "2026-02-10T00:00:00+00:00"
+    conn.executemany(
+        (
+            "INSERT INTO state_items("
+            "uid, thread_id, text, status, type_tag, created_at, last_seen_at, updated_at, "
+            "agent_id"
+            ") VALUES(?,?,?,'active','decision',?,?,?,'main')"
+        ),
+        [
+            (f"bench_{run_id}_{idx:05d}", thread_id, _text(idx), seen_at, seen_at, seen_at)
+            for idx in range(item_count)
+        ],
+    )
+    conn.executemany(
+        (
+            "INSERT INTO failure_capsules("
+            "id, trace_id, phase, error_summary, error_details_json, attempt, created_at"
+            ") VALUES(?,?,?,?,'{}',1,?)"
+        ),
+        [
+            (f"fcp_{run_id}_{idx:05d}", f"trc_{idx}", "bench", _text(idx), seen_at)
+            for idx in range(item_count)
+        ],
+    )
+    return thread_id
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+    return {
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[p95_index], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _time(fn: Callable[[], list[object]], iterations: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        default="docs/reports/retrieval/state_fts_latest.json",
+        help="Path to write benchmark artifact JSON.",
+    )
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per query path.")
+    parser.add_argument("--items", type=int, default=20000, help="Rows seeded per table.")
+    parser.add_argument("--query", default="w0042 w1337", help="Lexical query to time.")
+    args = parser.parse_args()
+
+    iterations = max(1, args.iterations)
+    item_count = max(100, args.items)
+    run_id = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+    query = args.query.strip()
+    fts_query = MemoryService._fts_query(query)
+    pool_size = 60
+
+    with get_conn() as conn:
+        thread_id = _prepare_fixture(conn, run_id, item_count)
+        paths: dict[str, dict[str, Callable[[], list[object]]]] = {
+            "state_items": {
+                "like": lambda: conn.execute(
+                    (
+                        "SELECT uid FROM state_items WHERE thread_id=? "
+                        "AND status!='superseded' AND agent_id='main' "
+                        "AND LOWER(text) LIKE ? ORDER BY updated_at DESC LIMIT ?"
+                    ),
+                    (thread_id, f"%{query.lower()}%", pool_size),
+                ).fetchall(),
+                "fts": lambda: conn.execute(
+                    (
+                        "SELECT si.uid FROM state_items_fts f "
+                        "JOIN state_items si ON si.uid=f.uid AND si.thread_id=f.thread_id "
+                        "WHERE state_items_fts MATCH ? AND f.thread_id=? "
+                        "AND si.status!='superseded' AND si.agent_id='main' "
+                        "ORDER BY bm25(state_items_fts), si.updated_at DESC LIMIT ?"
+                    ),
+                    (fts_query, thread_id, pool_size),
+                ).fetchall(),
+            },
+            "failure_capsules": {
+                "like": lambda: conn.execute(
+                    (
+                        "SELECT id FROM failure_capsules WHERE LOWER(error_summary) LIKE ? "
+                        "ORDER BY created_at DESC LIMIT 10"
+                    ),
+                    (f"%{query.lower()}%",),
+                ).fetchall(),
+                "fts": lambda: conn.execute(
+                    (
+                        "SELECT fc.id FROM failure_capsules_fts f "
+                        "JOIN failure_capsules fc ON fc.id=f.capsule_id "
+                        "WHERE failure_capsules_fts MATCH ? "
+                        "ORDER BY bm25(failure_capsules_fts), fc.created_at DESC LIMIT 10"
+                    ),
+                    (fts_query,),
+                ).fetchall(),
+            },
+        }
+        latency_ms = {
+            table: {name: _summary(_time(fn, iterations)) for name, fn in variants.items()}
+            for table, variants in paths.items()
+        }
+        result_counts = {
+            table: {name: len(fn()) for name, fn in variants.items()}
+            for table, variants in paths.items()
+        }
+
+    artifact = {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "run_id": run_id,
+        "scenario": "state_lexical_like_vs_fts5",
+        "dataset": {"items_seeded": item_count, "query": query},
+        "runs": iterations,
+        "latency_ms": latency_ms,
+        "result_counts": result_counts,
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(artifact, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"wrote state FTS benchmark artifact: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
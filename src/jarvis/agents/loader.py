@@ -150,6 +150,22 @@ def _get_bundle_mtime(agent_dir: Path) -> float:
     return max_mtime
 
 
+def agent_root_signature(agent_root: Path) -> tuple[object, ...]:
+    """Cheap change token for ``agent_root``.
+
+    Combines the root mtime (agents added or removed) with each bundle's newest
+    file mtime (bundles edited), using only ``stat`` calls.
+    """
+    if not agent_root.is_dir():
+        return ()
+    bundles = tuple(
+        (candidate.name, _get_bundle_mtime(candidate))
+        for candidate in sorted(agent_root.iterdir())
+        if candidate.is_dir()
+    )
+    return (agent_root.stat().st_mtime, bundles)
+
+
 def load_agent_bundle(agent_dir: Path) -> AgentBundle:
     missing = [name for name in REQUIRED_FILES if not (agent_dir / name).exists()]
     if missing:
@@ -0,0 +1,70 @@
+"""Progressive channel replies built from streamed answer frames."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def supports_drafts(adapter: Any) -> bool:
+    """Whether a channel adapter can show a reply that is edited as it streams."""
+    return all(
+        callable(getattr(adapter, name, None))
+        for name in ("start_draft", "edit_draft", "finalize_draft")
+    )
+
+
+class DraftStreamer:
+    """Mirrors ``message.delta`` frames into one channel message, edited in place.
+
+    Edits are throttled to ``min_interval_s`` because chat APIs rate-limit them.
+    The draft is left showing the last preview; ``send_channel_message`` replaces
+    it with the persisted reply via ``finalize_draft``. Any transport failure
+    stops the preview for the rest of the step without affecting the reply.
+    """
+
+    def __init__(self, adapter: Any, recipient: str, *, min_interval_s: float) -> None:
+        self._adapter = adapter
+        self._recipient = recipient
+        self._min_interval_s = max(0.0, min_interval_s)
+        self._text = ""
+        self._shown = ""
+        self._last_push = 0.0
+        self._failed = False
+        self.draft_id: str | None = None
+        self.edits = 0
+
+    async def publish(self, frame: dict[str, object]) -> None:
+        if self._failed:
+            return
+        frame_type = frame.get("type")
+        if frame_type == "message.delta":
+            self._text = str(frame.get("text", ""))
+            if time.monotonic() - self._last_push >= self._min_interval_s:
+                await self._push()
+        elif frame_type == "message.stream.reset":
+            self._text = ""
+
+    async def _push(self) -> None:
+        text = self._text.strip()
+        if not text or text == self._shown:
+            return
+        self._last_push = time.monotonic()
+        try:
+            if self.draft_id is None:
+                self.draft_id = await self._adapter.start_draft(self._recipient, text)
+                self._failed = self.draft_id is None
+            else:
+                status = await self._adapter.edit_draft(self._recipient, self.draft_id, text)
+                self._failed = status >= 400
+                self.edits += 1
+        except (httpx.HTTPError, ValueError):
+            logger.warning("draft preview failed for %s", self._recipient, exc_info=True)
+            self._failed = True
+        if not self._failed:
+            self._shown = text
@@ -42,6 +42,55 @@ class TelegramAdapter:
                     break
         return last_status
 
+    async def start_draft(self, recipient: str, text: str) -> str | None:
+        """Send the first preview of a streamed reply; returns its message_id.
+
+        Drafts are plain text: a half-streamed reply is rarely valid Markdown.
+        """
+        token = get_settings().telegram_bot_token
+        if not token:
+            return None
+        async with httpx.AsyncClient(timeout=20) as client:
+            response = await client.post(
+                f"https://api.telegram.org/bot{token}/sendMessage",
+                json={"chat_id": recipient, "text": text[:4096]},
+            )
+        if response.status_code >= 400:
+            return None
+        message_id = response.json().get("result", {}).get("message_id")
+        return str(message_id) if message_id is not None else None
+
+    async def edit_draft(
+        self, recipient: str, draft_id: str, text: str, *, parse_mode: str | None = None
+    ) -> int:
+        """Replace the text of a draft sent by :meth:`start_draft`."""
+        token = get_settings().telegram_bot_token
+        if not token:
+            return 503
+        payload: dict[str, Any] = {
+            "chat_id": recipient,
+            "message_id": int(draft_id),
+            "text": text[:4096],
+        }
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        async with httpx.AsyncClient(timeout=20) as client:
+            response = await client.post(
+                f"https://api.telegram.org/bot{token}/editMessageText", json=payload
+            )
+        # Editing to identical text is rejected, but the draft already shows it.
+        if response.status_code == 400 and "message is not modified" in response.text:
+            return 200
+        return response.status_code
+
+    async def finalize_draft(self, recipient: str, draft_id: str, text: str) -> int:
+        """Turn a draft into the final reply; overflow beyond 4096 chars is sent after it."""
+        chunks = _chunk_text(text, max_len=4096)
+        status = await self.edit_draft(recipient, draft_id, chunks[0], parse_mode="Markdown")
+        if status >= 400 or len(chunks) == 1:
+            return status
+        return await self.send_text(recipient, "".join(chunks[1:]))
+
     def parse_inbound(self, payload: dict[str, Any]) -> list[InboundMessage]:
         """Parse a Telegram Bot API Update payload into InboundMessages."""
         messages: list[InboundMessage] = []
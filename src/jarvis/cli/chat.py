@@ -6,6 +6,7 @@ import json
 import os
 import socket
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 
 import click
@@ -20,6 +21,7 @@ from jarvis.db.queries import (
     insert_message,
 )
 from jarvis.ids import new_id
+from jarvis.orchestrator.streaming import StreamListener, get_stream_bus
 from jarvis.tasks import get_task_runner
 from jarvis.tasks.agent import agent_step
 
@@ -86,12 +88,63 @@ def _assistant_message_after(thread_id: str, user_message_id: str) -> tuple[str,
     return str(row["id"]), str(row["content"])
 
 
+class StreamPrinter:
+    """Echoes the main agent's streamed answer for one thread as it arrives."""
+
+    def __init__(self, thread_id: str, echo: Callable[..., None] = click.echo) -> None:
+        self.thread_id = thread_id
+        self.text = ""
+        self._echo = echo
+
+    def __call__(self, thread_id: str, frame: dict[str, object]) -> None:
+        if thread_id != self.thread_id:
+            return
+        frame_type = frame.get("type")
+        if frame_type == "message.delta":
+            if not self.text:
+                self._echo("assistant > ", nl=False)
+            self._echo(str(frame.get("delta", "")), nl=False)
+            self.text = str(frame.get("text", ""))
+        elif frame_type == "message.stream.reset" or (
+            frame_type == "message.stream.end" and not frame.get("final")
+        ):
+            # The preview was not the answer (retry, or the model is calling tools).
+            if self.text:
+                self._echo()
+            self.text = ""
+
+    def finish(self, reply_text: str) -> None:
+        """Close the streamed line, or print the stored reply if it differs."""
+        if self.text:
+            self._echo()
+            if self.text.strip() == reply_text.strip():
+                return
+        self._echo(f"assistant > {reply_text}")
+
+
 def send_and_wait(
     thread_id: str,
     message: str,
     enqueue: bool,
     timeout_s: float,
     poll_interval_s: float,
+    stream: StreamListener | None = None,
+) -> AssistantReply:
+    if stream is None:
+        return _send_and_wait(thread_id, message, enqueue, timeout_s, poll_interval_s)
+    remove = get_stream_bus().add_listener(stream)
+    try:
+        return _send_and_wait(thread_id, message, enqueue, timeout_s, poll_interval_s)
+    finally:
+        remove()
+
+
+def _send_and_wait(
+    thread_id: str,
+    message: str,
+    enqueue: bool,
+    timeout_s: float,
+    poll_interval_s: float,
 ) -> AssistantReply:
     with get_conn() as conn:
         user_message_id = insert_message(conn, thread_id, "user", message)
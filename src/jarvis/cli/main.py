@@ -10,6 +10,7 @@ from pathlib import Path
 import click
 
 from jarvis.cli.chat import (
+    StreamPrinter,
     default_cli_user,
     format_json_error,
     format_reply,
@@ -156,6 +157,12 @@ def ask(
 @click.option("--timeout-s", type=float, default=30.0, show_default=True)
 @click.option("--poll-interval-s", type=float, default=0.5, show_default=True)
 @click.option("--json", "json_output", is_flag=True, help="Print each assistant reply as JSON.")
+@click.option(
+    "--stream/--no-stream",
+    default=True,
+    show_default=True,
+    help="Print the reply as it is generated (ignored with --json).",
+)
 def chat(
     thread_id: str | None,
     new_thread: bool,
@@ -164,6 +171,7 @@ def chat(
     timeout_s: float,
     poll_interval_s: float,
     json_output: bool,
+    stream: bool,
 ) -> None:
     """Interactive CLI chat loop with the main agent."""
     if timeout_s <= 0:
@@ -183,15 +191,19 @@ def chat(
             continue
         if message.lower() in {"/quit", "/exit"}:
             break
+        printer = StreamPrinter(target_thread) if stream and not json_output else None
         reply = send_and_wait(
             thread_id=target_thread,
             message=message,
             enqueue=enqueue,
             timeout_s=timeout_s,
             poll_interval_s=poll_interval_s,
+            stream=printer,
         )
         if json_output:
             click.echo(format_reply(reply, json_output=True))
+        elif printer is not None:
+            printer.finish(reply.assistant_text)
         else:
             click.echo(f"assistant > {reply.assistant_text}")
 
@@ -635,3 +647,182 @@ def memory_export(
             out.close()
     if output:
         click.echo(f"exported to {output}")
+
+
+@cli.group("db")
+def db_group() -> None:
+    """Database diagnostics."""
+
+
+@db_group.command("profile")
+@click.option("--limit", default=20, show_default=True)
+@click.option(
+    "--sort",
+    type=click.Choice(["total_ms", "mean_ms", "p95_ms", "max_ms", "calls", "rows"]),
+    default="total_ms",
+    show_default=True,
+)
+@click.option("--slow", is_flag=True, help="Also list recent slow queries with their plans.")
+@click.option("--json", "json_output", is_flag=True, help="Print the report as JSON.")
+def db_profile(limit: int, sort: str, slow: bool, json_output: bool) -> None:
+    """Show the top SQL statements from the server's query profiler snapshot."""
+    from jarvis.db.profiler import read_snapshot, snapshot_path
+
+    path = snapshot_path(get_settings().app_db)
+    payload = read_snapshot(path)
+    if payload is None:
+        raise click.ClickException(
+            f"no query profile at {path}; run the server with DB_PROFILE_ENABLED=1"
+        )
+    top = payload.get("top")
+    statements = [item for item in top if isinstance(item, dict)] if isinstance(top, list) else []
+    statements.sort(key=lambda item: float(item.get(sort) or 0), reverse=True)
+    payload["top"] = statements[: max(1, int(limit))]
+    if json_output:
+        click.echo(json.dumps(payload, indent=2, sort_keys=True))
+        return
+    click.echo(
+        f"since {payload.get('since')}  snapshot {payload.get('generated_at')}  "
+        f"statements={payload.get('statements')} calls={payload.get('calls')} "
+        f"total_ms={payload.get('total_ms')}"
+    )
+    click.echo(
+        f"{'total_ms':>11} {'calls':>8} {'mean_ms':>9} {'p95_ms':>9} {'max_ms':>9} "
+        f"{'rows':>9}  statement"
+    )
+    for item in payload["top"]:
+        click.echo(
+            f"{float(item.get('total_ms') or 0):>11.1f} {int(item.get('calls') or 0):>8} "
+            f"{float(item.get('mean_ms') or 0):>9.2f} {float(item.get('p95_ms') or 0):>9.2f} "
+            f"{float(item.get('max_ms') or 0):>9.2f} {int(item.get('rows') or 0):>9}  "
+            f"{str(item.get('fingerprint'))[:160]}"
+        )
+    if not slow:
+        return
+    slow_queries = payload.get("slow_queries")
+    if not isinstance(slow_queries, list) or not slow_queries:
+        click.echo("no slow queries recorded")
+        return
+    click.echo(f"slow queries (>= {payload.get('slow_ms')} ms):")
+    for entry in slow_queries:
+        if not isinstance(entry, dict):
+            continue
+        click.echo(
+            f"  {entry.get('at')} {entry.get('duration_ms')} ms rows={entry.get('rows')}: "
+            f"{str(entry.get('fingerprint'))[:160]}"
+        )
+        plan = entry.get("plan")
+        for line in plan if isinstance(plan, list) else []:
+            click.echo(f"      {line}")
+
+
+@db_group.command("audit-plans")
+@click.option("--json", "json_output", is_flag=True, help="Print findings as JSON.")
+def db_audit_plans(json_output: bool) -> None:
+    """EXPLAIN the hot statement set and flag unexpected full scans or sorts."""
+    from jarvis.db.plan_audit import HOT_QUERIES, audit_query_plans
+
+    with get_conn() as conn:
+        if getattr(conn, "dialect", "sqlite") != "sqlite":
+            raise click.ClickException("plan audit reads SQLite query plans; DB_ENGINE=sqlite")
+        findings = audit_query_plans(conn)
+    if json_output:
+        click.echo(
+            json.dumps(
+                [
+                    {
+                        "query": item.query,
+                        "problem": item.problem,
+                        "detail": item.detail,
+                        "plan": list(item.plan),
+                    }
+                    for item in findings
+                ],
+                indent=2,
+            )
+        )
+    else:
+        for item in findings:
+            click.echo(f"{item.query}: {item.problem} ({item.detail})")
+            click.echo(f"    plan: {'; '.join(item.plan)}")
+        click.echo(f"audited {len(HOT_QUERIES)} statements, {len(findings)} finding(s)")
+    if findings:
+        sys.exit(1)
+
+
+@db_group.group("events")
+def db_events_group() -> None:
+    """Monthly archive partitions of the events table."""
+
+
+@db_events_group.command("list")
+@click.option("--json", "json_output", is_flag=True, help="Print partitions as JSON.")
+def db_events_list(json_output: bool) -> None:
+    """List archived event partitions, newest first."""
+    from jarvis.events.archive import list_partitions, partition_stats
+
+    partitions = [partition_stats(item) for item in list_partitions()]
+    if json_output:
+        click.echo(json.dumps(partitions, indent=2))
+        return
+    if not partitions:
+        click.echo("no archived event partitions")
+        return
+    click.echo(f"{'month':<8} {'events':>10} {'size_kib':>10}  oldest .. newest")
+    for item in partitions:
+        click.echo(
+            f"{item['month']:<8} {item['events']:>10} {item['size_bytes'] // 1024:>10}  "
+            f"{item['oldest']} .. {item['newest']}"
+        )
+
+
+@db_events_group.command("compact")
+@click.option(
+    "--older-than-days",
+    type=int,
+    default=None,
+    help="Archive window in days (default EVENTS_ARCHIVE_AFTER_DAYS).",
+)
+@click.option("--json", "json_output", is_flag=True, help="Print the result as JSON.")
+def db_events_compact(older_than_days: int | None, json_output: bool) -> None:
+    """Move events past the archive window into their monthly partitions."""
+    from jarvis.events.archive import archive_cutoff, compact_events
+
+    settings = get_settings()
+    days = settings.events_archive_after_days if older_than_days is None else older_than_days
+    if days <= 0:
+        raise click.ClickException("archive window must be at least one day")
+    with get_conn() as conn:
+        result = compact_events(
+            conn,
+            before=archive_cutoff(days),
+            batch_size=int(settings.events_archive_batch_size),
+        )
+    if result.get("skipped"):
+        raise click.ClickException("event partitions are SQLite files; DB_ENGINE=sqlite")
+    if json_output:
+        click.echo(json.dumps(result, indent=2))
+        return
+    partitions = result.get("partitions") or []
+    click.echo(
+        f"archived {result['archived']} event(s) older than {days} day(s)"
+        + (f" into {', '.join(str(month) for month in partitions)}" if partitions else "")
+    )
+
+
+@db_events_group.command("drop")
+@click.argument("month")
+@click.option("--yes", is_flag=True, help="Do not ask for confirmation.")
+def db_events_drop(month: str, yes: bool) -> None:
+    """Delete the archived partition for MONTH (YYYY-MM) and its events."""
+    from jarvis.events.archive import drop_partition
+
+    if not yes:
+        click.confirm(f"Permanently delete archived events for {month}?", abort=True)
+    try:
+        dropped = drop_partition(month)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    if not dropped:
+        raise click.ClickException(f"no archived event partition for {month}")
+    click.echo(f"dropped event partition {month}")
@@ -16,10 +16,13 @@ from jarvis.db.queries import (
     list_selfupdate_checks,
     list_selfupdate_transitions,
     list_whatsapp_sender_reviews,
+    mark_system_state_changed,
     resolve_whatsapp_sender_review,
     set_thread_agents,
     set_thread_verbose,
 )
+from jarvis.db.write_queue import flush_writes
+from jarvis.events.archive import query_events
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
 from jarvis.ids import new_id
@@ -185,25 +188,31 @@ async def maybe_execute_command(
 
     if command == "/logs" and len(args) >= 2 and args[0] == "trace":
         trace_id = args[1]
-        rows = conn.execute(
+        flush_writes()
+        rows = query_events(
+            conn,
             (
-                "SELECT event_type, component, created_at FROM events "
+                "SELECT event_type, component, created_at FROM {events} "
                 "WHERE trace_id=? ORDER BY created_at ASC"
             ),
             (trace_id,),
-        ).fetchall()
+            oldest_first=True,
+        )
         payload = [dict(r) for r in rows]
         return json.dumps({"trace_id": trace_id, "events": payload})
 
     if command == "/logs" and len(args) >= 2 and args[0] == "trace-audit":
         trace_id = args[1]
-        event_rows = conn.execute(
+        flush_writes()
+        event_rows = query_events(
+            conn,
             (
                 "SELECT event_type, component, created_at, payload_redacted_json "
-                "FROM events WHERE trace_id=? ORDER BY created_at ASC"
+                "FROM {events} WHERE trace_id=? ORDER BY created_at ASC"
             ),
             (trace_id,),
-        ).fetchall()
+            oldest_first=True,
+        )
         checks = list_selfupdate_checks(conn, trace_id)
         transitions = list_selfupdate_transitions(conn, trace_id)
         patch_base = Path(get_settings().selfupdate_patch_dir)
@@ -237,6 +246,7 @@ async def maybe_execute_command(
         query = " ".join(args[1:]).strip()
         if not query:
             return json.dumps({"query": "", "events": []})
+        flush_writes()
         semantic_rows = MemoryService().search_events(conn, query=query, limit=20)
         if semantic_rows:
             return json.dumps({"query": query, "events": semantic_rows})
@@ -335,6 +345,7 @@ async def maybe_execute_command(
         conn.execute(
             "UPDATE system_state SET lockdown=0, updated_at=datetime('now') WHERE id='singleton'"
         )
+        mark_system_state_changed()
         emit_event(
             conn,
             EventInput(
@@ -362,6 +373,7 @@ async def maybe_execute_command(
         conn.execute(
             "UPDATE system_state SET restarting=1, updated_at=datetime('now') WHERE id='singleton'"
         )
+        mark_system_state_changed()
         trace_id = f"trc_restart_{thread_id}"
         _ = enqueue_restart(trace_id)
         return "restart flag set"
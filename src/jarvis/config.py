@@ -11,12 +11,44 @@ class Settings(BaseSettings):
 
     app_env: str = Field(alias="APP_ENV", default="dev")
     app_db: str = Field(alias="APP_DB", default="/tmp/jarvis.db")
+    db_engine: str = Field(alias="DB_ENGINE", default="sqlite")
+    database_url: str = Field(alias="DATABASE_URL", default="")
+    db_pool_size: int = Field(alias="DB_POOL_SIZE", default=8)
+    db_pool_timeout_seconds: float = Field(alias="DB_POOL_TIMEOUT_SECONDS", default=2.0)
+    db_statement_cache_size: int = Field(alias="DB_STATEMENT_CACHE_SIZE", default=256)
+    db_cache_size_kib: int = Field(alias="DB_CACHE_SIZE_KIB", default=16384)
+    db_mmap_size_bytes: int = Field(alias="DB_MMAP_SIZE_BYTES", default=268435456)
+    db_read_pool_size: int = Field(alias="DB_READ_POOL_SIZE", default=8)
+    db_read_cache_size_kib: int = Field(alias="DB_READ_CACHE_SIZE_KIB", default=65536)
+    db_read_mmap_size_bytes: int = Field(alias="DB_READ_MMAP_SIZE_BYTES", default=1073741824)
+    db_write_behind_enabled: int = Field(alias="DB_WRITE_BEHIND_ENABLED", default=1)
+    db_write_batch_ms: int = Field(alias="DB_WRITE_BATCH_MS", default=50)
+    db_write_batch_rows: int = Field(alias="DB_WRITE_BATCH_ROWS", default=500)
+    db_write_queue_max: int = Field(alias="DB_WRITE_QUEUE_MAX", default=20000)
+    db_profile_enabled: int = Field(alias="DB_PROFILE_ENABLED", default=0)
+    db_profile_slow_ms: float = Field(alias="DB_PROFILE_SLOW_MS", default=100.0)
+    db_profile_max_statements: int = Field(alias="DB_PROFILE_MAX_STATEMENTS", default=500)
+    db_profile_slow_log_size: int = Field(alias="DB_PROFILE_SLOW_LOG_SIZE", default=100)
+    db_profile_snapshot_seconds: int = Field(alias="DB_PROFILE_SNAPSHOT_SECONDS", default=60)
+    events_archive_after_days: int = Field(alias="EVENTS_ARCHIVE_AFTER_DAYS", default=90)
+    events_archive_interval_seconds: int = Field(
+        alias="EVENTS_ARCHIVE_INTERVAL_SECONDS", default=86400
+    )
+    events_archive_batch_size: int = Field(alias="EVENTS_ARCHIVE_BATCH_SIZE", default=2000)
     log_level: str = Field(alias="LOG_LEVEL", default="INFO")
     trace_sample_rate: float = Field(alias="TRACE_SAMPLE_RATE", default=1.0)
     compaction_every_n_events: int = Field(alias="COMPACTION_EVERY_N_EVENTS", default=25)
     compaction_interval_seconds: int = Field(alias="COMPACTION_INTERVAL_SECONDS", default=600)
     prompt_budget_gemini_tokens: int = Field(alias="PROMPT_BUDGET_GEMINI_TOKENS", default=200000)
     prompt_budget_sglang_tokens: int = Field(alias="PROMPT_BUDGET_SGLANG_TOKENS", default=110000)
+    prompt_context_source_timeout_seconds: float = Field(
+        alias="PROMPT_CONTEXT_SOURCE_TIMEOUT_SECONDS", default=5.0
+    )
+    environment_refresh_seconds: float = Field(
+        alias="ENVIRONMENT_REFRESH_SECONDS", default=30.0
+    )
+    model_streaming_enabled: int = Field(alias="MODEL_STREAMING_ENABLED", default=1)
+    model_stream_flush_ms: int = Field(alias="MODEL_STREAM_FLUSH_MS", default=80)
     lockdown_default: int = Field(alias="LOCKDOWN_DEFAULT", default=0)
     selfupdate_auto_apply_dev: int = Field(alias="SELFUPDATE_AUTO_APPLY_DEV", default=1)
     selfupdate_auto_apply_prod: int = Field(alias="SELFUPDATE_AUTO_APPLY_PROD", default=0)
@@ -133,6 +165,9 @@ class Settings(BaseSettings):
     # Telegram
     telegram_bot_token: str = Field(alias="TELEGRAM_BOT_TOKEN", default="")
     telegram_allowed_chat_ids: str = Field(alias="TELEGRAM_ALLOWED_CHAT_IDS", default="")
+    telegram_stream_edit_interval_seconds: float = Field(
+        alias="TELEGRAM_STREAM_EDIT_INTERVAL_SECONDS", default=1.0
+    )
 
     google_oauth_client_id: str = Field(alias="GOOGLE_OAUTH_CLIENT_ID", default="")
     google_oauth_client_secret: str = Field(alias="GOOGLE_OAUTH_CLIENT_SECRET", default="")
@@ -164,7 +199,29 @@ class Settings(BaseSettings):
     ollama_base_url: str = Field(alias="OLLAMA_BASE_URL", default="http://localhost:11434")
     ollama_embed_model: str = Field(alias="OLLAMA_EMBED_MODEL", default="nomic-embed-text")
     memory_embed_dims: int = Field(alias="MEMORY_EMBED_DIMS", default=768)
+    memory_embed_batch_size: int = Field(alias="MEMORY_EMBED_BATCH_SIZE", default=32)
+    memory_embed_concurrency: int = Field(alias="MEMORY_EMBED_CONCURRENCY", default=2)
+    memory_embed_retry_seconds: int = Field(alias="MEMORY_EMBED_RETRY_SECONDS", default=30)
+    memory_query_cache_size: int = Field(alias="MEMORY_QUERY_CACHE_SIZE", default=1024)
+    memory_query_cache_ttl_seconds: int = Field(
+        alias="MEMORY_QUERY_CACHE_TTL_SECONDS", default=600
+    )
+    event_vector_index_interval_seconds: int = Field(
+        alias="EVENT_VECTOR_INDEX_INTERVAL_SECONDS", default=5
+    )
+    memory_ann_enabled: int = Field(alias="MEMORY_ANN_ENABLED", default=0)
+    memory_ann_nprobe: int = Field(alias="MEMORY_ANN_NPROBE", default=8)
+    memory_ann_min_train_size: int = Field(alias="MEMORY_ANN_MIN_TRAIN_SIZE", default=2048)
+    memory_ann_rebuild_interval_seconds: int = Field(
+        alias="MEMORY_ANN_REBUILD_INTERVAL_SECONDS", default=900
+    )
     sqlite_vec_extension_path: str = Field(alias="SQLITE_VEC_EXTENSION_PATH", default="")
+    memory_vec_backfill_interval_seconds: int = Field(
+        alias="MEMORY_VEC_BACKFILL_INTERVAL_SECONDS", default=60
+    )
+    memory_vec_backfill_rescan_seconds: int = Field(
+        alias="MEMORY_VEC_BACKFILL_RESCAN_SECONDS", default=86400
+    )
     state_extraction_enabled: int = Field(alias="STATE_EXTRACTION_ENABLED", default=1)
     state_extraction_max_messages: int = Field(alias="STATE_EXTRACTION_MAX_MESSAGES", default=20)
     state_extraction_merge_threshold: float = Field(
@@ -191,6 +248,10 @@ class Settings(BaseSettings):
     memory_secret_scan_enabled: int = Field(alias="MEMORY_SECRET_SCAN_ENABLED", default=1)
     memory_pii_redact_mode: str = Field(alias="MEMORY_PII_REDACT_MODE", default="mask")
     memory_retention_days: int = Field(alias="MEMORY_RETENTION_DAYS", default=180)
+    memory_maintenance_batch_size: int = Field(
+        alias="MEMORY_MAINTENANCE_BATCH_SIZE", default=500
+    )
+    memory_maintenance_yield_ms: int = Field(alias="MEMORY_MAINTENANCE_YIELD_MS", default=5)
     memory_tiers_enabled: int = Field(alias="MEMORY_TIERS_ENABLED", default=0)
     memory_importance_enabled: int = Field(alias="MEMORY_IMPORTANCE_ENABLED", default=0)
     memory_graph_enabled: int = Field(alias="MEMORY_GRAPH_ENABLED", default=0)
@@ -200,6 +261,10 @@ class Settings(BaseSettings):
         alias="MEMORY_SENTENCE_TRANSFORMERS_MODEL",
         default="all-MiniLM-L6-v2",
     )
+    memory_vector_cache_max_bytes: int = Field(
+        alias="MEMORY_VECTOR_CACHE_MAX_BYTES",
+        default=67_108_864,
+    )
 
     searxng_base_url: str = Field(alias="SEARXNG_BASE_URL", default="http://localhost:8080")
     searxng_api_key: str = Field(alias="SEARXNG_API_KEY", default="")
@@ -346,6 +411,10 @@ def validate_settings_for_env(settings: Settings) -> None:
             missing.append("GITHUB_ISSUE_SYNC_REPO")
     if not settings.app_db.startswith("/"):
         missing.append("APP_DB(absolute path required)")
+    if settings.db_engine not in {"sqlite", "postgres"}:
+        missing.append("DB_ENGINE(sqlite|postgres)")
+    if settings.db_engine == "postgres" and not settings.database_url.strip():
+        missing.append("DATABASE_URL")
 
     if missing:
         keys = ", ".join(sorted(set(missing)))
@@ -1,32 +1,440 @@
-"""SQLite connection management."""
+"""Database connection management.
 
+:func:`get_conn` checks connections out of a process-wide :class:`ConnectionPool`
+instead of opening a fresh handle (and re-running every PRAGMA) per use. Pooled
+connections keep their prepared-statement cache, page cache and per-connection
+``runtime_flags`` warm across requests. A thread prefers the connection it used
+last; when every connection is busy a caller waits up to
+``DB_POOL_TIMEOUT_SECONDS`` and then gets a transient overflow connection, so a
+burst never fails and nested ``get_conn()`` calls never deadlock.
+
+Read-only routes use a second lane, :func:`get_read_conn` (or the
+:func:`read_db` FastAPI dependency). Its connections open the database with
+``mode=ro`` and ``PRAGMA query_only``, get a larger page cache and mmap window,
+and never hold the write lock, so dashboards and exports do not contend with
+agent writes. A read connection ends its snapshot as soon as it is returned so
+a finished read never pins the WAL against checkpointing.
+
+``DB_PROFILE_ENABLED=1`` opens :class:`ProfiledConnection` handles whose
+cursors report to :mod:`jarvis.db.profiler`.
+
+``DB_ENGINE=postgres`` swaps the factories for :mod:`jarvis.db.postgres`
+connections to ``DATABASE_URL``; pooling, lanes and callers stay the same.
+"""
+
+import logging
+import os
 import sqlite3
-from collections.abc import Iterator
+import threading
+import time
+from collections.abc import Callable, Iterator
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, cast
+from urllib.parse import quote
+
+from jarvis.config import Settings, get_settings
+from jarvis.db.profiler import get_query_profiler
+
+logger = logging.getLogger(__name__)
+
+
+class Connection(sqlite3.Connection):
+    """``sqlite3.Connection`` that can remember per-connection runtime probes."""
+
+    dialect = "sqlite"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.runtime_flags: dict[str, bool] = {}
+
+
+class ProfiledConnection(Connection):
+    """:class:`Connection` whose cursors time statements for the query profiler."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.profiler = get_query_profiler()
+
+    def cursor(self, factory: Any = sqlite3.Cursor) -> Any:
+        return self.profiler.wrap(self, super().cursor(factory))
+
+    def execute(self, sql: str, parameters: Any = (), /) -> Any:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> Any:
+        return self.cursor().executemany(sql, seq_of_parameters)
 
-from jarvis.config import get_settings
+
+def _connection_class(settings: Settings) -> type[Connection]:
+    return ProfiledConnection if int(settings.db_profile_enabled) == 1 else Connection
+
+
+def db_target(settings: Settings | None = None) -> str:
+    """Identify the configured database: the SQLite path or the Postgres URL."""
+    settings = settings or get_settings()
+    if settings.db_engine == "postgres":
+        return settings.database_url
+    return settings.app_db
+
+
+def _connect_postgres(*, read_only: bool) -> sqlite3.Connection:
+    from jarvis.db.postgres import connect_postgres
+
+    settings = get_settings()
+    conn = connect_postgres(
+        settings.database_url,
+        read_only=read_only,
+        statement_cache_size=settings.db_statement_cache_size,
+    )
+    if int(settings.db_profile_enabled) == 1:
+        conn.profiler = get_query_profiler()
+    return cast(sqlite3.Connection, conn)
 
 
 def connect() -> sqlite3.Connection:
     settings = get_settings()
+    if settings.db_engine == "postgres":
+        return _connect_postgres(read_only=False)
     Path(settings.app_db).parent.mkdir(parents=True, exist_ok=True)
     # Autocommit mode keeps write locks short under mixed API/worker access.
-    conn = sqlite3.connect(settings.app_db, timeout=30.0, isolation_level=None)
+    # Pooled handles move between threads, one holder at a time.
+    conn = sqlite3.connect(
+        settings.app_db,
+        timeout=30.0,
+        isolation_level=None,
+        factory=_connection_class(settings),
+        check_same_thread=False,
+        cached_statements=max(0, int(settings.db_statement_cache_size)),
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
     conn.execute("PRAGMA synchronous = NORMAL")
     conn.execute("PRAGMA wal_autocheckpoint = 1000")
     conn.execute("PRAGMA busy_timeout = 30000")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    # Negative cache_size is in KiB rather than pages.
+    conn.execute(f"PRAGMA cache_size = -{max(0, int(settings.db_cache_size_kib))}")
+    conn.execute(f"PRAGMA mmap_size = {max(0, int(settings.db_mmap_size_bytes))}")
+    return conn
+
+
+def connect_readonly() -> sqlite3.Connection:
+    settings = get_settings()
+    if settings.db_engine == "postgres":
+        return _connect_postgres(read_only=True)
+    uri = f"file:{quote(str(Path(settings.app_db).resolve()))}?mode=ro"
+    conn: sqlite3.Connection
+    try:
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=30.0,
+            isolation_level=None,
+            factory=_connection_class(settings),
+            check_same_thread=False,
+            cached_statements=max(0, int(settings.db_statement_cache_size)),
+        )
+        conn.execute("PRAGMA busy_timeout = 30000")
+    except sqlite3.OperationalError:
+        # The database does not exist yet; create it through the writable path.
+        conn = connect()
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA cache_size = -{max(0, int(settings.db_read_cache_size_kib))}")
+    conn.execute(f"PRAGMA mmap_size = {max(0, int(settings.db_read_mmap_size_bytes))}")
     return conn
 
 
+class ConnectionPool:
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        timeout_seconds: float,
+        *,
+        factory: Callable[[], sqlite3.Connection] = connect,
+        metric_prefix: str = "db_pool",
+    ) -> None:
+        self.path = path
+        self.factory = factory
+        self.metric_prefix = metric_prefix
+        self.size = max(0, int(size))
+        self.timeout_seconds = max(0.0, float(timeout_seconds))
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        self._idle: list[sqlite3.Connection] = []
+        self._pooled: set[sqlite3.Connection] = set()
+        self._in_use = 0
+        self._opening = 0
+        self._closed = False
+        self._local = threading.local()
+        # Hold counts by thread; a FastAPI dependency may release on another thread.
+        self._held_by: dict[int, int] = {}
+        self._owners: dict[sqlite3.Connection, int] = {}
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._hold_total_ms = 0.0
+        self._overflow = 0
+        self._created = 0
+        self._discarded = 0
+
+    def _held(self) -> int:
+        return self._held_by.get(threading.get_ident(), 0)
+
+    def _mark_held(self, conn: sqlite3.Connection) -> None:
+        owner = threading.get_ident()
+        with self._cond:
+            self._owners[conn] = owner
+            self._held_by[owner] = self._held_by.get(owner, 0) + 1
+
+    def _mark_released(self, conn: sqlite3.Connection) -> None:
+        with self._cond:
+            owner = self._owners.pop(conn, None)
+            if owner is None:
+                return
+            remaining = self._held_by.get(owner, 0) - 1
+            if remaining > 0:
+                self._held_by[owner] = remaining
+            else:
+                self._held_by.pop(owner, None)
+
+    def _take_idle(self) -> sqlite3.Connection:
+        # Prefer the connection this thread used last; otherwise the most recently used.
+        preferred = getattr(self._local, "last", None)
+        for index in range(len(self._idle) - 1, -1, -1):
+            if self._idle[index] is preferred:
+                return self._idle.pop(index)
+        return self._idle.pop()
+
+    def _open_reserved(self) -> sqlite3.Connection:
+        try:
+            conn = self.factory()
+        except Exception:
+            with self._cond:
+                self._opening -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._opening -= 1
+            self._created += 1
+            self._pooled.add(conn)
+        return conn
+
+    def _reopen(self) -> sqlite3.Connection:
+        with self._cond:
+            self._opening += 1
+            self._in_use += 1
+        return self._open_reserved()
+
+    def _healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._cond:
+            self._pooled.discard(conn)
+            self._discarded += 1
+            self._in_use -= 1
+            self._cond.notify()
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def acquire(self) -> sqlite3.Connection:
+        started = time.perf_counter()
+        waited = False
+        reserved = False
+        conn: sqlite3.Connection | None = None
+        with self._cond:
+            self._checkouts += 1
+            deadline = time.monotonic() + self.timeout_seconds
+            while not self._closed and self.size > 0:
+                if self._idle:
+                    conn = self._take_idle()
+                    self._in_use += 1
+                    break
+                if len(self._pooled) + self._opening < self.size:
+                    self._opening += 1
+                    self._in_use += 1
+                    reserved = True
+                    break
+                # A thread already holding a connection must not wait on its peers.
+                remaining = deadline - time.monotonic()
+                if self._held() > 0 or remaining <= 0:
+                    break
+                waited = True
+                self._cond.wait(remaining)
+            if waited:
+                wait_ms = (time.perf_counter() - started) * 1000
+                self._waits += 1
+                self._wait_total_ms += wait_ms
+                self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+        if reserved:
+            conn = self._open_reserved()
+        elif conn is None:
+            if waited:
+                logger.warning(
+                    "SQLite pool exhausted after %.1fs; opening overflow connection",
+                    self.timeout_seconds,
+                )
+            conn = self.factory()
+            with self._cond:
+                self._created += 1
+                self._overflow += 1
+        elif not self._healthy(conn):
+            logger.warning("Discarding unhealthy pooled SQLite connection")
+            self._discard(conn)
+            conn = self._reopen()
+        self._mark_held(conn)
+        return conn
+
+    def release(self, conn: sqlite3.Connection, held_since: float) -> None:
+        self._mark_released(conn)
+        with self._cond:
+            self._hold_total_ms += (time.perf_counter() - held_since) * 1000
+            pooled = conn in self._pooled
+        if not pooled:
+            conn.close()
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._in_use -= 1
+            if self._closed:
+                self._pooled.discard(conn)
+                conn.close()
+                return
+            self._idle.append(conn)
+            self._local.last = conn
+            self._cond.notify()
+
+    def stats(self) -> dict[str, float | int]:
+        prefix = self.metric_prefix
+        with self._cond:
+            return {
+                f"{prefix}_size": self.size,
+                f"{prefix}_open": len(self._pooled),
+                f"{prefix}_idle": len(self._idle),
+                f"{prefix}_in_use": self._in_use,
+                f"{prefix}_checkouts": self._checkouts,
+                f"{prefix}_waits": self._waits,
+                f"{prefix}_wait_avg_ms": (
+                    round(self._wait_total_ms / self._waits, 3) if self._waits else 0.0
+                ),
+                f"{prefix}_wait_max_ms": round(self._wait_max_ms, 3),
+                f"{prefix}_hold_avg_ms": (
+                    round(self._hold_total_ms / self._checkouts, 3) if self._checkouts else 0.0
+                ),
+                f"{prefix}_overflow": self._overflow,
+                f"{prefix}_created": self._created,
+                f"{prefix}_discarded": self._discarded,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for conn in idle:
+                self._pooled.discard(conn)
+            self._cond.notify_all()
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(lane: str) -> ConnectionPool:
+    settings = get_settings()
+    target = db_target(settings)
+    pool = _pools.get(lane)
+    if pool is not None and pool.path == target and pool.pid == os.getpid():
+        return pool
+    with _pool_lock:
+        pool = _pools.get(lane)
+        if pool is None or pool.path != target or pool.pid != os.getpid():
+            if pool is not None and pool.pid == os.getpid():
+                pool.close()
+            if lane == "read":
+                pool = ConnectionPool(
+                    target,
+                    settings.db_read_pool_size,
+                    settings.db_pool_timeout_seconds,
+                    factory=connect_readonly,
+                    metric_prefix="db_read_pool",
+                )
+            else:
+                pool = ConnectionPool(
+                    target, settings.db_pool_size, settings.db_pool_timeout_seconds
+                )
+            _pools[lane] = pool
+        return pool
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the pool for the configured database, rebuilding it if the target changed."""
+    return _get_pool("write")
+
+
+def get_read_pool() -> ConnectionPool:
+    """Return the read-only lane pool for the configured database."""
+    return _get_pool("read")
+
+
+def reset_connection_pool() -> None:
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        if pool.pid == os.getpid():
+            pool.close()
+
+
 @contextmanager
 def get_conn() -> Iterator[sqlite3.Connection]:
-    conn = connect()
+    pool = get_connection_pool()
+    conn = pool.acquire()
+    held_since = time.perf_counter()
     try:
         yield conn
         conn.commit()
     finally:
-        conn.close()
+        pool.release(conn, held_since)
+
+
+@contextmanager
+def get_read_conn() -> Iterator[sqlite3.Connection]:
+    pool = get_read_pool()
+    conn = pool.acquire()
+    held_since = time.perf_counter()
+    try:
+        yield conn
+    finally:
+        pool.release(conn, held_since)
+
+
+def read_db() -> Iterator[sqlite3.Connection]:
+    """FastAPI dependency yielding a read-lane connection for the request."""
+    with get_read_conn() as conn:
+        yield conn
@@ -0,0 +1,8 @@
+-- Packed little-endian float32 vectors with a dims/model header.
+-- Legacy rows keep vector_json and are upgraded lazily on read; packed rows
+-- store an empty vector_json so the NOT NULL contract still holds.
+ALTER TABLE memory_embeddings ADD COLUMN vector_blob BLOB;
+ALTER TABLE memory_vec ADD COLUMN vector_blob BLOB;
+ALTER TABLE event_vec ADD COLUMN vector_blob BLOB;
+ALTER TABLE state_item_embeddings ADD COLUMN vector_blob BLOB;
+ALTER TABLE embedding_cache ADD COLUMN vector_blob BLOB;
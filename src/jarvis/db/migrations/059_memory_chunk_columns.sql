@@ -0,0 +1,14 @@
+ALTER TABLE memory_items ADD COLUMN chunk_group_id TEXT;
+
+ALTER TABLE memory_items ADD COLUMN chunk_index INTEGER;
+
+UPDATE memory_items
+SET chunk_group_id=json_extract(metadata_json, '$.chunk_group_id'),
+    chunk_index=CAST(COALESCE(json_extract(metadata_json, '$.chunk_index'), 0) AS INTEGER)
+WHERE json_valid(metadata_json)
+  AND json_type(metadata_json, '$.chunk_group_id')='text'
+  AND length(trim(json_extract(metadata_json, '$.chunk_group_id'))) > 0;
+
+CREATE INDEX IF NOT EXISTS idx_memory_items_chunk_group
+  ON memory_items(thread_id, chunk_group_id, chunk_index)
+  WHERE chunk_group_id IS NOT NULL;
@@ -0,0 +1,54 @@
+CREATE VIRTUAL TABLE IF NOT EXISTS state_items_fts USING fts5(
+  uid UNINDEXED,
+  thread_id UNINDEXED,
+  text
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_state_items_fts_insert
+AFTER INSERT ON state_items
+BEGIN
+  INSERT INTO state_items_fts(uid, thread_id, text) VALUES(new.uid, new.thread_id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_state_items_fts_delete
+AFTER DELETE ON state_items
+BEGIN
+  DELETE FROM state_items_fts WHERE uid=old.uid AND thread_id=old.thread_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_state_items_fts_update
+AFTER UPDATE OF uid, thread_id, text ON state_items
+BEGIN
+  DELETE FROM state_items_fts WHERE uid=old.uid AND thread_id=old.thread_id;
+  INSERT INTO state_items_fts(uid, thread_id, text) VALUES(new.uid, new.thread_id, new.text);
+END;
+
+INSERT INTO state_items_fts(uid, thread_id, text)
+SELECT uid, thread_id, text FROM state_items;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS failure_capsules_fts USING fts5(
+  capsule_id UNINDEXED,
+  error_summary
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_failure_capsules_fts_insert
+AFTER INSERT ON failure_capsules
+BEGIN
+  INSERT INTO failure_capsules_fts(capsule_id, error_summary) VALUES(new.id, new.error_summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_failure_capsules_fts_delete
+AFTER DELETE ON failure_capsules
+BEGIN
+  DELETE FROM failure_capsules_fts WHERE capsule_id=old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_failure_capsules_fts_update
+AFTER UPDATE OF id, error_summary ON failure_capsules
+BEGIN
+  DELETE FROM failure_capsules_fts WHERE capsule_id=old.id;
+  INSERT INTO failure_capsules_fts(capsule_id, error_summary) VALUES(new.id, new.error_summary);
+END;
+
+INSERT INTO failure_capsules_fts(capsule_id, error_summary)
+SELECT id, error_summary FROM failure_capsules;
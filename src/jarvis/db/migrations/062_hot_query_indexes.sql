@@ -0,0 +1,39 @@
+-- Supporting indexes for the statements audited by jarvis.db.plan_audit.
+
+CREATE INDEX IF NOT EXISTS idx_messages_thread_created
+  ON messages(thread_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_memory_items_thread_created
+  ON memory_items(thread_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_memory_items_created
+  ON memory_items(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_threads_user_channel_status
+  ON threads(user_id, channel_id, status, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_threads_user_updated
+  ON threads(user_id, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_channels_user_type
+  ON channels(user_id, channel_type);
+
+-- The thread and trace composites supersede the single-column indexes from 001.
+CREATE INDEX IF NOT EXISTS idx_events_thread_created
+  ON events(thread_id, created_at);
+
+DROP INDEX IF EXISTS idx_events_thread;
+
+CREATE INDEX IF NOT EXISTS idx_events_trace_created
+  ON events(trace_id, created_at);
+
+DROP INDEX IF EXISTS idx_events_trace;
+
+CREATE INDEX IF NOT EXISTS idx_events_created
+  ON events(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_events_type_created
+  ON events(event_type, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_events_component_created
+  ON events(component, created_at);
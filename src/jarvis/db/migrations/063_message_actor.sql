@@ -0,0 +1,14 @@
+ALTER TABLE messages ADD COLUMN actor_id TEXT;
+
+ALTER TABLE messages ADD COLUMN trace_id TEXT;
+
+-- Agent replies were attributed through their agent.step.end event payload.
+UPDATE messages
+SET actor_id=src.actor_id,
+    trace_id=src.trace_id
+FROM (
+  SELECT json_extract(payload_json, '$.message_id') AS message_id, actor_id, trace_id
+  FROM events
+  WHERE event_type='agent.step.end' AND json_valid(payload_json)
+) AS src
+WHERE messages.id=src.message_id;
@@ -0,0 +1,70 @@
+-- 060 keyed the FTS rows on UNINDEXED columns, so every UPDATE/DELETE trigger
+-- scanned the whole FTS table. Rebuild both tables keyed on the source rowid.
+DROP TRIGGER IF EXISTS trg_state_items_fts_insert;
+DROP TRIGGER IF EXISTS trg_state_items_fts_delete;
+DROP TRIGGER IF EXISTS trg_state_items_fts_update;
+DROP TABLE IF EXISTS state_items_fts;
+
+CREATE VIRTUAL TABLE state_items_fts USING fts5(
+  uid UNINDEXED,
+  thread_id UNINDEXED,
+  text
+);
+
+CREATE TRIGGER trg_state_items_fts_insert
+AFTER INSERT ON state_items
+BEGIN
+  INSERT INTO state_items_fts(rowid, uid, thread_id, text)
+  VALUES(new.rowid, new.uid, new.thread_id, new.text);
+END;
+
+CREATE TRIGGER trg_state_items_fts_delete
+AFTER DELETE ON state_items
+BEGIN
+  DELETE FROM state_items_fts WHERE rowid=old.rowid;
+END;
+
+CREATE TRIGGER trg_state_items_fts_update
+AFTER UPDATE OF uid, thread_id, text ON state_items
+BEGIN
+  DELETE FROM state_items_fts WHERE rowid=old.rowid;
+  INSERT INTO state_items_fts(rowid, uid, thread_id, text)
+  VALUES(new.rowid, new.uid, new.thread_id, new.text);
+END;
+
+INSERT INTO state_items_fts(rowid, uid, thread_id, text)
+SELECT rowid, uid, thread_id, text FROM state_items;
+
+DROP TRIGGER IF EXISTS trg_failure_capsules_fts_insert;
+DROP TRIGGER IF EXISTS trg_failure_capsules_fts_delete;
+DROP TRIGGER IF EXISTS trg_failure_capsules_fts_update;
+DROP TABLE IF EXISTS failure_capsules_fts;
+
+CREATE VIRTUAL TABLE failure_capsules_fts USING fts5(
+  capsule_id UNINDEXED,
+  error_summary
+);
+
+CREATE TRIGGER trg_failure_capsules_fts_insert
+AFTER INSERT ON failure_capsules
+BEGIN
+  INSERT INTO failure_capsules_fts(rowid, capsule_id, error_summary)
+  VALUES(new.rowid, new.id, new.error_summary);
+END;
+
+CREATE TRIGGER trg_failure_capsules_fts_delete
+AFTER DELETE ON failure_capsules
+BEGIN
+  DELETE FROM failure_capsules_fts WHERE rowid=old.rowid;
+END;
+
+CREATE TRIGGER trg_failure_capsules_fts_update
+AFTER UPDATE OF id, error_summary ON failure_capsules
+BEGIN
+  DELETE FROM failure_capsules_fts WHERE rowid=old.rowid;
+  INSERT INTO failure_capsules_fts(rowid, capsule_id, error_summary)
+  VALUES(new.rowid, new.id, new.error_summary);
+END;
+
+INSERT INTO failure_capsules_fts(rowid, capsule_id, error_summary)
+SELECT rowid, id, error_summary FROM failure_capsules;
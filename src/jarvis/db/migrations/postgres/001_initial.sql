@@ -0,0 +1,109 @@
+-- SQLite compatibility helpers: queries shared by both engines may call
+-- datetime('now'[, modifier]) and json_extract(doc, '$.path'), and schema probes
+-- read sqlite_master.
+CREATE OR REPLACE FUNCTION datetime(value TEXT, modifier TEXT DEFAULT NULL) RETURNS TEXT
+LANGUAGE sql STABLE AS $$
+  SELECT to_char(
+    (CASE WHEN value = 'now' THEN now() AT TIME ZONE 'UTC' ELSE value::timestamp END)
+      + COALESCE(modifier::interval, interval '0'),
+    'YYYY-MM-DD HH24:MI:SS'
+  )
+$$;
+
+CREATE OR REPLACE FUNCTION json_extract(doc TEXT, path TEXT) RETURNS TEXT
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+  RETURN doc::jsonb #>> string_to_array(regexp_replace(path, '^\$\.?', ''), '.');
+EXCEPTION WHEN invalid_text_representation THEN
+  RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE VIEW sqlite_master AS
+SELECT
+  CASE c.relkind WHEN 'v' THEN 'view' WHEN 'i' THEN 'index' ELSE 'table' END AS type,
+  c.relname::text AS name,
+  COALESCE(t.relname, c.relname)::text AS tbl_name,
+  NULL::text AS sql
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_index i ON i.indexrelid = c.oid
+LEFT JOIN pg_class t ON t.oid = i.indrelid
+WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p', 'v', 'i');
+
+CREATE TABLE IF NOT EXISTS system_state (
+  id TEXT PRIMARY KEY,
+  lockdown BIGINT NOT NULL DEFAULT 0,
+  restarting BIGINT NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS users (
+  id TEXT PRIMARY KEY,
+  external_id TEXT NOT NULL UNIQUE,
+  created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS channels (
+  id TEXT PRIMARY KEY,
+  user_id TEXT NOT NULL,
+  channel_type TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  FOREIGN KEY(user_id) REFERENCES users(id) DEFERRABLE INITIALLY IMMEDIATE
+);
+
+CREATE TABLE IF NOT EXISTS threads (
+  id TEXT PRIMARY KEY,
+  user_id TEXT NOT NULL,
+  channel_id TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'open',
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  FOREIGN KEY(user_id) REFERENCES users(id) DEFERRABLE INITIALLY IMMEDIATE,
+  FOREIGN KEY(channel_id) REFERENCES channels(id) DEFERRABLE INITIALLY IMMEDIATE
+);
+
+CREATE TABLE IF NOT EXISTS thread_settings (
+  thread_id TEXT PRIMARY KEY,
+  "verbose" BIGINT NOT NULL DEFAULT 0,
+  active_agent_ids_json TEXT NOT NULL DEFAULT '["main","researcher","planner","coder"]',
+  updated_at TEXT NOT NULL,
+  FOREIGN KEY(thread_id) REFERENCES threads(id) DEFERRABLE INITIALLY IMMEDIATE
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+  id TEXT PRIMARY KEY,
+  thread_id TEXT NOT NULL,
+  role TEXT NOT NULL,
+  content TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  FOREIGN KEY(thread_id) REFERENCES threads(id) DEFERRABLE INITIALLY IMMEDIATE
+);
+
+CREATE TABLE IF NOT EXISTS external_messages (
+  id TEXT PRIMARY KEY,
+  channel_type TEXT NOT NULL,
+  external_msg_id TEXT NOT NULL,
+  trace_id TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  UNIQUE(channel_type, external_msg_id)
+);
+CREATE INDEX IF NOT EXISTS idx_external_messages_trace ON external_messages(trace_id);
+
+CREATE TABLE IF NOT EXISTS events (
+  rowid BIGINT GENERATED BY DEFAULT AS IDENTITY UNIQUE,
+  id TEXT PRIMARY KEY,
+  trace_id TEXT NOT NULL,
+  span_id TEXT NOT NULL,
+  parent_span_id TEXT,
+  thread_id TEXT,
+  event_type TEXT NOT NULL,
+  component TEXT NOT NULL,
+  actor_type TEXT NOT NULL,
+  actor_id TEXT NOT NULL,
+  payload_json TEXT NOT NULL,
+  payload_redacted_json TEXT NOT NULL,
+  created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_trace ON events(trace_id);
+CREATE INDEX IF NOT EXISTS idx_events_thread ON events(thread_id);
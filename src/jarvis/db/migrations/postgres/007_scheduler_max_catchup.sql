@@ -0,0 +1 @@
+ALTER TABLE schedules ADD COLUMN IF NOT EXISTS max_catchup BIGINT;
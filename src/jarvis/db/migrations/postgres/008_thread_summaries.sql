@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS thread_summaries (
+  thread_id TEXT PRIMARY KEY,
+  short_summary TEXT NOT NULL,
+  long_summary TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  FOREIGN KEY(thread_id) REFERENCES threads(id) DEFERRABLE INITIALLY IMMEDIATE
+);
@@ -0,0 +1,4 @@
+ALTER TABLE system_state ADD COLUMN IF NOT EXISTS readyz_fail_streak BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE system_state ADD COLUMN IF NOT EXISTS rollback_count BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE system_state ADD COLUMN IF NOT EXISTS last_rollback_at TEXT;
+ALTER TABLE system_state ADD COLUMN IF NOT EXISTS lockdown_reason TEXT NOT NULL DEFAULT '';
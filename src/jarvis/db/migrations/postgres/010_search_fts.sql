@@ -0,0 +1,19 @@
+-- FTS5 tables map to plain tables with a generated tsvector over the indexed
+-- columns; "<table> MATCH ?" and bm25(<table>) are rewritten to query tsv.
+CREATE TABLE IF NOT EXISTS event_fts (
+  event_id TEXT,
+  thread_id TEXT,
+  redacted_text TEXT,
+  tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(redacted_text, ''))) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_event_fts_tsv ON event_fts USING gin(tsv);
+CREATE INDEX IF NOT EXISTS idx_event_fts_event ON event_fts(event_id);
+
+CREATE TABLE IF NOT EXISTS memory_fts (
+  memory_id TEXT,
+  thread_id TEXT,
+  text TEXT,
+  tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(text, ''))) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_memory_fts_tsv ON memory_fts USING gin(tsv);
+CREATE INDEX IF NOT EXISTS idx_memory_fts_memory ON memory_fts(memory_id);
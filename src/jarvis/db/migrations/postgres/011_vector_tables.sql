@@ -0,0 +1,26 @@
+-- pgvector backs the vec0 index tables when it is installed; without it the
+-- vector runtime reports unavailable and search uses the in-process ANN index.
+DO $$
+BEGIN
+  CREATE EXTENSION IF NOT EXISTS vector;
+EXCEPTION WHEN OTHERS THEN
+  RAISE NOTICE 'pgvector unavailable: %', SQLERRM;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS memory_vec (
+  memory_id TEXT PRIMARY KEY,
+  vector_json TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  FOREIGN KEY(memory_id) REFERENCES memory_items(id) DEFERRABLE INITIALLY IMMEDIATE
+);
+
+CREATE TABLE IF NOT EXISTS event_vec (
+  rowid BIGINT GENERATED BY DEFAULT AS IDENTITY UNIQUE,
+  id TEXT PRIMARY KEY,
+  thread_id TEXT,
+  vector_json TEXT NOT NULL,
+  created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_event_vec_thread ON event_vec(thread_id);
@@ -0,0 +1,8 @@
+ALTER TABLE system_state ADD COLUMN IF NOT EXISTS host_exec_fail_streak BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE system_state ADD COLUMN IF NOT EXISTS last_host_exec_fail_at TEXT;
+
+CREATE TABLE IF NOT EXISTS schema_migration_lock (
+  id BIGINT PRIMARY KEY CHECK (id = 1),
+  holder TEXT,
+  acquired_at TEXT
+);
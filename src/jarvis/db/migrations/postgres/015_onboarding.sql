@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS onboarding_states (
+  user_id TEXT PRIMARY KEY,
+  thread_id TEXT NOT NULL,
+  status TEXT NOT NULL,
+  step BIGINT NOT NULL DEFAULT 0,
+  answers_json TEXT NOT NULL DEFAULT '{}',
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  FOREIGN KEY(user_id) REFERENCES users(id) DEFERRABLE INITIALLY IMMEDIATE,
+  FOREIGN KEY(thread_id) REFERENCES threads(id) DEFERRABLE INITIALLY IMMEDIATE
+);
+
+CREATE INDEX IF NOT EXISTS idx_onboarding_states_status ON onboarding_states(status);
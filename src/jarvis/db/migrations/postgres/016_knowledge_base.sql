@@ -0,0 +1,26 @@
+CREATE TABLE IF NOT EXISTS knowledge_docs (
+  id TEXT PRIMARY KEY,
+  title TEXT NOT NULL UNIQUE,
+  content TEXT NOT NULL,
+  tags_json TEXT NOT NULL DEFAULT '[]',
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_docs_updated_at
+ON knowledge_docs(updated_at DESC);
+
+CREATE TABLE IF NOT EXISTS knowledge_docs_fts (
+  doc_id TEXT,
+  title TEXT,
+  content TEXT,
+  tags TEXT,
+  tsv tsvector GENERATED ALWAYS AS (
+    to_tsvector(
+      'simple',
+      COALESCE(title, '') || ' ' || COALESCE(content, '') || ' ' || COALESCE(tags, '')
+    )
+  ) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_knowledge_docs_fts_tsv ON knowledge_docs_fts USING gin(tsv);
+CREATE INDEX IF NOT EXISTS idx_knowledge_docs_fts_doc ON knowledge_docs_fts(doc_id);
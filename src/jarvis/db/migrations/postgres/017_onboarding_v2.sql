@@ -0,0 +1 @@
+ALTER TABLE onboarding_states ADD COLUMN IF NOT EXISTS conversation_json TEXT NOT NULL DEFAULT '[]';
@@ -0,0 +1,41 @@
+CREATE TABLE IF NOT EXISTS skills (
+  id TEXT PRIMARY KEY,
+  slug TEXT NOT NULL,
+  title TEXT NOT NULL,
+  content TEXT NOT NULL,
+  scope TEXT NOT NULL DEFAULT 'global',
+  owner_id TEXT,
+  pinned BIGINT NOT NULL DEFAULT 0,
+  version BIGINT NOT NULL DEFAULT 1,
+  source TEXT NOT NULL DEFAULT 'agent',
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  CHECK (source IN ('seed', 'agent')),
+  UNIQUE(slug, scope)
+);
+
+CREATE INDEX IF NOT EXISTS idx_skills_scope
+ON skills(scope);
+
+CREATE INDEX IF NOT EXISTS idx_skills_pinned
+ON skills(pinned);
+
+CREATE INDEX IF NOT EXISTS idx_skills_updated_at
+ON skills(updated_at DESC);
+
+CREATE TABLE IF NOT EXISTS skills_fts (
+  skill_id TEXT,
+  slug TEXT,
+  title TEXT,
+  content TEXT,
+  scope TEXT,
+  tsv tsvector GENERATED ALWAYS AS (
+    to_tsvector(
+      'simple',
+      COALESCE(slug, '') || ' ' || COALESCE(title, '') || ' ' || COALESCE(content, '')
+        || ' ' || COALESCE(scope, '')
+    )
+  ) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_skills_fts_tsv ON skills_fts USING gin(tsv);
+CREATE INDEX IF NOT EXISTS idx_skills_fts_skill ON skills_fts(skill_id);
@@ -0,0 +1,2 @@
+-- Per-thread compaction threshold (NULL = use global default)
+ALTER TABLE thread_settings ADD COLUMN IF NOT EXISTS compaction_threshold BIGINT DEFAULT NULL;
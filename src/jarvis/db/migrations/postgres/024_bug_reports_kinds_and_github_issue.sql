@@ -0,0 +1,8 @@
+ALTER TABLE bug_reports ADD COLUMN IF NOT EXISTS kind TEXT NOT NULL DEFAULT 'bug';
+ALTER TABLE bug_reports ADD COLUMN IF NOT EXISTS github_issue_number BIGINT;
+ALTER TABLE bug_reports ADD COLUMN IF NOT EXISTS github_issue_url TEXT;
+ALTER TABLE bug_reports ADD COLUMN IF NOT EXISTS github_synced_at TEXT;
+ALTER TABLE bug_reports ADD COLUMN IF NOT EXISTS github_sync_error TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_bug_reports_kind ON bug_reports(kind);
+CREATE INDEX IF NOT EXISTS idx_bug_reports_github_issue_number ON bug_reports(github_issue_number);
@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS governance_agent_runs (
+  id TEXT PRIMARY KEY,
+  run_type TEXT NOT NULL,
+  status TEXT NOT NULL,
+  summary TEXT NOT NULL DEFAULT '',
+  payload_json TEXT NOT NULL DEFAULT '{}',
+  trace_id TEXT NOT NULL DEFAULT '',
+  created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_governance_agent_runs_type_created
+ON governance_agent_runs(run_type, created_at DESC);
@@ -0,0 +1,12 @@
+ALTER TABLE state_items ADD COLUMN IF NOT EXISTS tier TEXT NOT NULL DEFAULT 'working';
+ALTER TABLE state_items ADD COLUMN IF NOT EXISTS importance_score DOUBLE PRECISION NOT NULL DEFAULT 0.5;
+ALTER TABLE state_items ADD COLUMN IF NOT EXISTS access_count BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE state_items ADD COLUMN IF NOT EXISTS conflict_count BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE state_items ADD COLUMN IF NOT EXISTS agent_id TEXT NOT NULL DEFAULT 'main';
+ALTER TABLE state_items ADD COLUMN IF NOT EXISTS last_accessed_at TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_state_items_scope_tier_status_seen
+ON state_items(thread_id, agent_id, tier, status, last_seen_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_state_items_tier_importance_seen
+ON state_items(tier, importance_score, last_seen_at DESC);
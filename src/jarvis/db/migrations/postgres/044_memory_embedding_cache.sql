@@ -0,0 +1,10 @@
+CREATE TABLE IF NOT EXISTS embedding_cache (
+  hash TEXT PRIMARY KEY,
+  model TEXT NOT NULL,
+  vector_json TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  hit_count BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_model_created
+ON embedding_cache(model, created_at DESC);
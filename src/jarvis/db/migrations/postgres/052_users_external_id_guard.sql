@@ -0,0 +1,19 @@
+CREATE OR REPLACE FUNCTION trg_users_external_id_guard() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF length(trim(COALESCE(NEW.external_id, ''))) < 1 OR length(COALESCE(NEW.external_id, '')) > 256 THEN
+    RAISE EXCEPTION 'users.external_id must be 1..256 chars' USING ERRCODE = 'check_violation';
+  END IF;
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_users_external_id_guard_insert ON users;
+CREATE TRIGGER trg_users_external_id_guard_insert
+BEFORE INSERT ON users
+FOR EACH ROW EXECUTE FUNCTION trg_users_external_id_guard();
+
+DROP TRIGGER IF EXISTS trg_users_external_id_guard_update ON users;
+CREATE TRIGGER trg_users_external_id_guard_update
+BEFORE UPDATE OF external_id ON users
+FOR EACH ROW EXECUTE FUNCTION trg_users_external_id_guard();
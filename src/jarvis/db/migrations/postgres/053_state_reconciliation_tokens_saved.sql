@@ -0,0 +1,2 @@
+ALTER TABLE state_reconciliation_runs
+ADD COLUMN IF NOT EXISTS tokens_saved DOUBLE PRECISION NOT NULL DEFAULT 0;
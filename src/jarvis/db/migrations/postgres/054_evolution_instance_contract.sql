@@ -0,0 +1,14 @@
+ALTER TABLE whatsapp_instances
+  ADD COLUMN IF NOT EXISTS callback_url TEXT NOT NULL DEFAULT '';
+
+ALTER TABLE whatsapp_instances
+  ADD COLUMN IF NOT EXISTS callback_by_events BIGINT NOT NULL DEFAULT 0;
+
+ALTER TABLE whatsapp_instances
+  ADD COLUMN IF NOT EXISTS callback_events_json TEXT NOT NULL DEFAULT '[]';
+
+ALTER TABLE whatsapp_instances
+  ADD COLUMN IF NOT EXISTS callback_configured BIGINT NOT NULL DEFAULT 0;
+
+ALTER TABLE whatsapp_instances
+  ADD COLUMN IF NOT EXISTS callback_last_error TEXT NOT NULL DEFAULT '';
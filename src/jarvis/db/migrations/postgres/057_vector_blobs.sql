@@ -0,0 +1,8 @@
+-- Packed little-endian float32 vectors with a dims/model header.
+-- Legacy rows keep vector_json and are upgraded lazily on read; packed rows
+-- store an empty vector_json so the NOT NULL contract still holds.
+ALTER TABLE memory_embeddings ADD COLUMN IF NOT EXISTS vector_blob BYTEA;
+ALTER TABLE memory_vec ADD COLUMN IF NOT EXISTS vector_blob BYTEA;
+ALTER TABLE event_vec ADD COLUMN IF NOT EXISTS vector_blob BYTEA;
+ALTER TABLE state_item_embeddings ADD COLUMN IF NOT EXISTS vector_blob BYTEA;
+ALTER TABLE embedding_cache ADD COLUMN IF NOT EXISTS vector_blob BYTEA;
@@ -0,0 +1,17 @@
+CREATE TABLE IF NOT EXISTS pending_event_vectors(
+  event_id TEXT PRIMARY KEY,
+  thread_id TEXT,
+  created_at TEXT NOT NULL,
+  FOREIGN KEY(event_id) REFERENCES events(id) ON DELETE CASCADE DEFERRABLE INITIALLY IMMEDIATE
+);
+
+CREATE INDEX IF NOT EXISTS idx_pending_event_vectors_created
+  ON pending_event_vectors(created_at);
+
+INSERT INTO pending_event_vectors(event_id, thread_id, created_at)
+SELECT et.event_id, et.thread_id, et.created_at
+FROM event_text et
+LEFT JOIN event_vec ev ON ev.id=et.event_id
+WHERE ev.id IS NULL
+  AND EXISTS(SELECT 1 FROM events e WHERE e.id=et.event_id)
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,13 @@
+ALTER TABLE memory_items ADD COLUMN IF NOT EXISTS chunk_group_id TEXT;
+
+ALTER TABLE memory_items ADD COLUMN IF NOT EXISTS chunk_index BIGINT;
+
+UPDATE memory_items
+SET chunk_group_id=metadata_json::jsonb ->> 'chunk_group_id',
+    chunk_index=COALESCE((metadata_json::jsonb ->> 'chunk_index')::numeric, 0)::BIGINT
+WHERE jsonb_typeof(metadata_json::jsonb -> 'chunk_group_id')='string'
+  AND length(trim(metadata_json::jsonb ->> 'chunk_group_id')) > 0;
+
+CREATE INDEX IF NOT EXISTS idx_memory_items_chunk_group
+  ON memory_items(thread_id, chunk_group_id, chunk_index)
+  WHERE chunk_group_id IS NOT NULL;
@@ -0,0 +1,78 @@
+CREATE TABLE IF NOT EXISTS state_items_fts (
+  uid TEXT,
+  thread_id TEXT,
+  text TEXT,
+  tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(text, ''))) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_state_items_fts_tsv ON state_items_fts USING gin(tsv);
+CREATE INDEX IF NOT EXISTS idx_state_items_fts_uid ON state_items_fts(uid, thread_id);
+
+CREATE OR REPLACE FUNCTION trg_state_items_fts() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    DELETE FROM state_items_fts WHERE uid=OLD.uid AND thread_id=OLD.thread_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO state_items_fts(uid, thread_id, text) VALUES(NEW.uid, NEW.thread_id, NEW.text);
+  END IF;
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_state_items_fts_insert ON state_items;
+CREATE TRIGGER trg_state_items_fts_insert
+AFTER INSERT ON state_items
+FOR EACH ROW EXECUTE FUNCTION trg_state_items_fts();
+
+DROP TRIGGER IF EXISTS trg_state_items_fts_delete ON state_items;
+CREATE TRIGGER trg_state_items_fts_delete
+AFTER DELETE ON state_items
+FOR EACH ROW EXECUTE FUNCTION trg_state_items_fts();
+
+DROP TRIGGER IF EXISTS trg_state_items_fts_update ON state_items;
+CREATE TRIGGER trg_state_items_fts_update
+AFTER UPDATE OF uid, thread_id, text ON state_items
+FOR EACH ROW EXECUTE FUNCTION trg_state_items_fts();
+
+INSERT INTO state_items_fts(uid, thread_id, text)
+SELECT uid, thread_id, text FROM state_items;
+
+CREATE TABLE IF NOT EXISTS failure_capsules_fts (
+  capsule_id TEXT,
+  error_summary TEXT,
+  tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(error_summary, ''))) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_failure_capsules_fts_tsv ON failure_capsules_fts USING gin(tsv);
+CREATE INDEX IF NOT EXISTS idx_failure_capsules_fts_capsule ON failure_capsules_fts(capsule_id);
+
+CREATE OR REPLACE FUNCTION trg_failure_capsules_fts() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    DELETE FROM failure_capsules_fts WHERE capsule_id=OLD.id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO failure_capsules_fts(capsule_id, error_summary) VALUES(NEW.id, NEW.error_summary);
+  END IF;
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_failure_capsules_fts_insert ON failure_capsules;
+CREATE TRIGGER trg_failure_capsules_fts_insert
+AFTER INSERT ON failure_capsules
+FOR EACH ROW EXECUTE FUNCTION trg_failure_capsules_fts();
+
+DROP TRIGGER IF EXISTS trg_failure_capsules_fts_delete ON failure_capsules;
+CREATE TRIGGER trg_failure_capsules_fts_delete
+AFTER DELETE ON failure_capsules
+FOR EACH ROW EXECUTE FUNCTION trg_failure_capsules_fts();
+
+DROP TRIGGER IF EXISTS trg_failure_capsules_fts_update ON failure_capsules;
+CREATE TRIGGER trg_failure_capsules_fts_update
+AFTER UPDATE OF id, error_summary ON failure_capsules
+FOR EACH ROW EXECUTE FUNCTION trg_failure_capsules_fts();
+
+INSERT INTO failure_capsules_fts(capsule_id, error_summary)
+SELECT id, error_summary FROM failure_capsules;
@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS vector_backfill_progress (
+  name TEXT PRIMARY KEY,
+  last_rowid BIGINT NOT NULL DEFAULT 0,
+  rows_scanned BIGINT NOT NULL DEFAULT 0,
+  rows_indexed BIGINT NOT NULL DEFAULT 0,
+  pass_started_at TEXT,
+  pass_completed_at TEXT,
+  updated_at TEXT NOT NULL
+);
@@ -0,0 +1,14 @@
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS actor_id TEXT;
+
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS trace_id TEXT;
+
+-- Agent replies were attributed through their agent.step.end event payload.
+UPDATE messages
+SET actor_id=src.actor_id,
+    trace_id=src.trace_id
+FROM (
+  SELECT payload_json::jsonb ->> 'message_id' AS message_id, actor_id, trace_id
+  FROM events
+  WHERE event_type='agent.step.end'
+) AS src
+WHERE messages.id=src.message_id;
@@ -0,0 +1,3 @@
+-- The SQLite FTS triggers are rekeyed on rowid here. PostgreSQL already deletes
+-- through idx_state_items_fts_uid and idx_failure_capsules_fts_capsule (060).
+SELECT 1;
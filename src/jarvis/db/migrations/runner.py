@@ -1,11 +1,23 @@
-"""Simple SQL migration runner."""
+"""Simple SQL migration runner.
+
+SQLite migrations live in this directory; ``postgres/`` holds the same
+migrations, under the same names, in the PostgreSQL dialect.
+"""
 
 import os
 from pathlib import Path
 
+from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
 
 MIGRATIONS_DIR = Path(__file__).resolve().parent
+POSTGRES_MIGRATIONS_DIR = MIGRATIONS_DIR / "postgres"
+
+
+def migrations_dir() -> Path:
+    if get_settings().db_engine == "postgres":
+        return POSTGRES_MIGRATIONS_DIR
+    return MIGRATIONS_DIR
 
 
 def run_migrations() -> None:
@@ -13,6 +25,9 @@ def run_migrations() -> None:
         holder = f"{os.uname().nodename}:{os.getpid()}"
         conn.execute("BEGIN IMMEDIATE")
         try:
+            if get_settings().db_engine == "postgres":
+                # BEGIN does not take a write lock on Postgres; serialize runners explicitly.
+                conn.execute("SELECT pg_advisory_xact_lock(hashtext('jarvis.schema_migrations'))")
             conn.execute(
                 "CREATE TABLE IF NOT EXISTS schema_migrations("
                 "name TEXT PRIMARY KEY, "
@@ -34,7 +49,7 @@ def run_migrations() -> None:
             if current_holder and current_holder != holder:
                 raise RuntimeError(f"migration lock held by {current_holder}")
             conn.execute(
-                "UPDATE schema_migration_lock SET holder=?, acquired_at=datetime('now') "
+                "UPDATE schema_migration_lock SET holder=?, acquired_at=CURRENT_TIMESTAMP "
                 "WHERE id=1",
                 (holder,),
             )
@@ -42,12 +57,12 @@ def run_migrations() -> None:
             applied = {
                 row[0] for row in conn.execute("SELECT name FROM schema_migrations").fetchall()
             }
-            for file in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            for file in sorted(migrations_dir().glob("*.sql")):
                 if file.name in applied:
                     continue
                 conn.executescript(file.read_text())
                 conn.execute(
-                    "INSERT INTO schema_migrations(name, applied_at) VALUES(?, datetime('now'))",
+                    "INSERT INTO schema_migrations(name, applied_at) VALUES(?, CURRENT_TIMESTAMP)",
                     (file.name,),
                 )
             conn.execute(
@@ -0,0 +1,266 @@
+"""Query-plan audit for the hot statement set.
+
+:data:`HOT_QUERIES` mirrors the statements the request paths, websocket poller
+and memory services run most often, with representative parameters.
+:func:`audit_query_plans` runs ``EXPLAIN QUERY PLAN`` for each one against a
+migrated SQLite database and reports full table scans and temporary sort
+B-trees that the entry does not explicitly allow. The unit suite runs it on
+every schema, and ``jarvis db audit-plans`` runs it against a live database,
+so a new hot statement or a dropped index fails loudly instead of quietly
+degrading into a scan.
+
+When a hot statement changes, update its entry here; when the audit flags one,
+add the supporting index in a migration (and its ``postgres/`` twin).
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+
+_SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS (\w+))?(.*)$")
+_TEMP_SORT_RE = re.compile(r"^USE TEMP B-TREE FOR (?:[A-Z -]+ OF )?ORDER BY$")
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    sql: str
+    params: tuple[object, ...] = ()
+    # Tables a full scan is expected on (queues read in rowid order, global counts).
+    allow_scan: tuple[str, ...] = ()
+    # A temporary sort is fine when the rows being sorted are already bounded.
+    allow_sort: bool = False
+
+
+@dataclass(frozen=True)
+class PlanFinding:
+    query: str
+    problem: str
+    detail: str
+    plan: tuple[str, ...]
+
+
+_EVENT_COLUMNS = (
+    "SELECT e.id, e.trace_id, e.span_id, e.parent_span_id, e.thread_id, "
+    "e.event_type, e.component, e.actor_type, e.actor_id, "
+    "e.payload_redacted_json, e.created_at "
+)
+
+HOT_QUERIES: tuple[HotQuery, ...] = (
+    # routes/api/messages.py list_messages
+    HotQuery(
+        "list_messages",
+        "SELECT id, role, content, created_at, actor_id FROM messages "
+        "WHERE thread_id=? AND (role='user' "
+        "OR (role='assistant' AND (actor_id IS NULL OR actor_id='main'))) "
+        "ORDER BY created_at DESC LIMIT ?",
+        ("thr_audit", 50),
+    ),
+    HotQuery(
+        "list_messages_before",
+        "SELECT id, role, content, created_at, actor_id FROM messages "
+        "WHERE thread_id=? AND (role='user' "
+        "OR (role='assistant' AND (actor_id IS NULL OR actor_id='main'))) "
+        "AND created_at < ? ORDER BY created_at DESC LIMIT ?",
+        ("thr_audit", "2026-01-01T00:00:00+00:00", 50),
+    ),
+    # routes/api/threads.py list_threads
+    HotQuery(
+        "list_threads",
+        "SELECT t.id, t.status, t.created_at, t.updated_at, c.channel_type, "
+        "(SELECT content FROM messages m WHERE m.thread_id=t.id "
+        "ORDER BY m.created_at DESC LIMIT 1) AS last_message "
+        "FROM threads t JOIN channels c ON c.id=t.channel_id "
+        "WHERE t.user_id=? ORDER BY t.updated_at DESC LIMIT ? OFFSET ?",
+        ("usr_audit", 50, 0),
+    ),
+    HotQuery(
+        "export_thread_messages",
+        "SELECT id, role, content, created_at FROM messages "
+        "WHERE thread_id=? ORDER BY created_at ASC",
+        ("thr_audit",),
+    ),
+    HotQuery(
+        "export_thread_memory",
+        "SELECT id, text, created_at FROM memory_items "
+        "WHERE thread_id=? ORDER BY created_at ASC",
+        ("thr_audit",),
+    ),
+    HotQuery(
+        "export_thread_events",
+        "SELECT id, event_type, component, actor_type, actor_id, "
+        "payload_redacted_json, created_at FROM events "
+        "WHERE thread_id=? ORDER BY created_at ASC",
+        ("thr_audit",),
+    ),
+    # db/queries.py
+    HotQuery(
+        "ensure_open_thread",
+        "SELECT id FROM threads WHERE user_id=? AND channel_id=? AND status='open' "
+        "ORDER BY created_at DESC LIMIT 1",
+        ("usr_audit", "chn_audit"),
+    ),
+    HotQuery(
+        "ensure_channel",
+        "SELECT id FROM channels WHERE user_id=? AND channel_type=?",
+        ("usr_audit", "web"),
+    ),
+    HotQuery(
+        "get_channel_outbound",
+        "SELECT u.external_id AS recipient, m.content AS text "
+        "FROM messages m JOIN threads t ON t.id=m.thread_id "
+        "JOIN users u ON u.id=t.user_id JOIN channels c ON c.id=t.channel_id "
+        "WHERE m.id=? AND m.thread_id=? AND m.role='assistant' AND c.channel_type=? LIMIT 1",
+        ("msg_audit", "thr_audit", "web"),
+    ),
+    # orchestrator/step.py
+    HotQuery(
+        "step_recent_messages",
+        "SELECT role, content FROM messages WHERE thread_id=? "
+        "ORDER BY created_at DESC LIMIT 8",
+        ("thr_audit",),
+    ),
+    HotQuery(
+        "step_compaction_backlog",
+        "SELECT COUNT(*) AS cnt FROM messages m WHERE m.thread_id=? AND m.created_at > "
+        "COALESCE((SELECT ts.updated_at FROM thread_summaries ts WHERE ts.thread_id=?), "
+        "'1970-01-01')",
+        ("thr_audit", "thr_audit"),
+    ),
+    # memory/service.py and memory/state_store.py
+    HotQuery(
+        "memory_recency",
+        "SELECT id, text, created_at FROM memory_items "
+        "WHERE thread_id=? ORDER BY created_at DESC LIMIT ?",
+        ("thr_audit", 50),
+    ),
+    HotQuery(
+        "memory_chunk_groups",
+        "SELECT id, text, metadata_json, chunk_group_id FROM memory_items "
+        "WHERE thread_id=? AND chunk_group_id IN (?, ?) "
+        "ORDER BY chunk_group_id, chunk_index, created_at",
+        ("thr_audit", "grp_a", "grp_b"),
+        allow_sort=True,
+    ),
+    HotQuery(
+        "memory_thread_vectors",
+        "SELECT m.id, m.text, me.vector_json, me.vector_blob FROM memory_items m "
+        "JOIN memory_embeddings me ON me.memory_id=m.id WHERE m.thread_id=?",
+        ("thr_audit",),
+    ),
+    HotQuery(
+        "summary_recent_messages",
+        "SELECT role, content, created_at FROM messages "
+        "WHERE thread_id=? ORDER BY created_at DESC LIMIT 50",
+        ("thr_audit",),
+    ),
+    HotQuery(
+        "extraction_messages",
+        "SELECT id, role, content, created_at FROM messages "
+        "WHERE thread_id=? ORDER BY created_at, id LIMIT ?",
+        ("thr_audit", 200),
+    ),
+    HotQuery(
+        "extraction_messages_after_watermark",
+        "SELECT id, role, content, created_at FROM messages "
+        "WHERE thread_id=? AND ((created_at > ?) OR (created_at = ? AND id > ?)) "
+        "ORDER BY created_at, id LIMIT ?",
+        ("thr_audit", "2026-01-01", "2026-01-01", "msg_audit", 200),
+    ),
+    # routes/api/memory.py
+    HotQuery(
+        "memory_list_admin",
+        "SELECT id, thread_id, text, metadata_json, created_at FROM memory_items "
+        "ORDER BY created_at DESC LIMIT ?",
+        (50,),
+    ),
+    HotQuery(
+        "memory_list_user",
+        "SELECT mi.id, mi.thread_id, mi.text, mi.metadata_json, mi.created_at "
+        "FROM memory_items mi JOIN threads t ON t.id=mi.thread_id "
+        "WHERE t.user_id=? ORDER BY mi.created_at DESC LIMIT ?",
+        ("usr_audit", 50),
+        # Bounded by the user's threads; the sort covers only their memories.
+        allow_sort=True,
+    ),
+    # routes/api/events.py search_events and trace views
+    HotQuery(
+        "events_search",
+        _EVENT_COLUMNS + "FROM events e ORDER BY e.created_at DESC LIMIT ? OFFSET ?",
+        (50, 0),
+    ),
+    HotQuery(
+        "events_search_by_type",
+        _EVENT_COLUMNS
+        + "FROM events e WHERE event_type=? ORDER BY e.created_at DESC LIMIT ? OFFSET ?",
+        ("agent.step.end", 50, 0),
+    ),
+    HotQuery(
+        "events_search_by_component",
+        _EVENT_COLUMNS
+        + "FROM events e WHERE component=? ORDER BY e.created_at DESC LIMIT ? OFFSET ?",
+        ("orchestrator", 50, 0),
+    ),
+    HotQuery(
+        "events_search_by_thread",
+        _EVENT_COLUMNS
+        + "FROM events e WHERE e.thread_id=? ORDER BY e.created_at DESC LIMIT ? OFFSET ?",
+        ("thr_audit", 50, 0),
+    ),
+    HotQuery(
+        "events_trace",
+        "SELECT id, span_id, parent_span_id, thread_id, event_type, component, "
+        "actor_type, actor_id, payload_redacted_json AS payload, created_at "
+        "FROM events WHERE trace_id=? ORDER BY created_at ASC",
+        ("trc_audit",),
+    ),
+    # routes/ws.py notification poller: a queue drained in id order.
+    HotQuery(
+        "ws_poll_notifications",
+        "SELECT id, thread_id, event_type, payload_json, created_at "
+        "FROM web_notifications ORDER BY id ASC LIMIT 200",
+        allow_scan=("web_notifications",),
+    ),
+    # routes/health.py /metrics global counts.
+    HotQuery(
+        "metrics_counts",
+        "SELECT (SELECT COUNT(*) FROM messages) AS messages, "
+        "(SELECT COUNT(*) FROM threads) AS threads, "
+        "(SELECT COUNT(*) FROM events) AS events, "
+        "(SELECT COUNT(*) FROM memory_items) AS memory_items",
+        allow_scan=("messages", "threads", "events", "memory_items"),
+    ),
+)
+
+
+def explain(conn: sqlite3.Connection, query: HotQuery) -> tuple[str, ...]:
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query.sql}", query.params).fetchall()
+    return tuple(str(row[-1]) for row in rows)
+
+
+def check_plan(query: HotQuery, plan: tuple[str, ...]) -> list[PlanFinding]:
+    findings: list[PlanFinding] = []
+    for detail in plan:
+        scan = _SCAN_RE.match(detail)
+        if scan:
+            table, _alias, rest = scan.groups()
+            # Index-driven and virtual-table scans are not table scans.
+            if "VIRTUAL TABLE" in rest or "USING" in rest or "CONSTANT ROW" in detail:
+                continue
+            if table not in query.allow_scan:
+                findings.append(PlanFinding(query.name, "full_scan", detail, plan))
+        elif _TEMP_SORT_RE.match(detail) and not query.allow_sort:
+            findings.append(PlanFinding(query.name, "temp_sort", detail, plan))
+    return findings
+
+
+def audit_query_plans(
+    conn: sqlite3.Connection, queries: tuple[HotQuery, ...] = HOT_QUERIES
+) -> list[PlanFinding]:
+    """Return every unexpected scan or sort in the plans of ``queries``."""
+    findings: list[PlanFinding] = []
+    for query in queries:
+        findings.extend(check_plan(query, explain(conn, query)))
+    return findings
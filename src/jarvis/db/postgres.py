@@ -0,0 +1,694 @@
+"""PostgreSQL backend behind the ``sqlite3`` connection surface.
+
+Selected with ``DB_ENGINE=postgres`` and ``DATABASE_URL``. The rest of the code
+base talks to the database through the subset of ``sqlite3.Connection`` it has
+always used (``execute``/``executemany``/``commit``/``rollback``,
+``in_transaction``, ``row_factory``, ``sqlite3.Row``-style rows and
+``sqlite3.Error`` exceptions), so :class:`PostgresConnection` implements that
+surface over psycopg and translates the SQLite dialect per statement:
+
+- ``?`` placeholders, ``INSERT OR IGNORE``/``INSERT OR REPLACE`` (upserts keyed
+  on the table's primary key or a unique index), ``BEGIN IMMEDIATE``,
+  case-insensitive ``LIKE``, ``changes()`` and ``EXPLAIN QUERY PLAN``;
+- FTS5: ``<table> MATCH ?`` becomes a ``tsvector`` match against the ``tsv``
+  column the Postgres migrations generate, and ``bm25(<table>)`` a negated
+  ``ts_rank``;
+- sqlite-vec: ``vec0`` tables become pgvector tables with an HNSW index, and
+  ``<alias>.embedding MATCH ? AND k = ?`` a k-nearest-neighbour subquery;
+- the PRAGMAs the application issues are emulated or ignored.
+
+``datetime()``, ``json_extract()`` and ``sqlite_master`` are provided by the
+Postgres migrations. Translations are cached per connection like SQLite's
+statement cache, and psycopg prepares hot statements server-side.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import struct
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+try:  # pragma: no cover - exercised only when the postgres extra is installed
+    import psycopg
+    from psycopg.adapt import Dumper, Loader
+    from psycopg.pq import TransactionStatus
+except ImportError:  # pragma: no cover
+    psycopg = None  # type: ignore[assignment]
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/", re.S)
+_PARAM_RE = re.compile(r"\x01(-?\d+)\x01")
+_BEGIN_RE = re.compile(r"^BEGIN(?:\s+(?:IMMEDIATE|DEFERRED|EXCLUSIVE))?(?:\s+TRANSACTION)?$", re.I)
+_PRAGMA_RE = re.compile(
+    r"^PRAGMA\s+(\w+)\s*(?:=\s*(\w+)|\(\s*(\w+)\s*\))?$",
+    re.I,
+)
+_VEC0_RE = re.compile(
+    r"^CREATE\s+VIRTUAL\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+USING\s+vec0\(\s*"
+    r"(\w+)\s+float\[(\d+)\]\s*\)$",
+    re.I,
+)
+_INSERT_OR_RE = re.compile(r"^INSERT\s+OR\s+(IGNORE|REPLACE)\s+INTO\s+", re.I)
+_INSERT_RE = re.compile(r"^INSERT\s+INTO\s+(\w+)\s*(?:\(([^)]*)\))?", re.I)
+_VEC_MATCH_RE = re.compile(
+    r"\b(\w+)\.(\w+)\s+MATCH\s+(\x01\d+\x01)\s+AND\s+k\s*=\s*(\x01\d+\x01)", re.I
+)
+_FTS_MATCH_RE = re.compile(r"\b(\w+)\s+MATCH\s+(\x01\d+\x01)", re.I)
+_BM25_RE = re.compile(r"\bbm25\(\s*(\w+)\s*\)", re.I)
+_CHANGES_RE = re.compile(r"\bchanges\(\s*\)", re.I)
+_LIKE_RE = re.compile(r"\bLIKE\b", re.I)
+_TRAILING_LIMIT_RE = re.compile(r"\s+LIMIT\s+[^()]*$", re.I)
+_DDL_RE = re.compile(r"^(?:CREATE|ALTER|DROP)\b", re.I)
+_EXPLAIN_RE = re.compile(r"^EXPLAIN\s+QUERY\s+PLAN\s+", re.I)
+_SQL_KEYWORDS = frozenset(
+    {"where", "join", "left", "inner", "cross", "on", "order", "group", "limit", "using", "as"}
+)
+# Column names that are reserved words in PostgreSQL but not in SQLite.
+_RESERVED_IDENTIFIERS = re.compile(r"(?<![\w.\"])verbose\b", re.I)
+_CHANGES = -1
+_FTS_CONFIG = "'simple'"
+
+
+@dataclass
+class _TableInfo:
+    columns: list[str]
+    unique_keys: list[tuple[str, ...]]
+    identity: str | None
+    vector_columns: frozenset[str]
+
+
+@dataclass
+class _Plan:
+    sql: str
+    params: list[int] = field(default_factory=list)
+    converters: dict[int, Callable[[Any], Any]] = field(default_factory=dict)
+    returns_rowid: bool = False
+    extra: list[str] = field(default_factory=list)
+    pragma: tuple[str, str | None] | None = None
+    cacheable: bool = True
+
+
+def _fts_query(value: Any) -> Any:
+    """Turn an FTS5 query (``"a" OR "b"``) into ``websearch_to_tsquery`` syntax."""
+    if not isinstance(value, str):
+        return value
+    text = value.replace("*", " ")
+    text = re.sub(r"\bAND\b", " ", text)
+    text = re.sub(r"\bNOT\s+", "-", text)
+    return re.sub(r"\bOR\b", "or", text)
+
+
+def _vector_literal(value: Any) -> Any:
+    """Turn a packed little-endian float32 blob into a pgvector literal."""
+    if isinstance(value, bytes | bytearray | memoryview):
+        raw = bytes(value)
+        floats = struct.unpack(f"<{len(raw) // 4}f", raw[: len(raw) - len(raw) % 4])
+        return "[" + ",".join(repr(item) for item in floats) + "]"
+    return value
+
+
+def _mask(sql: str) -> tuple[str, list[str]]:
+    literals: list[str] = []
+
+    def keep(match: re.Match[str]) -> str:
+        token = match.group(0)
+        if token.startswith("--") or token.startswith("/*"):
+            return " "
+        literals.append(token)
+        return f"\x00{len(literals) - 1}\x00"
+
+    masked = _LITERAL_RE.sub(keep, sql)
+    index = 0
+
+    def number(_: re.Match[str]) -> str:
+        nonlocal index
+        index += 1
+        return f"\x01{index - 1}\x01"
+
+    return re.sub(r"\?", number, masked), literals
+
+
+def _unmask(masked: str, literals: list[str]) -> tuple[str, list[int]]:
+    """Escape ``%``, restore literals and number the placeholders in output order."""
+    order: list[int] = []
+
+    def placeholder(match: re.Match[str]) -> str:
+        order.append(int(match.group(1)))
+        return "%s"
+
+    text = _PARAM_RE.sub(placeholder, masked.replace("%", "%%"))
+    text = re.sub(r"\x00(\d+)\x00", lambda m: literals[int(m.group(1))].replace("%", "%%"), text)
+    return text, order
+
+
+def _alias_for(masked: str, table: str) -> str:
+    match = re.search(rf"\b(?:FROM|JOIN)\s+{table}(?:\s+(?:AS\s+)?(\w+))?", masked, re.I)
+    if match and match.group(1) and match.group(1).lower() not in _SQL_KEYWORDS:
+        return match.group(1)
+    return table
+
+
+def _table_for_alias(masked: str, alias: str) -> str:
+    match = re.search(rf"\b(?:FROM|JOIN)\s+(\w+)\s+(?:AS\s+)?{alias}\b", masked, re.I)
+    return match.group(1) if match else alias
+
+
+class Row(tuple[Any, ...]):
+    """``sqlite3.Row`` look-alike: index, slice and case-insensitive key access."""
+
+    _keys: tuple[str, ...] = ()
+    _index: dict[str, int] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            try:
+                return tuple.__getitem__(self, self._index[key.lower()])
+            except KeyError:
+                raise IndexError("No item with that key") from None
+        return tuple.__getitem__(self, key)
+
+    def keys(self) -> list[str]:
+        return list(self._keys)
+
+    def __repr__(self) -> str:
+        return f"<Row {dict(zip(self._keys, self, strict=False))!r}>"
+
+
+@lru_cache(maxsize=2048)
+def _row_class(keys: tuple[str, ...]) -> type[Row]:
+    index: dict[str, int] = {}
+    for position, key in enumerate(keys):
+        index.setdefault(key.lower(), position)
+    return type("Row", (Row,), {"_keys": keys, "_index": index, "__slots__": ()})
+
+
+def _map_error(exc: Exception) -> sqlite3.Error:
+    message = str(exc).strip()
+    if psycopg is not None:
+        if isinstance(exc, psycopg.IntegrityError):
+            return sqlite3.IntegrityError(message)
+        if isinstance(exc, psycopg.InterfaceError):
+            return sqlite3.ProgrammingError(message)
+        if isinstance(
+            exc,
+            psycopg.OperationalError
+            | psycopg.ProgrammingError
+            | psycopg.DataError
+            | psycopg.NotSupportedError
+            | psycopg.InternalError,
+        ):
+            return sqlite3.OperationalError(message)
+    return sqlite3.DatabaseError(message)
+
+
+class PostgresCursor:
+    def __init__(self, conn: PostgresConnection) -> None:
+        self.connection = conn
+        try:
+            self._cursor = conn._pg.cursor()
+        except psycopg.Error as exc:
+            raise _map_error(exc) from exc
+        self._rows: list[Any] | None = None
+        self._position = 0
+        self.rowcount = -1
+        self.lastrowid: int | None = None
+        self.description: Any = None
+        self.arraysize = 1
+
+    def execute(self, sql: str, parameters: Sequence[Any] = ()) -> PostgresCursor:
+        conn = self.connection
+        plan = conn._plan(sql)
+        if plan.pragma is not None:
+            self._set_rows(conn._pragma(*plan.pragma))
+            return self
+        values = conn._bind(plan, parameters)
+        conn._run(self._cursor, plan.sql, values)
+        for statement in plan.extra:
+            conn._run(self._cursor, statement, None)
+        self._finish(plan)
+        if _DDL_RE.match(plan.sql):
+            conn._forget_schema()
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> PostgresCursor:
+        conn = self.connection
+        plan = conn._plan(sql, returning=False)
+        total = 0
+        for parameters in seq_of_parameters:
+            conn._run(self._cursor, plan.sql, conn._bind(plan, parameters))
+            total += max(0, self._cursor.rowcount)
+        self._rows = []
+        self.description = None
+        self.rowcount = total
+        conn._last_changes = total
+        return self
+
+    def _finish(self, plan: _Plan) -> None:
+        cursor = self._cursor
+        self.rowcount = cursor.rowcount
+        self.connection._last_changes = max(0, cursor.rowcount)
+        self._position = 0
+        if plan.returns_rowid:
+            returned = cursor.fetchall()
+            self.lastrowid = int(returned[-1][0]) if returned else None
+            self._rows = []
+            self.description = None
+            return
+        if cursor.description is None:
+            self._rows = []
+            self.description = None
+            return
+        self.description = tuple(
+            (column.name, None, None, None, None, None, None) for column in cursor.description
+        )
+        self._rows = None
+
+    def _set_rows(self, rows: list[tuple[Any, ...]], names: Sequence[str] = ()) -> None:
+        self.description = tuple((name, None, None, None, None, None, None) for name in names)
+        self._rows = [self._make(row) for row in rows]
+        self._position = 0
+        self.rowcount = -1
+
+    def _make(self, values: tuple[Any, ...]) -> Any:
+        factory = self.connection.row_factory
+        if factory is None:
+            return values
+        if factory is sqlite3.Row:
+            keys = tuple(item[0] for item in self.description or ())
+            return _row_class(keys)(values)
+        return factory(self, values)
+
+    def fetchone(self) -> Any:
+        if self._rows is not None:
+            if self._position >= len(self._rows):
+                return None
+            self._position += 1
+            return self._rows[self._position - 1]
+        try:
+            values = self._cursor.fetchone()
+        except psycopg.Error as exc:
+            raise _map_error(exc) from exc
+        return None if values is None else self._make(values)
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        rows = []
+        for _ in range(size or self.arraysize):
+            row = self.fetchone()
+            if row is None:
+                break
+            rows.append(row)
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        if self._rows is not None:
+            rows = self._rows[self._position :]
+            self._position = len(self._rows)
+            return rows
+        try:
+            values = self._cursor.fetchall()
+        except psycopg.Error as exc:
+            raise _map_error(exc) from exc
+        factory = self.connection.row_factory
+        if factory is sqlite3.Row:
+            cls = _row_class(tuple(item[0] for item in self.description or ()))
+            return [cls(item) for item in values]
+        return [self._make(item) for item in values]
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class PostgresConnection:
+    """A psycopg connection presenting the ``sqlite3.Connection`` surface."""
+
+    dialect = "postgres"
+
+    def __init__(self, pg: Any, *, statement_cache_size: int = 256) -> None:
+        self._pg = pg
+        self.runtime_flags: dict[str, bool] = {}
+        self.row_factory: Any = sqlite3.Row
+        self._plans: OrderedDict[str, _Plan] = OrderedDict()
+        self._plan_cache_size = max(0, int(statement_cache_size))
+        self._tables: dict[str, _TableInfo | None] = {}
+        self._foreign_keys = True
+        self._query_only = False
+        self._last_changes = 0
+        self.profiler: Any = None
+
+    # -- sqlite3.Connection surface -------------------------------------------------
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._pg.info.transaction_status in (
+            TransactionStatus.INTRANS,
+            TransactionStatus.INERROR,
+        )
+
+    def cursor(self) -> Any:
+        cursor = PostgresCursor(self)
+        return cursor if self.profiler is None else self.profiler.wrap(self, cursor)
+
+    def execute(self, sql: str, parameters: Sequence[Any] = ()) -> Any:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> Any:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script: str) -> PostgresCursor:
+        """Run a Postgres-dialect script (migrations) without translation."""
+        cursor = PostgresCursor(self)
+        self._run(cursor._cursor, script, None)
+        self._forget_schema()
+        return cursor
+
+    def commit(self) -> None:
+        if self.in_transaction:
+            self._run(self._pg.cursor(), "COMMIT", None)
+
+    def rollback(self) -> None:
+        if self.in_transaction:
+            self._run(self._pg.cursor(), "ROLLBACK", None)
+
+    def close(self) -> None:
+        self._pg.close()
+
+    # -- execution ------------------------------------------------------------------
+
+    def _run(self, cursor: Any, sql: str, values: Sequence[Any] | None) -> None:
+        # SQLite undoes only the failing statement inside a transaction; Postgres
+        # aborts the whole transaction, so guard each statement with a savepoint.
+        guarded = (
+            self._pg.info.transaction_status == TransactionStatus.INTRANS
+            and not sql.startswith(("COMMIT", "ROLLBACK", "BEGIN", "SAVEPOINT", "RELEASE"))
+        )
+        try:
+            if guarded:
+                self._pg.execute("SAVEPOINT jarvis_stmt", prepare=False)
+            cursor.execute(sql, values)
+            if guarded:
+                self._pg.execute("RELEASE SAVEPOINT jarvis_stmt", prepare=False)
+        except psycopg.Error as exc:
+            if guarded and self._pg.info.transaction_status == TransactionStatus.INERROR:
+                try:
+                    self._pg.execute("ROLLBACK TO SAVEPOINT jarvis_stmt", prepare=False)
+                    self._pg.execute("RELEASE SAVEPOINT jarvis_stmt", prepare=False)
+                except psycopg.Error:
+                    pass
+            raise _map_error(exc) from exc
+        if sql == "BEGIN" and not self._foreign_keys:
+            cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+    def _bind(self, plan: _Plan, parameters: Sequence[Any] | dict[str, Any]) -> list[Any]:
+        if isinstance(parameters, dict):
+            raise sqlite3.ProgrammingError("named parameters are not supported")
+        values = list(parameters)
+        bound: list[Any] = []
+        for index in plan.params:
+            if index == _CHANGES:
+                bound.append(self._last_changes)
+                continue
+            try:
+                value = values[index]
+            except IndexError:
+                raise sqlite3.ProgrammingError(
+                    f"Incorrect number of bindings supplied. Supplied {len(values)}."
+                ) from None
+            if isinstance(value, bool):
+                value = int(value)
+            converter = plan.converters.get(index)
+            bound.append(converter(value) if converter is not None else value)
+        return bound
+
+    def _forget_schema(self) -> None:
+        self._tables.clear()
+        self._plans.clear()
+
+    # -- PRAGMA emulation -----------------------------------------------------------
+
+    def _pragma(self, name: str, value: str | None) -> list[tuple[Any, ...]]:
+        if name == "foreign_keys":
+            if value is None:
+                return [(int(self._foreign_keys),)]
+            self._foreign_keys = value.upper() in ("1", "ON", "TRUE", "YES")
+            return []
+        if name == "query_only":
+            if value is None:
+                return [(int(self._query_only),)]
+            self._query_only = value.upper() in ("1", "ON", "TRUE", "YES")
+            flag = "on" if self._query_only else "off"
+            self._run(self._pg.cursor(), f"SET default_transaction_read_only = {flag}", None)
+            return []
+        if name == "integrity_check":
+            return [("ok",)]
+        if name == "optimize":
+            self._run(self._pg.cursor(), "ANALYZE", None)
+            return []
+        if name == "wal_checkpoint":
+            return [(0, 0, 0)]
+        # journal_mode, synchronous, cache_size, mmap_size, ... have no equivalent.
+        return []
+
+    # -- translation ----------------------------------------------------------------
+
+    def _plan(self, sql: str, *, returning: bool = True) -> _Plan:
+        key = sql if returning else "\x00many\x00" + sql
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            return plan
+        plan = self._translate(sql, returning=returning)
+        if plan.cacheable and self._plan_cache_size:
+            self._plans[key] = plan
+            if len(self._plans) > self._plan_cache_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def _translate(self, sql: str, *, returning: bool) -> _Plan:
+        masked, literals = _mask(sql)
+        masked = masked.strip().rstrip(";").strip()
+        plan = _Plan(sql="")
+        explain = _EXPLAIN_RE.match(masked)
+        if explain:
+            masked = masked[explain.end() :]
+            returning = False
+
+        pragma = _PRAGMA_RE.match(masked)
+        if pragma:
+            plan.pragma = (pragma.group(1).lower(), pragma.group(2) or pragma.group(3))
+            return plan
+        if _BEGIN_RE.match(masked):
+            plan.sql = "BEGIN"
+            return plan
+        vec_table = _VEC0_RE.match(masked)
+        if vec_table:
+            table, column, dims = vec_table.groups()
+            plan.sql = (
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                f"(rowid BIGINT PRIMARY KEY, {column} vector({int(dims)}))"
+            )
+            plan.extra.append(
+                f"CREATE INDEX IF NOT EXISTS {table}_hnsw "
+                f"ON {table} USING hnsw ({column} vector_l2_ops)"
+            )
+            return plan
+
+        conflict: str | None = None
+        insert_or = _INSERT_OR_RE.match(masked)
+        if insert_or:
+            conflict = insert_or.group(1).upper()
+            masked = "INSERT INTO " + masked[insert_or.end() :]
+
+        knn_order: list[str] = []
+
+        def vec_match(match: re.Match[str]) -> str:
+            alias, column, vector_param, k_param = match.groups()
+            table = _table_for_alias(masked, alias)
+            plan.converters[int(vector_param.strip("\x01"))] = _vector_literal
+            knn_order.append(f"{alias}.{column} <-> {vector_param}::vector")
+            return (
+                f"{alias}.rowid IN (SELECT rowid FROM {table} "
+                f"ORDER BY {column} <-> {vector_param}::vector LIMIT {k_param})"
+            )
+
+        masked = _VEC_MATCH_RE.sub(vec_match, masked)
+        # vec0 yields KNN rows nearest first; keep that order unless the query sets one.
+        if knn_order and not re.search(r"\bORDER\s+BY\b", masked, re.I):
+            limit = _TRAILING_LIMIT_RE.search(masked)
+            order_by = f" ORDER BY {knn_order[0]}"
+            if limit:
+                masked = masked[: limit.start()] + order_by + masked[limit.start() :]
+            else:
+                masked += order_by
+
+        fts_queries: dict[str, str] = {}
+
+        def fts_match(match: re.Match[str]) -> str:
+            table, param = match.groups()
+            reference = _alias_for(masked, table)
+            plan.converters[int(param.strip("\x01"))] = _fts_query
+            query = f"websearch_to_tsquery({_FTS_CONFIG}, {param})"
+            fts_queries[table.lower()] = f"{reference}.tsv, {query}"
+            return f"{reference}.tsv @@ {query}"
+
+        masked = _FTS_MATCH_RE.sub(fts_match, masked)
+        masked = _BM25_RE.sub(
+            lambda m: f"(-ts_rank({fts_queries[m.group(1).lower()]}))"
+            if m.group(1).lower() in fts_queries
+            else "0",
+            masked,
+        )
+        masked = _CHANGES_RE.sub(f"\x01{_CHANGES}\x01", masked)
+        masked = _LIKE_RE.sub("ILIKE", masked)
+        masked = _RESERVED_IDENTIFIERS.sub('"verbose"', masked)
+
+        insert = _INSERT_RE.match(masked)
+        if insert and not re.search(r"\bRETURNING\b", masked, re.I):
+            table = insert.group(1)
+            info = self._table_info(table)
+            if info is None:
+                plan.cacheable = False
+            columns = (
+                [name.strip().strip('"') for name in insert.group(2).split(",")]
+                if insert.group(2)
+                else (info.columns if info else [])
+            )
+            if info is not None and info.vector_columns:
+                for position, name in enumerate(columns):
+                    if name in info.vector_columns:
+                        plan.converters[position] = _vector_literal
+                        masked = re.sub(
+                            rf"\x01{position}\x01", f"\x01{position}\x01::vector", masked, count=1
+                        )
+            if conflict == "IGNORE" and "ON CONFLICT" not in masked.upper():
+                masked += " ON CONFLICT DO NOTHING"
+            elif conflict == "REPLACE" and info is not None:
+                masked += _replace_clause(info, columns)
+            if returning and info is not None and info.identity:
+                masked += f" RETURNING {info.identity}"
+                plan.returns_rowid = True
+
+        if explain:
+            masked = "EXPLAIN " + masked
+        plan.sql, plan.params = _unmask(masked, literals)
+        return plan
+
+    def _table_info(self, table: str) -> _TableInfo | None:
+        key = table.lower()
+        if key in self._tables:
+            return self._tables[key]
+        cursor = self._pg.cursor()
+        cursor.execute(
+            "SELECT a.attname, a.attidentity, pg_get_expr(d.adbin, d.adrelid), t.typname "
+            "FROM pg_attribute a "
+            "JOIN pg_type t ON t.oid = a.atttypid "
+            "LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum "
+            "WHERE a.attrelid = to_regclass(%s) AND a.attnum > 0 AND NOT a.attisdropped "
+            "ORDER BY a.attnum",
+            (key,),
+        )
+        attributes = cursor.fetchall()
+        if not attributes:
+            return None
+        cursor.execute(
+            "SELECT i.indisprimary, array_agg(a.attname::text ORDER BY k.ord) "
+            "FROM pg_index i "
+            "CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord) "
+            "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum "
+            "WHERE i.indrelid = to_regclass(%s) AND i.indisunique AND i.indpred IS NULL "
+            "GROUP BY i.indexrelid, i.indisprimary "
+            "ORDER BY i.indisprimary DESC, i.indexrelid",
+            (key,),
+        )
+        unique_keys = [tuple(names) for _, names in cursor.fetchall()]
+        identity = next(
+            (
+                name
+                for name, ident, default, _ in attributes
+                if ident or (default or "").startswith("nextval(")
+            ),
+            None,
+        )
+        info = _TableInfo(
+            columns=[name for name, _, _, typname in attributes if name != "tsv"],
+            unique_keys=unique_keys,
+            identity=identity,
+            vector_columns=frozenset(
+                name for name, _, _, typname in attributes if typname == "vector"
+            ),
+        )
+        self._tables[key] = info
+        return info
+
+
+def _replace_clause(info: _TableInfo, columns: list[str]) -> str:
+    inserted = set(columns)
+    for key in info.unique_keys:
+        if set(key) <= inserted:
+            updates = [name for name in columns if name not in key]
+            if not updates:
+                return f" ON CONFLICT ({', '.join(key)}) DO NOTHING"
+            assignments = ", ".join(f"{name}=EXCLUDED.{name}" for name in updates)
+            return f" ON CONFLICT ({', '.join(key)}) DO UPDATE SET {assignments}"
+    return ""
+
+
+if psycopg is not None:  # pragma: no branch
+
+    class _UntypedIntDumper(Dumper):
+        # SQLite compares by column affinity; sending ints untyped lets Postgres
+        # infer the type from context (``text_col = ?`` binds as text).
+        oid = 0
+
+        def dump(self, obj: int) -> bytes:
+            return str(obj).encode()
+
+    class _NumericLoader(Loader):
+        def load(self, data: Any) -> int | float:
+            value = Decimal(bytes(data).decode())
+            return int(value) if value == value.to_integral_value() else float(value)
+
+    class _BoolLoader(Loader):
+        def load(self, data: Any) -> int:
+            return 1 if bytes(data) == b"t" else 0
+
+
+def connect_postgres(
+    url: str, *, read_only: bool = False, statement_cache_size: int = 256
+) -> PostgresConnection:
+    if psycopg is None:
+        raise RuntimeError(
+            "DB_ENGINE=postgres requires psycopg; install the 'postgres' extra"
+        )
+    if not url:
+        raise RuntimeError("DB_ENGINE=postgres requires DATABASE_URL")
+    options = "-c lock_timeout=30000"
+    if read_only:
+        options += " -c default_transaction_read_only=on"
+    try:
+        pg = psycopg.connect(
+            url,
+            autocommit=True,
+            prepare_threshold=5,
+            application_name="jarvis",
+            options=options,
+        )
+    except psycopg.Error as exc:
+        raise _map_error(exc) from exc
+    pg.adapters.register_dumper(int, _UntypedIntDumper)
+    pg.adapters.register_loader("numeric", _NumericLoader)
+    pg.adapters.register_loader("bool", _BoolLoader)
+    conn = PostgresConnection(pg, statement_cache_size=statement_cache_size)
+    conn._query_only = read_only
+    return conn
@@ -0,0 +1,382 @@
+"""Opt-in SQL statement profiler.
+
+With ``DB_PROFILE_ENABLED=1`` every connection handed out by
+:mod:`jarvis.db.connection` returns :class:`ProfiledCursor` objects. Each
+statement is normalized into a fingerprint (literals become ``?``, ``IN``
+lists and multi-row ``VALUES`` collapse) and its wall time, from ``execute``
+until the cursor is exhausted, closed or reused, lands in a per-fingerprint
+latency histogram together with the rows it returned or changed.
+
+The first time a fingerprint is seen its ``EXPLAIN QUERY PLAN`` is captured on
+the executing connection, so statements slower than ``DB_PROFILE_SLOW_MS`` are
+logged with their plan without touching the database again. The report is
+served live by ``GET /api/v1/system/db-profile`` and written every
+``DB_PROFILE_SNAPSHOT_SECONDS`` to a JSON sidecar next to ``APP_DB`` for
+``jarvis db profile``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from jarvis.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, in milliseconds.
+BUCKETS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0,
+    100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0, float("inf"),
+)  # fmt: skip
+SORT_KEYS = ("total_ms", "mean_ms", "p95_ms", "max_ms", "calls", "rows")
+OTHER_FINGERPRINT = "(other statements)"
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_SPACE_RE = re.compile(r"\s+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_RE = re.compile(r"(\([?,\s]*\))(?:\s*,\s*\([?,\s]*\))+")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """Normalize ``sql`` so statements differing only in literals share a key."""
+    text = _STRING_RE.sub("?", sql)
+    text = _NUMBER_RE.sub("?", text)
+    text = _SPACE_RE.sub(" ", text).strip().rstrip(";").strip()
+    text = _IN_LIST_RE.sub("IN (?...)", text)
+    return _VALUES_RE.sub(r"\1, ...", text)
+
+
+def snapshot_path(db_path: str) -> Path:
+    return Path(f"{db_path}.query_profile.json")
+
+
+def _percentile(counts: list[int], calls: int, quantile: float, max_ms: float) -> float:
+    if calls <= 0:
+        return 0.0
+    threshold = quantile * calls
+    seen = 0
+    for bound, count in zip(BUCKETS_MS, counts, strict=True):
+        seen += count
+        if seen >= threshold:
+            return min(bound, max_ms)
+    return max_ms
+
+
+@dataclass
+class _StatementStats:
+    calls: int = 0
+    errors: int = 0
+    rows: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_calls: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(BUCKETS_MS))
+    plan: list[str] | None = None
+
+    def summary(self, key: str) -> dict[str, Any]:
+        calls = self.calls
+        return {
+            "fingerprint": key,
+            "calls": calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "rows_per_call": round(self.rows / calls, 2) if calls else 0.0,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / calls, 3) if calls else 0.0,
+            "p50_ms": _percentile(self.buckets, calls, 0.50, round(self.max_ms, 3)),
+            "p95_ms": _percentile(self.buckets, calls, 0.95, round(self.max_ms, 3)),
+            "p99_ms": _percentile(self.buckets, calls, 0.99, round(self.max_ms, 3)),
+            "max_ms": round(self.max_ms, 3),
+            "slow_calls": self.slow_calls,
+            "histogram": {
+                f"le_{bound:g}": count
+                for bound, count in zip(BUCKETS_MS, self.buckets, strict=True)
+                if count
+            },
+            "plan": list(self.plan or []),
+        }
+
+
+class QueryProfiler:
+    def __init__(self, *, slow_ms: float, max_statements: int, slow_log_size: int) -> None:
+        self.slow_ms = max(0.0, float(slow_ms))
+        self.max_statements = max(1, int(max_statements))
+        # Cursors may be finalized from __del__ on the thread already recording.
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._stats: dict[str, _StatementStats] = {}
+        self._slow: deque[dict[str, Any]] = deque(maxlen=max(0, int(slow_log_size)))
+        self._since = datetime.now(UTC).isoformat()
+
+    # -- recording ------------------------------------------------------------------
+
+    def wrap(self, conn: Any, cursor: Any) -> ProfiledCursor:
+        return ProfiledCursor(self, conn, cursor)
+
+    def suspended(self) -> bool:
+        return bool(getattr(self._local, "suspended", False))
+
+    def _entry(self, key: str) -> _StatementStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= self.max_statements:
+                key = OTHER_FINGERPRINT
+            stats = self._stats.setdefault(key, _StatementStats())
+        return stats
+
+    def prepare(self, conn: Any, sql: str, parameters: Any) -> str:
+        """Fingerprint ``sql``, capturing its plan the first time it is seen."""
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._entry(key)
+            if stats.plan is not None:
+                return key
+            stats.plan = []
+        if key.upper().startswith(_EXPLAINABLE):
+            plan = self._explain(conn, sql, parameters)
+            with self._lock:
+                stats.plan = plan
+        return key
+
+    def _explain(self, conn: Any, sql: str, parameters: Any) -> list[str]:
+        self._local.suspended = True
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error as exc:
+            return [f"unavailable: {exc}"]
+        finally:
+            self._local.suspended = False
+        return [str(row[-1]) for row in rows]
+
+    def record(
+        self, key: str, sql: str, elapsed_ms: float, rows: int, *, error: bool = False
+    ) -> None:
+        slow = elapsed_ms >= self.slow_ms > 0
+        with self._lock:
+            stats = self._entry(key)
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.rows += max(0, rows)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            for index, bound in enumerate(BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    stats.buckets[index] += 1
+                    break
+            if not slow:
+                return
+            stats.slow_calls += 1
+            plan = list(stats.plan or [])
+            self._slow.append(
+                {
+                    "at": datetime.now(UTC).isoformat(),
+                    "fingerprint": key,
+                    "sql": sql[:2000],
+                    "duration_ms": round(elapsed_ms, 3),
+                    "rows": rows,
+                    "error": error,
+                    "plan": plan,
+                }
+            )
+        logger.warning(
+            "Slow SQL statement (%.1f ms, %d rows): %s\n  plan: %s",
+            elapsed_ms,
+            rows,
+            key,
+            "; ".join(plan) or "n/a",
+        )
+
+    # -- reporting ------------------------------------------------------------------
+
+    def report(self, *, limit: int = 20, sort: str = "total_ms") -> dict[str, Any]:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        with self._lock:
+            statements = [stats.summary(key) for key, stats in self._stats.items()]
+            slow = list(self._slow)
+        statements.sort(key=lambda item: item[sort], reverse=True)
+        return {
+            "since": self._since,
+            "generated_at": datetime.now(UTC).isoformat(),
+            "slow_ms": self.slow_ms,
+            "statements": len(statements),
+            "calls": sum(int(item["calls"]) for item in statements),
+            "total_ms": round(sum(float(item["total_ms"]) for item in statements), 3),
+            "top": statements[: max(0, int(limit))],
+            "slow_queries": slow[::-1],
+        }
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "db_profile_statements": len(self._stats),
+                "db_profile_calls": sum(stats.calls for stats in self._stats.values()),
+                "db_profile_slow_calls": sum(stats.slow_calls for stats in self._stats.values()),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self._since = datetime.now(UTC).isoformat()
+
+    def write_snapshot(self, path: Path) -> Path:
+        payload = self.report(limit=self.max_statements)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+        return path
+
+
+class ProfiledCursor:
+    """Cursor proxy timing each statement until its results are consumed."""
+
+    _cursor: Any = None
+    _pending: tuple[str, str] | None = None
+
+    def __init__(self, profiler: QueryProfiler, conn: Any, cursor: Any) -> None:
+        self._profiler = profiler
+        self._conn = conn
+        self._cursor = cursor
+        self._pending: tuple[str, str] | None = None
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def _begin(self, sql: str, parameters: Any) -> str | None:
+        self._finish()
+        if self._profiler.suspended():
+            return None
+        if parameters is None:
+            return fingerprint(sql)
+        return self._profiler.prepare(self._conn, sql, parameters)
+
+    def _run(self, key: str | None, sql: str, method: Any, *args: Any) -> ProfiledCursor:
+        if key is None:
+            method(*args)
+            return self
+        started = time.perf_counter()
+        try:
+            method(*args)
+        except Exception:
+            elapsed = (time.perf_counter() - started) * 1000
+            self._profiler.record(key, sql, elapsed, 0, error=True)
+            raise
+        self._pending = (key, sql)
+        self._elapsed = (time.perf_counter() - started) * 1000
+        # Statements returning rows count what is fetched; the rest what they changed.
+        if self._cursor.description is None:
+            self._rows = max(0, int(self._cursor.rowcount or 0))
+        else:
+            self._rows = 0
+        return self
+
+    def execute(self, sql: str, parameters: Sequence[Any] = ()) -> ProfiledCursor:
+        key = self._begin(sql, parameters)
+        return self._run(key, sql, self._cursor.execute, sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> ProfiledCursor:
+        key = self._begin(sql, None)
+        return self._run(key, sql, self._cursor.executemany, sql, seq_of_parameters)
+
+    def _fetched(self, started: float, rows: int, *, done: bool) -> None:
+        if self._pending is None:
+            return
+        self._elapsed += (time.perf_counter() - started) * 1000
+        self._rows += rows
+        if done:
+            self._finish()
+
+    def _finish(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._profiler.record(pending[0], pending[1], self._elapsed, self._rows)
+
+    def fetchone(self) -> Any:
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(started, 0 if row is None else 1, done=row is None)
+        return row
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        started = time.perf_counter()
+        size = self._cursor.arraysize if size is None else size
+        rows: list[Any] = self._cursor.fetchmany(size)
+        self._fetched(started, len(rows), done=len(rows) < size)
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        started = time.perf_counter()
+        rows: list[Any] = self._cursor.fetchall()
+        self._fetched(started, len(rows), done=True)
+        return rows
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        self._cursor.close()
+
+    def __del__(self) -> None:
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+_profiler: QueryProfiler | None = None
+_profiler_lock = threading.Lock()
+
+
+def get_query_profiler() -> QueryProfiler:
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                settings = get_settings()
+                _profiler = QueryProfiler(
+                    slow_ms=settings.db_profile_slow_ms,
+                    max_statements=settings.db_profile_max_statements,
+                    slow_log_size=settings.db_profile_slow_log_size,
+                )
+    return _profiler
+
+
+def reset_query_profiler() -> None:
+    global _profiler
+    with _profiler_lock:
+        _profiler = None
+
+
+def read_snapshot(path: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
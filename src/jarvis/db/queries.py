@@ -1,5 +1,6 @@
 """Core query helpers used by routes/tasks."""
 
+import itertools
 import json
 import sqlite3
 from datetime import UTC, datetime, timedelta
@@ -8,6 +9,7 @@ from typing import Literal
 from fastapi import HTTPException
 
 from jarvis.agents.loader import get_all_agent_ids
+from jarvis.db.write_queue import write_behind
 from jarvis.ids import new_id
 
 
@@ -15,6 +17,43 @@ def now_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
+_system_state_changes = itertools.count(1)
+_system_state_generation = 0
+
+
+def mark_system_state_changed() -> None:
+    """Record that ``system_state`` lockdown/restart flags were written in-process.
+
+    Caches of those flags compare :func:`system_state_generation` to reload
+    immediately instead of waiting for their refresh interval.
+    """
+    global _system_state_generation
+    _system_state_generation = next(_system_state_changes)
+
+
+def system_state_generation() -> int:
+    return _system_state_generation
+
+
+def insert_web_notification(
+    conn: sqlite3.Connection,
+    thread_id: str | None,
+    event_type: str,
+    payload_json: str,
+    created_at: str,
+) -> None:
+    write_behind(
+        conn,
+        [
+            (
+                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
+                "VALUES(?,?,?,?)",
+                (thread_id, event_type, payload_json, created_at),
+            )
+        ],
+    )
+
+
 def verify_thread_owner(conn: sqlite3.Connection, thread_id: str, user_id: str) -> None:
     row = conn.execute("SELECT user_id FROM threads WHERE id=? LIMIT 1", (thread_id,)).fetchone()
     if row is None:
@@ -85,6 +124,7 @@ def record_readyz_result(conn: sqlite3.Connection, ok: bool, threshold: int = 3)
         ),
         (next_streak, lockdown, reason, now_iso()),
     )
+    mark_system_state_changed()
     return lockdown == 1
 
 
@@ -118,6 +158,7 @@ def register_rollback(
         ),
         (count, current.isoformat(), lockdown, reason, now_iso()),
     )
+    mark_system_state_changed()
     return lockdown == 1
 
 
@@ -130,6 +171,7 @@ def trigger_lockdown(conn: sqlite3.Connection, reason: str) -> None:
         ),
         (reason, now_iso()),
     )
+    mark_system_state_changed()
 
 
 def record_exec_host_result(
@@ -187,6 +229,7 @@ def record_exec_host_result(
         ),
         (count, current.isoformat(), lockdown, reason, now_iso()),
     )
+    mark_system_state_changed()
     return lockdown == 1
 
 
@@ -611,11 +654,23 @@ def create_thread(conn: sqlite3.Connection, user_id: str, channel_id: str) -> st
     return thread_id
 
 
-def insert_message(conn: sqlite3.Connection, thread_id: str, role: str, content: str) -> str:
+def insert_message(
+    conn: sqlite3.Connection,
+    thread_id: str,
+    role: str,
+    content: str,
+    *,
+    actor_id: str | None = None,
+    trace_id: str | None = None,
+) -> str:
+    """Insert a message; agent replies record the authoring ``actor_id`` and trace."""
     message_id = new_id("msg")
     conn.execute(
-        "INSERT INTO messages(id, thread_id, role, content, created_at) VALUES(?,?,?,?,?)",
-        (message_id, thread_id, role, content, now_iso()),
+        (
+            "INSERT INTO messages(id, thread_id, role, content, created_at, actor_id, trace_id) "
+            "VALUES(?,?,?,?,?,?,?)"
+        ),
+        (message_id, thread_id, role, content, now_iso(), actor_id, trace_id),
     )
     conn.execute("UPDATE threads SET updated_at=? WHERE id=?", (now_iso(), thread_id))
     return message_id
@@ -848,6 +903,22 @@ def get_channel_outbound(
     return {"recipient": str(row["recipient"]), "text": str(row["text"])}
 
 
+def get_thread_channel(conn: sqlite3.Connection, thread_id: str) -> dict[str, str] | None:
+    row = conn.execute(
+        (
+            "SELECT c.channel_type, u.external_id AS recipient "
+            "FROM threads t "
+            "JOIN channels c ON c.id=t.channel_id "
+            "JOIN users u ON u.id=t.user_id "
+            "WHERE t.id=? LIMIT 1"
+        ),
+        (thread_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    return {"channel_type": str(row["channel_type"]), "recipient": str(row["recipient"])}
+
+
 def upsert_selfupdate_run(
     conn: sqlite3.Connection,
     *,
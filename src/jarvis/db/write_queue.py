@@ -0,0 +1,275 @@
+"""Write-behind queue for high-volume append-only inserts.
+
+Events, web notifications and memory governance audit rows are appended many
+times per agent step. Instead of each taking the WAL write lock as its own
+autocommit transaction, :func:`write_behind` hands them to one writer thread
+that commits them in batches of up to ``DB_WRITE_BATCH_ROWS`` statements, at
+most ``DB_WRITE_BATCH_MS`` after the first queued write. Readers that must see
+their own writes (trace and event views) call :func:`flush_writes` first.
+
+A write runs inline on the caller's connection when the queue is disabled or
+full, or when the caller is inside an explicit transaction (so a rollback still
+discards it).
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from jarvis.config import get_settings
+from jarvis.db.connection import connect, db_target
+
+logger = logging.getLogger(__name__)
+
+Statement = tuple[str, Sequence[Any]]
+
+
+@dataclass
+class _Write:
+    seq: int
+    statements: tuple[Statement, ...]
+
+
+class WriteQueue:
+    def __init__(
+        self, path: str, *, enabled: bool, batch_ms: int, batch_rows: int, max_depth: int
+    ) -> None:
+        self.path = path
+        self.enabled = enabled
+        self.batch_seconds = max(0, int(batch_ms)) / 1000
+        self.batch_rows = max(1, int(batch_rows))
+        self.max_depth = max(1, int(max_depth))
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        self._pending: deque[_Write] = deque()
+        self._pending_rows = 0
+        self._first_queued_at = 0.0
+        self._submitted = 0
+        self._completed = 0
+        self._flush_target = 0
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self._max_depth_seen = 0
+        self._batches = 0
+        self._rows = 0
+        self._inline = 0
+        self._dropped = 0
+        self._commit_total_ms = 0.0
+        self._commit_last_ms = 0.0
+        self._commit_max_ms = 0.0
+
+    def submit(self, statements: Sequence[Statement]) -> bool:
+        """Queue ``statements`` to be committed together; False means run them inline."""
+        if not self.enabled or not statements:
+            return False
+        with self._cond:
+            if self._stopping or self._pending_rows >= self.max_depth:
+                return False
+            self._start_locked()
+            self._submitted += 1
+            if not self._pending:
+                self._first_queued_at = time.monotonic()
+            self._pending.append(_Write(self._submitted, tuple(statements)))
+            self._pending_rows += len(statements)
+            self._max_depth_seen = max(self._max_depth_seen, self._pending_rows)
+            if len(self._pending) == 1 or self._pending_rows >= self.batch_rows:
+                self._cond.notify_all()
+        return True
+
+    def record_inline(self) -> None:
+        with self._cond:
+            self._inline += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every write queued before this call is committed."""
+        with self._cond:
+            target = self._submitted
+            if self._completed >= target:
+                return True
+            self._flush_target = max(self._flush_target, target)
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._completed >= target, timeout)
+
+    def _start_locked(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="jarvis-db-writer", daemon=True)
+        self._thread.start()
+
+    def _next_batch(self) -> list[_Write] | None:
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if self._stopping:
+                        return None
+                    self._cond.wait()
+                    continue
+                remaining = self._first_queued_at + self.batch_seconds - time.monotonic()
+                if (
+                    self._pending_rows >= self.batch_rows
+                    or self._flush_target > self._completed
+                    or self._stopping
+                    or remaining <= 0
+                ):
+                    break
+                self._cond.wait(remaining)
+            batch: list[_Write] = []
+            rows = 0
+            while self._pending and (not batch or rows < self.batch_rows):
+                write = self._pending.popleft()
+                batch.append(write)
+                rows += len(write.statements)
+            self._pending_rows -= rows
+            self._first_queued_at = time.monotonic()
+            return batch
+
+    def _run(self) -> None:
+        conn: sqlite3.Connection | None = None
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                if conn is None:
+                    conn = connect()
+                self._commit(conn, batch)
+            except Exception:
+                logger.exception("Write-behind batch of %d writes failed", len(batch))
+                with self._cond:
+                    self._dropped += len(batch)
+            with self._cond:
+                self._completed = batch[-1].seq
+                self._cond.notify_all()
+        if conn is not None:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: list[_Write]) -> None:
+        started = time.perf_counter()
+        rows = sum(len(write.statements) for write in batch)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for write in batch:
+                for sql, params in write.statements:
+                    conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Isolate the failing write so one bad row does not discard its batch.
+            dropped = 0
+            for write in batch:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for sql, params in write.statements:
+                        conn.execute(sql, params)
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    logger.warning(
+                        "Dropping write-behind write: %s",
+                        write.statements[0][0].split("(")[0].strip(),
+                        exc_info=True,
+                    )
+                    dropped += 1
+                    rows -= len(write.statements)
+            with self._cond:
+                self._dropped += dropped
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._cond:
+            self._batches += 1
+            self._rows += rows
+            self._commit_total_ms += elapsed_ms
+            self._commit_last_ms = elapsed_ms
+            self._commit_max_ms = max(self._commit_max_ms, elapsed_ms)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._cond:
+            return {
+                "db_write_queue_enabled": int(self.enabled),
+                "db_write_queue_depth": self._pending_rows,
+                "db_write_queue_max_depth": self._max_depth_seen,
+                "db_write_batches": self._batches,
+                "db_write_rows": self._rows,
+                "db_write_inline": self._inline,
+                "db_write_dropped": self._dropped,
+                "db_write_commit_avg_ms": (
+                    round(self._commit_total_ms / self._batches, 3) if self._batches else 0.0
+                ),
+                "db_write_commit_last_ms": round(self._commit_last_ms, 3),
+                "db_write_commit_max_ms": round(self._commit_max_ms, 3),
+            }
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Commit everything still queued and stop the writer thread."""
+        with self._cond:
+            self._stopping = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+
+_write_queue: WriteQueue | None = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteQueue:
+    """Return the queue for the configured database, draining the old one if it changed."""
+    global _write_queue
+    settings = get_settings()
+    target = db_target(settings)
+    queue = _write_queue
+    if queue is not None and queue.path == target and queue.pid == os.getpid():
+        return queue
+    with _write_queue_lock:
+        queue = _write_queue
+        if queue is None or queue.path != target or queue.pid != os.getpid():
+            if queue is not None and queue.pid == os.getpid():
+                queue.close()
+            queue = WriteQueue(
+                target,
+                enabled=int(settings.db_write_behind_enabled) == 1,
+                batch_ms=settings.db_write_batch_ms,
+                batch_rows=settings.db_write_batch_rows,
+                max_depth=settings.db_write_queue_max,
+            )
+            _write_queue = queue
+        return queue
+
+
+def reset_write_queue() -> None:
+    global _write_queue
+    with _write_queue_lock:
+        queue, _write_queue = _write_queue, None
+    if queue is not None and queue.pid == os.getpid():
+        queue.close()
+
+
+def write_behind(conn: sqlite3.Connection, statements: Sequence[Statement]) -> None:
+    """Queue ``statements`` for the writer thread, or run them on ``conn`` right away."""
+    if conn.in_transaction:
+        queued = False
+    else:
+        queue = get_write_queue()
+        queued = queue.submit(statements)
+        if not queued and queue.enabled:
+            queue.record_inline()
+    if queued:
+        return
+    for sql, params in statements:
+        conn.execute(sql, params)
+
+
+def flush_writes(timeout: float = 5.0) -> bool:
+    """Read barrier: wait until queued writes are visible to new transactions."""
+    queue = _write_queue
+    if queue is None or not queue.enabled:
+        return True
+    return queue.flush(timeout)
@@ -0,0 +1,351 @@
+"""Monthly archive partitions for the ``events`` table.
+
+Events older than ``EVENTS_ARCHIVE_AFTER_DAYS`` are moved out of the main
+database into one SQLite file per calendar month, ``<APP_DB>.events-YYYY-MM.db``,
+by :func:`compact_events` (the ``jarvis.tasks.system.events_archive`` periodic
+task and ``jarvis db events compact``). A partition keeps the ``events`` rows and
+their ``event_text``; the search-only copies (``event_fts``, ``event_vec`` and the
+vector index entries) are dropped from the main database, so archived events no
+longer take part in full-text or semantic event search.
+
+Readers call :func:`query_events` with SQL that names the table as ``{events}``.
+It runs against the live table first and then ATTACHes each partition in turn,
+newest month first, stopping as soon as a ``limit`` is satisfied. Partitions hold
+disjoint, strictly older months than the live table, so concatenating the results
+keeps a ``created_at`` ordering intact.
+
+Partitions stay out of the main database, so VACUUM and the periodic backup
+snapshots no longer carry them. They are plain SQLite files: SQLite only. With
+``DB_ENGINE=postgres`` the live table is the only partition and compaction is a
+no-op.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import NotRequired, TypedDict
+from urllib.parse import quote
+
+from jarvis.config import get_settings
+from jarvis.memory.ann import discard_ann_keys
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "events_archive"
+ARCHIVE_SCHEMA_VERSION = 1
+_MONTH_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+_EVENT_COLUMNS = (
+    "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
+    "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
+)
+_PARTITION_DDL = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.events (
+      id TEXT PRIMARY KEY,
+      trace_id TEXT NOT NULL,
+      span_id TEXT NOT NULL,
+      parent_span_id TEXT,
+      thread_id TEXT,
+      event_type TEXT NOT NULL,
+      component TEXT NOT NULL,
+      actor_type TEXT NOT NULL,
+      actor_id TEXT NOT NULL,
+      payload_json TEXT NOT NULL,
+      payload_redacted_json TEXT NOT NULL,
+      created_at TEXT NOT NULL
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.event_text (
+      event_id TEXT PRIMARY KEY,
+      thread_id TEXT,
+      redacted_text TEXT NOT NULL,
+      created_at TEXT NOT NULL
+    )
+    """,
+    # The same lookups the live table is indexed for (migration 062).
+    f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_events_trace_created "
+    "ON events(trace_id, created_at)",
+    f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_events_thread_created "
+    "ON events(thread_id, created_at)",
+    f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_events_created ON events(created_at)",
+    f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_events_type_created "
+    "ON events(event_type, created_at)",
+    f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_events_component_created "
+    "ON events(component, created_at)",
+)
+_BATCH_IDS = f"SELECT id FROM temp.{ARCHIVE_SCHEMA}_batch"
+
+
+@dataclass(frozen=True)
+class EventPartition:
+    month: str
+    path: Path
+    size_bytes: int
+
+
+class PartitionStats(TypedDict):
+    month: str
+    path: str
+    size_bytes: int
+    events: int
+    oldest: str | None
+    newest: str | None
+
+
+class CompactSummary(TypedDict):
+    archived: int
+    partitions: list[str]
+    skipped: NotRequired[str]
+
+
+def partition_path(db_path: str, month: str) -> Path:
+    return Path(f"{db_path}.events-{month}.db")
+
+
+def archive_supported(conn: sqlite3.Connection) -> bool:
+    return getattr(conn, "dialect", "sqlite") == "sqlite"
+
+
+def list_partitions(db_path: str | None = None) -> list[EventPartition]:
+    """Return the archive partitions of ``db_path`` (default ``APP_DB``), newest first."""
+    base = Path(db_path or get_settings().app_db)
+    prefix = f"{base.name}.events-"
+    partitions: list[EventPartition] = []
+    for candidate in base.parent.glob(f"{base.name}.events-*.db"):
+        month = candidate.name[len(prefix) : -len(".db")]
+        if not _MONTH_RE.match(month):
+            continue
+        try:
+            size = candidate.stat().st_size
+        except OSError:
+            continue
+        partitions.append(EventPartition(month=month, path=candidate, size_bytes=size))
+    partitions.sort(key=lambda item: item.month, reverse=True)
+    return partitions
+
+
+def partition_stats(partition: EventPartition) -> PartitionStats:
+    """Row count and ``created_at`` range of one partition, read without attaching it."""
+    conn = sqlite3.connect(f"file:{quote(str(partition.path))}?mode=ro", uri=True)
+    try:
+        row = conn.execute(
+            "SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM events"
+        ).fetchone()
+    except sqlite3.DatabaseError:
+        row = (0, None, None)
+    finally:
+        conn.close()
+    return {
+        "month": partition.month,
+        "path": str(partition.path),
+        "size_bytes": partition.size_bytes,
+        "events": int(row[0] or 0),
+        "oldest": row[1],
+        "newest": row[2],
+    }
+
+
+@contextmanager
+def attached_partition(conn: sqlite3.Connection, path: Path) -> Iterator[str]:
+    """ATTACH ``path`` as :data:`ARCHIVE_SCHEMA` for the duration of the block."""
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (str(path),))
+    try:
+        yield ARCHIVE_SCHEMA
+    finally:
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+
+def query_events(
+    conn: sqlite3.Connection,
+    sql: str,
+    params: Sequence[object] = (),
+    *,
+    limit: int | None = None,
+    oldest_first: bool = False,
+    contiguous: bool = False,
+) -> list[sqlite3.Row]:
+    """Run ``sql`` over the live ``events`` table and every archive partition.
+
+    ``sql`` refers to the table as ``{events}``. With ``limit`` the statement must
+    end in ``LIMIT ?``: each partition is asked for the rows still missing and the
+    walk stops once ``limit`` rows are collected. Partitions are visited newest
+    first (live table, then months descending) unless ``oldest_first`` is set.
+    Set ``contiguous`` when the matching rows form one unbroken run in time, as a
+    trace does: the walk then stops at the first source that adds no rows after
+    one that did.
+    """
+    rows: list[sqlite3.Row] = []
+    found = False
+
+    def run(events_table: str) -> bool:
+        nonlocal found
+        args = tuple(params) if limit is None else (*params, limit - len(rows))
+        batch = conn.execute(sql.format(events=events_table), args).fetchall()
+        rows.extend(batch)
+        if batch:
+            found = True
+        # True once the walk can stop: limit reached, or a contiguous run has ended.
+        return (limit is not None and len(rows) >= limit) or (contiguous and found and not batch)
+
+    partitions = list_partitions() if archive_supported(conn) else []
+    if oldest_first:
+        partitions.reverse()
+    elif run("events"):
+        return rows
+    for partition in partitions:
+        try:
+            with attached_partition(conn, partition.path) as schema:
+                done = run(f"{schema}.events")
+        except sqlite3.OperationalError:
+            # Dropped mid-walk, or not yet initialised by compaction.
+            logger.debug("skipping event partition %s", partition.path, exc_info=True)
+            continue
+        if done:
+            return rows
+    if oldest_first:
+        run("events")
+    return rows
+
+
+def archive_cutoff(days: int, now: datetime | None = None) -> str:
+    return ((now or datetime.now(UTC)) - timedelta(days=max(0, days))).isoformat()
+
+
+def _next_month(month: str) -> str:
+    year, mon = (int(part) for part in month.split("-"))
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+
+
+def compact_events(
+    conn: sqlite3.Connection,
+    *,
+    before: str,
+    db_path: str | None = None,
+    batch_size: int = 2000,
+) -> CompactSummary:
+    """Move events created before ``before`` into their monthly partitions.
+
+    Each batch is first committed to the partition (``INSERT OR IGNORE``) and only
+    then deleted from the main database, so an interrupted run leaves at most a
+    duplicate that the next run removes, never a lost event.
+    """
+    summary: CompactSummary = {"archived": 0, "partitions": []}
+    if not archive_supported(conn):
+        summary["skipped"] = "unsupported_engine"
+        return summary
+    base = db_path or get_settings().app_db
+    months = [
+        str(row[0])
+        for row in conn.execute(
+            "SELECT DISTINCT substr(created_at, 1, 7) FROM events WHERE created_at < ?",
+            (before,),
+        ).fetchall()
+        if row[0] and _MONTH_RE.match(str(row[0]))
+    ]
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}_batch(id TEXT PRIMARY KEY)")
+    archived = 0
+    touched: list[str] = []
+    try:
+        for month in sorted(months):
+            upper = min(_next_month(month), before)
+            moved = _compact_month(
+                conn, partition_path(base, month), month, upper, max(1, int(batch_size))
+            )
+            if moved:
+                archived += moved
+                touched.append(month)
+    finally:
+        conn.execute(f"DROP TABLE IF EXISTS temp.{ARCHIVE_SCHEMA}_batch")
+    summary["archived"] = archived
+    summary["partitions"] = touched
+    return summary
+
+
+def _compact_month(
+    conn: sqlite3.Connection, path: Path, lower: str, upper: str, batch_size: int
+) -> int:
+    moved = 0
+    with attached_partition(conn, path) as schema:
+        conn.execute(f"PRAGMA {schema}.journal_mode = WAL")
+        for statement in _PARTITION_DDL:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA {schema}.user_version = {ARCHIVE_SCHEMA_VERSION}")
+        while True:
+            conn.execute(f"DELETE FROM temp.{ARCHIVE_SCHEMA}_batch")
+            conn.execute(
+                f"INSERT INTO temp.{ARCHIVE_SCHEMA}_batch(id) "
+                "SELECT id FROM main.events WHERE created_at >= ? AND created_at < ? "
+                "ORDER BY created_at LIMIT ?",
+                (lower, upper, batch_size),
+            )
+            ids = [str(row[0]) for row in conn.execute(_BATCH_IDS).fetchall()]
+            if not ids:
+                break
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {schema}.events({_EVENT_COLUMNS}) "
+                    f"SELECT {_EVENT_COLUMNS} FROM main.events WHERE id IN ({_BATCH_IDS})"
+                )
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {schema}.event_text("
+                    "event_id, thread_id, redacted_text, created_at) "
+                    "SELECT event_id, thread_id, redacted_text, created_at "
+                    f"FROM main.event_text WHERE event_id IN ({_BATCH_IDS})"
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                _delete_live(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            discard_ann_keys("event", ids)
+            moved += len(ids)
+            if len(ids) < batch_size:
+                break
+    return moved
+
+
+def _delete_live(conn: sqlite3.Connection) -> None:
+    conn.execute(f"DELETE FROM main.pending_event_vectors WHERE event_id IN ({_BATCH_IDS})")
+    try:
+        conn.execute(
+            "DELETE FROM main.event_vec_index WHERE rowid IN ("
+            "SELECT vec_rowid FROM main.event_vec_index_map "
+            f"WHERE event_id IN ({_BATCH_IDS}))"
+        )
+    except sqlite3.OperationalError:
+        # sqlite-vec is not loaded on this connection; the map rows go below.
+        pass
+    conn.execute(f"DELETE FROM main.event_vec_index_map WHERE event_id IN ({_BATCH_IDS})")
+    conn.execute(f"DELETE FROM main.event_vec WHERE id IN ({_BATCH_IDS})")
+    conn.execute(f"DELETE FROM main.event_fts WHERE event_id IN ({_BATCH_IDS})")
+    conn.execute(f"DELETE FROM main.event_text WHERE event_id IN ({_BATCH_IDS})")
+    conn.execute(f"DELETE FROM main.events WHERE id IN ({_BATCH_IDS})")
+
+
+def drop_partition(month: str, db_path: str | None = None) -> bool:
+    """Delete the partition file for ``month``; False when there is none."""
+    if not _MONTH_RE.match(month):
+        raise ValueError(f"invalid partition month: {month!r} (expected YYYY-MM)")
+    path = partition_path(db_path or get_settings().app_db, month)
+    if not path.exists():
+        return False
+    for suffix in ("-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    path.unlink()
+    return True
@@ -5,10 +5,10 @@ import sqlite3
 from datetime import UTC, datetime
 from typing import Any, cast
 
+from jarvis.db.write_queue import Statement, write_behind
 from jarvis.events.envelope import enforce_action_envelope
 from jarvis.events.models import EventInput
 from jarvis.ids import new_id
-from jarvis.memory.service import MemoryService
 
 SENSITIVE_KEYS = {
     "access_token",
@@ -56,29 +56,32 @@ def emit_event(conn: sqlite3.Connection, event: EventInput) -> str:
         payload_redacted_raw = json.dumps(redact_payload(payload))
 
     event_id = new_id("evt")
-    conn.execute(
-        """
-        INSERT INTO events(
-          id, trace_id, span_id, parent_span_id, thread_id,
-          event_type, component, actor_type, actor_id,
-          payload_json, payload_redacted_json, created_at
-        ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
+    created_at = now_iso()
+    statements: list[Statement] = [
         (
-            event_id,
-            event.trace_id,
-            event.span_id,
-            event.parent_span_id,
-            event.thread_id,
-            event.event_type,
-            event.component,
-            event.actor_type,
-            event.actor_id,
-            payload_raw,
-            payload_redacted_raw,
-            now_iso(),
-        ),
-    )
+            """
+            INSERT INTO events(
+              id, trace_id, span_id, parent_span_id, thread_id,
+              event_type, component, actor_type, actor_id,
+              payload_json, payload_redacted_json, created_at
+            ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            (
+                event_id,
+                event.trace_id,
+                event.span_id,
+                event.parent_span_id,
+                event.thread_id,
+                event.event_type,
+                event.component,
+                event.actor_type,
+                event.actor_id,
+                payload_raw,
+                payload_redacted_raw,
+                created_at,
+            ),
+        )
+    ]
 
     try:
         redacted_payload = json.loads(payload_redacted_raw)
@@ -86,22 +89,28 @@ def emit_event(conn: sqlite3.Connection, event: EventInput) -> str:
         redacted_payload = {}
     text_value = redacted_payload.get("text")
     if isinstance(text_value, str):
-        conn.execute(
+        statements.append(
             (
                 "INSERT OR REPLACE INTO event_text("
                 "event_id, thread_id, redacted_text, created_at"
-                ") VALUES(?,?,?,?)"
-            ),
-            (event_id, event.thread_id, text_value, now_iso()),
+                ") VALUES(?,?,?,?)",
+                (event_id, event.thread_id, text_value, created_at),
+            )
         )
-        conn.execute(
+        statements.append(
             (
-                "INSERT INTO event_fts(event_id, thread_id, redacted_text) "
-                "VALUES(?,?,?)"
-            ),
-            (event_id, event.thread_id, text_value),
+                "INSERT INTO event_fts(event_id, thread_id, redacted_text) VALUES(?,?,?)",
+                (event_id, event.thread_id, text_value),
+            )
+        )
+        # Embedding happens off the request path in tasks.memory.index_event_vectors.
+        statements.append(
+            (
+                "INSERT OR IGNORE INTO pending_event_vectors(event_id, thread_id, created_at) "
+                "VALUES(?,?,?)",
+                (event_id, event.thread_id, created_at),
+            )
         )
-        memory = MemoryService()
-        vector = memory.embed_text(text_value)
-        memory.upsert_event_vector(conn, event_id, event.thread_id, vector)
+    # Committed by the write-behind writer; readers of the trace call flush_writes().
+    write_behind(conn, statements)
     return event_id
@@ -25,10 +25,13 @@ from jarvis.channels.whatsapp.adapter import WhatsAppAdapter
 from jarvis.channels.whatsapp.baileys_client import BaileysClient
 from jarvis.channels.whatsapp.router import router as whatsapp_router
 from jarvis.config import get_settings, validate_settings_for_env
-from jarvis.db.connection import get_conn
+from jarvis.db.connection import get_conn, reset_connection_pool
 from jarvis.db.migrations.runner import run_migrations
+from jarvis.db.write_queue import reset_write_queue
 from jarvis.db.queries import ensure_root_user, ensure_system_state, upsert_whatsapp_instance
 from jarvis.logging import configure_logging
+from jarvis.memory.ann import ann_enabled, save_ann_indexes
+from jarvis.memory.embedder_runtime import get_embedder_runtime
 from jarvis.memory.service import MemoryService
 from jarvis.repo_index import write_repo_index
 from jarvis.routes.api import router as api_router
@@ -106,17 +109,25 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
             )
         if bundles:
             sync_tool_permissions(conn, bundles)
-        MemoryService().ensure_vector_indexes(conn)
+        vec_ready = MemoryService().ensure_vector_indexes(conn)
     poller_task, poller_stop = start_notification_poller()
     task_runner = get_task_runner()
     periodic = get_periodic_scheduler()
     periodic_task = asyncio.create_task(periodic.run())
+    if vec_ready:
+        task_runner.send_task("jarvis.tasks.memory.backfill_vector_indexes")
+    if ann_enabled():
+        task_runner.send_task("jarvis.tasks.memory.refresh_ann_indexes")
     yield
     poller_stop.set()
     await poller_task
     await periodic.shutdown()
     await periodic_task
     await task_runner.shutdown(timeout_s=float(settings.task_runner_shutdown_timeout_seconds))
+    get_embedder_runtime().close()
+    save_ann_indexes()
+    reset_write_queue()
+    reset_connection_pool()
 
 
 limiter = Limiter(key_func=get_remote_address)
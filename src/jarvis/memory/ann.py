@@ -0,0 +1,543 @@
+"""Built-in approximate nearest-neighbour index used when sqlite-vec is unavailable.
+
+Each index (``memory``, ``event``, ``state``) is an inverted-file (IVF) index over
+row-normalized float32 vectors: k-means centroids partition the rows and a query
+scores only the rows in its ``nprobe`` nearest lists. Every row carries a tag
+(the thread id) so searches can be filtered; small tags are scanned exactly, which
+keeps per-thread recall at 100% for typical thread sizes.
+
+Indexes live in memory, receive incremental upserts from the write paths, are
+rebuilt (re-clustered and compacted) by ``jarvis.tasks.memory.refresh_ann_indexes``
+and persisted to an ``.npz`` sidecar next to ``APP_DB``. Each sidecar records the
+high-water mark (row count, max rowid) of its source table; when the database has
+moved on since the save, :func:`get_ann_index` adds the appended rows, or drops the
+sidecar for a full rebuild when rows were deleted or replaced. NumPy is required;
+without it :func:`get_ann_index` returns None and callers keep using brute-force
+search.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from jarvis.config import get_settings
+from jarvis.db.connection import get_read_conn
+from jarvis.memory.vectors import load_vector
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is not installed
+    np = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+ANN_INDEX_NAMES = ("memory", "event", "state")
+# Source table of each index and the query yielding its (key, tag) rows. State keys
+# are ``{thread_id}:{uid}``, matching ``StateStore._ann_key``.
+_ANN_SOURCES = {
+    "memory": (
+        "memory_embeddings",
+        "SELECT me.memory_id AS key, mi.thread_id AS tag, me.vector_json, me.vector_blob "
+        "FROM memory_embeddings me JOIN memory_items mi ON mi.id=me.memory_id "
+        "WHERE me.rowid>?",
+    ),
+    "event": (
+        "event_vec",
+        "SELECT id AS key, thread_id AS tag, vector_json, vector_blob FROM event_vec "
+        "WHERE rowid>?",
+    ),
+    "state": (
+        "state_item_embeddings",
+        "SELECT thread_id || ':' || uid AS key, thread_id AS tag, vector_json, vector_blob "
+        "FROM state_item_embeddings WHERE rowid>?",
+    ),
+}
+_KMEANS_ITERATIONS = 8
+_ASSIGN_CHUNK = 4096
+
+
+class IVFIndex:
+    def __init__(
+        self,
+        dims: int,
+        model: str,
+        *,
+        nprobe: int = 8,
+        min_train_size: int = 2048,
+        exact_tag_limit: int = 2048,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for the ANN index")
+        self.dims = int(dims)
+        self.model = model
+        self.nprobe = max(1, int(nprobe))
+        self.min_train_size = max(1, int(min_train_size))
+        self.exact_tag_limit = max(0, int(exact_tag_limit))
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, self.dims), dtype=np.float32)
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._tags = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._tag_codes: dict[str, int] = {}
+        self._tag_counts: dict[int, int] = {}
+        self._centroids = np.zeros((0, self.dims), dtype=np.float32)
+        self._trained_size = 0
+        self._journal: list[tuple[str, str, Any, str | None]] | None = None
+        self.high_water: tuple[int, int] | None = None
+        self.ready = False
+        self.dirty = False
+
+    def add(self, key: str, vector: Sequence[float], tag: str | None = None) -> None:
+        if len(vector) != self.dims:
+            return
+        row_vec = self._normalize(np.asarray(vector, dtype=np.float32))
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("add", key, row_vec, tag))
+            self._add_locked(key, row_vec, tag)
+
+    def remove(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                if self._journal is not None:
+                    self._journal.append(("remove", key, None, None))
+                self._remove_locked(key)
+
+    def rebuild(self, entries: Iterable[tuple[str, str | None, Sequence[float]]]) -> None:
+        """Re-cluster from ``entries``; upserts made while this runs are replayed."""
+        with self._lock:
+            self._journal = []
+        try:
+            fresh = IVFIndex(
+                self.dims,
+                self.model,
+                nprobe=self.nprobe,
+                min_train_size=self.min_train_size,
+                exact_tag_limit=self.exact_tag_limit,
+            )
+            for key, tag, vector in entries:
+                if len(vector) == self.dims:
+                    fresh._add_locked(
+                        key, self._normalize(np.asarray(vector, dtype=np.float32)), tag
+                    )
+            fresh._train()
+            with self._lock:
+                for op, key, row_vec, tag in self._journal or []:
+                    if op == "add":
+                        fresh._add_locked(key, row_vec, tag)
+                    else:
+                        fresh._remove_locked(key)
+                self._adopt(fresh)
+                self.ready = True
+                self.dirty = True
+        finally:
+            with self._lock:
+                self._journal = None
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        *,
+        tag: str | None = None,
+        exact: bool = False,
+    ) -> list[tuple[str, float]]:
+        """Return ``(key, cosine)`` pairs for the best ``k`` live rows, best first."""
+        limit = max(0, int(k))
+        if limit == 0 or len(query) != self.dims:
+            return []
+        unit = self._normalize(np.asarray(query, dtype=np.float32))
+        with self._lock:
+            size = self._size
+            if size == 0:
+                return []
+            mask = self._alive[:size].copy()
+            scan_all = exact or len(self._centroids) == 0
+            if tag is not None:
+                code = self._tag_codes.get(tag)
+                if code is None:
+                    return []
+                mask &= self._tags[:size] == code
+                scan_all = scan_all or self._tag_counts.get(code, 0) <= self.exact_tag_limit
+            if not scan_all:
+                probes = self._nearest_centroids(unit, self.nprobe)
+                assign = self._assign[:size]
+                mask &= np.isin(assign, probes) | (assign < 0)
+            candidates = np.nonzero(mask)[0]
+            if candidates.size == 0:
+                return []
+            if candidates.size * 2 > size:
+                # Dense candidate sets: one contiguous GEMV beats gathering rows first.
+                scores = (self._vectors[:size] @ unit)[candidates]
+            else:
+                scores = self._vectors[candidates] @ unit
+            keys = self._keys
+        take = min(limit, int(candidates.size))
+        if take < candidates.size:
+            top = np.argpartition(-scores, take - 1)[:take]
+        else:
+            top = np.arange(candidates.size)
+        ordered = top[np.argsort(-scores[top], kind="stable")]
+        return [(keys[int(candidates[idx])], float(scores[idx])) for idx in ordered]
+
+    def benchmark(self, queries: Sequence[Sequence[float]], k: int) -> dict[str, float]:
+        """Compare ANN search against an exact scan: recall@k and mean latencies."""
+        hits = 0
+        expected = 0
+        ann_ms = 0.0
+        exact_ms = 0.0
+        for query in queries:
+            started = time.perf_counter()
+            truth = {key for key, _ in self.search(query, k, exact=True)}
+            exact_ms += (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            found = {key for key, _ in self.search(query, k)}
+            ann_ms += (time.perf_counter() - started) * 1000
+            hits += len(truth & found)
+            expected += len(truth)
+        runs = max(1, len(queries))
+        return {
+            "recall_at_k": round(hits / expected, 4) if expected else 1.0,
+            "ann_avg_ms": round(ann_ms / runs, 3),
+            "exact_avg_ms": round(exact_ms / runs, 3),
+        }
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def needs_rebuild(self) -> bool:
+        with self._lock:
+            if not self.ready:
+                return True
+            live = len(self._rows)
+            dead = self._size - live
+            if dead > max(64, live // 4):
+                return True
+            if not len(self._centroids):
+                return live >= self.min_train_size
+            return live > 2 * max(1, self._trained_size)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "rows": len(self._rows),
+                "tombstones": self._size - len(self._rows),
+                "lists": len(self._centroids),
+                "ready": int(self.ready),
+            }
+
+    def save(self, path: Path, *, high_water: tuple[int, int] | None = None) -> None:
+        """Write the sidecar; ``high_water`` is the source table mark it reflects."""
+        with self._lock:
+            size = self._size
+            meta = {
+                "dims": self.dims,
+                "model": self.model,
+                "keys": self._keys[:size],
+                "tags": sorted(self._tag_codes, key=self._tag_codes.__getitem__),
+                "trained_size": self._trained_size,
+                "high_water": list(high_water) if high_water is not None else None,
+            }
+            self.high_water = high_water
+            vectors = self._vectors[:size].copy()
+            assign = self._assign[:size].copy()
+            row_tags = self._tags[:size].copy()
+            alive = self._alive[:size].copy()
+            centroids = self._centroids.copy()
+            self.dirty = False
+        encoded = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as handle:
+            np.savez(
+                handle,
+                meta=encoded,
+                vectors=vectors,
+                assign=assign,
+                row_tags=row_tags,
+                alive=alive,
+                centroids=centroids,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, *, dims: int, model: str, **options: int) -> IVFIndex | None:
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(bytes(data["meta"]).decode("utf-8"))
+                if int(meta["dims"]) != dims or meta["model"] != model:
+                    return None
+                index = cls(dims, model, **options)
+                vectors = data["vectors"].astype(np.float32, copy=False)
+                index._vectors = vectors.copy()
+                index._assign = data["assign"].astype(np.int32)
+                index._tags = data["row_tags"].astype(np.int32)
+                index._alive = data["alive"].astype(bool)
+                index._centroids = data["centroids"].astype(np.float32)
+        except (OSError, ValueError, KeyError):
+            logger.debug("ANN sidecar %s unreadable; will rebuild", path, exc_info=True)
+            return None
+        keys = [str(key) for key in meta["keys"]]
+        if len(keys) != len(index._vectors):
+            return None
+        index._size = len(keys)
+        index._keys = keys
+        index._tag_codes = {str(tag): code for code, tag in enumerate(meta["tags"])}
+        for row, key in enumerate(keys):
+            if index._alive[row]:
+                index._rows[key] = row
+                code = int(index._tags[row])
+                index._tag_counts[code] = index._tag_counts.get(code, 0) + 1
+        index._trained_size = int(meta.get("trained_size", 0))
+        mark = meta.get("high_water")
+        if isinstance(mark, list) and len(mark) == 2:
+            index.high_water = (int(mark[0]), int(mark[1]))
+        index.ready = True
+        return index
+
+    @staticmethod
+    def _normalize(vector: Any) -> Any:
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _add_locked(self, key: str, row_vec: Any, tag: str | None) -> None:
+        code = self._tag_code(tag)
+        assign = self._nearest_centroids(row_vec, 1)[0] if len(self._centroids) else -1
+        row = self._rows.get(key)
+        if row is None:
+            row = self._append_row()
+            self._keys.append(key)
+            self._rows[key] = row
+        else:
+            old = int(self._tags[row])
+            self._tag_counts[old] = self._tag_counts.get(old, 1) - 1
+        self._vectors[row] = row_vec
+        self._assign[row] = assign
+        self._tags[row] = code
+        self._alive[row] = True
+        self._tag_counts[code] = self._tag_counts.get(code, 0) + 1
+        self.dirty = True
+
+    def _remove_locked(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        code = int(self._tags[row])
+        self._tag_counts[code] = self._tag_counts.get(code, 1) - 1
+        self.dirty = True
+
+    def _append_row(self) -> int:
+        if self._size == len(self._vectors):
+            capacity = max(64, self._size * 2)
+            self._vectors = self._grow(self._vectors, (capacity, self.dims))
+            self._assign = self._grow(self._assign, (capacity,))
+            self._tags = self._grow(self._tags, (capacity,))
+            self._alive = self._grow(self._alive, (capacity,))
+        row = self._size
+        self._size += 1
+        return row
+
+    def _grow(self, array: Any, shape: tuple[int, ...]) -> Any:
+        grown = np.zeros(shape, dtype=array.dtype)
+        grown[: self._size] = array[: self._size]
+        return grown
+
+    def _tag_code(self, tag: str | None) -> int:
+        name = tag or ""
+        code = self._tag_codes.get(name)
+        if code is None:
+            code = len(self._tag_codes)
+            self._tag_codes[name] = code
+        return code
+
+    def _nearest_centroids(self, unit: Any, count: int) -> Any:
+        scores = self._centroids @ unit
+        take = min(count, len(scores))
+        if take < len(scores):
+            return np.argpartition(-scores, take - 1)[:take]
+        return np.arange(len(scores))
+
+    def _train(self) -> None:
+        live = np.nonzero(self._alive[: self._size])[0]
+        self._trained_size = int(live.size)
+        if live.size < self.min_train_size:
+            self._centroids = np.zeros((0, self.dims), dtype=np.float32)
+            self._assign[: self._size] = -1
+            return
+        data = self._vectors[live]
+        nlist = max(1, min(4096, int(np.sqrt(live.size))))
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(live.size, size=nlist, replace=False)].copy()
+        labels = np.zeros(live.size, dtype=np.int32)
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = self._assign_rows(data, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            counts = np.bincount(labels, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids /= norms
+        self._centroids = centroids.astype(np.float32)
+        self._assign[: self._size] = -1
+        self._assign[live] = self._assign_rows(data, self._centroids)
+
+    @staticmethod
+    def _assign_rows(data: Any, centroids: Any) -> Any:
+        labels = np.empty(len(data), dtype=np.int32)
+        for start in range(0, len(data), _ASSIGN_CHUNK):
+            block = data[start : start + _ASSIGN_CHUNK] @ centroids.T
+            labels[start : start + _ASSIGN_CHUNK] = np.argmax(block, axis=1)
+        return labels
+
+    def _adopt(self, other: IVFIndex) -> None:
+        self._vectors = other._vectors
+        self._assign = other._assign
+        self._tags = other._tags
+        self._alive = other._alive
+        self._size = other._size
+        self._keys = other._keys
+        self._rows = other._rows
+        self._tag_codes = other._tag_codes
+        self._tag_counts = other._tag_counts
+        self._centroids = other._centroids
+        self._trained_size = other._trained_size
+
+
+_indexes: dict[tuple[str, str], IVFIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def sidecar_path(db_path: str, name: str) -> Path:
+    return Path(f"{db_path}.{name}.ann.npz")
+
+
+def ann_enabled() -> bool:
+    return np is not None and int(get_settings().memory_ann_enabled) == 1
+
+
+def ann_entries(
+    conn: sqlite3.Connection, name: str, *, after_rowid: int = 0
+) -> Iterator[tuple[str, str | None, Sequence[float]]]:
+    """Yield ``(key, thread_id, vector)`` source rows of index ``name`` past ``after_rowid``."""
+    settings = get_settings()
+    for row in conn.execute(_ANN_SOURCES[name][1], (after_rowid,)):
+        vector, _ = load_vector(
+            row["vector_blob"],
+            row["vector_json"],
+            dims=settings.memory_embed_dims,
+            model=settings.ollama_embed_model,
+        )
+        if vector:
+            tag = str(row["tag"]) if row["tag"] is not None else None
+            yield str(row["key"]), tag, vector
+
+
+def ann_high_water(conn: sqlite3.Connection, name: str) -> tuple[int, int] | None:
+    """``(row count, max rowid)`` of the source table of ``name``; None without rowids."""
+    if getattr(conn, "dialect", "sqlite") != "sqlite":
+        return None
+    row = conn.execute(
+        f"SELECT COUNT(*), COALESCE(MAX(rowid), 0) FROM {_ANN_SOURCES[name][0]}"
+    ).fetchone()
+    return int(row[0]), int(row[1])
+
+
+def _catch_up(index: IVFIndex, name: str) -> IVFIndex | None:
+    """Bring a loaded sidecar up to the database; None when it needs a full rebuild."""
+    with get_read_conn() as conn:
+        current = ann_high_water(conn, name)
+        saved = index.high_water
+        if current is None or saved is None or current[1] < saved[1]:
+            return None
+        if current == saved:
+            return index
+        appended = conn.execute(
+            f"SELECT COUNT(*) FROM {_ANN_SOURCES[name][0]} WHERE rowid>?", (saved[1],)
+        ).fetchone()
+        if saved[0] + int(appended[0]) != current[0]:
+            # Rows at or below the mark were deleted or replaced since the save.
+            return None
+        for key, tag, vector in ann_entries(conn, name, after_rowid=saved[1]):
+            index.add(key, vector, tag=tag)
+    index.high_water = current
+    index.dirty = True
+    return index
+
+
+def get_ann_index(name: str) -> IVFIndex | None:
+    """Return the process-wide index ``name`` for the current database, or None."""
+    if not ann_enabled():
+        return None
+    settings = get_settings()
+    key = (settings.app_db, name)
+    with _indexes_lock:
+        index = _indexes.get(key)
+    if index is not None:
+        return index
+    options = {
+        "nprobe": int(settings.memory_ann_nprobe),
+        "min_train_size": int(settings.memory_ann_min_train_size),
+    }
+    dims = max(1, int(settings.memory_embed_dims))
+    path = sidecar_path(settings.app_db, name)
+    loaded = (
+        IVFIndex.load(path, dims=dims, model=settings.ollama_embed_model, **options)
+        if path.exists()
+        else None
+    )
+    if loaded is not None:
+        loaded = _catch_up(loaded, name)
+        if loaded is None:
+            logger.info("ANN sidecar %s is behind the database; will rebuild", path)
+    # Loaded outside the lock (the catch-up reads the database); first one in wins.
+    with _indexes_lock:
+        return _indexes.setdefault(
+            key, loaded or IVFIndex(dims, settings.ollama_embed_model, **options)
+        )
+
+
+def discard_ann_keys(name: str, keys: Iterable[str]) -> None:
+    index = get_ann_index(name)
+    if index is not None:
+        index.remove(keys)
+
+
+def save_ann_indexes() -> None:
+    with _indexes_lock:
+        items = list(_indexes.items())
+    app_db = get_settings().app_db
+    for (db_path, name), index in items:
+        if index.ready and index.dirty:
+            high_water = None
+            if db_path == app_db:
+                with get_read_conn() as conn:
+                    high_water = ann_high_water(conn, name)
+            try:
+                index.save(sidecar_path(db_path, name), high_water=high_water)
+            except OSError:
+                logger.warning("failed to persist ANN index %s", name, exc_info=True)
+
+
+def reset_ann_indexes(db_path: str | None = None, *, delete_files: bool = False) -> None:
+    """Forget loaded indexes (all, or those of ``db_path``), optionally removing sidecars."""
+    with _indexes_lock:
+        for key in list(_indexes):
+            if db_path is None or key[0] == db_path:
+                del _indexes[key]
+        if delete_files and db_path is not None:
+            for name in ANN_INDEX_NAMES:
+                sidecar_path(db_path, name).unlink(missing_ok=True)
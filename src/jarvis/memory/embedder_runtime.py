@@ -0,0 +1,131 @@
+"""Process-wide embedding backends shared by every ``MemoryService`` instance.
+
+Holds one keep-alive ``httpx.Client`` for Ollama, the lazily loaded
+sentence-transformers model, and per-backend health and latency counters. A
+backend that fails at the transport level is skipped until
+``MEMORY_EMBED_RETRY_SECONDS`` have passed, so an Ollama outage costs one failed
+connect per window instead of one per embedding.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from jarvis.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("ollama", "sentence_transformers", "deterministic")
+
+
+@dataclass
+class BackendStats:
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    last_ms: float = 0.0
+    down_until: float = 0.0
+
+
+class EmbedderRuntime:
+    def __init__(self, retry_seconds: float) -> None:
+        self.retry_seconds = max(0.0, float(retry_seconds))
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._model: Any | None = None
+        self._model_name = ""
+        self._model_failed = False
+        self._stats = {name: BackendStats() for name in BACKENDS}
+
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=8,
+                    limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+                )
+            return self._client
+
+    def sentence_model(self, name: str) -> Any | None:
+        """Return the resident sentence-transformers model, loading it on first use."""
+        with self._model_lock:
+            if self._model is not None and self._model_name == name:
+                return self._model
+            if self._model_failed and self._model_name == name:
+                return None
+            self._model_name = name
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                self._model = SentenceTransformer(name)
+                self._model_failed = False
+            except Exception:
+                logger.debug("sentence-transformers model %s unavailable", name, exc_info=True)
+                self._model = None
+                self._model_failed = True
+            return self._model
+
+    def available(self, backend: str) -> bool:
+        with self._lock:
+            return self._stats[backend].down_until <= time.monotonic()
+
+    def record_success(self, backend: str, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._stats[backend]
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.last_ms = elapsed_ms
+            stats.down_until = 0.0
+
+    def record_failure(self, backend: str, *, mark_down: bool = False) -> None:
+        with self._lock:
+            stats = self._stats[backend]
+            stats.errors += 1
+            if mark_down:
+                stats.down_until = time.monotonic() + self.retry_seconds
+
+    def stats(self) -> dict[str, float | int]:
+        now = time.monotonic()
+        out: dict[str, float | int] = {}
+        with self._lock:
+            for name, stats in self._stats.items():
+                prefix = f"embedder_{name}"
+                out[f"{prefix}_calls"] = stats.calls
+                out[f"{prefix}_errors"] = stats.errors
+                out[f"{prefix}_avg_ms"] = (
+                    round(stats.total_ms / stats.calls, 3) if stats.calls else 0.0
+                )
+                out[f"{prefix}_last_ms"] = round(stats.last_ms, 3)
+                out[f"{prefix}_healthy"] = int(stats.down_until <= now)
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+_embedder_runtime: EmbedderRuntime | None = None
+
+
+def get_embedder_runtime() -> EmbedderRuntime:
+    global _embedder_runtime
+    if _embedder_runtime is None:
+        _embedder_runtime = EmbedderRuntime(get_settings().memory_embed_retry_seconds)
+    return _embedder_runtime
+
+
+def reset_embedder_runtime() -> None:
+    global _embedder_runtime
+    if _embedder_runtime is not None:
+        _embedder_runtime.close()
+    _embedder_runtime = None
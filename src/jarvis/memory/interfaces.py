@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Sequence
 from typing import Any, Protocol
 
 
 class IEmbedder(Protocol):
     def embed_text(self, text: str) -> list[float]: ...
 
+    def embed_batch(self, texts: Sequence[str]) -> list[list[float]]: ...
+
 
 class IMemoryPolicy(Protocol):
     def apply(
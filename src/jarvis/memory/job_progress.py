@@ -0,0 +1,89 @@
+"""Progress counters for the batched memory maintenance jobs.
+
+``jarvis.tasks.memory`` archives, prunes, dedupes and re-tiers rows in bounded
+batches, each committed in its own short write transaction. Every job reports
+its runs, committed batches and affected rows here; ``/metrics`` exposes them as
+``memory_job_<job>_*`` so a long backlog shows up as moving numbers rather than
+one opaque lock-holding call.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class JobCounters:
+    runs: int = 0
+    batches: int = 0
+    rows: int = 0
+    running: int = 0
+    last_batches: int = 0
+    last_rows: int = 0
+    last_duration_ms: float = 0.0
+    max_batch_ms: float = 0.0
+
+
+class JobProgress:
+    def __init__(self) -> None:
+        self._jobs: dict[str, JobCounters] = {}
+        self._started: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def start(self, job: str) -> None:
+        with self._lock:
+            counters = self._jobs.setdefault(job, JobCounters())
+            counters.running = 1
+            counters.last_batches = 0
+            counters.last_rows = 0
+            self._started[job] = time.perf_counter()
+
+    def batch(self, job: str, rows: int, elapsed_ms: float) -> None:
+        with self._lock:
+            counters = self._jobs.setdefault(job, JobCounters())
+            counters.batches += 1
+            counters.last_batches += 1
+            counters.rows += rows
+            counters.last_rows += rows
+            counters.max_batch_ms = max(counters.max_batch_ms, elapsed_ms)
+
+    def finish(self, job: str) -> None:
+        with self._lock:
+            counters = self._jobs.setdefault(job, JobCounters())
+            started = self._started.pop(job, None)
+            counters.runs += 1
+            counters.running = 0
+            if started is not None:
+                counters.last_duration_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            out: dict[str, float | int] = {}
+            for job, counters in sorted(self._jobs.items()):
+                prefix = f"memory_job_{job}"
+                out[f"{prefix}_runs"] = counters.runs
+                out[f"{prefix}_batches"] = counters.batches
+                out[f"{prefix}_rows"] = counters.rows
+                out[f"{prefix}_running"] = counters.running
+                out[f"{prefix}_last_batches"] = counters.last_batches
+                out[f"{prefix}_last_rows"] = counters.last_rows
+                out[f"{prefix}_last_duration_ms"] = counters.last_duration_ms
+                out[f"{prefix}_max_batch_ms"] = round(counters.max_batch_ms, 3)
+            return out
+
+
+_job_progress: JobProgress | None = None
+
+
+def get_memory_job_progress() -> JobProgress:
+    global _job_progress
+    if _job_progress is None:
+        _job_progress = JobProgress()
+    return _job_progress
+
+
+def reset_memory_job_progress() -> None:
+    global _job_progress
+    _job_progress = None
@@ -8,6 +8,7 @@ import sqlite3
 from datetime import UTC, datetime
 
 from jarvis.config import get_settings
+from jarvis.db.write_queue import write_behind
 from jarvis.ids import new_id
 
 _EMAIL_RE = re.compile(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", re.IGNORECASE)
@@ -50,27 +51,32 @@ def _emit_policy_event(
     payload: dict[str, object],
 ) -> None:
     encoded = json.dumps(payload, sort_keys=True)
-    conn.execute(
-        (
-            "INSERT INTO events("
-            "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
-            "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
-            ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
-        ),
-        (
-            new_id("evt"),
-            new_id("trc"),
-            new_id("spn"),
-            None,
-            thread_id,
-            event_type,
-            "memory.policy",
-            "agent",
-            actor_id,
-            encoded,
-            encoded,
-            _now_iso(),
-        ),
+    write_behind(
+        conn,
+        [
+            (
+                (
+                    "INSERT INTO events("
+                    "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
+                    "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
+                    ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
+                ),
+                (
+                    new_id("evt"),
+                    new_id("trc"),
+                    new_id("spn"),
+                    None,
+                    thread_id,
+                    event_type,
+                    "memory.policy",
+                    "agent",
+                    actor_id,
+                    encoded,
+                    encoded,
+                    _now_iso(),
+                ),
+            )
+        ],
     )
 
 
@@ -93,24 +99,29 @@ def record_memory_governance_decision(
     if extra:
         payload.update(extra)
     try:
-        conn.execute(
-            (
-                "INSERT INTO memory_governance_audit("
-                "id, thread_id, actor_id, decision, reason, target_kind, target_id, "
-                "payload_redacted_json, created_at"
-                ") VALUES(?,?,?,?,?,?,?,?,?)"
-            ),
-            (
-                new_id("evt"),
-                thread_id,
-                actor_id,
-                decision,
-                reason,
-                target_kind,
-                target_id,
-                json.dumps(payload, sort_keys=True),
-                _now_iso(),
-            ),
+        write_behind(
+            conn,
+            [
+                (
+                    (
+                        "INSERT INTO memory_governance_audit("
+                        "id, thread_id, actor_id, decision, reason, target_kind, target_id, "
+                        "payload_redacted_json, created_at"
+                        ") VALUES(?,?,?,?,?,?,?,?,?)"
+                    ),
+                    (
+                        new_id("evt"),
+                        thread_id,
+                        actor_id,
+                        decision,
+                        reason,
+                        target_kind,
+                        target_id,
+                        json.dumps(payload, sort_keys=True),
+                        _now_iso(),
+                    ),
+                )
+            ],
         )
     except sqlite3.OperationalError:
         # Table not present yet (pre-migration), avoid breaking runtime.
@@ -0,0 +1,103 @@
+"""In-process TTL + LRU cache of text embeddings.
+
+Retrieval entry points (``search``, ``search_events``, ``search_state``) and the
+persistent ``embedding_cache`` lookup all consult this cache first, so the same
+user message embedded for memory retrieval, event search and state search costs
+one embedding call per TTL window. Keys are ``(model, dims, normalized text)``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from jarvis.config import get_settings
+
+QueryKey = tuple[str, int, str]
+
+
+def normalize_query_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._entries: OrderedDict[QueryKey, tuple[float, tuple[float, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def key(model: str, dims: int, text: str) -> QueryKey:
+        return (model, int(dims), normalize_query_text(text))
+
+    def get(self, key: QueryKey) -> list[float] | None:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, vector = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(vector)
+
+    def put(self, key: QueryKey, vector: Sequence[float]) -> None:
+        if not self.enabled or not vector:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, tuple(vector))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "memory_query_cache_hits": self.hits,
+                "memory_query_cache_misses": self.misses,
+                "memory_query_cache_expirations": self.expirations,
+                "memory_query_cache_entries": len(self._entries),
+                "memory_query_cache_hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        settings = get_settings()
+        _query_embedding_cache = QueryEmbeddingCache(
+            settings.memory_query_cache_size,
+            settings.memory_query_cache_ttl_seconds,
+        )
+    return _query_embedding_cache
+
+
+def reset_query_embedding_cache() -> None:
+    global _query_embedding_cache
+    _query_embedding_cache = None
@@ -0,0 +1,123 @@
+"""Brute-force cosine scoring shared by the non-sqlite-vec search paths.
+
+Candidates are stacked into a row-normalized matrix so a query costs one
+matrix-vector product and an ``argpartition`` top-k. NumPy is optional; without it
+the same contract is served by a pure-Python loop.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Sequence
+from math import sqrt
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is not installed
+    np = None  # type: ignore[assignment]
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _normalize(vector: Sequence[float]) -> list[float]:
+    length = sqrt(sum(item * item for item in vector))
+    if length == 0:
+        return list(vector)
+    return [item / length for item in vector]
+
+
+class VectorMatrix:
+    """Row-normalized candidate matrix for one search call (or one cache entry)."""
+
+    def __init__(self, dims: int, matrix: Any, size: int) -> None:
+        self.dims = dims
+        self._matrix = matrix
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        if np is not None and isinstance(self._matrix, np.ndarray):
+            return int(self._matrix.nbytes)
+        return self._size * self.dims * 8
+
+    @classmethod
+    def build(cls, vectors: Sequence[Sequence[float]], dims: int) -> VectorMatrix:
+        """Stack ``vectors`` (all of length ``dims``) and normalize each row."""
+        if np is None:
+            return cls(dims, [_normalize(vector) for vector in vectors], len(vectors))
+        if not vectors:
+            return cls(dims, np.zeros((0, dims), dtype=np.float32), 0)
+        matrix = np.empty((len(vectors), dims), dtype=np.float32)
+        for idx, vector in enumerate(vectors):
+            if isinstance(vector, memoryview):
+                matrix[idx] = np.frombuffer(vector, dtype=np.float32)
+            else:
+                matrix[idx] = vector
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return cls(dims, matrix, len(vectors))
+
+    def appended(self, vectors: Sequence[Sequence[float]]) -> VectorMatrix:
+        """Return a new matrix with ``vectors`` normalized and added as trailing rows."""
+        extra = VectorMatrix.build(vectors, self.dims)
+        if np is None:
+            return VectorMatrix(self.dims, [*self._matrix, *extra._matrix], len(self) + len(extra))
+        return VectorMatrix(
+            self.dims, np.concatenate([self._matrix, extra._matrix]), len(self) + len(extra)
+        )
+
+    def subset(self, indices: Sequence[int]) -> VectorMatrix:
+        """Return a new matrix holding only the rows at ``indices`` (in that order)."""
+        if np is None:
+            return VectorMatrix(self.dims, [self._matrix[idx] for idx in indices], len(indices))
+        picked = self._matrix[np.asarray(indices, dtype=np.intp)]
+        return VectorMatrix(self.dims, picked.reshape(len(indices), self.dims), len(indices))
+
+    def scores(self, query: Sequence[float]) -> list[float]:
+        if self._size == 0:
+            return []
+        if np is None:
+            unit = _normalize(query)
+            return [
+                sum(left * right for left, right in zip(unit, row, strict=False))
+                for row in self._matrix
+            ]
+        return [float(score) for score in self._score_array(query)]
+
+    def top_k(self, query: Sequence[float], k: int) -> list[tuple[int, float]]:
+        """Return ``(row_index, cosine)`` pairs for the best ``k`` rows, best first."""
+        limit = min(max(0, int(k)), self._size)
+        if limit == 0:
+            return []
+        if np is None:
+            return heapq.nlargest(limit, enumerate(self.scores(query)), key=lambda item: item[1])
+        scores = self._score_array(query)
+        if limit < self._size:
+            candidates = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            candidates = np.arange(self._size)
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(idx), float(scores[idx])) for idx in ordered]
+
+    def _score_array(self, query: Sequence[float]) -> Any:
+        unit = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(unit))
+        if norm > 0:
+            unit = unit / norm
+        return self._matrix @ unit
+
+
+def top_k_cosine(
+    query: Sequence[float],
+    vectors: Sequence[Sequence[float]],
+    k: int,
+) -> list[tuple[int, float]]:
+    """One-shot helper: score ``vectors`` against ``query`` and keep the best ``k``."""
+    return VectorMatrix.build(vectors, len(query)).top_k(query, k)
@@ -3,6 +3,9 @@
 import json
 import logging
 import sqlite3
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from hashlib import sha256
 from math import sqrt
@@ -12,10 +15,18 @@ from typing import Any
 import httpx
 
 from jarvis.config import get_settings
+from jarvis.db.write_queue import write_behind
 from jarvis.ids import new_id
+from jarvis.memory.ann import get_ann_index
+from jarvis.memory.embedder_runtime import get_embedder_runtime
 from jarvis.memory.policy import apply_memory_policy, record_memory_governance_decision
+from jarvis.memory.query_cache import get_query_embedding_cache
 from jarvis.memory.scope import can_agent_access_thread_memory, is_known_agent, normalize_agent_id
+from jarvis.memory.scoring import VectorMatrix, top_k_cosine
 from jarvis.memory.state_store import StateStore
+from jarvis.memory.vec_runtime import get_vec_runtime
+from jarvis.memory.vector_cache import ThreadVectors, get_thread_vector_cache
+from jarvis.memory.vectors import decode_rows, load_vector, pack_raw, pack_vector
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +37,7 @@ class MemoryService:
     EVENT_VEC_INDEX_TABLE = "event_vec_index"
     EVENT_VEC_INDEX_MAP_TABLE = "event_vec_index_map"
     BACKFILL_BATCH_SIZE = 200
+    EMBED_CACHE_LOOKUP_CHUNK = 500
     DEFAULT_CHUNK_SIZE = 8192
     _MESSAGE_LINKED_SOURCES = frozenset({"agent.step.end", "command.executed", "onboarding.step"})
 
@@ -56,27 +68,32 @@ class MemoryService:
     ) -> None:
         event_trace = trace_id or new_id("trc")
         serialized = json.dumps(payload, sort_keys=True)
-        conn.execute(
-            (
-                "INSERT INTO events("
-                "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
-                "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
-                ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
-            ),
-            (
-                new_id("evt"),
-                event_trace,
-                new_id("spn"),
-                None,
-                thread_id,
-                event_type,
-                "memory",
-                "system",
-                "memory",
-                serialized,
-                serialized,
-                datetime.now(UTC).isoformat(),
-            ),
+        write_behind(
+            conn,
+            [
+                (
+                    (
+                        "INSERT INTO events("
+                        "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
+                        "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
+                        ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
+                    ),
+                    (
+                        new_id("evt"),
+                        event_trace,
+                        new_id("spn"),
+                        None,
+                        thread_id,
+                        event_type,
+                        "memory",
+                        "system",
+                        "memory",
+                        serialized,
+                        serialized,
+                        datetime.now(UTC).isoformat(),
+                    ),
+                )
+            ],
         )
 
     def ensure_vector_indexes(self, conn: sqlite3.Connection) -> bool:
@@ -87,7 +104,7 @@ class MemoryService:
         tokens = [token.strip() for token in text.replace('"', " ").split() if token.strip()]
         if not tokens:
             return ""
-        return " OR ".join(tokens[:8])
+        return " OR ".join(f'"{token}"' for token in tokens[:8])
 
     def write(
         self,
@@ -136,38 +153,59 @@ class MemoryService:
         )
         memory_id = new_id("mem")
         metadata_json = json.dumps(metadata or {})
+        chunk_group_id, chunk_index = self._chunk_columns(metadata or {})
         conn.execute(
             (
                 "INSERT INTO memory_items("
-                "id, thread_id, text, metadata_json, created_at"
-                ") VALUES(?,?,?,?,?)"
+                "id, thread_id, text, metadata_json, chunk_group_id, chunk_index, created_at"
+                ") VALUES(?,?,?,?,?,?,?)"
+            ),
+            (
+                memory_id,
+                thread_id,
+                governed_text,
+                metadata_json,
+                chunk_group_id,
+                chunk_index,
+                datetime.now(UTC).isoformat(),
             ),
-            (memory_id, thread_id, governed_text, metadata_json, datetime.now(UTC).isoformat()),
         )
         conn.execute(
             "INSERT INTO memory_fts(memory_id, thread_id, text) VALUES(?,?,?)",
             (memory_id, thread_id, governed_text),
         )
         vector = self._embed_text_cached(conn, governed_text)
-        vec_json = json.dumps(vector)
+        vec_blob = pack_vector(vector, settings.ollama_embed_model)
         conn.execute(
             (
                 "INSERT OR REPLACE INTO memory_embeddings("
-                "memory_id, model, vector_json, created_at"
-                ") VALUES(?,?,?,?)"
+                "memory_id, model, vector_json, vector_blob, created_at"
+                ") VALUES(?,?,'',?,?)"
             ),
             (
                 memory_id,
                 settings.ollama_embed_model,
-                vec_json,
+                vec_blob,
                 datetime.now(UTC).isoformat(),
             ),
         )
         conn.execute(
-            "INSERT OR REPLACE INTO memory_vec(memory_id, vector_json, created_at) VALUES(?,?,?)",
-            (memory_id, vec_json, datetime.now(UTC).isoformat()),
+            (
+                "INSERT OR REPLACE INTO memory_vec("
+                "memory_id, vector_json, vector_blob, created_at"
+                ") VALUES(?,'',?,?)"
+            ),
+            (memory_id, vec_blob, datetime.now(UTC).isoformat()),
+        )
+        self._upsert_memory_vec_index(conn, memory_id, vector, thread_id=thread_id)
+        get_thread_vector_cache().append(
+            settings.app_db,
+            thread_id,
+            memory_id=memory_id,
+            text=governed_text,
+            vector=vector,
+            model=settings.ollama_embed_model,
         )
-        self._upsert_memory_vec_index(conn, memory_id, vector)
         self._emit_memory_event(
             conn,
             "memory.write",
@@ -199,6 +237,8 @@ class MemoryService:
         chunk_total = len(pieces)
         memory_ids: list[str] = []
         base_metadata = dict(metadata or {})
+        # Warm embedding_cache in one batch so each chunk write below is a cache hit.
+        self._embed_texts_cached(conn, pieces)
         for chunk_idx, piece in enumerate(pieces):
             chunk_metadata: dict[str, object] = dict(base_metadata)
             chunk_metadata.update(
@@ -218,39 +258,109 @@ class MemoryService:
     def embed_text(self, text: str) -> list[float]:
         return self._embed_text(text)
 
+    def embed_batch(self, texts: Sequence[str]) -> list[list[float]]:
+        return self._embed_batch(list(texts))
+
     def _embed_text_cached(self, conn: sqlite3.Connection, text: str) -> list[float]:
+        return self._embed_texts_cached(conn, [text])[0]
+
+    def _embed_query(self, text: str) -> list[float]:
+        """Embed a retrieval query through the in-process query cache only."""
         settings = get_settings()
-        model = settings.ollama_embed_model
-        key = sha256(f"{model}\n{text.strip()}".encode()).hexdigest()
-        row = conn.execute(
-            "SELECT vector_json FROM embedding_cache WHERE hash=? LIMIT 1",
-            (key,),
-        ).fetchone()
-        if row is not None and isinstance(row["vector_json"], str):
-            try:
-                decoded = json.loads(str(row["vector_json"]))
-                if isinstance(decoded, list):
-                    vec = [float(item) for item in decoded if isinstance(item, int | float)]
-                    if vec:
-                        conn.execute(
-                            "UPDATE embedding_cache SET hit_count=hit_count+1 WHERE hash=?",
-                            (key,),
-                        )
-                        return self._fit_dims(vec, settings.memory_embed_dims)
-            except json.JSONDecodeError:
-                pass
-        vector = self._embed_text(text)
-        conn.execute(
-            (
-                "INSERT OR REPLACE INTO embedding_cache("
-                "hash, model, vector_json, created_at, hit_count"
-                ") "
-                "VALUES(?,?,?,?,COALESCE((SELECT hit_count FROM embedding_cache WHERE hash=?), 0))"
-            ),
-            (key, model, json.dumps(vector), datetime.now(UTC).isoformat(), key),
-        )
+        cache = get_query_embedding_cache()
+        key = cache.key(settings.ollama_embed_model, settings.memory_embed_dims, text)
+        vector = cache.get(key)
+        if vector is None:
+            vector = self._embed_text(text)
+            cache.put(key, vector)
         return vector
 
+    def _embed_texts_cached(
+        self, conn: sqlite3.Connection, texts: Sequence[str]
+    ) -> list[list[float]]:
+        """Resolve ``texts`` through the query cache, then ``embedding_cache``."""
+        if not texts:
+            return []
+        settings = get_settings()
+        cache = get_query_embedding_cache()
+        keys = [
+            cache.key(settings.ollama_embed_model, settings.memory_embed_dims, text)
+            for text in texts
+        ]
+        vectors: list[list[float] | None] = [cache.get(key) for key in keys]
+        missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+        if missing:
+            stored = self._embed_texts_persistent(conn, [texts[idx] for idx in missing])
+            for idx, vector in zip(missing, stored, strict=True):
+                vectors[idx] = vector
+                cache.put(keys[idx], vector)
+        return [vector or [] for vector in vectors]
+
+    def _embed_texts_persistent(
+        self, conn: sqlite3.Connection, texts: Sequence[str]
+    ) -> list[list[float]]:
+        """Resolve ``texts`` through ``embedding_cache`` with one lookup and one fill."""
+        if not texts:
+            return []
+        settings = get_settings()
+        model = settings.ollama_embed_model
+        keys = [sha256(f"{model}\n{text.strip()}".encode()).hexdigest() for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        rows: list[sqlite3.Row] = []
+        for start in range(0, len(unique_keys), self.EMBED_CACHE_LOOKUP_CHUNK):
+            chunk = unique_keys[start : start + self.EMBED_CACHE_LOOKUP_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            rows.extend(
+                conn.execute(
+                    "SELECT hash, vector_json, vector_blob FROM embedding_cache "
+                    f"WHERE hash IN ({placeholders})",
+                    tuple(chunk),
+                ).fetchall()
+            )
+        found: dict[str, list[float]] = {}
+        upgraded: list[tuple[bytes, str]] = []
+        for row in rows:
+            key = str(row["hash"])
+            vec, is_legacy = load_vector(row["vector_blob"], row["vector_json"], model=model)
+            if not vec:
+                continue
+            if is_legacy:
+                upgraded.append((pack_vector(vec, model), key))
+            found[key] = self._fit_dims(vec, settings.memory_embed_dims)
+        if found:
+            conn.executemany(
+                "UPDATE embedding_cache SET hit_count=hit_count+1 WHERE hash=?",
+                [(key,) for key in found],
+            )
+        if upgraded:
+            conn.executemany(
+                "UPDATE embedding_cache SET vector_json='', vector_blob=? WHERE hash=?",
+                upgraded,
+            )
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            now = datetime.now(UTC).isoformat()
+            vectors = self._embed_batch(list(missing.values()))
+            fresh = dict(zip(missing, vectors, strict=True))
+            conn.executemany(
+                (
+                    "INSERT OR REPLACE INTO embedding_cache("
+                    "hash, model, vector_json, vector_blob, created_at, hit_count"
+                    ") "
+                    "VALUES(?,?,'',?,?,"
+                    "COALESCE((SELECT hit_count FROM embedding_cache WHERE hash=?), 0))"
+                ),
+                [
+                    (key, model, pack_vector(vector, model), now, key)
+                    for key, vector in fresh.items()
+                ],
+            )
+            found.update(fresh)
+        return [found[key] for key in keys]
+
     def upsert_event_vector(
         self,
         conn: sqlite3.Connection,
@@ -261,18 +371,46 @@ class MemoryService:
         conn.execute(
             (
                 "INSERT OR REPLACE INTO event_vec("
-                "id, thread_id, vector_json, created_at"
-                ") VALUES(?,?,?,?)"
+                "id, thread_id, vector_json, vector_blob, created_at"
+                ") VALUES(?,?,'',?,?)"
             ),
             (
                 event_id,
                 thread_id,
-                json.dumps(embedding),
+                pack_vector(embedding, get_settings().ollama_embed_model),
                 datetime.now(UTC).isoformat(),
             ),
         )
         self._upsert_event_vec_index(conn, event_id, thread_id, embedding)
 
+    def index_pending_event_vectors(self, conn: sqlite3.Connection, limit: int = 32) -> int:
+        """Embed the oldest queued events into ``event_vec`` in one batch.
+
+        Embedding runs before any write, so no write lock is held across the HTTP
+        call. Returns the number of queue rows consumed (0 when the queue is empty).
+        """
+        rows = conn.execute(
+            (
+                "SELECT p.event_id, p.thread_id, et.redacted_text "
+                "FROM pending_event_vectors p "
+                "LEFT JOIN event_text et ON et.event_id=p.event_id "
+                "ORDER BY p.created_at ASC LIMIT ?"
+            ),
+            (max(1, int(limit)),),
+        ).fetchall()
+        if not rows:
+            return 0
+        ready = [row for row in rows if isinstance(row["redacted_text"], str)]
+        vectors = self.embed_batch([str(row["redacted_text"]) for row in ready])
+        for row, vector in zip(ready, vectors, strict=True):
+            thread_id = str(row["thread_id"]) if row["thread_id"] is not None else None
+            self.upsert_event_vector(conn, str(row["event_id"]), thread_id, vector)
+        conn.executemany(
+            "DELETE FROM pending_event_vectors WHERE event_id=?",
+            [(str(row["event_id"]),) for row in rows],
+        )
+        return len(rows)
+
     def search(
         self,
         conn: sqlite3.Connection,
@@ -282,8 +420,15 @@ class MemoryService:
         vector_weight: float = 0.4,
         bm25_weight: float = 0.35,
         recency_weight: float = 0.25,
+        *,
+        emit: bool = True,
     ) -> list[dict[str, object]]:
-        """Hybrid retrieval using Reciprocal Rank Fusion (vector + BM25 + recency)."""
+        """Hybrid retrieval using Reciprocal Rank Fusion (vector + BM25 + recency).
+
+        With ``emit=False`` nothing is written, so ``conn`` may be a read-only
+        connection; the caller records the ``memory.retrieve`` event with
+        :meth:`record_retrieval` on a writable one.
+        """
         rrf_k = 60  # RRF smoothing constant
         pool_size = max(limit * 3, 15)
 
@@ -335,12 +480,8 @@ class MemoryService:
 
         # If no results from any source, return empty
         if not vector_ranking and not bm25_ranking and not recency_ranking:
-            self._emit_memory_event(
-                conn,
-                "memory.retrieve",
-                {"result_count": 0, "query_present": bool(query and query.strip())},
-                thread_id=thread_id,
-            )
+            if emit:
+                self.record_retrieval(conn, thread_id, [], query=query)
             return []
 
         # --- Reciprocal Rank Fusion ---
@@ -361,15 +502,15 @@ class MemoryService:
 
         # Sort by fused score
         ranked = sorted(rrf_scores.items(), key=lambda kv: kv[1], reverse=True)
+        hits = self._materialize_memory_hits(
+            conn,
+            thread_id=thread_id,
+            memory_ids=[mid for mid, _ in ranked],
+            fallback_texts=all_texts,
+        )
         results: list[dict[str, object]] = []
         seen: set[str] = set()
-        for mid, _ in ranked:
-            stitched_id, stitched_text, stitched_metadata = self._materialize_memory_hit(
-                conn,
-                thread_id=thread_id,
-                memory_id=mid,
-                fallback_text=all_texts.get(mid, ""),
-            )
+        for stitched_id, stitched_text, stitched_metadata in hits:
             if stitched_id in seen:
                 continue
             seen.add(stitched_id)
@@ -378,18 +519,28 @@ class MemoryService:
             )
             if len(results) >= limit:
                 break
-        self._emit_memory_event(
-            conn,
-            "memory.retrieve",
-            {
-                "result_count": len(results),
-                "query_present": bool(query and query.strip()),
-                "limit": limit,
-            },
-            thread_id=thread_id,
-        )
+        if emit:
+            self.record_retrieval(conn, thread_id, results, query=query, limit=limit)
         return results
 
+    def record_retrieval(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        results: Sequence[dict[str, object]],
+        *,
+        query: str | None = None,
+        limit: int | None = None,
+    ) -> None:
+        """Emit the ``memory.retrieve`` event for a :meth:`search` result."""
+        payload: dict[str, object] = {
+            "result_count": len(results),
+            "query_present": bool(query and query.strip()),
+        }
+        if limit is not None:
+            payload["limit"] = limit
+        self._emit_memory_event(conn, "memory.retrieve", payload, thread_id=thread_id)
+
     @staticmethod
     def _parse_metadata(metadata_raw: object) -> dict[str, object]:
         if not isinstance(metadata_raw, str) or not metadata_raw:
@@ -400,56 +551,78 @@ class MemoryService:
             return {}
         return parsed if isinstance(parsed, dict) else {}
 
-    def _materialize_memory_hit(
-        self,
-        conn: sqlite3.Connection,
-        thread_id: str,
-        memory_id: str,
-        fallback_text: str,
-    ) -> tuple[str, str, dict[str, object]]:
-        row = conn.execute(
-            "SELECT id, text, metadata_json FROM memory_items WHERE id=? LIMIT 1",
-            (memory_id,),
-        ).fetchone()
-        if row is None:
-            return memory_id, fallback_text, {}
-        metadata = self._parse_metadata(row["metadata_json"])
+    @staticmethod
+    def _chunk_columns(metadata: dict[str, object]) -> tuple[str | None, int | None]:
         group_id = metadata.get("chunk_group_id")
         if not isinstance(group_id, str) or not group_id.strip():
-            return str(row["id"]), str(row["text"]), metadata
+            return None, None
+        index_raw = metadata.get("chunk_index", 0)
         try:
+            chunk_index = int(index_raw) if isinstance(index_raw, int | float | str) else 0
+        except ValueError:
+            chunk_index = 0
+        return group_id, chunk_index
+
+    def _materialize_memory_hits(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        memory_ids: Sequence[str],
+        fallback_texts: dict[str, str],
+    ) -> list[tuple[str, str, dict[str, object]]]:
+        """Resolve ranked ids to ``(id, text, metadata)`` with chunk groups stitched.
+
+        Uses one ``IN`` lookup for the hits and one indexed lookup for every chunk
+        group they touch; each group is stitched once per call.
+        """
+        rows_by_id: dict[str, sqlite3.Row] = {}
+        for start in range(0, len(memory_ids), self.EMBED_CACHE_LOOKUP_CHUNK):
+            chunk = memory_ids[start : start + self.EMBED_CACHE_LOOKUP_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            for row in conn.execute(
+                "SELECT id, text, metadata_json, chunk_group_id FROM memory_items "
+                f"WHERE id IN ({placeholders})",
+                tuple(chunk),
+            ):
+                rows_by_id[str(row["id"])] = row
+        group_ids = sorted(
+            {str(row["chunk_group_id"]) for row in rows_by_id.values() if row["chunk_group_id"]}
+        )
+        groups: dict[str, tuple[str, str, dict[str, object]]] = {}
+        if group_ids:
+            placeholders = ",".join("?" for _ in group_ids)
             chunk_rows = conn.execute(
                 (
-                    "SELECT id, text, metadata_json, created_at "
-                    "FROM memory_items "
-                    "WHERE thread_id=? AND json_extract(metadata_json, '$.chunk_group_id')=? "
-                    "ORDER BY CAST(json_extract(metadata_json, '$.chunk_index') AS INTEGER) ASC, "
-                    "created_at ASC"
+                    "SELECT id, text, metadata_json, chunk_group_id FROM memory_items "
+                    f"WHERE thread_id=? AND chunk_group_id IN ({placeholders}) "
+                    "ORDER BY chunk_group_id, chunk_index, created_at"
                 ),
-                (thread_id, group_id),
+                (thread_id, *group_ids),
             ).fetchall()
-        except sqlite3.OperationalError:
-            return str(row["id"]), str(row["text"]), metadata
-        if not chunk_rows:
-            return str(row["id"]), str(row["text"]), metadata
-        ordered = []
-        for chunk_row in chunk_rows:
-            chunk_metadata = self._parse_metadata(chunk_row["metadata_json"])
-            chunk_index_raw = chunk_metadata.get("chunk_index", 0)
-            if isinstance(chunk_index_raw, int | float | str):
-                try:
-                    chunk_index = int(chunk_index_raw)
-                except ValueError:
-                    chunk_index = 0
-            else:
-                chunk_index = 0
-            ordered.append(
-                (chunk_index, str(chunk_row["id"]), str(chunk_row["text"]), chunk_metadata)
+            members: dict[str, list[sqlite3.Row]] = {}
+            for chunk_row in chunk_rows:
+                members.setdefault(str(chunk_row["chunk_group_id"]), []).append(chunk_row)
+            for group_id, group_rows in members.items():
+                primary = group_rows[0]
+                groups[group_id] = (
+                    str(primary["id"]),
+                    "".join(str(item["text"]) for item in group_rows),
+                    self._parse_metadata(primary["metadata_json"]),
+                )
+        hits: list[tuple[str, str, dict[str, object]]] = []
+        for memory_id in memory_ids:
+            row = rows_by_id.get(memory_id)
+            if row is None:
+                hits.append((memory_id, fallback_texts.get(memory_id, ""), {}))
+                continue
+            group_id = row["chunk_group_id"]
+            if group_id and str(group_id) in groups:
+                hits.append(groups[str(group_id)])
+                continue
+            hits.append(
+                (str(row["id"]), str(row["text"]), self._parse_metadata(row["metadata_json"]))
             )
-        ordered.sort(key=lambda item: item[0])
-        stitched = "".join(item[2] for item in ordered)
-        primary = ordered[0]
-        return primary[1], stitched, primary[3]
+        return hits
 
     def _semantic_scored(
         self,
@@ -459,7 +632,7 @@ class MemoryService:
         limit: int,
     ) -> dict[str, tuple[float, str]]:
         """Return {memory_id: (cosine_score, text)} for semantic search."""
-        query_vec = self._normalize(self._embed_text(query))
+        query_vec = self._normalize(self._embed_query(query))
         # Try sqlite-vec index first
         sqlite_vec = self._search_memory_vec_index(conn, thread_id, query_vec, limit)
         if sqlite_vec:
@@ -471,32 +644,61 @@ class MemoryService:
             return result
 
         # Fallback: brute-force cosine similarity
+        return {
+            memory_id: (score, text)
+            for score, memory_id, text in self._score_thread_memory(
+                conn, thread_id, query_vec, limit
+            )
+        }
+
+    def _score_thread_memory(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        query_vec: list[float],
+        limit: int,
+    ) -> list[tuple[float, str, str]]:
+        entry = self._thread_vectors(conn, thread_id, len(query_vec))
+        return [
+            (score, entry.ids[idx], entry.texts[idx])
+            for idx, score in entry.matrix.top_k(query_vec, limit)
+        ]
+
+    def _thread_vectors(
+        self, conn: sqlite3.Connection, thread_id: str, dims: int
+    ) -> ThreadVectors:
+        settings = get_settings()
+        cache = get_thread_vector_cache()
+        model = settings.ollama_embed_model
+        cached = cache.get(settings.app_db, thread_id, dims=dims, model=model)
+        if cached is not None:
+            return cached
         rows = conn.execute(
             (
-                "SELECT m.id, m.text, me.vector_json "
+                "SELECT m.id, m.text, me.vector_json, me.vector_blob "
                 "FROM memory_items m "
                 "JOIN memory_embeddings me ON me.memory_id=m.id "
                 "WHERE m.thread_id=?"
             ),
             (thread_id,),
         ).fetchall()
-        scored: dict[str, tuple[float, str]] = {}
-        for row in rows:
-            raw_vec = row["vector_json"]
-            if not isinstance(raw_vec, str):
-                continue
-            try:
-                decoded = json.loads(raw_vec)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(decoded, list):
-                continue
-            vec = [float(item) for item in decoded if isinstance(item, int | float)]
-            if not vec:
-                continue
-            score = self._cosine(query_vec, self._normalize(vec))
-            scored[str(row["id"])] = (score, str(row["text"]))
-        return scored
+        decoded_rows = decode_rows(
+            conn,
+            rows,
+            table="memory_embeddings",
+            key_columns=("memory_id",),
+            row_keys=("id",),
+            dims=dims,
+            model=model,
+        )
+        entry = ThreadVectors(
+            model=model,
+            ids=tuple(str(row["id"]) for row, _ in decoded_rows),
+            texts=tuple(str(row["text"]) for row, _ in decoded_rows),
+            matrix=VectorMatrix.build([vec for _, vec in decoded_rows], dims),
+        )
+        cache.put(settings.app_db, thread_id, entry)
+        return entry
 
     @staticmethod
     def _normalize(vector: list[float]) -> list[float]:
@@ -519,39 +721,14 @@ class MemoryService:
         query: str,
         limit: int,
     ) -> list[dict[str, str]]:
-        query_vec = self._normalize(self._embed_text(query))
+        query_vec = self._normalize(self._embed_query(query))
         sqlite_vec = self._search_memory_vec_index(conn, thread_id, query_vec, limit)
         if sqlite_vec:
             return sqlite_vec
-        rows = conn.execute(
-            (
-                "SELECT m.id, m.text, me.vector_json "
-                "FROM memory_items m "
-                "JOIN memory_embeddings me ON me.memory_id=m.id "
-                "WHERE m.thread_id=?"
-            ),
-            (thread_id,),
-        ).fetchall()
-        scored: list[tuple[float, str, str]] = []
-        for row in rows:
-            raw_vec = row["vector_json"]
-            if not isinstance(raw_vec, str):
-                continue
-            try:
-                decoded = json.loads(raw_vec)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(decoded, list):
-                continue
-            vec = [float(item) for item in decoded if isinstance(item, int | float)]
-            if not vec:
-                continue
-            score = self._cosine(query_vec, self._normalize(vec))
-            scored.append((score, str(row["id"]), str(row["text"])))
-        if not scored:
-            return []
-        scored.sort(key=lambda item: item[0], reverse=True)
-        return [{"id": mid, "text": text} for _, mid, text in scored[:limit]]
+        return [
+            {"id": memory_id, "text": text}
+            for _, memory_id, text in self._score_thread_memory(conn, thread_id, query_vec, limit)
+        ]
 
     def search_events(
         self,
@@ -562,7 +739,7 @@ class MemoryService:
     ) -> list[dict[str, str]]:
         if not query.strip():
             return []
-        query_vec = self._normalize(self._embed_text(query))
+        query_vec = self._normalize(self._embed_query(query))
         sqlite_vec = self._search_event_vec_index(conn, query_vec, limit=limit, thread_id=thread_id)
         if sqlite_vec:
             return sqlite_vec
@@ -570,7 +747,7 @@ class MemoryService:
             rows = conn.execute(
                 (
                     "SELECT e.id, e.event_type, e.component, e.created_at, et.redacted_text, "
-                    "ev.vector_json "
+                    "ev.vector_json, ev.vector_blob "
                     "FROM event_vec ev "
                     "JOIN events e ON e.id=ev.id "
                     "JOIN event_text et ON et.event_id=e.id "
@@ -581,40 +758,30 @@ class MemoryService:
         else:
             rows = conn.execute(
                 "SELECT e.id, e.event_type, e.component, e.created_at, et.redacted_text, "
-                "ev.vector_json "
+                "ev.vector_json, ev.vector_blob "
                 "FROM event_vec ev "
                 "JOIN events e ON e.id=ev.id "
                 "JOIN event_text et ON et.event_id=e.id"
             ).fetchall()
-        scored: list[tuple[float, dict[str, str]]] = []
-        for row in rows:
-            raw_vec = row["vector_json"]
-            if not isinstance(raw_vec, str):
-                continue
-            try:
-                decoded = json.loads(raw_vec)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(decoded, list):
-                continue
-            vec = [float(item) for item in decoded if isinstance(item, int | float)]
-            if not vec:
-                continue
-            score = self._cosine(query_vec, self._normalize(vec))
-            scored.append(
-                (
-                    score,
-                    {
-                        "event_id": str(row["id"]),
-                        "event_type": str(row["event_type"]),
-                        "component": str(row["component"]),
-                        "created_at": str(row["created_at"]),
-                        "redacted_text": str(row["redacted_text"]),
-                    },
-                )
-            )
-        scored.sort(key=lambda item: item[0], reverse=True)
-        return [item for _, item in scored[:limit]]
+        decoded_rows = decode_rows(
+            conn,
+            rows,
+            table="event_vec",
+            key_columns=("id",),
+            dims=len(query_vec),
+            model=get_settings().ollama_embed_model,
+        )
+        ranked = top_k_cosine(query_vec, [vec for _, vec in decoded_rows], limit)
+        return [
+            {
+                "event_id": str(row["id"]),
+                "event_type": str(row["event_type"]),
+                "component": str(row["component"]),
+                "created_at": str(row["created_at"]),
+                "redacted_text": str(row["redacted_text"]),
+            }
+            for row, _ in (decoded_rows[idx] for idx, _ in ranked)
+        ]
 
     def _search_memory_vec_index(
         self,
@@ -624,7 +791,7 @@ class MemoryService:
         limit: int,
     ) -> list[dict[str, str]]:
         if not self._ensure_vec_runtime(conn):
-            return []
+            return self._search_memory_ann(conn, thread_id, query_vec, limit)
         try:
             rows = conn.execute(
                 (
@@ -634,7 +801,7 @@ class MemoryService:
                     "JOIN memory_items mi ON mi.id=m.memory_id "
                     "WHERE idx.embedding MATCH ? AND k = ? AND mi.thread_id=?"
                 ),
-                (json.dumps(query_vec), limit, thread_id),
+                (pack_raw(query_vec), limit, thread_id),
             ).fetchall()
         except sqlite3.OperationalError:
             logger.debug(
@@ -644,6 +811,27 @@ class MemoryService:
             return []
         return [{"id": str(r["id"]), "text": str(r["text"])} for r in rows]
 
+    def _search_memory_ann(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        query_vec: list[float],
+        limit: int,
+    ) -> list[dict[str, str]]:
+        index = get_ann_index("memory")
+        if index is None or not index.ready:
+            return []
+        memory_ids = [key for key, _ in index.search(query_vec, limit, tag=thread_id)]
+        if not memory_ids:
+            return []
+        placeholders = ",".join("?" for _ in memory_ids)
+        rows = conn.execute(
+            f"SELECT id, text FROM memory_items WHERE thread_id=? AND id IN ({placeholders})",
+            (thread_id, *memory_ids),
+        ).fetchall()
+        texts = {str(row["id"]): str(row["text"]) for row in rows}
+        return [{"id": mid, "text": texts[mid]} for mid in memory_ids if mid in texts]
+
     def _search_event_vec_index(
         self,
         conn: sqlite3.Connection,
@@ -652,7 +840,7 @@ class MemoryService:
         thread_id: str | None = None,
     ) -> list[dict[str, str]]:
         if not self._ensure_vec_runtime(conn):
-            return []
+            return self._search_event_ann(conn, query_vec, limit, thread_id)
         try:
             if thread_id is None:
                 rows = conn.execute(
@@ -664,7 +852,7 @@ class MemoryService:
                         "JOIN event_text et ON et.event_id=e.id "
                         "WHERE idx.embedding MATCH ? AND k = ?"
                     ),
-                    (json.dumps(query_vec), limit),
+                    (pack_raw(query_vec), limit),
                 ).fetchall()
             else:
                 rows = conn.execute(
@@ -676,7 +864,7 @@ class MemoryService:
                         "JOIN event_text et ON et.event_id=e.id "
                         "WHERE idx.embedding MATCH ? AND k = ? AND m.thread_id=?"
                     ),
-                    (json.dumps(query_vec), limit, thread_id),
+                    (pack_raw(query_vec), limit, thread_id),
                 ).fetchall()
         except sqlite3.OperationalError:
             logger.debug(
@@ -695,36 +883,150 @@ class MemoryService:
             for row in rows
         ]
 
+    def _search_event_ann(
+        self,
+        conn: sqlite3.Connection,
+        query_vec: list[float],
+        limit: int,
+        thread_id: str | None,
+    ) -> list[dict[str, str]]:
+        index = get_ann_index("event")
+        if index is None or not index.ready:
+            return []
+        event_ids = [key for key, _ in index.search(query_vec, limit, tag=thread_id)]
+        if not event_ids:
+            return []
+        placeholders = ",".join("?" for _ in event_ids)
+        rows = conn.execute(
+            (
+                "SELECT e.id, e.event_type, e.component, e.created_at, et.redacted_text "
+                "FROM events e JOIN event_text et ON et.event_id=e.id "
+                f"WHERE e.id IN ({placeholders})"
+            ),
+            tuple(event_ids),
+        ).fetchall()
+        by_id = {str(row["id"]): row for row in rows}
+        return [
+            {
+                "event_id": event_id,
+                "event_type": str(by_id[event_id]["event_type"]),
+                "component": str(by_id[event_id]["component"]),
+                "created_at": str(by_id[event_id]["created_at"]),
+                "redacted_text": str(by_id[event_id]["redacted_text"]),
+            }
+            for event_id in event_ids
+            if event_id in by_id
+        ]
+
     def _embed_text(self, text: str) -> list[float]:
         settings = get_settings()
-        base_url = settings.ollama_base_url.rstrip("/")
-        payload = {"model": settings.ollama_embed_model, "prompt": text}
-        try:
-            with httpx.Client(timeout=8) as client:
-                response = client.post(f"{base_url}/api/embeddings", json=payload)
+        runtime = get_embedder_runtime()
+        if runtime.available("ollama"):
+            base_url = settings.ollama_base_url.rstrip("/")
+            payload = {"model": settings.ollama_embed_model, "prompt": text}
+            started = time.perf_counter()
+            try:
+                response = runtime.client().post(f"{base_url}/api/embeddings", json=payload)
                 response.raise_for_status()
-            body = response.json()
-            embedding = body.get("embedding")
-            if isinstance(embedding, list) and embedding:
-                parsed = [float(item) for item in embedding if isinstance(item, int | float)]
-                return self._fit_dims(parsed, settings.memory_embed_dims)
-        except Exception:
-            pass
+                embedding = response.json().get("embedding")
+                if isinstance(embedding, list) and embedding:
+                    parsed = [float(item) for item in embedding if isinstance(item, int | float)]
+                    runtime.record_success("ollama", started)
+                    return self._fit_dims(parsed, settings.memory_embed_dims)
+                runtime.record_failure("ollama")
+            except httpx.TransportError:
+                runtime.record_failure("ollama", mark_down=True)
+            except Exception:
+                runtime.record_failure("ollama")
+        local = self._embed_local([text])
+        if local is not None:
+            return local[0]
+        started = time.perf_counter()
+        vector = self._deterministic_embedding(text, settings.memory_embed_dims)
+        runtime.record_success("deterministic", started)
+        return vector
+
+    def _embed_local(self, texts: list[str]) -> list[list[float]] | None:
+        """Encode ``texts`` with the resident sentence-transformers model, if loadable."""
+        settings = get_settings()
+        runtime = get_embedder_runtime()
+        model = runtime.sentence_model(settings.memory_sentence_transformers_model)
+        if model is None:
+            return None
+        started = time.perf_counter()
         try:
-            from sentence_transformers import SentenceTransformer
-
-            model = SentenceTransformer(settings.memory_sentence_transformers_model)
-            output = model.encode([text], normalize_embeddings=False)
-            if len(output) > 0:
-                first = output[0]
-                if hasattr(first, "tolist"):
-                    parsed = [float(item) for item in first.tolist()]
-                else:
-                    parsed = [float(item) for item in first]
-                return self._fit_dims(parsed, settings.memory_embed_dims)
+            output = model.encode(texts, normalize_embeddings=False)
         except Exception:
-            pass
-        return self._deterministic_embedding(text, settings.memory_embed_dims)
+            runtime.record_failure("sentence_transformers")
+            return None
+        if len(output) != len(texts):
+            runtime.record_failure("sentence_transformers")
+            return None
+        runtime.record_success("sentence_transformers", started)
+        return [
+            self._fit_dims(
+                [float(item) for item in (row.tolist() if hasattr(row, "tolist") else row)],
+                settings.memory_embed_dims,
+            )
+            for row in output
+        ]
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed ``texts`` in order via Ollama ``/api/embed`` multi-input batches.
+
+        Batches run concurrently up to ``MEMORY_EMBED_CONCURRENCY``; a batch the
+        endpoint cannot serve goes to the local model, then :meth:`_embed_text`.
+        """
+        if not texts:
+            return []
+        if len(texts) == 1:
+            return [self._embed_text(texts[0])]
+        settings = get_settings()
+        size = max(1, int(settings.memory_embed_batch_size))
+        batches = [texts[idx : idx + size] for idx in range(0, len(texts), size)]
+        workers = min(len(batches), max(1, int(settings.memory_embed_concurrency)))
+        if workers == 1:
+            results = [self._embed_batch_request(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._embed_batch_request, batches))
+        return [vector for batch in results for vector in batch]
+
+    def _embed_batch_request(self, texts: list[str]) -> list[list[float]]:
+        settings = get_settings()
+        runtime = get_embedder_runtime()
+        if runtime.available("ollama"):
+            base_url = settings.ollama_base_url.rstrip("/")
+            payload = {"model": settings.ollama_embed_model, "input": texts}
+            started = time.perf_counter()
+            try:
+                response = runtime.client().post(
+                    f"{base_url}/api/embed", json=payload, timeout=30
+                )
+                response.raise_for_status()
+                embeddings = response.json().get("embeddings")
+                if isinstance(embeddings, list) and len(embeddings) == len(texts):
+                    parsed = [
+                        [float(item) for item in embedding if isinstance(item, int | float)]
+                        for embedding in embeddings
+                        if isinstance(embedding, list)
+                    ]
+                    if len(parsed) == len(texts) and all(parsed):
+                        runtime.record_success("ollama", started)
+                        return [
+                            self._fit_dims(vector, settings.memory_embed_dims)
+                            for vector in parsed
+                        ]
+                runtime.record_failure("ollama")
+            except httpx.TransportError:
+                runtime.record_failure("ollama", mark_down=True)
+            except Exception:
+                logger.debug("batch embedding request failed; embedding per item", exc_info=True)
+                runtime.record_failure("ollama")
+        local = self._embed_local(texts)
+        if local is not None:
+            return local
+        return [self._embed_text(text) for text in texts]
 
     def search_state(
         self,
@@ -769,16 +1071,24 @@ class MemoryService:
             vector_rank.append(uid)
             rows_by_uid[uid] = dict(row)
 
-        lexical_rows = conn.execute(
-            (
-                "SELECT uid, text, status, type_tag, topic_tags_json, confidence, tier, "
-                "importance_score, last_seen_at "
-                "FROM state_items WHERE thread_id=? AND status!='superseded' "
-                "AND agent_id=? "
-                "AND LOWER(text) LIKE ? ORDER BY updated_at DESC LIMIT ?"
-            ),
-            (thread_id, scoped_actor_id, f"%{query.strip().lower()}%", pool_size),
-        ).fetchall()
+        lexical_rows: list[Any] = []
+        fts_query = self._fts_query(query)
+        if fts_query:
+            try:
+                lexical_rows = conn.execute(
+                    (
+                        "SELECT si.uid, si.text, si.status, si.type_tag, si.topic_tags_json, "
+                        "si.confidence, si.tier, si.importance_score, si.last_seen_at "
+                        "FROM state_items_fts f "
+                        "JOIN state_items si ON si.uid=f.uid AND si.thread_id=f.thread_id "
+                        "WHERE state_items_fts MATCH ? AND f.thread_id=? "
+                        "AND si.status!='superseded' AND si.agent_id=? "
+                        "ORDER BY bm25(state_items_fts), si.updated_at DESC LIMIT ?"
+                    ),
+                    (fts_query, thread_id, scoped_actor_id, pool_size),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                logger.debug("state_items_fts query failed", exc_info=True)
         lexical_rank: list[str] = []
         for row in lexical_rows:
             uid = str(row["uid"])
@@ -914,8 +1224,8 @@ class MemoryService:
         actor_id: str = "main",
     ) -> list[dict[str, object]]:
         del actor_id
-        text = similar_to.strip().lower()
-        if not text:
+        fts_query = self._fts_query(similar_to)
+        if not fts_query:
             rows = conn.execute(
                 (
                     "SELECT id, trace_id, phase, error_summary, error_details_json, "
@@ -925,15 +1235,21 @@ class MemoryService:
                 (max(1, int(k)),),
             ).fetchall()
         else:
-            rows = conn.execute(
-                (
-                    "SELECT id, trace_id, phase, error_summary, error_details_json, "
-                    "attempt, created_at "
-                    "FROM failure_capsules WHERE LOWER(error_summary) LIKE ? "
-                    "ORDER BY created_at DESC LIMIT ?"
-                ),
-                (f"%{text}%", max(1, int(k))),
-            ).fetchall()
+            try:
+                rows = conn.execute(
+                    (
+                        "SELECT fc.id, fc.trace_id, fc.phase, fc.error_summary, "
+                        "fc.error_details_json, fc.attempt, fc.created_at "
+                        "FROM failure_capsules_fts f "
+                        "JOIN failure_capsules fc ON fc.id=f.capsule_id "
+                        "WHERE failure_capsules_fts MATCH ? "
+                        "ORDER BY bm25(failure_capsules_fts), fc.created_at DESC LIMIT ?"
+                    ),
+                    (fts_query, max(1, int(k))),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                logger.debug("failure_capsules_fts query failed", exc_info=True)
+                rows = []
         return [
             {
                 "id": str(row["id"]),
@@ -1036,142 +1352,122 @@ class MemoryService:
         rng = Random(seed)
         return [rng.uniform(-1.0, 1.0) for _ in range(dims)]
 
-    @staticmethod
-    def _has_vec_module(conn: sqlite3.Connection) -> bool:
-        try:
-            row = conn.execute(
-                "SELECT 1 FROM pragma_module_list WHERE name='vec0' LIMIT 1"
-            ).fetchone()
-            return row is not None
-        except sqlite3.OperationalError:
-            return False
-
     def _ensure_vec_runtime(self, conn: sqlite3.Connection) -> bool:
-        settings = get_settings()
-        if not self._has_vec_module(conn):
-            extension_path = settings.sqlite_vec_extension_path.strip()
-            if not extension_path:
-                return False
-            try:
-                conn.enable_load_extension(True)
-                conn.load_extension(extension_path)
-            except sqlite3.OperationalError:
-                logger.debug(
-                    "sqlite-vec extension load failed",
-                    exc_info=True,
-                )
-                return False
-            finally:
-                try:
-                    conn.enable_load_extension(False)
-                except sqlite3.OperationalError:
-                    logger.debug("failed to disable sqlite extension loading", exc_info=True)
-            if not self._has_vec_module(conn):
-                return False
-
-        dims = max(1, settings.memory_embed_dims)
-        try:
-            conn.execute(
-                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.MEMORY_VEC_INDEX_TABLE} "
-                f"USING vec0(embedding float[{dims}])"
-            )
-            conn.execute(
-                f"CREATE TABLE IF NOT EXISTS {self.MEMORY_VEC_INDEX_MAP_TABLE}("
-                "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, "
-                "memory_id TEXT UNIQUE NOT NULL)"
-            )
-            conn.execute(
-                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.EVENT_VEC_INDEX_TABLE} "
-                f"USING vec0(embedding float[{dims}])"
-            )
-            conn.execute(
-                f"CREATE TABLE IF NOT EXISTS {self.EVENT_VEC_INDEX_MAP_TABLE}("
-                "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, "
-                "event_id TEXT UNIQUE NOT NULL, "
-                "thread_id TEXT)"
-            )
-        except sqlite3.OperationalError:
-            logger.debug("vector runtime table setup failed", exc_info=True)
-            return False
-        self._backfill_vec_runtime(conn)
-        return True
+        return get_vec_runtime().ensure(conn, "memory", self._create_vec_tables)
 
-    def _backfill_vec_runtime(self, conn: sqlite3.Connection) -> None:
-        self._backfill_memory_vec_runtime(conn)
-        self._backfill_event_vec_runtime(conn)
+    def _create_vec_tables(self, conn: sqlite3.Connection, dims: int) -> None:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.MEMORY_VEC_INDEX_TABLE} "
+            f"USING vec0(embedding float[{dims}])"
+        )
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.MEMORY_VEC_INDEX_MAP_TABLE}("
+            "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "memory_id TEXT UNIQUE NOT NULL)"
+        )
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.EVENT_VEC_INDEX_TABLE} "
+            f"USING vec0(embedding float[{dims}])"
+        )
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.EVENT_VEC_INDEX_MAP_TABLE}("
+            "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "event_id TEXT UNIQUE NOT NULL, "
+            "thread_id TEXT)"
+        )
 
-    def _backfill_memory_vec_runtime(self, conn: sqlite3.Connection) -> None:
+    def backfill_vec_index(
+        self, conn: sqlite3.Connection, name: str, *, after_rowid: int = 0
+    ) -> tuple[int, int, int]:
+        """Index one batch of ``memory``/``event`` vectors past ``after_rowid``.
+
+        Returns ``(last_rowid, rows_scanned, rows_indexed)``; fewer scanned rows than
+        ``BACKFILL_BATCH_SIZE`` means the source table is exhausted.
+        """
+        if name == "event":
+            return self._backfill_event_vec_runtime(conn, after_rowid=after_rowid)
+        return self._backfill_memory_vec_runtime(conn, after_rowid=after_rowid)
+
+    def _backfill_memory_vec_runtime(
+        self, conn: sqlite3.Connection, *, after_rowid: int = 0
+    ) -> tuple[int, int, int]:
         try:
             rows = conn.execute(
                 (
-                    "SELECT me.memory_id, me.vector_json "
+                    "SELECT me.rowid AS source_rowid, me.memory_id, me.vector_json, "
+                    "me.vector_blob, m.memory_id AS indexed_id "
                     "FROM memory_embeddings me "
                     f"LEFT JOIN {self.MEMORY_VEC_INDEX_MAP_TABLE} m "
                     "ON m.memory_id=me.memory_id "
-                    "WHERE m.memory_id IS NULL "
-                    "ORDER BY me.created_at ASC LIMIT ?"
+                    "WHERE me.rowid>? ORDER BY me.rowid ASC LIMIT ?"
                 ),
-                (self.BACKFILL_BATCH_SIZE,),
+                (after_rowid, self.BACKFILL_BATCH_SIZE),
             ).fetchall()
         except sqlite3.OperationalError:
             logger.debug("memory vector backfill query failed", exc_info=True)
-            return
-        for row in rows:
-            raw = row["vector_json"]
-            if not isinstance(raw, str):
-                continue
-            try:
-                decoded = json.loads(raw)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(decoded, list):
-                continue
-            embedding = [float(item) for item in decoded if isinstance(item, int | float)]
-            if not embedding:
-                continue
+            return after_rowid, 0, 0
+        if not rows:
+            return after_rowid, 0, 0
+        decoded_rows = decode_rows(
+            conn,
+            [row for row in rows if row["indexed_id"] is None],
+            table="memory_embeddings",
+            key_columns=("memory_id",),
+            model=get_settings().ollama_embed_model,
+        )
+        for row, embedding in decoded_rows:
             self._upsert_memory_vec_index_raw(conn, str(row["memory_id"]), embedding)
+        return int(rows[-1]["source_rowid"]), len(rows), len(decoded_rows)
 
-    def _backfill_event_vec_runtime(self, conn: sqlite3.Connection) -> None:
+    def _backfill_event_vec_runtime(
+        self, conn: sqlite3.Connection, *, after_rowid: int = 0
+    ) -> tuple[int, int, int]:
         try:
             rows = conn.execute(
                 (
-                    "SELECT ev.id, ev.thread_id, ev.vector_json "
+                    "SELECT ev.rowid AS source_rowid, ev.id, ev.thread_id, ev.vector_json, "
+                    "ev.vector_blob, m.event_id AS indexed_id "
                     "FROM event_vec ev "
                     f"LEFT JOIN {self.EVENT_VEC_INDEX_MAP_TABLE} m "
                     "ON m.event_id=ev.id "
-                    "WHERE m.event_id IS NULL "
-                    "ORDER BY ev.created_at ASC LIMIT ?"
+                    "WHERE ev.rowid>? ORDER BY ev.rowid ASC LIMIT ?"
                 ),
-                (self.BACKFILL_BATCH_SIZE,),
+                (after_rowid, self.BACKFILL_BATCH_SIZE),
             ).fetchall()
         except sqlite3.OperationalError:
             logger.debug("event vector backfill query failed", exc_info=True)
-            return
-        for row in rows:
-            raw = row["vector_json"]
-            if not isinstance(raw, str):
-                continue
-            try:
-                decoded = json.loads(raw)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(decoded, list):
-                continue
-            embedding = [float(item) for item in decoded if isinstance(item, int | float)]
-            if not embedding:
-                continue
+            return after_rowid, 0, 0
+        if not rows:
+            return after_rowid, 0, 0
+        decoded_rows = decode_rows(
+            conn,
+            [row for row in rows if row["indexed_id"] is None],
+            table="event_vec",
+            key_columns=("id",),
+            model=get_settings().ollama_embed_model,
+        )
+        for row, embedding in decoded_rows:
             thread_id = str(row["thread_id"]) if row["thread_id"] is not None else None
             self._upsert_event_vec_index_raw(conn, str(row["id"]), thread_id, embedding)
+        return int(rows[-1]["source_rowid"]), len(rows), len(decoded_rows)
 
     def _upsert_memory_vec_index(
-        self, conn: sqlite3.Connection, memory_id: str, embedding: list[float]
+        self,
+        conn: sqlite3.Connection,
+        memory_id: str,
+        embedding: list[float],
+        *,
+        thread_id: str | None = None,
     ) -> None:
         if not self._ensure_vec_runtime(conn):
+            index = get_ann_index("memory")
+            if index is not None:
+                index.add(memory_id, embedding, tag=thread_id)
             return
         self._upsert_memory_vec_index_raw(conn, memory_id, embedding)
 
     def _upsert_memory_vec_index_raw(
-        self, conn: sqlite3.Connection, memory_id: str, embedding: list[float]
+        self, conn: sqlite3.Connection, memory_id: str, embedding: Sequence[float]
     ) -> None:
         row = conn.execute(
             f"SELECT vec_rowid FROM {self.MEMORY_VEC_INDEX_MAP_TABLE} WHERE memory_id=?",
@@ -1191,7 +1487,7 @@ class MemoryService:
             conn.execute(
                 f"INSERT OR REPLACE INTO {self.MEMORY_VEC_INDEX_TABLE}(rowid, embedding) "
                 "VALUES(?, ?)",
-                (vec_rowid, json.dumps(embedding)),
+                (vec_rowid, pack_raw(embedding)),
             )
         except sqlite3.OperationalError:
             logger.debug("memory vector upsert failed", exc_info=True)
@@ -1205,6 +1501,9 @@ class MemoryService:
         embedding: list[float],
     ) -> None:
         if not self._ensure_vec_runtime(conn):
+            index = get_ann_index("event")
+            if index is not None:
+                index.add(event_id, embedding, tag=thread_id)
             return
         self._upsert_event_vec_index_raw(conn, event_id, thread_id, embedding)
 
@@ -1213,7 +1512,7 @@ class MemoryService:
         conn: sqlite3.Connection,
         event_id: str,
         thread_id: str | None,
-        embedding: list[float],
+        embedding: Sequence[float],
     ) -> None:
         row = conn.execute(
             f"SELECT vec_rowid FROM {self.EVENT_VEC_INDEX_MAP_TABLE} WHERE event_id=?",
@@ -1237,7 +1536,7 @@ class MemoryService:
             conn.execute(
                 f"INSERT OR REPLACE INTO {self.EVENT_VEC_INDEX_TABLE}(rowid, embedding) "
                 "VALUES(?, ?)",
-                (vec_rowid, json.dumps(embedding)),
+                (vec_rowid, pack_raw(embedding)),
             )
         except sqlite3.OperationalError:
             logger.debug("event vector upsert failed", exc_info=True)
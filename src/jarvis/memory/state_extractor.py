@@ -232,10 +232,11 @@ async def _extract_state_items_impl(
     merged_count = 0
     conflicted_count = 0
 
+    vectors = memory.embed_batch([item.text for item in capped_items])
+
     conn.execute("BEGIN")
     try:
-        for item in capped_items:
-            vector = memory.embed_text(item.text)
+        for item, vector in zip(capped_items, vectors, strict=True):
             similar = store.search_similar_items(
                 conn=conn,
                 thread_id=thread_id,
@@ -5,19 +5,24 @@ from __future__ import annotations
 import json
 import logging
 import sqlite3
+from collections.abc import Sequence
 from datetime import UTC, datetime
 from math import exp, log1p, sqrt
 
 from jarvis.config import get_settings
 from jarvis.ids import new_id
+from jarvis.memory.ann import get_ann_index
 from jarvis.memory.policy import apply_memory_policy, record_memory_governance_decision
 from jarvis.memory.scope import can_agent_access_thread_memory, normalize_agent_id
+from jarvis.memory.scoring import top_k_cosine
 from jarvis.memory.state_items import (
     DEFAULT_STATUS,
     TYPE_PRIORITY,
     StateItem,
     resolve_status_merge,
 )
+from jarvis.memory.vec_runtime import get_vec_runtime
+from jarvis.memory.vectors import decode_rows, load_vector, pack_raw, pack_vector
 
 logger = logging.getLogger(__name__)
 
@@ -530,8 +535,8 @@ class StateStore:
 
         rows = conn.execute(
             (
-                "SELECT si.uid, si.text, si.status, si.type_tag, si.topic_tags_json, "
-                "sie.vector_json "
+                "SELECT si.uid, si.thread_id, si.text, si.status, si.type_tag, "
+                "si.topic_tags_json, sie.vector_json, sie.vector_blob "
                 "FROM state_item_embeddings sie "
                 "JOIN state_items si ON si.uid=sie.uid AND si.thread_id=sie.thread_id "
                 "WHERE si.thread_id=? AND si.type_tag=? AND si.status!='superseded' "
@@ -539,49 +544,43 @@ class StateStore:
             ),
             (thread_id, type_tag, scoped_agent),
         ).fetchall()
-        scored: list[tuple[float, dict[str, object]]] = []
-        for row in rows:
-            raw_vec = row["vector_json"]
-            if not isinstance(raw_vec, str):
-                continue
-            try:
-                decoded = json.loads(raw_vec)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(decoded, list):
-                continue
-            vec = [float(item) for item in decoded if isinstance(item, int | float)]
-            if not vec:
-                continue
-            score = self._cosine(normalized, self._normalize(vec))
+        decoded_rows = decode_rows(
+            conn,
+            rows,
+            table="state_item_embeddings",
+            key_columns=("uid", "thread_id"),
+            dims=len(normalized),
+            model=get_settings().ollama_embed_model,
+        )
+        ranked = top_k_cosine(
+            normalized, [vec for _, vec in decoded_rows], max(1, int(limit))
+        )
+        result: list[dict[str, object]] = []
+        for idx, score in ranked:
+            row = decoded_rows[idx][0]
             topics_raw = json.loads(str(row["topic_tags_json"]) or "[]")
-            topics = [str(tag) for tag in topics_raw if isinstance(tag, str)]
-            scored.append(
-                (
-                    score,
-                    {
-                        "uid": str(row["uid"]),
-                        "text": str(row["text"]),
-                        "status": str(row["status"]),
-                        "type_tag": str(row["type_tag"]),
-                        "topic_tags": topics,
-                        "score": score,
-                    },
-                )
+            result.append(
+                {
+                    "uid": str(row["uid"]),
+                    "text": str(row["text"]),
+                    "status": str(row["status"]),
+                    "type_tag": str(row["type_tag"]),
+                    "topic_tags": [str(tag) for tag in topics_raw if isinstance(tag, str)],
+                    "score": score,
+                }
             )
-        scored.sort(key=lambda item: item[0], reverse=True)
-        return [item for _, item in scored[: max(1, int(limit))]]
+        return result
 
     def upsert_item_embedding(
         self, conn: sqlite3.Connection, uid: str, thread_id: str, embedding: list[float]
     ) -> None:
         now = self._now_iso()
-        encoded = json.dumps(embedding)
+        encoded = pack_vector(embedding, get_settings().ollama_embed_model)
         conn.execute(
             (
                 "INSERT OR REPLACE INTO state_item_embeddings("
-                "uid, thread_id, vector_json, created_at"
-                ") VALUES(?,?,?,?)"
+                "uid, thread_id, vector_json, vector_blob, created_at"
+                ") VALUES(?,?,'',?,?)"
             ),
             (uid, thread_id, encoded, now),
         )
@@ -610,99 +609,74 @@ class StateStore:
             for row in rows
         ]
 
-    @staticmethod
-    def _has_vec_module(conn: sqlite3.Connection) -> bool:
-        try:
-            row = conn.execute(
-                "SELECT 1 FROM pragma_module_list WHERE name='vec0' LIMIT 1"
-            ).fetchone()
-            return row is not None
-        except sqlite3.OperationalError:
-            return False
+    def ensure_vector_indexes(self, conn: sqlite3.Connection) -> bool:
+        return self._ensure_vec_runtime(conn)
 
     def _ensure_vec_runtime(self, conn: sqlite3.Connection) -> bool:
-        settings = get_settings()
-        if not self._has_vec_module(conn):
-            extension_path = settings.sqlite_vec_extension_path.strip()
-            if not extension_path:
-                return False
-            try:
-                conn.enable_load_extension(True)
-                conn.load_extension(extension_path)
-            except sqlite3.OperationalError:
-                logger.debug("sqlite-vec extension load failed for state store", exc_info=True)
-                return False
-            finally:
-                try:
-                    conn.enable_load_extension(False)
-                except sqlite3.OperationalError:
-                    logger.debug("failed to disable sqlite extension loading", exc_info=True)
-            if not self._has_vec_module(conn):
-                return False
-
-        dims = max(1, get_settings().memory_embed_dims)
-        try:
-            conn.execute(
-                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.STATE_VEC_INDEX_TABLE} "
-                f"USING vec0(embedding float[{dims}])"
-            )
-            conn.execute(
-                f"CREATE TABLE IF NOT EXISTS {self.STATE_VEC_INDEX_MAP_TABLE}("
-                "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, "
-                "uid TEXT NOT NULL, "
-                "thread_id TEXT NOT NULL, "
-                "UNIQUE(uid, thread_id))"
-            )
-        except sqlite3.OperationalError:
-            logger.debug("state vector runtime setup failed", exc_info=True)
-            return False
-        self._backfill_state_vec_runtime(conn)
-        return True
+        return get_vec_runtime().ensure(conn, "state", self._create_vec_tables)
 
-    def _backfill_state_vec_runtime(self, conn: sqlite3.Connection) -> None:
+    def _create_vec_tables(self, conn: sqlite3.Connection, dims: int) -> None:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.STATE_VEC_INDEX_TABLE} "
+            f"USING vec0(embedding float[{dims}])"
+        )
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.STATE_VEC_INDEX_MAP_TABLE}("
+            "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "uid TEXT NOT NULL, "
+            "thread_id TEXT NOT NULL, "
+            "UNIQUE(uid, thread_id))"
+        )
+
+    def backfill_vec_index(
+        self, conn: sqlite3.Connection, *, after_rowid: int = 0
+    ) -> tuple[int, int, int]:
+        """Index one batch of state vectors past ``after_rowid``; see ``MemoryService``."""
         try:
             rows = conn.execute(
                 (
-                    "SELECT sie.uid, sie.thread_id, sie.vector_json "
+                    "SELECT sie.rowid AS source_rowid, sie.uid, sie.thread_id, "
+                    "sie.vector_json, sie.vector_blob, sm.uid AS indexed_uid "
                     "FROM state_item_embeddings sie "
                     f"LEFT JOIN {self.STATE_VEC_INDEX_MAP_TABLE} sm "
                     "ON sm.uid=sie.uid AND sm.thread_id=sie.thread_id "
-                    "WHERE sm.uid IS NULL ORDER BY sie.created_at ASC LIMIT ?"
+                    "WHERE sie.rowid>? ORDER BY sie.rowid ASC LIMIT ?"
                 ),
-                (self.BACKFILL_BATCH_SIZE,),
+                (after_rowid, self.BACKFILL_BATCH_SIZE),
             ).fetchall()
         except sqlite3.OperationalError:
             logger.debug("state vector backfill query failed", exc_info=True)
-            return
-        for row in rows:
-            raw = row["vector_json"]
-            if not isinstance(raw, str):
-                continue
-            try:
-                decoded = json.loads(raw)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(decoded, list):
-                continue
-            embedding = [float(item) for item in decoded if isinstance(item, int | float)]
-            if not embedding:
-                continue
+            return after_rowid, 0, 0
+        if not rows:
+            return after_rowid, 0, 0
+        decoded_rows = decode_rows(
+            conn,
+            [row for row in rows if row["indexed_uid"] is None],
+            table="state_item_embeddings",
+            key_columns=("uid", "thread_id"),
+            model=get_settings().ollama_embed_model,
+        )
+        for row, embedding in decoded_rows:
             self._upsert_state_vec_index_raw(
                 conn=conn,
                 uid=str(row["uid"]),
                 thread_id=str(row["thread_id"]),
                 embedding=embedding,
             )
+        return int(rows[-1]["source_rowid"]), len(rows), len(decoded_rows)
 
     def _upsert_state_vec_index(
         self, conn: sqlite3.Connection, uid: str, thread_id: str, embedding: list[float]
     ) -> None:
         if not self._ensure_vec_runtime(conn):
+            index = get_ann_index("state")
+            if index is not None:
+                index.add(self._ann_key(uid, thread_id), embedding, tag=thread_id)
             return
         self._upsert_state_vec_index_raw(conn, uid=uid, thread_id=thread_id, embedding=embedding)
 
     def _upsert_state_vec_index_raw(
-        self, conn: sqlite3.Connection, uid: str, thread_id: str, embedding: list[float]
+        self, conn: sqlite3.Connection, uid: str, thread_id: str, embedding: Sequence[float]
     ) -> None:
         row = conn.execute(
             (
@@ -727,7 +701,7 @@ class StateStore:
                     f"INSERT OR REPLACE INTO {self.STATE_VEC_INDEX_TABLE}(rowid, embedding) "
                     "VALUES(?, ?)"
                 ),
-                (vec_rowid, json.dumps(embedding)),
+                (vec_rowid, pack_raw(embedding)),
             )
         except sqlite3.OperationalError:
             logger.debug("state vector upsert failed", exc_info=True)
@@ -742,12 +716,14 @@ class StateStore:
         limit: int,
     ) -> list[dict[str, object]]:
         if not self._ensure_vec_runtime(conn):
-            return []
+            return self._search_state_ann(
+                conn, thread_id, query_vec, type_tag=type_tag, agent_id=agent_id, limit=limit
+            )
         try:
             rows = conn.execute(
                 (
                     f"SELECT sm.uid, si.text, si.status, si.type_tag, si.topic_tags_json, "
-                    "sie.vector_json "
+                    "sie.vector_json, sie.vector_blob "
                     f"FROM {self.STATE_VEC_INDEX_TABLE} idx "
                     f"JOIN {self.STATE_VEC_INDEX_MAP_TABLE} sm ON sm.vec_rowid=idx.rowid "
                     "JOIN state_items si ON si.uid=sm.uid AND si.thread_id=sm.thread_id "
@@ -757,28 +733,22 @@ class StateStore:
                     "AND sm.thread_id=? AND si.type_tag=? AND si.status!='superseded' "
                     "AND si.agent_id=?"
                 ),
-                (json.dumps(query_vec), max(1, int(limit)), thread_id, type_tag, agent_id),
+                (pack_raw(query_vec), max(1, int(limit)), thread_id, type_tag, agent_id),
             ).fetchall()
         except sqlite3.OperationalError:
             logger.debug("state vector index search failed", exc_info=True)
             return []
+        model = get_settings().ollama_embed_model
         result: list[dict[str, object]] = []
         for idx, row in enumerate(rows):
             topics_raw = json.loads(str(row["topic_tags_json"]) or "[]")
             topics = [str(tag) for tag in topics_raw if isinstance(tag, str)]
             score = 1.0 - (idx / max(len(rows), 1))
-            raw_vec = row["vector_json"]
-            if isinstance(raw_vec, str):
-                try:
-                    decoded = json.loads(raw_vec)
-                    if isinstance(decoded, list):
-                        candidate_vec = [
-                            float(item) for item in decoded if isinstance(item, int | float)
-                        ]
-                        if candidate_vec:
-                            score = self._cosine(query_vec, self._normalize(candidate_vec))
-                except json.JSONDecodeError:
-                    pass
+            candidate_vec, _ = load_vector(
+                row["vector_blob"], row["vector_json"], dims=len(query_vec), model=model
+            )
+            if candidate_vec:
+                score = self._cosine(query_vec, self._normalize(candidate_vec))
             result.append(
                 {
                     "uid": str(row["uid"]),
@@ -791,6 +761,55 @@ class StateStore:
             )
         return result
 
+    @staticmethod
+    def _ann_key(uid: str, thread_id: str) -> str:
+        return f"{thread_id}:{uid}"
+
+    def _search_state_ann(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        query_vec: list[float],
+        *,
+        type_tag: str,
+        agent_id: str,
+        limit: int,
+    ) -> list[dict[str, object]]:
+        index = get_ann_index("state")
+        if index is None or not index.ready:
+            return []
+        max_k = max(1, int(limit))
+        # Over-fetch: type/status/agent filters are applied in SQL after the ANN probe.
+        hits = index.search(query_vec, max(max_k * 4, max_k + 16), tag=thread_id)
+        prefix = f"{thread_id}:"
+        scores = {key[len(prefix):]: score for key, score in hits if key.startswith(prefix)}
+        if not scores:
+            return []
+        placeholders = ",".join("?" for _ in scores)
+        rows = conn.execute(
+            (
+                "SELECT uid, text, status, type_tag, topic_tags_json FROM state_items "
+                f"WHERE thread_id=? AND uid IN ({placeholders}) AND type_tag=? "
+                "AND status!='superseded' AND agent_id=?"
+            ),
+            (thread_id, *scores, type_tag, agent_id),
+        ).fetchall()
+        ranked = sorted(rows, key=lambda row: scores[str(row["uid"])], reverse=True)[:max_k]
+        result: list[dict[str, object]] = []
+        for row in ranked:
+            topics_raw = json.loads(str(row["topic_tags_json"]) or "[]")
+            result.append(
+                {
+                    "uid": str(row["uid"]),
+                    "text": str(row["text"]),
+                    "status": str(row["status"]),
+                    "type_tag": str(row["type_tag"]),
+                    "topic_tags": [str(tag) for tag in topics_raw if isinstance(tag, str)],
+                    "score": scores[str(row["uid"])],
+                }
+            )
+        return result
+
     @staticmethod
     def _row_to_state_item(row: sqlite3.Row) -> StateItem:
         topic_tags_raw = json.loads(str(row["topic_tags_json"]) or "[]")
@@ -0,0 +1,118 @@
+"""Cached sqlite-vec availability for the write and search hot paths.
+
+On ``DB_ENGINE=postgres`` the same checks look for the pgvector extension, and
+the ``vec0`` statements are mapped to pgvector by :mod:`jarvis.db.postgres`.
+
+Whether ``vec0`` is usable is remembered per connection (connections opened by
+:func:`jarvis.db.connection.connect` carry ``runtime_flags``), the
+``CREATE ... IF NOT EXISTS`` setup for each index family runs once per process
+and database, and a failed extension load is not retried until
+:func:`reset_vec_runtime`. Backfilling rows written while the index was
+unavailable is the job of ``jarvis.tasks.memory.backfill_vector_indexes``.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Callable
+
+from jarvis.config import get_settings
+from jarvis.db.connection import db_target
+
+logger = logging.getLogger(__name__)
+
+VecTableSetup = Callable[[sqlite3.Connection, int], None]
+
+
+def has_vec_module(conn: sqlite3.Connection) -> bool:
+    if getattr(conn, "dialect", "sqlite") == "postgres":
+        query = "SELECT 1 FROM pg_extension WHERE extname='vector' LIMIT 1"
+    else:
+        query = "SELECT 1 FROM pragma_module_list WHERE name='vec0' LIMIT 1"
+    try:
+        row = conn.execute(query).fetchone()
+        return row is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+class VecRuntime:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tables_ready: set[tuple[str, str, int]] = set()
+        self._failed_extensions: set[str] = set()
+        self.setup_runs = 0
+
+    def ensure(self, conn: sqlite3.Connection, scope: str, setup: VecTableSetup) -> bool:
+        """Return True when ``vec0`` and the ``scope`` index tables are usable on ``conn``."""
+        flags: dict[str, bool] | None = getattr(conn, "runtime_flags", None)
+        flag = f"vec:{scope}"
+        if flags is not None and flag in flags:
+            return flags[flag]
+        ready = self._ensure(conn, scope, setup)
+        if flags is not None:
+            flags[flag] = ready
+        return ready
+
+    def _ensure(self, conn: sqlite3.Connection, scope: str, setup: VecTableSetup) -> bool:
+        if not self._load(conn):
+            return False
+        settings = get_settings()
+        dims = max(1, int(settings.memory_embed_dims))
+        key = (db_target(settings), scope, dims)
+        with self._lock:
+            if key in self._tables_ready:
+                return True
+        try:
+            setup(conn, dims)
+        except sqlite3.OperationalError:
+            logger.debug("%s vector runtime table setup failed", scope, exc_info=True)
+            return False
+        with self._lock:
+            self._tables_ready.add(key)
+            self.setup_runs += 1
+        return True
+
+    def _load(self, conn: sqlite3.Connection) -> bool:
+        if has_vec_module(conn):
+            return True
+        if getattr(conn, "dialect", "sqlite") == "postgres":
+            return False
+        extension_path = get_settings().sqlite_vec_extension_path.strip()
+        if not extension_path:
+            return False
+        with self._lock:
+            if extension_path in self._failed_extensions:
+                return False
+        try:
+            conn.enable_load_extension(True)
+            conn.load_extension(extension_path)
+        except (AttributeError, sqlite3.OperationalError):
+            # AttributeError: Python built without SQLITE_ENABLE_LOAD_EXTENSION.
+            logger.debug("sqlite-vec extension load failed", exc_info=True)
+            with self._lock:
+                self._failed_extensions.add(extension_path)
+            return False
+        finally:
+            try:
+                conn.enable_load_extension(False)
+            except (AttributeError, sqlite3.OperationalError):
+                logger.debug("failed to disable sqlite extension loading", exc_info=True)
+        return has_vec_module(conn)
+
+
+_vec_runtime: VecRuntime | None = None
+
+
+def get_vec_runtime() -> VecRuntime:
+    global _vec_runtime
+    if _vec_runtime is None:
+        _vec_runtime = VecRuntime()
+    return _vec_runtime
+
+
+def reset_vec_runtime() -> None:
+    global _vec_runtime
+    _vec_runtime = None
@@ -0,0 +1,173 @@
+"""Per-thread in-memory cache of normalized memory embedding matrices.
+
+``MemoryService`` consults the cache before scanning ``memory_embeddings`` for a
+thread and keeps it current on every write; maintenance jobs drop ids they archive
+or prune. Entries are keyed by database path so separate databases in one process
+never share state. The cache is bounded by an approximate byte budget and evicts
+least-recently-used threads first.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from jarvis.config import get_settings
+from jarvis.memory.scoring import VectorMatrix
+
+
+@dataclass(frozen=True)
+class ThreadVectors:
+    model: str
+    ids: tuple[str, ...]
+    texts: tuple[str, ...]
+    matrix: VectorMatrix
+
+    @property
+    def dims(self) -> int:
+        return self.matrix.dims
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + sum(len(text) for text in self.texts) + 64 * len(self.ids)
+
+
+class ThreadVectorCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: OrderedDict[tuple[str, str], ThreadVectors] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, db: str, thread_id: str, *, dims: int, model: str) -> ThreadVectors | None:
+        key = (db, thread_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.dims != dims or entry.model != model:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, db: str, thread_id: str, entry: ThreadVectors) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store((db, thread_id), entry)
+
+    def append(
+        self,
+        db: str,
+        thread_id: str,
+        *,
+        memory_id: str,
+        text: str,
+        vector: Sequence[float],
+        model: str,
+    ) -> None:
+        """Write-through for a new memory row; threads not in the cache are left alone."""
+        key = (db, thread_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if entry.dims != len(vector) or entry.model != model:
+                self._drop(key)
+                return
+            if memory_id in entry.ids:
+                keep = [idx for idx, mid in enumerate(entry.ids) if mid != memory_id]
+                entry = self._subset(entry, keep)
+            self._store(
+                key,
+                ThreadVectors(
+                    model=entry.model,
+                    ids=(*entry.ids, memory_id),
+                    texts=(*entry.texts, text),
+                    matrix=entry.matrix.appended([vector]),
+                ),
+            )
+
+    def discard(self, db: str, memory_ids: Iterable[str]) -> None:
+        """Remove archived/pruned memory ids from every cached thread of ``db``."""
+        doomed = set(memory_ids)
+        if not doomed:
+            return
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if key[0] != db or doomed.isdisjoint(entry.ids):
+                    continue
+                keep = [idx for idx, mid in enumerate(entry.ids) if mid not in doomed]
+                self._store(key, self._subset(entry, keep))
+
+    def invalidate(self, db: str, thread_id: str | None = None) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == db and (thread_id is None or key[1] == thread_id):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "memory_vector_cache_hits": self.hits,
+                "memory_vector_cache_misses": self.misses,
+                "memory_vector_cache_evictions": self.evictions,
+                "memory_vector_cache_entries": len(self._entries),
+                "memory_vector_cache_bytes": self._bytes,
+                "memory_vector_cache_max_bytes": self.max_bytes,
+            }
+
+    @staticmethod
+    def _subset(entry: ThreadVectors, keep: Sequence[int]) -> ThreadVectors:
+        return ThreadVectors(
+            model=entry.model,
+            ids=tuple(entry.ids[idx] for idx in keep),
+            texts=tuple(entry.texts[idx] for idx in keep),
+            matrix=entry.matrix.subset(keep),
+        )
+
+    def _store(self, key: tuple[str, str], entry: ThreadVectors) -> None:
+        self._drop(key)
+        size = entry.nbytes
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+
+_thread_vector_cache: ThreadVectorCache | None = None
+
+
+def get_thread_vector_cache() -> ThreadVectorCache:
+    global _thread_vector_cache
+    if _thread_vector_cache is None:
+        _thread_vector_cache = ThreadVectorCache(get_settings().memory_vector_cache_max_bytes)
+    return _thread_vector_cache
+
+
+def reset_thread_vector_cache() -> None:
+    global _thread_vector_cache
+    _thread_vector_cache = None
@@ -0,0 +1,184 @@
+"""Packed float32 encoding for stored embedding vectors.
+
+Vectors are stored as a 12-byte header (magic, dims, model fingerprint) followed by
+little-endian float32 values. The header lets readers reject vectors produced by a
+different model or with a different dimensionality without decoding the payload.
+Rows written before the packed format keep their ``vector_json`` text and are
+upgraded lazily by :func:`upgrade_legacy_vectors`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+VECTOR_MAGIC = b"JVF1"
+HEADER = struct.Struct("<4sII")
+HEADER_SIZE = HEADER.size
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def model_fingerprint(model: str) -> int:
+    return zlib.crc32(model.strip().encode("utf-8")) & 0xFFFFFFFF
+
+
+def pack_raw(vector: Sequence[float]) -> bytes:
+    """Headerless little-endian float32 payload (the format sqlite-vec accepts)."""
+    packed = array("f", vector)
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def pack_vector(vector: Sequence[float], model: str) -> bytes:
+    return HEADER.pack(VECTOR_MAGIC, len(vector), model_fingerprint(model)) + pack_raw(vector)
+
+
+def read_header(blob: bytes | memoryview) -> tuple[int, int] | None:
+    """Return ``(dims, model_fingerprint)`` for a packed vector, or None if malformed."""
+    if len(blob) < HEADER_SIZE:
+        return None
+    magic, dims, fingerprint = HEADER.unpack_from(blob)
+    if magic != VECTOR_MAGIC or len(blob) != HEADER_SIZE + dims * 4:
+        return None
+    return int(dims), int(fingerprint)
+
+
+def header_matches(
+    blob: bytes | memoryview,
+    *,
+    dims: int | None = None,
+    model: str | None = None,
+) -> bool:
+    header = read_header(blob)
+    if header is None:
+        return False
+    if dims is not None and header[0] != dims:
+        return False
+    return model is None or header[1] == model_fingerprint(model)
+
+
+def vector_view(
+    blob: bytes | memoryview,
+    *,
+    dims: int | None = None,
+    model: str | None = None,
+) -> memoryview[float] | array[float] | None:
+    """Zero-copy float32 view over a packed vector (a copy only on big-endian hosts)."""
+    if not header_matches(blob, dims=dims, model=model):
+        return None
+    payload = memoryview(blob)[HEADER_SIZE:]
+    if _LITTLE_ENDIAN:
+        return payload.cast("f")
+    swapped = array("f")
+    swapped.frombytes(payload)
+    swapped.byteswap()
+    return swapped
+
+
+def decode_vector(
+    blob: bytes | memoryview,
+    *,
+    dims: int | None = None,
+    model: str | None = None,
+) -> list[float] | None:
+    view = vector_view(blob, dims=dims, model=model)
+    if view is None:
+        return None
+    return list(view.tolist())
+
+
+def decode_legacy_json(raw: object, *, dims: int | None = None) -> list[float] | None:
+    if not isinstance(raw, str) or not raw:
+        return None
+    try:
+        decoded = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(decoded, list):
+        return None
+    vector = [float(item) for item in decoded if isinstance(item, int | float)]
+    if not vector or (dims is not None and len(vector) != dims):
+        return None
+    return vector
+
+
+def load_vector(
+    blob: object,
+    raw_json: object,
+    *,
+    dims: int | None = None,
+    model: str | None = None,
+) -> tuple[list[float] | None, bool]:
+    """Decode a stored vector from either column.
+
+    Returns ``(vector, is_legacy)``; ``is_legacy`` is True when the value came from
+    ``vector_json`` and the row is a candidate for :func:`upgrade_legacy_vectors`.
+    """
+    if isinstance(blob, bytes | memoryview) and len(blob) > 0:
+        return decode_vector(blob, dims=dims, model=model), False
+    vector = decode_legacy_json(raw_json, dims=dims)
+    return vector, vector is not None
+
+
+def upgrade_legacy_vectors(
+    conn: sqlite3.Connection,
+    table: str,
+    key_columns: Sequence[str],
+    rows: Sequence[tuple[Sequence[object], Sequence[float]]],
+    model: str,
+) -> None:
+    """Rewrite legacy ``vector_json`` rows as packed blobs in one statement batch."""
+    if not rows:
+        return
+    where = " AND ".join(f"{column}=?" for column in key_columns)
+    try:
+        conn.executemany(
+            f"UPDATE {table} SET vector_blob=?, vector_json='' WHERE {where}",
+            [(pack_vector(vector, model), *key) for key, vector in rows],
+        )
+    except sqlite3.OperationalError:
+        logger.debug("legacy vector upgrade failed for %s", table, exc_info=True)
+
+
+def decode_rows(
+    conn: sqlite3.Connection,
+    rows: Sequence[sqlite3.Row],
+    *,
+    table: str,
+    key_columns: Sequence[str],
+    row_keys: Sequence[str] | None = None,
+    dims: int | None = None,
+    model: str,
+) -> list[tuple[sqlite3.Row, Sequence[float]]]:
+    """Decode ``vector_blob``/``vector_json`` columns for a batch of rows.
+
+    Packed rows come back as zero-copy float views; rows whose header does not match
+    ``dims``/``model`` are dropped. Legacy JSON rows are upgraded to packed blobs in
+    place once the batch has been decoded.
+    """
+    keys = row_keys or key_columns
+    decoded: list[tuple[sqlite3.Row, Sequence[float]]] = []
+    legacy: list[tuple[Sequence[object], Sequence[float]]] = []
+    for row in rows:
+        blob = row["vector_blob"]
+        if isinstance(blob, bytes) and blob:
+            view = vector_view(blob, dims=dims, model=model)
+            if view is not None:
+                decoded.append((row, view))
+            continue
+        vector = decode_legacy_json(row["vector_json"], dims=dims)
+        if vector is None:
+            continue
+        decoded.append((row, vector))
+        legacy.append((tuple(row[key] for key in keys), vector))
+    upgrade_legacy_vectors(conn, table, key_columns, legacy, model)
+    return decoded
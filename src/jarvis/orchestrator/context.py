@@ -0,0 +1,80 @@
+"""Concurrent context assembly for the agent step.
+
+Before the first model call ``run_agent_step`` gathers several independent
+context sources: the thread summary, active state, retrieved memory, knowledge
+base hits, skills, the agent bundle, the environment block and the repo index.
+:func:`assemble_context` runs them at the same time, each on a worker thread
+holding its own pooled connection, so time-to-first-token tracks the slowest
+source rather than their sum. A source that raises or exceeds
+``PROMPT_CONTEXT_SOURCE_TIMEOUT_SECONDS`` is omitted: its ``default`` is used
+and the failure is recorded in the per-source timings that ``prompt.build``
+reports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Literal
+
+from jarvis.db.connection import get_conn, get_read_conn
+
+logger = logging.getLogger(__name__)
+
+SourceLane = Literal["read", "write"]
+
+
+@dataclass(frozen=True)
+class ContextSource:
+    name: str
+    # Called with a connection from ``lane``, or with no arguments when ``lane`` is None.
+    load: Callable[..., object]
+    default: object
+    lane: SourceLane | None = "read"
+
+
+def _load_on_thread(source: ContextSource) -> object:
+    if source.lane is None:
+        return source.load()
+    conn_factory = get_conn if source.lane == "write" else get_read_conn
+    conn: sqlite3.Connection
+    with conn_factory() as conn:
+        return source.load(conn)
+
+
+async def load_source(
+    source: ContextSource, *, timeout_s: float
+) -> tuple[object, dict[str, object]]:
+    """Run one source off the event loop; return its value (or default) and timing."""
+    started = time.perf_counter()
+    status = "ok"
+    value = source.default
+    try:
+        value = await asyncio.wait_for(asyncio.to_thread(_load_on_thread, source), timeout_s)
+    except TimeoutError:
+        status = "timeout"
+        logger.warning("context source %s timed out after %.1fs", source.name, timeout_s)
+    except Exception as exc:
+        status = "error"
+        logger.warning("context source %s failed: %s: %s", source.name, type(exc).__name__, exc)
+    return value, {
+        "ms": round((time.perf_counter() - started) * 1000.0, 3),
+        "status": status,
+    }
+
+
+async def assemble_context(
+    sources: Iterable[ContextSource], *, timeout_s: float
+) -> tuple[dict[str, object], dict[str, dict[str, object]]]:
+    """Load every source concurrently; return values and timings keyed by source name."""
+    ordered = list(sources)
+    results = await asyncio.gather(
+        *(load_source(source, timeout_s=timeout_s) for source in ordered)
+    )
+    values = {source.name: value for source, (value, _) in zip(ordered, results, strict=True)}
+    timings = {source.name: timing for source, (_, timing) in zip(ordered, results, strict=True)}
+    return values, timings
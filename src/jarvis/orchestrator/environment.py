@@ -0,0 +1,209 @@
+"""Precomputed environment and repo-index blocks for the agent prompt.
+
+Every agent step used to stat the disk, read ``system_state``, load every agent
+bundle for the roster and re-parse ``.jarvis/repo_index.json``. The values
+barely change, so :class:`EnvironmentContext` keeps them in an immutable
+:class:`EnvironmentSnapshot` and refreshes each part only when it is stale:
+
+* host facts (disk free, platform) every ``ENVIRONMENT_REFRESH_SECONDS``;
+* lockdown/restart flags when ``system_state`` is written in-process (see
+  ``mark_system_state_changed``), or after the refresh interval for writers in
+  other processes;
+* the agent roster when ``agent_root_signature`` changes;
+* the repo index block when the index file's mtime or size changes.
+
+Only the current time is computed per step.
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import shutil
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from pathlib import Path
+
+from jarvis.agents.loader import agent_root_signature, load_agent_registry
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import get_system_state, system_state_generation
+from jarvis.repo_index import read_repo_index
+from jarvis.repo_index.builder import REPO_INDEX_DIR, REPO_INDEX_FILE
+
+_ROLE_HINTS = {
+    "main": "coordinator",
+    "coder": "code implementation",
+    "researcher": "web research",
+    "planner": "task planning",
+    "tester": "test quality",
+    "lintfixer": "lint & typecheck fixes",
+    "api_guardian": "API contracts & auth",
+    "data_migrator": "database migrations",
+    "web_builder": "frontend UI",
+    "security_reviewer": "security audits",
+    "docs_keeper": "documentation",
+    "release_ops": "release operations",
+    "dependency_steward": "dependency management",
+    "release_candidate": "release readiness",
+    "user_simulator": "user-story simulation",
+}
+
+
+@dataclass(frozen=True)
+class EnvironmentSnapshot:
+    host_line: str
+    state_line: str
+    roster_line: str
+
+    def render(self, now: str) -> str:
+        return (
+            f"Current time: {now}\n"
+            f"Host machine: {self.host_line}\n"
+            f"System state: {self.state_line}\n"
+            f"Available agents: {self.roster_line}\n"
+            "Reminder: Handle simple requests directly. "
+            "Only delegate when the task genuinely requires a specialist."
+        )
+
+
+def _host_line() -> str:
+    disk_free_gb = shutil.disk_usage("/").free // (1024**3)
+    return (
+        f"hostname={platform.node() or 'unknown'}, "
+        f"os={platform.system()} {platform.release()}, "
+        f"python={platform.python_version()}, "
+        f"working_dir={os.getcwd()}, "
+        f"disk_free={disk_free_gb}GB"
+    )
+
+
+def _state_line() -> str:
+    with get_conn() as conn:
+        state = get_system_state(conn)
+    return (
+        f"lockdown={'on' if int(state['lockdown']) == 1 else 'off'}, "
+        f"restarting={'yes' if int(state['restarting']) == 1 else 'no'}"
+    )
+
+
+def _roster_line(agent_root: Path) -> str:
+    try:
+        bundles = load_agent_registry(agent_root)
+    except RuntimeError:
+        return "unavailable"
+    roster_items = [
+        f"{agent_id} ({_ROLE_HINTS.get(agent_id, 'specialist')})" for agent_id in sorted(bundles)
+    ]
+    return ", ".join(roster_items) if roster_items else "none"
+
+
+def _repo_index_block(repo_root: Path) -> str:
+    payload = read_repo_index(repo_root)
+    if not isinstance(payload, dict):
+        return ""
+    entrypoints = payload.get("entrypoints")
+    protected = payload.get("protected_modules")
+    invariants = payload.get("invariant_checks")
+    lines = ["[repo_index]"]
+    if isinstance(entrypoints, list) and entrypoints:
+        lines.append("entrypoints: " + ", ".join(str(item) for item in entrypoints[:8]))
+    if isinstance(protected, list) and protected:
+        lines.append("protected_modules: " + ", ".join(str(item) for item in protected[:10]))
+    if isinstance(invariants, list) and invariants:
+        lines.append("invariants: " + ", ".join(str(item) for item in invariants[:10]))
+    return "\n".join(lines)
+
+
+class EnvironmentContext:
+    def __init__(self, *, agent_root: Path = Path("agents")) -> None:
+        self._agent_root = agent_root
+        self._lock = threading.Lock()
+        self._snapshot: EnvironmentSnapshot | None = None
+        self._host_at = 0.0
+        self._state_at = 0.0
+        self._state_generation = -1
+        self._roster_signature: tuple[object, ...] | None = None
+        self._repo_index_key: tuple[str, int, int] | None = None
+        self._repo_index = ""
+        self._requests = 0
+        self._refreshes = {"host": 0, "state": 0, "roster": 0, "repo_index": 0}
+
+    def snapshot(self) -> EnvironmentSnapshot:
+        """Return the current snapshot, refreshing only the parts that went stale."""
+        interval = max(0.0, float(get_settings().environment_refresh_seconds))
+        with self._lock:
+            self._requests += 1
+            now = time.monotonic()
+            snapshot = self._snapshot or EnvironmentSnapshot("", "", "")
+            updates: dict[str, str] = {}
+            if self._snapshot is None or now - self._host_at >= interval:
+                updates["host_line"] = _host_line()
+                self._host_at = now
+                self._refreshes["host"] += 1
+            generation = system_state_generation()
+            if (
+                self._snapshot is None
+                or generation != self._state_generation
+                or now - self._state_at >= interval
+            ):
+                updates["state_line"] = _state_line()
+                self._state_at = now
+                self._state_generation = generation
+                self._refreshes["state"] += 1
+            signature = agent_root_signature(self._agent_root)
+            if self._snapshot is None or signature != self._roster_signature:
+                updates["roster_line"] = _roster_line(self._agent_root)
+                self._roster_signature = signature
+                self._refreshes["roster"] += 1
+            if updates:
+                snapshot = replace(snapshot, **updates)
+                self._snapshot = snapshot
+            return snapshot
+
+    def environment_block(self) -> str:
+        return self.snapshot().render(datetime.now(UTC).isoformat())
+
+    def repo_index_block(self, repo_root: Path | None = None) -> str:
+        path = (repo_root or Path.cwd()) / REPO_INDEX_DIR / REPO_INDEX_FILE
+        try:
+            stat = path.stat()
+            key: tuple[str, int, int] | None = (str(path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        with self._lock:
+            if key is None:
+                self._repo_index_key = None
+                self._repo_index = ""
+            elif key != self._repo_index_key:
+                self._repo_index = _repo_index_block(path.parent.parent)
+                self._repo_index_key = key
+                self._refreshes["repo_index"] += 1
+            return self._repo_index
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "environment_snapshot_requests": self._requests,
+                **{
+                    f"environment_{part}_refreshes": count
+                    for part, count in self._refreshes.items()
+                },
+            }
+
+
+_environment_context: EnvironmentContext | None = None
+
+
+def get_environment_context() -> EnvironmentContext:
+    global _environment_context
+    if _environment_context is None:
+        _environment_context = EnvironmentContext()
+    return _environment_context
+
+
+def reset_environment_context() -> None:
+    global _environment_context
+    _environment_context = None
@@ -0,0 +1,82 @@
+"""Prompt-prefix cache telemetry.
+
+``build_prompt_with_report`` renders each agent's system prompt as a byte-stable
+prefix (persona, identity policy, repo index, tooling, safety) followed by the
+volatile environment block, and hashes the prefix. ``run_agent_step`` records
+that hash per agent here, so ``prompt_cache_prefix_changes`` counts the builds
+that invalidated provider prefix caches, and records the prompt / cached token
+counts providers report back. ``/metrics`` exposes them as ``prompt_cache_*``.
+"""
+
+from __future__ import annotations
+
+import threading
+
+
+class PromptCacheStats:
+    def __init__(self) -> None:
+        self._prefixes: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._builds = 0
+        self._changes = 0
+        self._model_calls = 0
+        self._reported_calls = 0
+        self._hit_calls = 0
+        self._prompt_tokens = 0
+        self._cached_tokens = 0
+
+    def record_prefix(self, actor_id: str, prefix_sha256: str) -> bool:
+        """Remember an agent's prefix hash; true when it differs from the last one."""
+        with self._lock:
+            self._builds += 1
+            previous = self._prefixes.get(actor_id)
+            self._prefixes[actor_id] = prefix_sha256
+            changed = previous is not None and previous != prefix_sha256
+            if changed:
+                self._changes += 1
+            return changed
+
+    def record_usage(self, usage: dict[str, int]) -> None:
+        with self._lock:
+            self._model_calls += 1
+            if "prompt_tokens" not in usage:
+                return
+            self._reported_calls += 1
+            cached = int(usage.get("cached_tokens", 0))
+            self._prompt_tokens += int(usage["prompt_tokens"])
+            self._cached_tokens += cached
+            if cached > 0:
+                self._hit_calls += 1
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "prompt_cache_agents": len(self._prefixes),
+                "prompt_cache_prefix_builds": self._builds,
+                "prompt_cache_prefix_changes": self._changes,
+                "prompt_cache_model_calls": self._model_calls,
+                "prompt_cache_reported_calls": self._reported_calls,
+                "prompt_cache_hit_calls": self._hit_calls,
+                "prompt_cache_prompt_tokens": self._prompt_tokens,
+                "prompt_cache_cached_tokens": self._cached_tokens,
+                "prompt_cache_hit_ratio": (
+                    round(self._cached_tokens / self._prompt_tokens, 4)
+                    if self._prompt_tokens
+                    else 0.0
+                ),
+            }
+
+
+_prompt_cache_stats: PromptCacheStats | None = None
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    global _prompt_cache_stats
+    if _prompt_cache_stats is None:
+        _prompt_cache_stats = PromptCacheStats()
+    return _prompt_cache_stats
+
+
+def reset_prompt_cache_stats() -> None:
+    global _prompt_cache_stats
+    _prompt_cache_stats = None
@@ -1,24 +1,23 @@
 """Agent step loop implementation."""
 
+import asyncio
 import json
 import logging
-import os
-import platform
 import re
-import shutil
 import sqlite3
+import time
 import unicodedata
 from collections.abc import Callable
 from datetime import UTC, datetime
 from hashlib import sha256
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
-from jarvis.agents.loader import load_agent_bundle_cached, load_agent_registry
+from jarvis.agents.loader import load_agent_bundle_cached
 from jarvis.agents.types import AgentBundle
 from jarvis.commands.service import maybe_execute_command
 from jarvis.config import get_settings
-from jarvis.db.queries import get_system_state, insert_message
+from jarvis.db.queries import insert_message
 from jarvis.errors import ProviderError
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
@@ -27,12 +26,17 @@ from jarvis.memory.knowledge import KnowledgeBaseService
 from jarvis.memory.service import MemoryService
 from jarvis.memory.skills import SkillsService
 from jarvis.memory.state_extractor import extract_state_items
+from jarvis.memory.state_items import StateItem
 from jarvis.memory.state_renderer import render_state_section
 from jarvis.memory.state_store import StateStore
+from jarvis.orchestrator.context import ContextSource, assemble_context, load_source
+from jarvis.orchestrator.environment import get_environment_context
 from jarvis.orchestrator.prompt_builder import build_prompt_with_report, estimate_tokens
+from jarvis.orchestrator.prompt_cache import get_prompt_cache_stats
+from jarvis.orchestrator.streaming import DeltaRelay, StreamPublish
+from jarvis.providers.base import CACHE_KEY_FIELD
 from jarvis.providers.factory import resolve_primary_provider_name
 from jarvis.providers.router import ProviderRouter
-from jarvis.repo_index import read_repo_index
 from jarvis.tools.runtime import ToolRuntime
 
 MAX_TOOL_ITERATIONS = 8
@@ -299,73 +303,11 @@ def _load_agent_bundle(actor_id: str) -> AgentBundle | None:
 
 
 def _repo_index_context() -> str:
-    payload = read_repo_index(Path.cwd())
-    if not isinstance(payload, dict):
-        return ""
-    entrypoints = payload.get("entrypoints")
-    protected = payload.get("protected_modules")
-    invariants = payload.get("invariant_checks")
-    lines = ["[repo_index]"]
-    if isinstance(entrypoints, list) and entrypoints:
-        lines.append("entrypoints: " + ", ".join(str(item) for item in entrypoints[:8]))
-    if isinstance(protected, list) and protected:
-        lines.append("protected_modules: " + ", ".join(str(item) for item in protected[:10]))
-    if isinstance(invariants, list) and invariants:
-        lines.append("invariants: " + ", ".join(str(item) for item in invariants[:10]))
-    return "\n".join(lines)
-
-
-def _build_environment_context(conn: sqlite3.Connection) -> str:
-    now = datetime.now(UTC).isoformat()
-    disk_free_gb = shutil.disk_usage("/").free // (1024**3)
-    host_line = (
-        f"hostname={platform.node() or 'unknown'}, "
-        f"os={platform.system()} {platform.release()}, "
-        f"python={platform.python_version()}, "
-        f"working_dir={os.getcwd()}, "
-        f"disk_free={disk_free_gb}GB"
-    )
-    state = get_system_state(conn)
-    state_line = (
-        f"lockdown={'on' if int(state['lockdown']) == 1 else 'off'}, "
-        f"restarting={'yes' if int(state['restarting']) == 1 else 'no'}"
-    )
-    role_hints = {
-        "main": "coordinator",
-        "coder": "code implementation",
-        "researcher": "web research",
-        "planner": "task planning",
-        "tester": "test quality",
-        "lintfixer": "lint & typecheck fixes",
-        "api_guardian": "API contracts & auth",
-        "data_migrator": "database migrations",
-        "web_builder": "frontend UI",
-        "security_reviewer": "security audits",
-        "docs_keeper": "documentation",
-        "release_ops": "release operations",
-        "dependency_steward": "dependency management",
-        "release_candidate": "release readiness",
-        "user_simulator": "user-story simulation",
-    }
-    roster_line = "none"
-    try:
-        bundles = load_agent_registry(Path("agents"))
-        roster_items = []
-        for agent_id in sorted(bundles.keys()):
-            role = role_hints.get(agent_id, "specialist")
-            roster_items.append(f"{agent_id} ({role})")
-        roster_line = ", ".join(roster_items) if roster_items else "none"
-    except RuntimeError:
-        roster_line = "unavailable"
+    return get_environment_context().repo_index_block()
 
-    return (
-        f"Current time: {now}\n"
-        f"Host machine: {host_line}\n"
-        f"System state: {state_line}\n"
-        f"Available agents: {roster_line}\n"
-        "Reminder: Handle simple requests directly. "
-        "Only delegate when the task genuinely requires a specialist."
-    )
+
+def _build_environment_context() -> str:
+    return get_environment_context().environment_block()
 
 
 def _update_heartbeat(actor_id: str, message: str) -> None:
@@ -418,6 +360,123 @@ def _tool_loop_terminal_fallback_message(trace_id: str) -> str:
     )
 
 
+def _kb_context(conn: sqlite3.Connection, query_text: str) -> list[str]:
+    kb = KnowledgeBaseService()
+    if query_text:
+        kb_items = kb.search(conn, query=query_text, limit=2)
+    else:
+        kb_items = kb.list_docs(conn, limit=2)
+    return [f"[kb:{item['title']}] {item['content']}" for item in kb_items]
+
+
+def _skill_catalog(
+    conn: sqlite3.Connection, actor_id: str, query_text: str
+) -> list[dict[str, object]]:
+    skills = SkillsService()
+    items = list(skills.get_pinned(conn, scope=actor_id))
+    if query_text:
+        items.extend(skills.search(conn, query=query_text, scope=actor_id, limit=2))
+    skill_catalog: list[dict[str, object]] = []
+    seen_skill_slugs: set[str] = set()
+    for item in items:
+        slug = str(item.get("slug", "")).strip()
+        if not slug or slug in seen_skill_slugs:
+            continue
+        seen_skill_slugs.add(slug)
+        skill_catalog.append(
+            {
+                "slug": slug,
+                "title": str(item.get("title", "")).strip(),
+                "scope": str(item.get("scope", actor_id)),
+                "pinned": bool(item.get("pinned", False)),
+            }
+        )
+    return skill_catalog
+
+
+async def _run_state_extraction(
+    conn: sqlite3.Connection,
+    router: ProviderRouter,
+    memory: MemoryService,
+    thread_id: str,
+    trace_id: str,
+    actor_id: str,
+    notify_fn: Callable[[str, dict[str, object]], None] | None,
+) -> bool:
+    try:
+        extraction_result = await extract_state_items(
+            conn=conn,
+            thread_id=thread_id,
+            router=router,
+            memory=memory,
+            actor_id=actor_id,
+        )
+        extraction_payload = {
+            "thread_id": thread_id,
+            "actor_id": actor_id,
+            "items_extracted": extraction_result.items_extracted,
+            "items_merged": extraction_result.items_merged,
+            "items_conflicted": extraction_result.items_conflicted,
+            "items_dropped": extraction_result.items_dropped,
+            "duration_ms": extraction_result.duration_ms,
+            "skipped_reason": extraction_result.skipped_reason,
+        }
+        logger.info(
+            "State extraction result: %s",
+            json.dumps(extraction_payload, sort_keys=True),
+        )
+        if notify_fn is not None:
+            notify_fn("state.extraction.complete", extraction_payload)
+        emit_event(
+            conn,
+            EventInput(
+                trace_id=trace_id,
+                span_id=new_id("spn"),
+                parent_span_id=None,
+                thread_id=thread_id,
+                event_type="state.extraction.complete",
+                component="memory",
+                actor_type="agent",
+                actor_id=actor_id,
+                payload_json=json.dumps(extraction_payload),
+                payload_redacted_json=json.dumps(redact_payload(extraction_payload)),
+            ),
+        )
+        return True
+    except Exception as exc:
+        extraction_failure_payload: dict[str, object] = {
+            "thread_id": thread_id,
+            "actor_id": actor_id,
+            "error": f"{type(exc).__name__}: {exc}",
+        }
+        extraction_failure_payload.update(
+            _extract_primary_failure_fields(str(extraction_failure_payload["error"]))
+        )
+        logger.warning(
+            "Structured state extraction failed thread=%s error=%s",
+            thread_id,
+            extraction_failure_payload["error"],
+        )
+        if notify_fn is not None:
+            notify_fn("state.extraction.failed", extraction_failure_payload)
+        emit_event(
+            conn,
+            EventInput(
+                trace_id=trace_id,
+                span_id=new_id("spn"),
+                parent_span_id=None,
+                thread_id=thread_id,
+                event_type="state.extraction.failed",
+                component="memory",
+                actor_type="agent",
+                actor_id=actor_id,
+                payload_json=json.dumps(extraction_failure_payload),
+                payload_redacted_json=json.dumps(redact_payload(extraction_failure_payload)),
+            ),
+        )
+        return False
+
+
 async def run_agent_step(
     conn: sqlite3.Connection,
     router: ProviderRouter,
@@ -426,6 +485,7 @@ async def run_agent_step(
     trace_id: str,
     actor_id: str = "main",
     notify_fn: Callable[[str, dict[str, object]], None] | None = None,
+    stream_fn: StreamPublish | None = None,
 ) -> str:
     settings = get_settings()
     admin_ids = {item.strip() for item in settings.admin_whatsapp_ids.split(",") if item.strip()}
@@ -477,7 +537,14 @@ async def run_agent_step(
             admin_ids=admin_ids,
         )
         if command_result is not None:
-            command_message_id = insert_message(conn, thread_id, "assistant", command_result)
+            command_message_id = insert_message(
+                conn,
+                thread_id,
+                "assistant",
+                command_result,
+                actor_id=actor_id,
+                trace_id=trace_id,
+            )
             _enqueue_memory_index(
                 trace_id=trace_id,
                 thread_id=thread_id,
@@ -510,134 +577,86 @@ async def run_agent_step(
             return command_message_id
 
     memory = MemoryService()
-    summaries = memory.thread_summary(conn, thread_id)
     state_store = StateStore()
-    if int(settings.state_extraction_enabled) == 1:
-        try:
-            extraction_result = await extract_state_items(
-                conn=conn,
-                thread_id=thread_id,
-                router=router,
-                memory=memory,
-                actor_id=actor_id,
-            )
-            extraction_payload = {
-                "thread_id": thread_id,
-                "actor_id": actor_id,
-                "items_extracted": extraction_result.items_extracted,
-                "items_merged": extraction_result.items_merged,
-                "items_conflicted": extraction_result.items_conflicted,
-                "items_dropped": extraction_result.items_dropped,
-                "duration_ms": extraction_result.duration_ms,
-                "skipped_reason": extraction_result.skipped_reason,
-            }
-            logger.info(
-                "State extraction result: %s",
-                json.dumps(extraction_payload, sort_keys=True),
-            )
-            if notify_fn is not None:
-                notify_fn("state.extraction.complete", extraction_payload)
-            emit_event(
-                conn,
-                EventInput(
-                    trace_id=trace_id,
-                    span_id=new_id("spn"),
-                    parent_span_id=None,
-                    thread_id=thread_id,
-                    event_type="state.extraction.complete",
-                    component="memory",
-                    actor_type="agent",
-                    actor_id=actor_id,
-                    payload_json=json.dumps(extraction_payload),
-                    payload_redacted_json=json.dumps(redact_payload(extraction_payload)),
-                ),
+    source_timeout_s = max(0.1, float(settings.prompt_context_source_timeout_seconds))
+    state_limit = max(1, int(settings.state_max_active_items))
+
+    async def _state_context() -> tuple[object, dict[str, dict[str, object]]]:
+        # Extraction writes the items the active-state read returns, so these two stay ordered.
+        timings: dict[str, dict[str, object]] = {}
+        if int(settings.state_extraction_enabled) == 1:
+            started = time.perf_counter()
+            extracted = await _run_state_extraction(
+                conn, router, memory, thread_id, trace_id, actor_id, notify_fn
             )
-        except Exception as exc:
-            extraction_failure_payload: dict[str, object] = {
-                "thread_id": thread_id,
-                "actor_id": actor_id,
-                "error": f"{type(exc).__name__}: {exc}",
+            timings["state_extraction"] = {
+                "ms": round((time.perf_counter() - started) * 1000.0, 3),
+                "status": "ok" if extracted else "error",
             }
-            extraction_failure_payload.update(
-                _extract_primary_failure_fields(str(extraction_failure_payload["error"]))
-            )
-            logger.warning(
-                "Structured state extraction failed thread=%s error=%s",
-                thread_id,
-                extraction_failure_payload["error"],
-            )
-            if notify_fn is not None:
-                notify_fn("state.extraction.failed", extraction_failure_payload)
-            emit_event(
-                conn,
-                EventInput(
-                    trace_id=trace_id,
-                    span_id=new_id("spn"),
-                    parent_span_id=None,
-                    thread_id=thread_id,
-                    event_type="state.extraction.failed",
-                    component="memory",
-                    actor_type="agent",
-                    actor_id=actor_id,
-                    payload_json=json.dumps(extraction_failure_payload),
-                    payload_redacted_json=json.dumps(redact_payload(extraction_failure_payload)),
-                ),
-            )
-    active_state_items = state_store.get_active_items(
-        conn, thread_id, limit=max(1, int(settings.state_max_active_items))
-    )
-    structured_state = render_state_section(active_state_items)
-    retrieved = [str(item.get("text", "")) for item in memory.search(conn, thread_id, limit=8)]
-    kb_context: list[str] = []
-    if actor_id == "main":
-        kb = KnowledgeBaseService()
-        if query_text:
-            kb_items = kb.search(conn, query=query_text, limit=2)
-        else:
-            kb_items = kb.list_docs(conn, limit=2)
-        kb_context = [f"[kb:{item['title']}] {item['content']}" for item in kb_items]
+        active, timings["state"] = await load_source(
+            ContextSource(
+                "state",
+                lambda c: state_store.get_active_items(c, thread_id, limit=state_limit),
+                default=[],
+                lane="write",
+            ),
+            timeout_s=source_timeout_s,
+        )
+        return active, timings
 
-    skills = SkillsService()
-    pinned_skills = skills.get_pinned(conn, scope=actor_id)
-    skill_catalog: list[dict[str, object]] = []
-    seen_skill_slugs: set[str] = set()
-    for item in pinned_skills:
-        slug = str(item.get("slug", "")).strip()
-        if not slug or slug in seen_skill_slugs:
-            continue
-        seen_skill_slugs.add(slug)
-        skill_catalog.append(
-            {
-                "slug": slug,
-                "title": str(item.get("title", "")).strip(),
-                "scope": str(item.get("scope", actor_id)),
-                "pinned": bool(item.get("pinned", False)),
-            }
+    sources = [
+        ContextSource(
+            "summary",
+            lambda c: memory.thread_summary(c, thread_id),
+            default={"short": "", "long": ""},
+        ),
+        ContextSource(
+            "memory", lambda c: memory.search(c, thread_id, limit=8, emit=False), default=[]
+        ),
+        ContextSource(
+            "skills", lambda c: _skill_catalog(c, actor_id, query_text), default=[]
+        ),
+        ContextSource(
+            "agent",
+            lambda: (_load_agent_bundle(actor_id), _load_agent_context(actor_id)),
+            default=(None, ""),
+            lane=None,
+        ),
+        ContextSource("environment", _build_environment_context, default="", lane=None),
+        ContextSource("repo_index", _repo_index_context, default="", lane=None),
+    ]
+    if actor_id == "main":
+        sources.append(
+            ContextSource("kb", lambda c: _kb_context(c, query_text), default=[])
         )
-    if query_text:
-        related_skills = skills.search(conn, query=query_text, scope=actor_id, limit=2)
-        for item in related_skills:
-            slug = str(item.get("slug", "")).strip()
-            if not slug or slug in seen_skill_slugs:
-                continue
-            seen_skill_slugs.add(slug)
-            skill_catalog.append(
-                {
-                    "slug": slug,
-                    "title": str(item.get("title", "")).strip(),
-                    "scope": str(item.get("scope", actor_id)),
-                    "pinned": bool(item.get("pinned", False)),
-                }
-            )
-    bundle = _load_agent_bundle(actor_id)
-    agent_context = _load_agent_context(actor_id) or f"You are Jarvis {actor_id} agent."
+    assembly_started = time.perf_counter()
+    (context, source_timings), (state_items, state_timings) = await asyncio.gather(
+        assemble_context(sources, timeout_s=source_timeout_s), _state_context()
+    )
+    context_assembly_ms = round((time.perf_counter() - assembly_started) * 1000.0, 3)
+    context_sources = {**source_timings, **state_timings}
+
+    summaries = cast(dict[str, str], context["summary"])
+    active_state_items = cast(list[StateItem], state_items)
+    structured_state = render_state_section(active_state_items)
+    retrieved_items = cast(list[dict[str, object]], context["memory"])
+    # The read lane cannot write, so the retrieval event is recorded here.
+    memory.record_retrieval(conn, thread_id, retrieved_items, limit=8)
+    retrieved = [str(item.get("text", "")) for item in retrieved_items]
+    kb_context = cast(list[str], context.get("kb", []))
+    skill_catalog = cast(list[dict[str, object]], context["skills"])
+    bundle, loaded_agent_context = cast(tuple[AgentBundle | None, str], context["agent"])
+    agent_context = loaded_agent_context or f"You are Jarvis {actor_id} agent."
     max_actions_per_step = bundle.max_actions_per_step if bundle is not None else 6
     action_calls_used = 0
     agent_context = f"{agent_context}\n\n{IDENTITY_POLICY}"
-    agent_context = f"{agent_context}\n\n[environment]\n{_build_environment_context(conn)}"
-    repo_idx = _repo_index_context()
+    repo_idx = str(context["repo_index"])
     if repo_idx:
         agent_context = f"{agent_context}\n\n{repo_idx}"
+    # The environment block embeds the clock and host state, so it goes after
+    # the cacheable system prefix rather than inside it.
+    environment_context = str(context["environment"])
+    volatile_context = f"[environment]\n{environment_context}" if environment_context else ""
 
     primary_provider = resolve_primary_provider_name(settings)
     token_budget = (
@@ -668,6 +687,7 @@ async def run_agent_step(
         prompt_mode=prompt_mode,
         available_tools=tool_context,
         skill_catalog=skill_catalog,
+        volatile_context=volatile_context,
     )
     prompt_report_payload = {
         **prompt_report,
@@ -676,6 +696,11 @@ async def run_agent_step(
         "thread_id": thread_id,
         "tool_count": len(tool_context),
         "skill_count": len(skill_catalog),
+        "context_assembly_ms": context_assembly_ms,
+        "context_sources": context_sources,
+        "prefix_changed": get_prompt_cache_stats().record_prefix(
+            actor_id, str(prompt_report["prefix_sha256"])
+        ),
     }
     logger.info("Prompt build report: %s", json.dumps(prompt_report_payload, sort_keys=True))
     if notify_fn is not None:
@@ -722,10 +747,15 @@ async def run_agent_step(
             prompt_mode=prompt_mode,
             available_tools=tool_context,
             skill_catalog=skill_catalog,
+            volatile_context=volatile_context,
         )
 
     convo: list[dict[str, str]] = [
-        {"role": "system", "content": system_prompt},
+        {
+            "role": "system",
+            "content": system_prompt,
+            CACHE_KEY_FIELD: str(prompt_report["prefix_sha256"]),
+        },
         {"role": "user", "content": user_prompt},
     ]
     lane = "primary"
@@ -733,6 +763,11 @@ async def run_agent_step(
     final_text = ""
     tool_iteration_exhausted = False
     degraded_reason: str | None = None
+    relay = (
+        DeltaRelay(stream_fn, flush_interval_s=settings.model_stream_flush_ms / 1000.0)
+        if stream_fn is not None
+        else None
+    )
     for step_idx in range(MAX_TOOL_ITERATIONS + 1):
         if notify_fn is not None:
             notify_fn("model.run.start", {"iteration": step_idx})
@@ -754,12 +789,23 @@ async def run_agent_step(
             ),
         )
         try:
-            model_resp, lane, primary_error = await router.generate(
-                convo,
-                tools=tool_schemas,
-                priority="normal" if actor_id == "main" else "low",
-            )
+            if relay is not None:
+                relay.start(step_idx)
+                model_resp, lane, primary_error = await router.generate_stream(
+                    convo,
+                    relay,
+                    tools=tool_schemas,
+                    priority="normal" if actor_id == "main" else "low",
+                )
+            else:
+                model_resp, lane, primary_error = await router.generate(
+                    convo,
+                    tools=tool_schemas,
+                    priority="normal" if actor_id == "main" else "low",
+                )
         except ProviderError as exc:
+            if relay is not None:
+                await relay.finish(final=True)
             run_error_payload: dict[str, object] = {
                 "iteration": step_idx,
                 "error": str(exc),
@@ -785,7 +831,9 @@ async def run_agent_step(
             final_text = DEGRADED_RESPONSE
             lane = "degraded"
             break
-        run_end_payload: dict[str, object] = {"iteration": step_idx, "lane": lane}
+        usage = dict(getattr(model_resp, "usage", None) or {})
+        get_prompt_cache_stats().record_usage(usage)
+        run_end_payload: dict[str, object] = {"iteration": step_idx, "lane": lane, **usage}
         if primary_error:
             run_end_payload["primary_error"] = primary_error[:500]
             run_end_payload.update(_extract_primary_failure_fields(primary_error))
@@ -909,6 +957,8 @@ async def run_agent_step(
             },
         )
         final_text = _strip_control_tokens(_enforce_identity_policy(stripped_text))
+        if relay is not None:
+            await relay.finish(final=not parsed_tool_calls or step_idx >= MAX_TOOL_ITERATIONS)
 
         if not parsed_tool_calls:
             break
@@ -917,6 +967,7 @@ async def run_agent_step(
             break
 
         convo.append({"role": "assistant", "content": stripped_text})
+        admitted_calls: list[dict[str, Any]] = []
         for tool_call in parsed_tool_calls:
             if action_calls_used >= max_actions_per_step:
                 deny_payload = {
@@ -942,6 +993,9 @@ async def run_agent_step(
                 )
                 break
             action_calls_used += 1
+            admitted_calls.append(tool_call)
+
+        async def _run_tool_call(tool_call: dict[str, Any], step_idx: int = step_idx) -> str:
             tool_name = str(tool_call.get("name", ""))
             raw_args = tool_call.get("arguments", {})
             arguments = raw_args if isinstance(raw_args, dict) else {}
@@ -1035,7 +1089,57 @@ async def run_agent_step(
                         "result_char_count": len(tool_error_memory_text),
                     },
                 )
+            return payload
+
+        # Independent calls run concurrently (see ToolRegistry.plan_batches); results
+        # are appended to the conversation in the order the model issued them.
+        async def _run_lane(
+            lane: list[int], calls: list[dict[str, Any]] = admitted_calls
+        ) -> list[tuple[int, str, float]]:
+            done: list[tuple[int, str, float]] = []
+            for call_idx in lane:
+                call_started = time.perf_counter()
+                call_payload = await _run_tool_call(calls[call_idx])
+                done.append((call_idx, call_payload, (time.perf_counter() - call_started) * 1000.0))
+            return done
+
+        tool_batches = runtime.registry.plan_batches(
+            [str(tool_call.get("name", "")) for tool_call in admitted_calls]
+        )
+        tool_payloads = [""] * len(admitted_calls)
+        tool_ms_total = 0.0
+        tools_started = time.perf_counter()
+        for tool_batch in tool_batches:
+            for lane_results in await asyncio.gather(*(_run_lane(lane) for lane in tool_batch)):
+                for call_idx, call_payload, elapsed_ms in lane_results:
+                    tool_payloads[call_idx] = call_payload
+                    tool_ms_total += elapsed_ms
+        for payload in tool_payloads:
             convo.append({"role": "user", "content": f"[tool_result] {payload}"})
+        if admitted_calls:
+            tool_batch_payload: dict[str, object] = {
+                "iteration": step_idx,
+                "tool_count": len(admitted_calls),
+                "batches": len(tool_batches),
+                "max_parallel": max(len(tool_batch) for tool_batch in tool_batches),
+                "wall_ms": round((time.perf_counter() - tools_started) * 1000.0, 3),
+                "tool_ms_total": round(tool_ms_total, 3),
+            }
+            emit_event(
+                conn,
+                EventInput(
+                    trace_id=trace_id,
+                    span_id=new_id("spn"),
+                    parent_span_id=None,
+                    thread_id=thread_id,
+                    event_type="tool.batch.end",
+                    component="orchestrator",
+                    actor_type="agent",
+                    actor_id=actor_id,
+                    payload_json=json.dumps(tool_batch_payload),
+                    payload_redacted_json=json.dumps(redact_payload(tool_batch_payload)),
+                ),
+            )
 
     if final_text.strip() == PLACEHOLDER_RESPONSE or tool_iteration_exhausted:
         for retry_idx in range(FALLBACK_ONLY_RETRIES):
@@ -1100,10 +1204,13 @@ async def run_agent_step(
                 degraded_reason = "provider_error_terminal_synthesis"
                 lane = "degraded"
                 break
+            retry_usage = dict(getattr(retry_resp, "usage", None) or {})
+            get_prompt_cache_stats().record_usage(retry_usage)
             run_end_payload = {
                 "iteration": synthetic_iteration,
                 "lane": retry_lane,
                 "terminal_synthesis": True,
+                **retry_usage,
             }
             if retry_primary_error:
                 run_end_payload["primary_error"] = retry_primary_error[:500]
@@ -1269,7 +1376,9 @@ async def run_agent_step(
         )
 
     message_role = "assistant" if actor_id == "main" else "agent"
-    message_id = insert_message(conn, thread_id, message_role, final_text)
+    message_id = insert_message(
+        conn, thread_id, message_role, final_text, actor_id=actor_id, trace_id=trace_id
+    )
     _enqueue_memory_index(
         trace_id=trace_id,
         thread_id=thread_id,
@@ -0,0 +1,173 @@
+"""Incremental delivery of the main agent's answer while it is generated.
+
+``run_agent_step`` hands a :class:`DeltaRelay` to ``ProviderRouter.generate_stream``.
+The relay coalesces provider text deltas into frames at most every
+``MODEL_STREAM_FLUSH_MS`` and publishes three envelope types:
+
+* ``message.delta`` – ``delta`` is the newly released text, ``text`` everything
+  released so far in this iteration;
+* ``message.stream.reset`` – drop the partial text (a provider retry or
+  fallback is about to start over);
+* ``message.stream.end`` – the iteration finished; ``final`` is false when the
+  model asked for tools, in which case the partial text is not the answer.
+
+Frames are previews: the persisted ``message.new`` stays authoritative, since
+control tokens, identity policy and embedded tool payloads are only resolved on
+the complete text. Text from a ``{"`` or ``<|`` onwards is held back for the rest
+of the iteration, so a tool-call payload leaked into plain text is never shown.
+
+:class:`StreamBus` fans frames out to in-process listeners (the WebSocket hub,
+``jarvis chat``). Listeners are called on the producing thread and must only
+hand the frame off.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+StreamPublish = Callable[[dict[str, object]], Awaitable[None]]
+StreamListener = Callable[[str, dict[str, object]], None]
+
+# Starts of text that may turn into an embedded tool payload or a control token.
+_HOLD_MARKERS = ('{"', "<|")
+
+
+class DeltaRelay:
+    def __init__(self, publish: StreamPublish, *, flush_interval_s: float) -> None:
+        self._publish = publish
+        self._flush_interval_s = max(0.0, flush_interval_s)
+        self._iteration = 0
+        self._seq = 0
+        self._received = ""
+        self._released = ""
+        self._pending = ""
+        self._holding = False
+        self._last_flush = 0.0
+        self.frames = 0
+
+    def start(self, iteration: int) -> None:
+        self._iteration = iteration
+        self._received = ""
+        self._released = ""
+        self._pending = ""
+        self._holding = False
+        self._last_flush = time.monotonic()
+
+    async def text(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._received += chunk
+        if self._holding:
+            return
+        unreleased = self._received[len(self._released) + len(self._pending) :]
+        hold_at = min(
+            (idx for idx in (unreleased.find(m) for m in _HOLD_MARKERS) if idx != -1),
+            default=-1,
+        )
+        if hold_at != -1:
+            self._holding = True
+            unreleased = unreleased[:hold_at]
+        elif unreleased.endswith(tuple(marker[0] for marker in _HOLD_MARKERS)):
+            # A marker may be split across chunks; decide once the next one arrives.
+            unreleased = unreleased[:-1]
+        self._pending += unreleased
+        if self._holding or time.monotonic() - self._last_flush >= self._flush_interval_s:
+            await self._flush()
+
+    async def restart(self) -> None:
+        if self._received:
+            await self._emit({"type": "message.stream.reset", "iteration": self._iteration})
+        self.start(self._iteration)
+
+    async def finish(self, *, final: bool) -> None:
+        await self._flush()
+        await self._emit(
+            {"type": "message.stream.end", "iteration": self._iteration, "final": final}
+        )
+
+    async def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        delta, self._pending = self._pending, ""
+        self._released += delta
+        await self._emit(
+            {
+                "type": "message.delta",
+                "iteration": self._iteration,
+                "delta": delta,
+                "text": self._released,
+            }
+        )
+
+    async def _emit(self, frame: dict[str, object]) -> None:
+        self._seq += 1
+        self.frames += 1
+        frame["seq"] = self._seq
+        try:
+            await self._publish(frame)
+        except Exception:
+            logger.exception("stream frame publish failed")
+
+
+class StreamBus:
+    def __init__(self) -> None:
+        self._listeners: list[StreamListener] = []
+        self._lock = threading.Lock()
+        self._published = 0
+        self._listener_errors = 0
+
+    def add_listener(self, listener: StreamListener) -> Callable[[], None]:
+        with self._lock:
+            self._listeners.append(listener)
+
+        def _remove() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return _remove
+
+    def has_listeners(self) -> bool:
+        with self._lock:
+            return bool(self._listeners)
+
+    def publish(self, thread_id: str, frame: dict[str, object]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+            self._published += 1
+        for listener in listeners:
+            try:
+                listener(thread_id, frame)
+            except Exception:
+                with self._lock:
+                    self._listener_errors += 1
+                logger.exception("stream listener failed")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "stream_frames_published": self._published,
+                "stream_listener_errors": self._listener_errors,
+                "stream_listeners": len(self._listeners),
+            }
+
+
+_stream_bus: StreamBus | None = None
+
+
+def get_stream_bus() -> StreamBus:
+    global _stream_bus
+    if _stream_bus is None:
+        _stream_bus = StreamBus()
+    return _stream_bus
+
+
+def reset_stream_bus() -> None:
+    global _stream_bus
+    _stream_bus = None
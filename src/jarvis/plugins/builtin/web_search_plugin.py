@@ -30,4 +30,5 @@ class WebSearchPlugin(JarvisPlugin):
                 },
                 "required": ["query"],
             },
+            side_effect="read",
         )
@@ -102,6 +102,20 @@ def parse_candidates(candidates: Any) -> ModelResponse:
     )
 
 
+def parse_usage(payload: object) -> dict[str, int]:
+    """Read prompt and context-cache token counts from ``usageMetadata``."""
+    if not isinstance(payload, dict):
+        return {}
+    usage: dict[str, int] = {}
+    prompt_tokens = payload.get("promptTokenCount")
+    if isinstance(prompt_tokens, int):
+        usage["prompt_tokens"] = prompt_tokens
+    cached_tokens = payload.get("cachedContentTokenCount")
+    if isinstance(cached_tokens, int):
+        usage["cached_tokens"] = cached_tokens
+    return usage
+
+
 def parse_response(payload: dict[str, Any]) -> ModelResponse:
     return parse_candidates(payload.get("candidates"))
 
@@ -1,8 +1,14 @@
 """Provider contracts."""
 
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any, Protocol
 
+# Optional key on the system message: a hash of the byte-stable prompt prefix
+# that precedes any per-call data. Providers may use it as a cache handle and
+# must not forward it as message content.
+CACHE_KEY_FIELD = "cache_key"
+
 
 @dataclass(slots=True)
 class ModelResponse:
@@ -10,6 +16,22 @@ class ModelResponse:
     tool_calls: list[dict[str, Any]]
     reasoning_text: str = ""
     reasoning_parts: list[dict[str, Any]] = field(default_factory=list)
+    # Token accounting as reported by the backend: ``prompt_tokens`` and
+    # ``cached_tokens`` (the prompt prefix served from its cache), when known.
+    usage: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ModelDelta:
+    """One increment of a streamed response.
+
+    ``text`` is newly generated answer text (never reasoning). The last delta of
+    a stream carries the complete ``response``, tool calls included, so callers
+    never reassemble tool calls from fragments.
+    """
+
+    text: str = ""
+    response: ModelResponse | None = None
 
 
 class ModelProvider(Protocol):
@@ -22,3 +44,30 @@ class ModelProvider(Protocol):
     ) -> ModelResponse: ...
 
     async def health_check(self) -> bool: ...
+
+
+class StreamingModelProvider(ModelProvider, Protocol):
+    def generate_stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[ModelDelta]: ...
+
+
+class StreamSink(Protocol):
+    """Receives answer text as a provider streams it."""
+
+    async def text(self, chunk: str) -> None: ...
+
+    async def restart(self) -> None:
+        """Discard text received so far; a retry or fallback attempt follows."""
+        ...
+
+
+def prompt_cache_key(messages: list[dict[str, str]]) -> str:
+    for message in messages:
+        if message.get("role") == "system":
+            return str(message.get(CACHE_KEY_FIELD, ""))
+    return ""
@@ -17,6 +17,7 @@ import subprocess
 import time
 import urllib.parse
 from collections import deque
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -30,8 +31,9 @@ from jarvis.ids import new_id
 from jarvis.providers._gemini_common import (
     build_request_body,
     parse_candidate_parts,
+    parse_usage,
 )
-from jarvis.providers.base import ModelResponse
+from jarvis.providers.base import ModelDelta, ModelResponse, prompt_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -596,6 +598,24 @@ class GeminiCodeAssistProvider:
         cloudaicompanion_project: str,
         body: dict[str, Any],
     ) -> ModelResponse:
+        async for delta in self._stream_events(
+            request_id=request_id,
+            access_token=access_token,
+            cloudaicompanion_project=cloudaicompanion_project,
+            body=body,
+        ):
+            if delta.response is not None:
+                return delta.response
+        raise RuntimeError("gemini Code Assist stream ended without a response")
+
+    async def _stream_events(
+        self,
+        *,
+        request_id: str,
+        access_token: str,
+        cloudaicompanion_project: str,
+        body: dict[str, Any],
+    ) -> AsyncIterator[ModelDelta]:
         headers = _code_assist_headers(
             access_token=access_token,
             model=self.model,
@@ -614,6 +634,7 @@ class GeminiCodeAssistProvider:
         tool_calls: list[dict[str, Any]] = []
         thought_text_parts: list[str] = []
         thought_parts: list[dict[str, Any]] = []
+        usage: dict[str, int] = {}
         chunk_count = 0
         started = time.perf_counter()
         self._emit_provider_event(
@@ -658,6 +679,14 @@ class GeminiCodeAssistProvider:
                             continue
                         if not isinstance(event, dict):
                             continue
+                        response_obj = event.get("response")
+                        usage_metadata = (
+                            response_obj.get("usageMetadata")
+                            if isinstance(response_obj, dict)
+                            else event.get("usageMetadata")
+                        )
+                        if usage_metadata:
+                            usage = parse_usage(usage_metadata)
                         for candidate in self._extract_event_candidates(event):
                             content = candidate.get("content")
                             if not isinstance(content, dict):
@@ -672,6 +701,8 @@ class GeminiCodeAssistProvider:
                             tool_calls.extend(chunk_calls)
                             thought_text_parts.extend(chunk_thought_text)
                             thought_parts.extend(chunk_thought_parts)
+                            if chunk_text:
+                                yield ModelDelta(text="".join(chunk_text))
         except httpx.TimeoutException as exc:
             duration_ms = int((time.perf_counter() - started) * 1000)
             self._emit_provider_event(
@@ -709,13 +740,17 @@ class GeminiCodeAssistProvider:
                 "stream_chunks": chunk_count,
                 "text_chars": len(final_text),
                 "tool_calls_count": len(tool_calls),
+                **usage,
             },
         )
-        return ModelResponse(
-            text=final_text,
-            tool_calls=tool_calls,
-            reasoning_text="".join(thought_text_parts),
-            reasoning_parts=thought_parts,
+        yield ModelDelta(
+            response=ModelResponse(
+                text=final_text,
+                tool_calls=tool_calls,
+                reasoning_text="".join(thought_text_parts),
+                reasoning_parts=thought_parts,
+                usage=usage,
+            )
         )
 
     async def generate(
@@ -725,6 +760,50 @@ class GeminiCodeAssistProvider:
         temperature: float = 0.7,
         max_tokens: int = 4096,
     ) -> ModelResponse:
+        request_id, access_token, cloudaicompanion_project = await self._prepare_request()
+        body = self._request_body(messages, tools, temperature, max_tokens)
+        return await self._stream_generate(
+            request_id=request_id,
+            access_token=access_token,
+            cloudaicompanion_project=cloudaicompanion_project,
+            body=body,
+        )
+
+    async def generate_stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[dict[str, object]] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[ModelDelta]:
+        request_id, access_token, cloudaicompanion_project = await self._prepare_request()
+        body = self._request_body(messages, tools, temperature, max_tokens)
+        async for delta in self._stream_events(
+            request_id=request_id,
+            access_token=access_token,
+            cloudaicompanion_project=cloudaicompanion_project,
+            body=body,
+        ):
+            yield delta
+
+    @staticmethod
+    def _request_body(
+        messages: list[dict[str, str]],
+        tools: list[dict[str, object]] | None,
+        temperature: float,
+        max_tokens: int,
+    ) -> dict[str, Any]:
+        body: dict[str, Any] = build_request_body(messages, tools, temperature, max_tokens)
+        cache_key = prompt_cache_key(messages)
+        if cache_key:
+            # Code Assist has no cachedContents API; a session id derived from the
+            # stable prompt prefix keeps requests sharing it on one cache lineage
+            # for the backend's implicit prefix caching.
+            body["session_id"] = f"s_{cache_key[:32]}"
+        return body
+
+    async def _prepare_request(self) -> tuple[str, str, str]:
+        """Check quota, then resolve the access token and Code Assist project."""
         request_id = _random_id("req_")
         now_mono = time.monotonic()
         if now_mono < self._quota_block_until_monotonic:
@@ -763,14 +842,7 @@ class GeminiCodeAssistProvider:
                 cache["current_tier_id"] = current_tier.get("id")
                 cache["current_tier_name"] = current_tier.get("name")
             self._save_token_cache(cache)
-
-        body = build_request_body(messages, tools, temperature, max_tokens)
-        return await self._stream_generate(
-            request_id=request_id,
-            access_token=access_token,
-            cloudaicompanion_project=cloudaicompanion_project,
-            body=body,
-        )
+        return request_id, access_token, cloudaicompanion_project
 
     async def health_check(self) -> bool:
         if time.monotonic() < self._quota_block_until_monotonic:
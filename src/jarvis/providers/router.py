@@ -6,7 +6,7 @@ import random
 import re
 
 from jarvis.errors import ProviderError
-from jarvis.providers.base import ModelProvider, ModelResponse
+from jarvis.providers.base import ModelProvider, ModelResponse, StreamSink
 
 logger = logging.getLogger(__name__)
 _PRIMARY_RETRY_ATTEMPTS = 2
@@ -29,17 +29,49 @@ class ProviderRouter:
         temperature: float = 0.7,
         max_tokens: int = 4096,
         priority: str = "normal",
+    ) -> tuple[ModelResponse, str, str | None]:
+        return await self._generate(messages, tools, temperature, max_tokens, priority, None)
+
+    async def generate_stream(
+        self,
+        messages: list[dict[str, str]],
+        sink: StreamSink,
+        tools: list[dict[str, object]] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        priority: str = "normal",
+    ) -> tuple[ModelResponse, str, str | None]:
+        """Like :meth:`generate`, forwarding answer text to ``sink`` as it arrives.
+
+        Providers without ``generate_stream`` are called through ``generate`` and
+        stream nothing. Before every retry or fallback attempt the sink is told to
+        restart, so text from a failed attempt never mixes with the answer.
+        """
+        return await self._generate(messages, tools, temperature, max_tokens, priority, sink)
+
+    async def _generate(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[dict[str, object]] | None,
+        temperature: float,
+        max_tokens: int,
+        priority: str,
+        sink: StreamSink | None,
     ) -> tuple[ModelResponse, str, str | None]:
         last_exc: Exception | None = None
         primary_error = ""
         for attempt in range(_PRIMARY_RETRY_ATTEMPTS + 1):
             try:
-                response = await self.primary.generate(messages, tools, temperature, max_tokens)
+                response = await _call_provider(
+                    self.primary, messages, tools, temperature, max_tokens, sink
+                )
                 return response, "primary", None
             except Exception as exc:
                 last_exc = exc
                 primary_error = f"{type(exc).__name__}: {exc}"
                 logger.warning("Primary provider failed: %s", primary_error)
+                if sink is not None:
+                    await sink.restart()
                 if (
                     attempt >= _PRIMARY_RETRY_ATTEMPTS
                     or not _is_retryable_primary_error(primary_error)
@@ -51,8 +83,12 @@ class ProviderRouter:
         if priority == "low" and await self._local_llm_overloaded():
             raise ProviderError(primary_error, retryable=True) from last_exc
         try:
-            response = await self.fallback.generate(messages, tools, temperature, max_tokens)
+            response = await _call_provider(
+                self.fallback, messages, tools, temperature, max_tokens, sink
+            )
         except Exception as fallback_exc:
+            if sink is not None:
+                await sink.restart()
             raise ProviderError(
                 f"all providers failed: primary={primary_error}, "
                 f"fallback={type(fallback_exc).__name__}: {fallback_exc}",
@@ -67,6 +103,28 @@ class ProviderRouter:
         }
 
 
+async def _call_provider(
+    provider: ModelProvider,
+    messages: list[dict[str, str]],
+    tools: list[dict[str, object]] | None,
+    temperature: float,
+    max_tokens: int,
+    sink: StreamSink | None,
+) -> ModelResponse:
+    stream = getattr(provider, "generate_stream", None)
+    if sink is None or stream is None:
+        return await provider.generate(messages, tools, temperature, max_tokens)
+    response: ModelResponse | None = None
+    async for delta in stream(messages, tools, temperature, max_tokens):
+        if delta.text:
+            await sink.text(delta.text)
+        if delta.response is not None:
+            response = delta.response
+    if response is None:
+        raise RuntimeError("provider stream ended without a response")
+    return response
+
+
 def _is_retryable_primary_error(primary_error: str) -> bool:
     text = primary_error.lower()
     retryable_markers = (
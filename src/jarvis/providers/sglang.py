@@ -1,12 +1,13 @@
 """SGLang provider adapter using OpenAI-compatible chat completions API."""
 
 import json
+from collections.abc import AsyncIterator
 from typing import Any
 
 import httpx
 
 from jarvis.config import get_settings
-from jarvis.providers.base import ModelResponse
+from jarvis.providers.base import CACHE_KEY_FIELD, ModelDelta, ModelResponse
 
 
 class SGLangProvider:
@@ -65,6 +66,24 @@ class SGLangProvider:
             return None
         return normalized
 
+    @staticmethod
+    def _parse_usage(payload: object) -> dict[str, int]:
+        """Read prompt and prefix-cache token counts from a ``usage`` object.
+
+        SGLang reports ``prompt_tokens_details.cached_tokens`` (the RadixAttention
+        hit) when the server runs with ``--enable-cache-report``.
+        """
+        if not isinstance(payload, dict):
+            return {}
+        usage: dict[str, int] = {}
+        prompt_tokens = payload.get("prompt_tokens")
+        if isinstance(prompt_tokens, int):
+            usage["prompt_tokens"] = prompt_tokens
+        details = payload.get("prompt_tokens_details")
+        if isinstance(details, dict) and isinstance(details.get("cached_tokens"), int):
+            usage["cached_tokens"] = int(details["cached_tokens"])
+        return usage
+
     @staticmethod
     def _parse_response(payload: dict[str, Any]) -> ModelResponse:
         choices = payload.get("choices")
@@ -101,20 +120,26 @@ class SGLangProvider:
                     parsed_arguments = arguments
                 if isinstance(name, str) and name:
                     tool_calls.append({"name": name, "arguments": parsed_arguments})
-        return ModelResponse(text=content, tool_calls=tool_calls, reasoning_text=reasoning)
+        return ModelResponse(
+            text=content,
+            tool_calls=tool_calls,
+            reasoning_text=reasoning,
+            usage=SGLangProvider._parse_usage(payload.get("usage")),
+        )
 
-    async def generate(
+    def _request_body(
         self,
         messages: list[dict[str, str]],
-        tools: list[dict[str, object]] | None = None,
-        temperature: float = 0.7,
-        max_tokens: int = 4096,
-    ) -> ModelResponse:
-        settings = get_settings()
-        base_url = self._normalize_base_url(settings.sglang_base_url)
+        tools: list[dict[str, object]] | None,
+        temperature: float,
+        max_tokens: int,
+    ) -> dict[str, object]:
         body: dict[str, object] = {
             "model": self.model,
-            "messages": messages,
+            "messages": [
+                {key: value for key, value in message.items() if key != CACHE_KEY_FIELD}
+                for message in messages
+            ],
             "temperature": temperature,
             "max_tokens": max_tokens,
             "separate_reasoning": True,
@@ -122,6 +147,18 @@ class SGLangProvider:
         normalized_tools = self._to_tools(tools)
         if normalized_tools is not None:
             body["tools"] = normalized_tools
+        return body
+
+    async def generate(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[dict[str, object]] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> ModelResponse:
+        settings = get_settings()
+        base_url = self._normalize_base_url(settings.sglang_base_url)
+        body = self._request_body(messages, tools, temperature, max_tokens)
         endpoint = f"{base_url}/chat/completions"
         timeout_seconds = max(10, int(settings.sglang_timeout_seconds))
         async with httpx.AsyncClient(timeout=timeout_seconds, transport=self._transport) as client:
@@ -132,6 +169,80 @@ class SGLangProvider:
             raise RuntimeError("sglang response is not an object")
         return self._parse_response(payload)
 
+    async def generate_stream(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[dict[str, object]] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[ModelDelta]:
+        settings = get_settings()
+        base_url = self._normalize_base_url(settings.sglang_base_url)
+        body = self._request_body(messages, tools, temperature, max_tokens)
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}
+        endpoint = f"{base_url}/chat/completions"
+        timeout_seconds = max(10, int(settings.sglang_timeout_seconds))
+        content_parts: list[str] = []
+        reasoning_parts: list[str] = []
+        # Streamed tool calls arrive as fragments keyed by index: the name once,
+        # the JSON arguments string in pieces.
+        calls: dict[int, dict[str, str]] = {}
+        usage: object = None
+        async with httpx.AsyncClient(timeout=timeout_seconds, transport=self._transport) as client:
+            async with client.stream("POST", endpoint, json=body) as response:
+                response.raise_for_status()
+                async for raw in response.aiter_lines():
+                    line = raw.strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:") :].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        event = json.loads(data)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(event, dict) and event.get("usage"):
+                        usage = event["usage"]
+                    choices = event.get("choices") if isinstance(event, dict) else None
+                    if not isinstance(choices, list) or not choices:
+                        continue
+                    delta = choices[0].get("delta") if isinstance(choices[0], dict) else None
+                    if not isinstance(delta, dict):
+                        continue
+                    reasoning = self._coerce_text(delta.get("reasoning_content"))
+                    if reasoning:
+                        reasoning_parts.append(reasoning)
+                    for fragment in delta.get("tool_calls") or []:
+                        if not isinstance(fragment, dict):
+                            continue
+                        index = fragment.get("index", len(calls))
+                        call = calls.setdefault(
+                            index if isinstance(index, int) else len(calls),
+                            {"name": "", "arguments": ""},
+                        )
+                        fn = fragment.get("function")
+                        if isinstance(fn, dict):
+                            if isinstance(fn.get("name"), str):
+                                call["name"] += fn["name"]
+                            if isinstance(fn.get("arguments"), str):
+                                call["arguments"] += fn["arguments"]
+                    text = self._coerce_text(delta.get("content"))
+                    if text:
+                        content_parts.append(text)
+                        yield ModelDelta(text=text)
+        message = {
+            "content": "".join(content_parts),
+            "reasoning_content": "".join(reasoning_parts),
+            "tool_calls": [
+                {"function": calls[index]} for index in sorted(calls) if calls[index]["name"]
+            ],
+        }
+        yield ModelDelta(
+            response=self._parse_response({"choices": [{"message": message}], "usage": usage})
+        )
+
     async def health_check(self) -> bool:
         settings = get_settings()
         base_url = self._normalize_base_url(settings.sglang_base_url)
@@ -1,14 +1,20 @@
 """Event search + trace API routes."""
 
 import json
+import sqlite3
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from jarvis.auth.dependencies import UserContext, require_auth
-from jarvis.db.connection import get_conn
+from jarvis.db.connection import read_db
+from jarvis.db.write_queue import flush_writes
+from jarvis.events.archive import query_events
 
 router = APIRouter(tags=["api-events"])
 
+# Upper bound on the events one trace view returns; the newest are kept.
+_TRACE_EVENT_LIMIT = 5000
+
 
 def _parse_json_payload(raw_value: str) -> dict[str, object]:
     try:
@@ -27,6 +33,7 @@ def search_events(
     query: str | None = None,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    conn: sqlite3.Connection = Depends(read_db),  # noqa: B008
 ) -> dict[str, object]:
     filters: list[str] = []
     params: list[object] = []
@@ -55,13 +62,13 @@ def search_events(
         "SELECT e.id, e.trace_id, e.span_id, e.parent_span_id, e.thread_id, "
         "e.event_type, e.component, e.actor_type, e.actor_id, "
         "e.payload_redacted_json, e.created_at "
-        f"FROM events e {where} "
-        "ORDER BY e.created_at DESC LIMIT ? OFFSET ?"
+        f"FROM {{events}} e {where} "
+        "ORDER BY e.created_at DESC LIMIT ?"
     )
-    params.extend([limit, offset])
 
-    with get_conn() as conn:
-        rows = conn.execute(sql, tuple(params)).fetchall()
+    flush_writes()
+    # Archived months are only attached when the live table runs out of matches.
+    rows = query_events(conn, sql, params, limit=offset + limit)[offset:]
     items = []
     for row in rows:
         payload = str(row["payload_redacted_json"])
@@ -85,23 +92,30 @@ def search_events(
 
 
 @router.get("/events/{event_id}")
-def get_event(event_id: str, ctx: UserContext = Depends(require_auth)) -> dict[str, object]:  # noqa: B008
-    with get_conn() as conn:
-        row = conn.execute(
-            (
-                "SELECT id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
-                "actor_type, actor_id, payload_redacted_json, created_at "
-                "FROM events WHERE id=? LIMIT 1"
-            ),
-            (event_id,),
+def get_event(
+    event_id: str,
+    ctx: UserContext = Depends(require_auth),  # noqa: B008
+    conn: sqlite3.Connection = Depends(read_db),  # noqa: B008
+) -> dict[str, object]:
+    flush_writes()
+    found = query_events(
+        conn,
+        (
+            "SELECT id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
+            "actor_type, actor_id, payload_redacted_json, created_at "
+            "FROM {events} WHERE id=? LIMIT ?"
+        ),
+        (event_id,),
+        limit=1,
+    )
+    row = found[0] if found else None
+    if row is not None and not ctx.is_admin and row["thread_id"] is not None:
+        owner = conn.execute(
+            "SELECT user_id FROM threads WHERE id=? LIMIT 1",
+            (str(row["thread_id"]),),
         ).fetchone()
-        if row is not None and not ctx.is_admin and row["thread_id"] is not None:
-            owner = conn.execute(
-                "SELECT user_id FROM threads WHERE id=? LIMIT 1",
-                (str(row["thread_id"]),),
-            ).fetchone()
-            if owner is None or str(owner["user_id"]) != ctx.user_id:
-                raise HTTPException(status_code=403, detail="forbidden")
+        if owner is None or str(owner["user_id"]) != ctx.user_id:
+            raise HTTPException(status_code=403, detail="forbidden")
     if row is None:
         raise HTTPException(status_code=404, detail="event not found")
     return {
@@ -124,32 +138,39 @@ def get_trace(
     trace_id: str,
     view: str = Query(default="redacted", pattern="^(redacted|raw)$"),
     ctx: UserContext = Depends(require_auth),  # noqa: B008
+    conn: sqlite3.Connection = Depends(read_db),  # noqa: B008
 ) -> dict[str, object]:  # noqa: B008
     raw_view = view == "raw"
-    with get_conn() as conn:
-        if ctx.is_admin:
-            payload_column = "payload_json" if raw_view else "payload_redacted_json"
-            rows = conn.execute(
-                (
-                    "SELECT id, span_id, parent_span_id, thread_id, event_type, component, "
-                    f"actor_type, actor_id, {payload_column} AS payload, created_at "
-                    "FROM events WHERE trace_id=? ORDER BY created_at ASC"
-                ),
-                (trace_id,),
-            ).fetchall()
-        else:
-            payload_column = "e.payload_json" if raw_view else "e.payload_redacted_json"
-            rows = conn.execute(
-                (
-                    "SELECT e.id, e.span_id, e.parent_span_id, e.thread_id, e.event_type, "
-                    f"e.component, e.actor_type, e.actor_id, {payload_column} AS payload, "
-                    "e.created_at "
-                    "FROM events e LEFT JOIN threads t ON t.id=e.thread_id "
-                    "WHERE e.trace_id=? AND (e.thread_id IS NULL OR t.user_id=?) "
-                    "ORDER BY e.created_at ASC"
-                ),
-                (trace_id, ctx.user_id),
-            ).fetchall()
+    flush_writes()
+    if ctx.is_admin:
+        payload_column = "payload_json" if raw_view else "payload_redacted_json"
+        rows = query_events(
+            conn,
+            (
+                "SELECT id, span_id, parent_span_id, thread_id, event_type, component, "
+                f"actor_type, actor_id, {payload_column} AS payload, created_at "
+                "FROM {events} WHERE trace_id=? ORDER BY created_at DESC LIMIT ?"
+            ),
+            (trace_id,),
+            limit=_TRACE_EVENT_LIMIT,
+            contiguous=True,
+        )
+    else:
+        payload_column = "e.payload_json" if raw_view else "e.payload_redacted_json"
+        rows = query_events(
+            conn,
+            (
+                "SELECT e.id, e.span_id, e.parent_span_id, e.thread_id, e.event_type, "
+                f"e.component, e.actor_type, e.actor_id, {payload_column} AS payload, "
+                "e.created_at "
+                "FROM {events} e LEFT JOIN threads t ON t.id=e.thread_id "
+                "WHERE e.trace_id=? AND (e.thread_id IS NULL OR t.user_id=?) "
+                "ORDER BY e.created_at DESC LIMIT ?"
+            ),
+            (trace_id, ctx.user_id),
+            limit=_TRACE_EVENT_LIMIT,
+            contiguous=True,
+        )
     items = [
         {
             "id": str(row["id"]),
@@ -163,6 +184,6 @@ def get_trace(
             "payload": _parse_json_payload(str(row["payload"])),
             "created_at": str(row["created_at"]),
         }
-        for row in rows
+        for row in reversed(rows)
     ]
     return {"trace_id": trace_id, "view": view, "items": items}
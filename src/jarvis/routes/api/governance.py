@@ -27,6 +27,7 @@ from jarvis.db.queries import (
     update_remediation_confidence,
     upsert_evolution_item,
 )
+from jarvis.db.write_queue import flush_writes
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
 from jarvis.ids import new_id
@@ -175,6 +176,7 @@ def reload_governance(ctx: UserContext = Depends(require_admin)) -> dict[str, ob
 @router.get("/audit")
 def memory_governance_audit(ctx: UserContext = Depends(require_admin)) -> dict[str, object]:  # noqa: B008
     del ctx
+    flush_writes()
     with get_conn() as conn:
         rows = conn.execute(
             "SELECT id, thread_id, actor_id, decision, reason, target_kind, target_id, "
@@ -300,6 +302,7 @@ def decision_timeline(
         filters.append("thread_id=?")
         params.append(thread_id)
     where = f"WHERE {' AND '.join(filters)}" if filters else ""
+    flush_writes()
     with get_conn() as conn:
         rows = conn.execute(
             (
@@ -358,6 +361,7 @@ def evolution_items(
     ctx: UserContext = Depends(require_admin),  # noqa: B008
 ) -> dict[str, object]:
     del ctx
+    flush_writes()
     with get_conn() as conn:
         items = list_evolution_items(
             conn,
@@ -448,6 +452,7 @@ def evolution_item_set_status(
                 payload_redacted_json=json.dumps(redact_payload(payload)),
             ),
         )
+        flush_writes()
         current = get_evolution_item(conn, normalized_item_id)
     return {
         "ok": True,
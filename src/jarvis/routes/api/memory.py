@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, Field
 
 from jarvis.auth.dependencies import UserContext, require_admin, require_auth
-from jarvis.db.connection import get_conn
+from jarvis.db.connection import get_conn, read_db
 from jarvis.memory.knowledge import KnowledgeBaseService
 from jarvis.memory.scope import can_agent_access_thread_memory, normalize_agent_id
 from jarvis.memory.service import MemoryService
@@ -125,26 +125,28 @@ def search_memory(
 
 
 @router.get("/stats")
-def memory_stats(ctx: UserContext = Depends(require_auth)) -> dict[str, int]:  # noqa: B008
-    with get_conn() as conn:
-        if ctx.is_admin:
-            total = conn.execute("SELECT COUNT(*) AS n FROM memory_items").fetchone()
-            embedded = conn.execute("SELECT COUNT(*) AS n FROM memory_embeddings").fetchone()
-        else:
-            total = conn.execute(
-                "SELECT COUNT(*) AS n "
-                "FROM memory_items mi JOIN threads t ON t.id=mi.thread_id "
-                "WHERE t.user_id=?",
-                (ctx.user_id,),
-            ).fetchone()
-            embedded = conn.execute(
-                "SELECT COUNT(*) AS n "
-                "FROM memory_embeddings me "
-                "JOIN memory_items mi ON mi.id=me.memory_id "
-                "JOIN threads t ON t.id=mi.thread_id "
-                "WHERE t.user_id=?",
-                (ctx.user_id,),
-            ).fetchone()
+def memory_stats(
+    ctx: UserContext = Depends(require_auth),  # noqa: B008
+    conn: sqlite3.Connection = Depends(read_db),  # noqa: B008
+) -> dict[str, int]:
+    if ctx.is_admin:
+        total = conn.execute("SELECT COUNT(*) AS n FROM memory_items").fetchone()
+        embedded = conn.execute("SELECT COUNT(*) AS n FROM memory_embeddings").fetchone()
+    else:
+        total = conn.execute(
+            "SELECT COUNT(*) AS n "
+            "FROM memory_items mi JOIN threads t ON t.id=mi.thread_id "
+            "WHERE t.user_id=?",
+            (ctx.user_id,),
+        ).fetchone()
+        embedded = conn.execute(
+            "SELECT COUNT(*) AS n "
+            "FROM memory_embeddings me "
+            "JOIN memory_items mi ON mi.id=me.memory_id "
+            "JOIN threads t ON t.id=mi.thread_id "
+            "WHERE t.user_id=?",
+            (ctx.user_id,),
+        ).fetchone()
     total_n = int(total["n"]) if total is not None else 0
     embedded_n = int(embedded["n"]) if embedded is not None else 0
     return {
@@ -359,94 +361,94 @@ def memory_export(
     thread_id: str | None = None,
     agent_id: str = "",
     limit: int = Query(default=500, ge=1, le=5000),
+    conn: sqlite3.Connection = Depends(read_db),  # noqa: B008
 ) -> dict[str, object]:
     if format.lower() != "jsonl":
         return {"error": "only jsonl format is supported"}
-    with get_conn() as conn:
-        scoped_agent: str | None = None
-        if thread_id and agent_id.strip():
-            scoped_agent = _resolve_state_agent_scope(conn, thread_id=thread_id, agent_id=agent_id)
-            if scoped_agent is None:
-                return {"items": []}
-        elif agent_id.strip():
-            scoped_agent = normalize_agent_id(agent_id)
-        if thread_id:
-            if not _thread_allowed(conn, ctx, thread_id):
-                return {"items": []}
-            rows = conn.execute(
-                (
-                    "SELECT uid, thread_id, text, type_tag, status, tier, "
-                    "importance_score, created_at "
-                    "FROM state_items WHERE thread_id=? "
-                    + ("AND tier=? " if tier.strip() else "")
-                    + ("AND agent_id=? " if scoped_agent else "")
-                    + "ORDER BY created_at DESC LIMIT ?"
-                ),
-                (
-                    (
-                        thread_id,
-                        tier,
-                        scoped_agent,
-                        limit,
-                    )
-                    if tier.strip() and scoped_agent
-                    else (
-                        thread_id,
-                        tier,
-                        limit,
-                    )
-                    if tier.strip()
-                    else (
-                        thread_id,
-                        scoped_agent,
-                        limit,
-                    )
-                    if scoped_agent
-                    else (thread_id, limit)
-                ),
-            ).fetchall()
-        elif ctx.is_admin:
-            rows = conn.execute(
-                (
-                    "SELECT uid, thread_id, text, type_tag, status, tier, "
-                    "importance_score, created_at "
-                    "FROM state_items "
-                    + ("WHERE tier=? " if tier.strip() else "")
-                    + ("AND agent_id=? " if tier.strip() and scoped_agent else "")
-                    + ("WHERE agent_id=? " if (not tier.strip()) and scoped_agent else "")
-                    + "ORDER BY created_at DESC LIMIT ?"
-                ),
-                (
-                    (tier, scoped_agent, limit)
-                    if tier.strip() and scoped_agent
-                    else (tier, limit)
-                    if tier.strip()
-                    else (scoped_agent, limit)
-                    if scoped_agent
-                    else (limit,)
-                ),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                (
-                    "SELECT si.uid, si.thread_id, si.text, si.type_tag, si.status, si.tier, "
-                    "si.importance_score, si.created_at "
-                    "FROM state_items si JOIN threads t ON t.id=si.thread_id "
-                    "WHERE t.user_id=? "
-                    + ("AND si.tier=? " if tier.strip() else "")
-                    + ("AND si.agent_id=? " if scoped_agent else "")
-                    + "ORDER BY si.created_at DESC LIMIT ?"
-                ),
+    scoped_agent: str | None = None
+    if thread_id and agent_id.strip():
+        scoped_agent = _resolve_state_agent_scope(conn, thread_id=thread_id, agent_id=agent_id)
+        if scoped_agent is None:
+            return {"items": []}
+    elif agent_id.strip():
+        scoped_agent = normalize_agent_id(agent_id)
+    if thread_id:
+        if not _thread_allowed(conn, ctx, thread_id):
+            return {"items": []}
+        rows = conn.execute(
+            (
+                "SELECT uid, thread_id, text, type_tag, status, tier, "
+                "importance_score, created_at "
+                "FROM state_items WHERE thread_id=? "
+                + ("AND tier=? " if tier.strip() else "")
+                + ("AND agent_id=? " if scoped_agent else "")
+                + "ORDER BY created_at DESC LIMIT ?"
+            ),
+            (
                 (
-                    (ctx.user_id, tier, scoped_agent, limit)
-                    if tier.strip() and scoped_agent
-                    else (ctx.user_id, tier, limit)
-                    if tier.strip()
-                    else (ctx.user_id, scoped_agent, limit)
-                    if scoped_agent
-                    else (ctx.user_id, limit)
-                ),
-            ).fetchall()
+                    thread_id,
+                    tier,
+                    scoped_agent,
+                    limit,
+                )
+                if tier.strip() and scoped_agent
+                else (
+                    thread_id,
+                    tier,
+                    limit,
+                )
+                if tier.strip()
+                else (
+                    thread_id,
+                    scoped_agent,
+                    limit,
+                )
+                if scoped_agent
+                else (thread_id, limit)
+            ),
+        ).fetchall()
+    elif ctx.is_admin:
+        rows = conn.execute(
+            (
+                "SELECT uid, thread_id, text, type_tag, status, tier, "
+                "importance_score, created_at "
+                "FROM state_items "
+                + ("WHERE tier=? " if tier.strip() else "")
+                + ("AND agent_id=? " if tier.strip() and scoped_agent else "")
+                + ("WHERE agent_id=? " if (not tier.strip()) and scoped_agent else "")
+                + "ORDER BY created_at DESC LIMIT ?"
+            ),
+            (
+                (tier, scoped_agent, limit)
+                if tier.strip() and scoped_agent
+                else (tier, limit)
+                if tier.strip()
+                else (scoped_agent, limit)
+                if scoped_agent
+                else (limit,)
+            ),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            (
+                "SELECT si.uid, si.thread_id, si.text, si.type_tag, si.status, si.tier, "
+                "si.importance_score, si.created_at "
+                "FROM state_items si JOIN threads t ON t.id=si.thread_id "
+                "WHERE t.user_id=? "
+                + ("AND si.tier=? " if tier.strip() else "")
+                + ("AND si.agent_id=? " if scoped_agent else "")
+                + "ORDER BY si.created_at DESC LIMIT ?"
+            ),
+            (
+                (ctx.user_id, tier, scoped_agent, limit)
+                if tier.strip() and scoped_agent
+                else (ctx.user_id, tier, limit)
+                if tier.strip()
+                else (ctx.user_id, scoped_agent, limit)
+                if scoped_agent
+                else (ctx.user_id, limit)
+            ),
+        ).fetchall()
     items = [
         json.dumps(
             {
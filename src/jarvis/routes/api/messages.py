@@ -1,13 +1,20 @@
 """Message list/send API routes."""
 
 import json
+import sqlite3
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from jarvis.auth.dependencies import UserContext, require_auth
 from jarvis.config import get_settings
-from jarvis.db.connection import get_conn
-from jarvis.db.queries import insert_message, now_iso, verify_thread_owner
+from jarvis.db.connection import get_conn, read_db
+from jarvis.db.queries import (
+    insert_message,
+    insert_web_notification,
+    now_iso,
+    verify_thread_owner,
+)
+from jarvis.db.write_queue import flush_writes
 from jarvis.ids import new_id
 from jarvis.onboarding.service import (
     get_assistant_name,
@@ -36,57 +43,35 @@ def list_messages(
     ctx: UserContext = Depends(require_auth),  # noqa: B008
     before: str | None = None,
     limit: int = Query(default=50, ge=1, le=200),
+    conn: sqlite3.Connection = Depends(read_db),  # noqa: B008
 ) -> dict[str, object]:
     assistant_name = get_assistant_name()
-    with get_conn() as conn:
-        owner_row = conn.execute(
-            "SELECT user_id FROM threads WHERE id=? LIMIT 1", (thread_id,)
-        ).fetchone()
-        if owner_row is None:
-            raise HTTPException(status_code=404, detail="thread not found")
-        thread_user_id = str(owner_row["user_id"])
-        if not ctx.is_admin:
-            verify_thread_owner(conn, thread_id, ctx.user_id)
-        user_name = get_user_name(conn, thread_user_id)
-        if before:
-            rows = conn.execute(
-                (
-                    "SELECT m.id, m.role, m.content, m.created_at, "
-                    "       e.actor_id AS actor_id "
-                    "FROM messages m "
-                    "LEFT JOIN events e ON "
-                    "  e.thread_id = m.thread_id "
-                    "  AND e.event_type = 'agent.step.end' "
-                    "  AND json_extract(e.payload_json, '$.message_id') = m.id "
-                    "WHERE m.thread_id=? "
-                    "  AND ("
-                    "    m.role='user' "
-                    "    OR (m.role='assistant' AND (e.actor_id IS NULL OR e.actor_id='main'))"
-                    "  ) "
-                    "  AND m.created_at < ? "
-                    "ORDER BY m.created_at DESC LIMIT ?"
-                ),
-                (thread_id, before, limit),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                (
-                    "SELECT m.id, m.role, m.content, m.created_at, "
-                    "       e.actor_id AS actor_id "
-                    "FROM messages m "
-                    "LEFT JOIN events e ON "
-                    "  e.thread_id = m.thread_id "
-                    "  AND e.event_type = 'agent.step.end' "
-                    "  AND json_extract(e.payload_json, '$.message_id') = m.id "
-                    "WHERE m.thread_id=? "
-                    "  AND ("
-                    "    m.role='user' "
-                    "    OR (m.role='assistant' AND (e.actor_id IS NULL OR e.actor_id='main'))"
-                    "  ) "
-                    "ORDER BY m.created_at DESC LIMIT ?"
-                ),
-                (thread_id, limit),
-            ).fetchall()
+    flush_writes()
+    owner_row = conn.execute(
+        "SELECT user_id FROM threads WHERE id=? LIMIT 1", (thread_id,)
+    ).fetchone()
+    if owner_row is None:
+        raise HTTPException(status_code=404, detail="thread not found")
+    thread_user_id = str(owner_row["user_id"])
+    if not ctx.is_admin:
+        verify_thread_owner(conn, thread_id, ctx.user_id)
+    user_name = get_user_name(conn, thread_user_id)
+    # Only the main agent's replies belong in the thread view; insert_message records the author.
+    filters = (
+        "WHERE thread_id=? AND (role='user' "
+        "OR (role='assistant' AND (actor_id IS NULL OR actor_id='main'))) "
+    )
+    params: tuple[object, ...] = (thread_id, limit)
+    if before:
+        filters += "AND created_at < ? "
+        params = (thread_id, before, limit)
+    rows = conn.execute(
+        (
+            "SELECT id, role, content, created_at, actor_id FROM messages "
+            f"{filters}ORDER BY created_at DESC LIMIT ?"
+        ),
+        params,
+    ).fetchall()
 
     items = []
     for row in reversed(rows):
@@ -136,17 +121,12 @@ async def send_message(
         if not ctx.is_admin and thread_user_id != ctx.user_id:
             raise HTTPException(status_code=403, detail="forbidden")
         message_id = insert_message(conn, thread_id, "user", content)
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
-                thread_id,
-                "message.new",
-                json.dumps({"message_id": message_id, "role": "user"}),
-                now_iso(),
-            ),
+        insert_web_notification(
+            conn,
+            thread_id,
+            "message.new",
+            json.dumps({"message_id": message_id, "role": "user"}),
+            now_iso(),
         )
         onboarding = not content.startswith("/") and is_onboarding_active(
             conn,
@@ -259,17 +239,11 @@ async def start_thread_onboarding(
             },
             queue="tools_io",
         )
-        conn.execute(
-            (
-                "INSERT INTO web_notifications("
-                "thread_id, event_type, payload_json, created_at"
-                ") VALUES(?,?,?,?)"
-            ),
-            (
-                thread_id,
-                "message.new",
-                json.dumps({"message_id": assistant_message_id, "role": "assistant"}),
-                now_iso(),
-            ),
+        insert_web_notification(
+            conn,
+            thread_id,
+            "message.new",
+            json.dumps({"message_id": assistant_message_id, "role": "assistant"}),
+            now_iso(),
         )
         return {"ok": True, "prompted": True, "message_id": assistant_message_id}
@@ -3,13 +3,23 @@
 import json
 from pathlib import Path
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from jarvis.agents.loader import reset_loader_caches
 from jarvis.auth.dependencies import UserContext, require_admin, require_auth
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
-from jarvis.db.queries import ensure_system_state, get_system_state, now_iso
+from jarvis.db.profiler import SORT_KEYS, get_query_profiler
+from jarvis.db.queries import (
+    ensure_system_state,
+    get_system_state,
+    mark_system_state_changed,
+    now_iso,
+)
+from jarvis.db.write_queue import flush_writes
+from jarvis.events.archive import drop_partition, list_partitions
+from jarvis.memory.ann import reset_ann_indexes
+from jarvis.memory.vector_cache import get_thread_vector_cache
 from jarvis.providers.factory import (
     build_fallback_provider,
     build_primary_provider,
@@ -52,6 +62,8 @@ _RESET_DATA_TABLES = (
     "principals",
     "event_vec_index_map",
     "memory_vec_index_map",
+    "pending_event_vectors",
+    "vector_backfill_progress",
     "event_vec",
     "memory_vec",
     "event_text",
@@ -136,6 +148,7 @@ def toggle_lockdown(
             ),
             (1 if enabled else 0, reason if enabled else "", now_iso()),
         )
+        mark_system_state_changed()
         state = get_system_state(conn)
     return {"ok": True, "system": state}
 
@@ -145,6 +158,7 @@ def reset_db(
     ctx: UserContext = Depends(require_admin),  # noqa: B008
 ) -> dict[str, bool]:
     del ctx
+    flush_writes()
     with get_conn() as conn:
         conn.execute("PRAGMA foreign_keys = OFF")
         try:
@@ -160,6 +174,12 @@ def reset_db(
             raise
         finally:
             conn.execute("PRAGMA foreign_keys = ON")
+    mark_system_state_changed()
+    app_db = get_settings().app_db
+    for partition in list_partitions(app_db):
+        drop_partition(partition.month, app_db)
+    get_thread_vector_cache().invalidate(app_db)
+    reset_ann_indexes(app_db, delete_files=True)
     return {"ok": True}
 
 
@@ -181,3 +201,28 @@ def repo_index(
     out_path, _hash_path = write_repo_index(root)
     payload = read_repo_index(root) or {}
     return {"ok": True, "path": str(out_path), "index": payload}
+
+
+@router.get("/db-profile")
+def db_profile(
+    ctx: UserContext = Depends(require_admin),  # noqa: B008
+    limit: int = Query(default=20, ge=1, le=500),
+    sort: str = "total_ms",
+) -> dict[str, object]:
+    del ctx
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort: {sort}")
+    settings = get_settings()
+    return {
+        "enabled": int(settings.db_profile_enabled) == 1,
+        **get_query_profiler().report(limit=limit, sort=sort),
+    }
+
+
+@router.post("/db-profile/reset")
+def reset_db_profile(
+    ctx: UserContext = Depends(require_admin),  # noqa: B008
+) -> dict[str, bool]:
+    del ctx
+    get_query_profiler().reset()
+    return {"ok": True}
@@ -10,6 +10,8 @@ from jarvis.agents.loader import get_all_agent_ids
 from jarvis.auth.dependencies import UserContext, require_auth
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import create_thread, ensure_channel, set_thread_agents, set_thread_verbose
+from jarvis.db.write_queue import flush_writes
+from jarvis.events.archive import query_events
 
 router = APIRouter(tags=["api-threads"])
 
@@ -139,6 +141,7 @@ def patch_thread(
 
 def _stream_thread_jsonl(thread_id: str, include_events: bool = False) -> Iterator[str]:
     """Generator that yields JSONL lines for a thread's data."""
+    flush_writes()
     with get_conn() as conn:
         # Messages
         rows = conn.execute(
@@ -171,12 +174,14 @@ def _stream_thread_jsonl(thread_id: str, include_events: bool = False) -> Iterat
 
         # Events (optional, can be large)
         if include_events:
-            event_rows = conn.execute(
+            event_rows = query_events(
+                conn,
                 "SELECT id, event_type, component, actor_type, actor_id, "
-                "payload_redacted_json, created_at FROM events "
+                "payload_redacted_json, created_at FROM {events} "
                 "WHERE thread_id=? ORDER BY created_at ASC",
                 (thread_id,),
-            ).fetchall()
+                oldest_first=True,
+            )
             for row in event_rows:
                 yield json.dumps({
                     "type": "event",
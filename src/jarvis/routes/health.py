@@ -1,16 +1,27 @@
 """Health and readiness routes."""
 
 import json
+import sqlite3
+from datetime import UTC, datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 
 from jarvis.config import get_settings
-from jarvis.db.connection import get_conn
+from jarvis.db.connection import get_conn, get_connection_pool, get_read_pool, read_db
+from jarvis.db.profiler import get_query_profiler
 from jarvis.db.queries import get_system_state, record_readyz_result
+from jarvis.db.write_queue import get_write_queue
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event
 from jarvis.ids import new_id
+from jarvis.memory.embedder_runtime import get_embedder_runtime
+from jarvis.memory.job_progress import get_memory_job_progress
+from jarvis.memory.query_cache import get_query_embedding_cache
+from jarvis.memory.vector_cache import get_thread_vector_cache
+from jarvis.orchestrator.environment import get_environment_context
+from jarvis.orchestrator.prompt_cache import get_prompt_cache_stats
+from jarvis.orchestrator.streaming import get_stream_bus
 from jarvis.providers.factory import build_fallback_provider, build_primary_provider
 from jarvis.providers.router import ProviderRouter
 
@@ -31,29 +42,50 @@ def increment_metric(name: str, amount: int = 1) -> None:
     _metrics[name] = _metrics.get(name, 0) + amount
 
 
+def _age_seconds(timestamp: object) -> float:
+    if not isinstance(timestamp, str) or not timestamp:
+        return 0.0
+    try:
+        created = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return 0.0
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=UTC)
+    return max(0.0, round((datetime.now(UTC) - created).total_seconds(), 3))
+
+
 @router.get("/metrics")
-async def metrics() -> JSONResponse:
+async def metrics(conn: sqlite3.Connection = Depends(read_db)) -> JSONResponse:  # noqa: B008
     """Prometheus-compatible metrics in JSON format."""
-    with get_conn() as conn:
-        msg_count = conn.execute("SELECT COUNT(*) AS cnt FROM messages").fetchone()
-        thread_count = conn.execute("SELECT COUNT(*) AS cnt FROM threads").fetchone()
-        event_count = conn.execute("SELECT COUNT(*) AS cnt FROM events").fetchone()
-        memory_items_count = conn.execute("SELECT COUNT(*) AS cnt FROM memory_items").fetchone()
-        recon_rows = conn.execute(
-            "SELECT updated_count, superseded_count, deduped_count, pruned_count, "
-            "tokens_saved, detail_json "
-            "FROM state_reconciliation_runs "
-            "WHERE created_at >= datetime('now', '-7 day')"
-        ).fetchall()
-        failure_rows = conn.execute(
-            "SELECT error_summary, error_details_json FROM failure_capsules"
-        ).fetchall()
+    msg_count = conn.execute("SELECT COUNT(*) AS cnt FROM messages").fetchone()
+    thread_count = conn.execute("SELECT COUNT(*) AS cnt FROM threads").fetchone()
+    event_count = conn.execute("SELECT COUNT(*) AS cnt FROM events").fetchone()
+    memory_items_count = conn.execute("SELECT COUNT(*) AS cnt FROM memory_items").fetchone()
+    event_vector_backlog = conn.execute(
+        "SELECT COUNT(*) AS cnt, MIN(created_at) AS oldest FROM pending_event_vectors"
+    ).fetchone()
+    backfill_rows = conn.execute(
+        "SELECT name, last_rowid, rows_indexed, pass_completed_at FROM vector_backfill_progress"
+    ).fetchall()
+    recon_rows = conn.execute(
+        "SELECT updated_count, superseded_count, deduped_count, pruned_count, "
+        "tokens_saved, detail_json "
+        "FROM state_reconciliation_runs "
+        "WHERE created_at >= datetime('now', '-7 day')"
+    ).fetchall()
+    failure_rows = conn.execute(
+        "SELECT error_summary, error_details_json FROM failure_capsules"
+    ).fetchall()
 
     db_stats = {
         "messages_total": int(msg_count["cnt"]) if msg_count else 0,
         "threads_total": int(thread_count["cnt"]) if thread_count else 0,
         "events_total": int(event_count["cnt"]) if event_count else 0,
         "memory_items_count": int(memory_items_count["cnt"]) if memory_items_count else 0,
+        "event_vector_backlog": int(event_vector_backlog["cnt"]) if event_vector_backlog else 0,
+        "event_vector_backlog_oldest_age_s": _age_seconds(
+            event_vector_backlog["oldest"] if event_vector_backlog else None
+        ),
     }
     runs = len(recon_rows)
     runs_with_changes = 0
@@ -118,7 +150,42 @@ async def metrics() -> JSONResponse:
         "memory_reconciliation_rate": (runs_with_changes / runs) if runs > 0 else 1.0,
         "memory_hallucination_incidents": hallucination_incidents,
     }
-    return JSONResponse(content={**_metrics, **db_stats, **kpi_stats})
+    cache_stats = get_thread_vector_cache().stats()
+    query_cache_stats = get_query_embedding_cache().stats()
+    embedder_stats = get_embedder_runtime().stats()
+    pool_stats = get_connection_pool().stats()
+    read_pool_stats = get_read_pool().stats()
+    write_queue_stats = get_write_queue().stats()
+    profile_stats = get_query_profiler().stats()
+    memory_job_stats = get_memory_job_progress().stats()
+    stream_stats = get_stream_bus().stats()
+    prompt_cache_stats = get_prompt_cache_stats().stats()
+    environment_stats = get_environment_context().stats()
+    backfill_stats: dict[str, int] = {}
+    for row in backfill_rows:
+        prefix = f"vector_backfill_{row['name']}"
+        backfill_stats[f"{prefix}_cursor"] = int(row["last_rowid"])
+        backfill_stats[f"{prefix}_rows_indexed"] = int(row["rows_indexed"])
+        backfill_stats[f"{prefix}_complete"] = int(bool(row["pass_completed_at"]))
+    return JSONResponse(
+        content={
+            **_metrics,
+            **db_stats,
+            **kpi_stats,
+            **cache_stats,
+            **query_cache_stats,
+            **embedder_stats,
+            **pool_stats,
+            **read_pool_stats,
+            **write_queue_stats,
+            **profile_stats,
+            **memory_job_stats,
+            **stream_stats,
+            **prompt_cache_stats,
+            **environment_stats,
+            **backfill_stats,
+        }
+    )
 
 
 @router.get("/healthz")
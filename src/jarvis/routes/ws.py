@@ -9,7 +9,8 @@ from starlette.websockets import WebSocketDisconnect
 
 from jarvis.auth.dependencies import _extract_bearer
 from jarvis.auth.service import validate_token
-from jarvis.db.connection import get_conn
+from jarvis.db.connection import get_conn, get_read_conn
+from jarvis.orchestrator.streaming import get_stream_bus
 
 router = APIRouter(tags=["ws"])
 
@@ -105,7 +106,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
             if action == "subscribe":
                 thread_id = str(data.get("thread_id", "")).strip()
                 if thread_id:
-                    with get_conn() as conn:
+                    with get_read_conn() as conn:
                         row = conn.execute(
                             "SELECT user_id FROM threads WHERE id=? LIMIT 1", (thread_id,)
                         ).fetchone()
@@ -137,16 +138,41 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
 
 
 async def notification_poller(stop: asyncio.Event) -> None:
-    while not stop.is_set():
-        await _poll_once()
-        try:
-            await asyncio.wait_for(stop.wait(), timeout=0.5)
-        except TimeoutError:
-            pass
+    forwarder = asyncio.create_task(_forward_stream_frames())
+    try:
+        while not stop.is_set():
+            await _poll_once()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=0.5)
+            except TimeoutError:
+                pass
+    finally:
+        forwarder.cancel()
+
+
+async def _forward_stream_frames() -> None:
+    # Streamed answer frames are produced on agent worker threads and skip the
+    # web_notifications table: they are handed to this loop and broadcast in order.
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[str, dict[str, object]]] = asyncio.Queue()
+
+    def _enqueue(thread_id: str, frame: dict[str, object]) -> None:
+        envelope: dict[str, object] = {**frame, "thread_id": thread_id}
+        loop.call_soon_threadsafe(queue.put_nowait, (thread_id, envelope))
+
+    remove = get_stream_bus().add_listener(_enqueue)
+    try:
+        while True:
+            thread_id, envelope = await queue.get()
+            await hub.broadcast_thread(thread_id, envelope)
+    finally:
+        remove()
 
 
 async def _poll_once() -> None:
-    with get_conn() as conn:
+    # The idle poll only reads, so it stays on the read lane; the write lock is
+    # taken only to delete notifications that were actually delivered.
+    with get_read_conn() as conn:
         rows = conn.execute(
             "SELECT id, thread_id, event_type, payload_json, created_at "
             "FROM web_notifications ORDER BY id ASC LIMIT 200"
@@ -154,6 +180,7 @@ async def _poll_once() -> None:
         if not rows:
             return
         ids = [int(row["id"]) for row in rows]
+        envelopes: list[dict[str, object]] = []
 
         for row in rows:
             thread_id = str(row["thread_id"])
@@ -189,13 +216,16 @@ async def _poll_once() -> None:
                 envelope.update(payload)
             else:
                 envelope["payload"] = payload
+            envelopes.append(envelope)
 
-            if event_type.startswith("system."):
-                await hub.broadcast_system(envelope)
-            else:
-                await hub.broadcast_thread(thread_id, envelope)
+    for envelope in envelopes:
+        if str(envelope["type"]).startswith("system."):
+            await hub.broadcast_system(envelope)
+        else:
+            await hub.broadcast_thread(str(envelope["thread_id"]), envelope)
 
-        placeholders = ",".join("?" for _ in ids)
+    placeholders = ",".join("?" for _ in ids)
+    with get_conn() as conn:
         conn.execute(f"DELETE FROM web_notifications WHERE id IN ({placeholders})", tuple(ids))
 
 
@@ -50,6 +50,9 @@ def _register_tasks(runner: TaskRunner) -> None:
         maintenance.compute_system_fitness,
     )
     runner.register("jarvis.tasks.memory.index_event", memory.index_event)
+    runner.register("jarvis.tasks.memory.index_event_vectors", memory.index_event_vectors)
+    runner.register("jarvis.tasks.memory.refresh_ann_indexes", memory.refresh_ann_indexes)
+    runner.register("jarvis.tasks.memory.backfill_vector_indexes", memory.backfill_vector_indexes)
     runner.register("jarvis.tasks.memory.compact_thread", memory.compact_thread)
     runner.register("jarvis.tasks.memory.periodic_compaction", memory.periodic_compaction)
     runner.register("jarvis.tasks.memory.migrate_tiers", memory.migrate_tiers)
@@ -79,6 +82,8 @@ def _register_tasks(runner: TaskRunner) -> None:
     runner.register("jarvis.tasks.system.db_optimize", system.db_optimize)
     runner.register("jarvis.tasks.system.db_integrity_check", system.db_integrity_check)
     runner.register("jarvis.tasks.system.db_vacuum", system.db_vacuum)
+    runner.register("jarvis.tasks.system.db_profile_snapshot", system.db_profile_snapshot)
+    runner.register("jarvis.tasks.system.events_archive", system.events_archive)
 
 
 def get_task_runner() -> TaskRunner:
@@ -100,6 +105,19 @@ def get_periodic_scheduler() -> PeriodicScheduler:
         scheduler.add("jarvis.tasks.system.rotate_unlock_code", 600)
         scheduler.add("jarvis.tasks.backup.create_backup", 900)
         scheduler.add("jarvis.tasks.memory.periodic_compaction", 600)
+        scheduler.add(
+            "jarvis.tasks.memory.index_event_vectors",
+            float(settings.event_vector_index_interval_seconds),
+        )
+        scheduler.add(
+            "jarvis.tasks.memory.backfill_vector_indexes",
+            float(settings.memory_vec_backfill_interval_seconds),
+        )
+        if int(settings.memory_ann_enabled) == 1:
+            scheduler.add(
+                "jarvis.tasks.memory.refresh_ann_indexes",
+                float(settings.memory_ann_rebuild_interval_seconds),
+            )
         scheduler.add("jarvis.tasks.memory.sync_failure_capsules", 1800)
         scheduler.add("jarvis.tasks.memory.migrate_tiers", 21600)
         scheduler.add("jarvis.tasks.memory.prune_adaptive", 86400)
@@ -107,6 +125,16 @@ def get_periodic_scheduler() -> PeriodicScheduler:
         scheduler.add("jarvis.tasks.system.db_optimize", 86400)
         scheduler.add("jarvis.tasks.system.db_integrity_check", 604800)
         scheduler.add("jarvis.tasks.system.db_vacuum", 2592000)
+        if settings.events_archive_after_days > 0 and settings.events_archive_interval_seconds > 0:
+            scheduler.add(
+                "jarvis.tasks.system.events_archive",
+                float(settings.events_archive_interval_seconds),
+            )
+        if int(settings.db_profile_enabled) == 1 and settings.db_profile_snapshot_seconds > 0:
+            scheduler.add(
+                "jarvis.tasks.system.db_profile_snapshot",
+                float(settings.db_profile_snapshot_seconds),
+            )
         if settings.maintenance_enabled == 1 and settings.maintenance_interval_seconds > 0:
             scheduler.add(
                 "jarvis.tasks.maintenance.run_local_maintenance",
@@ -10,11 +10,14 @@ from jarvis.logging import bind_context, clear_context
 from jarvis.tasks import get_task_runner
 
 logger = logging.getLogger(__name__)
+from jarvis.channels.registry import get_channel  # noqa: E402
+from jarvis.channels.streaming import DraftStreamer, supports_drafts  # noqa: E402
 from jarvis.config import get_settings  # noqa: E402
-from jarvis.db.connection import get_conn  # noqa: E402
-from jarvis.db.queries import now_iso  # noqa: E402
+from jarvis.db.connection import get_conn, get_read_conn  # noqa: E402
+from jarvis.db.queries import get_thread_channel, insert_web_notification, now_iso  # noqa: E402
 from jarvis.memory.skills import SkillsService  # noqa: E402
 from jarvis.orchestrator.step import run_agent_step  # noqa: E402
+from jarvis.orchestrator.streaming import StreamPublish, get_stream_bus  # noqa: E402
 from jarvis.plugins.base import PluginContext  # noqa: E402
 from jarvis.plugins.loader import get_loaded_plugins  # noqa: E402
 from jarvis.providers.factory import build_fallback_provider, build_primary_provider  # noqa: E402
@@ -47,17 +50,12 @@ def agent_step(trace_id: str, thread_id: str, actor_id: str = "main") -> str:
     )
 
     with get_conn() as conn:
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
-                thread_id,
-                "agent.thinking",
-                json.dumps({"thread_id": thread_id, "agent_id": actor_id}),
-                now_iso(),
-            ),
+        insert_web_notification(
+            conn,
+            thread_id,
+            "agent.thinking",
+            json.dumps({"thread_id": thread_id, "agent_id": actor_id}),
+            now_iso(),
         )
 
     with get_conn() as conn:
@@ -72,6 +70,8 @@ def agent_step(trace_id: str, thread_id: str, actor_id: str = "main") -> str:
 
         registry = _build_registry(conn, trace_id, thread_id, actor_id)
         runtime = ToolRuntime(registry)
+        thread_channel = get_thread_channel(conn, thread_id)
+        stream_fn, draft = _stream_targets(thread_id, actor_id, thread_channel)
         message_id = asyncio.run(
             run_agent_step(
                 conn=conn,
@@ -81,52 +81,37 @@ def agent_step(trace_id: str, thread_id: str, actor_id: str = "main") -> str:
                 trace_id=trace_id,
                 actor_id=actor_id,
                 notify_fn=notify_trace,
+                stream_fn=stream_fn,
             )
         )
         if actor_id == "main":
-            conn.execute(
-                (
-                    "INSERT INTO web_notifications("
-                    "thread_id, event_type, payload_json, created_at"
-                    ") "
-                    "VALUES(?,?,?,?)"
-                ),
-                (
-                    thread_id,
-                    "message.new",
-                    json.dumps({"message_id": message_id, "agent_id": actor_id}),
-                    now_iso(),
-                ),
-            )
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
+            insert_web_notification(
+                conn,
                 thread_id,
-                "agent.done",
-                json.dumps({"thread_id": thread_id, "agent_id": actor_id}),
+                "message.new",
+                json.dumps({"message_id": message_id, "agent_id": actor_id}),
                 now_iso(),
-            ),
+            )
+        insert_web_notification(
+            conn,
+            thread_id,
+            "agent.done",
+            json.dumps({"thread_id": thread_id, "agent_id": actor_id}),
+            now_iso(),
         )
         if actor_id == "main":
-            channel_row = conn.execute(
-                (
-                    "SELECT c.channel_type FROM threads t "
-                    "JOIN channels c ON c.id=t.channel_id WHERE t.id=? LIMIT 1"
-                ),
-                (thread_id,),
-            ).fetchone()
-            channel_type = str(channel_row["channel_type"]) if channel_row is not None else ""
+            channel_type = thread_channel["channel_type"] if thread_channel is not None else ""
             if channel_type and channel_type != "web":
+                send_kwargs = {
+                    "thread_id": thread_id,
+                    "message_id": message_id,
+                    "channel_type": channel_type,
+                }
+                if draft is not None and draft.draft_id is not None:
+                    send_kwargs["draft_id"] = draft.draft_id
                 ok = get_task_runner().send_task(
                     "jarvis.tasks.channel.send_channel_message",
-                    kwargs={
-                        "thread_id": thread_id,
-                        "message_id": message_id,
-                        "channel_type": channel_type,
-                    },
+                    kwargs=send_kwargs,
                     queue="tools_io",
                 )
                 if not ok:
@@ -167,19 +152,44 @@ def _notify_trace_event(
     enriched_payload = dict(payload)
     enriched_payload["trace_id"] = trace_id
     enriched_payload["created_at"] = created_at
-    conn.execute(
-        "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-        "VALUES(?,?,?,?)",
-        (
-            thread_id,
-            f"trace.{event_type}",
-            json.dumps(enriched_payload),
-            created_at,
-        ),
+    insert_web_notification(
+        conn,
+        thread_id,
+        f"trace.{event_type}",
+        json.dumps(enriched_payload),
+        created_at,
     )
     conn.commit()
 
 
+def _stream_targets(
+    thread_id: str, actor_id: str, thread_channel: dict[str, str] | None
+) -> tuple[StreamPublish | None, DraftStreamer | None]:
+    """Where the main agent's streamed answer goes: stream bus listeners and a channel draft."""
+    settings = get_settings()
+    if actor_id != "main" or not int(settings.model_streaming_enabled):
+        return None, None
+    draft: DraftStreamer | None = None
+    if thread_channel is not None:
+        adapter = get_channel(thread_channel["channel_type"])
+        if adapter is not None and supports_drafts(adapter):
+            draft = DraftStreamer(
+                adapter,
+                thread_channel["recipient"],
+                min_interval_s=float(settings.telegram_stream_edit_interval_seconds),
+            )
+    bus = get_stream_bus()
+    if draft is None and not bus.has_listeners():
+        return None, None
+
+    async def publish(frame: dict[str, object]) -> None:
+        bus.publish(thread_id, frame)
+        if draft is not None:
+            await draft.publish(frame)
+
+    return publish, draft
+
+
 def _build_registry(
     conn: sqlite3.Connection, trace_id: str, thread_id: str, actor_id: str
 ) -> ToolRegistry:
@@ -192,8 +202,12 @@ def _build_registry(
     async def tool_session_list(args: dict[str, object]) -> dict[str, Any]:
         agent_id = str(args["agent_id"]) if isinstance(args.get("agent_id"), str) else None
         status = str(args["status"]) if isinstance(args.get("status"), str) else None
-        items = session_list(conn, agent_id=agent_id, status=status)
-        return {"sessions": items}
+
+        def _list() -> list[dict[str, Any]]:
+            with get_read_conn() as read_conn:
+                return session_list(read_conn, agent_id=agent_id, status=status)
+
+        return {"sessions": await asyncio.to_thread(_list)}
 
     async def tool_session_history(args: dict[str, object]) -> dict[str, Any]:
         raw_session_id = args.get("session_id")
@@ -204,8 +218,12 @@ def _build_registry(
         except (TypeError, ValueError):
             limit = 200
         before = str(args["before"]) if isinstance(args.get("before"), str) else None
-        items = session_history(conn, session_id=session_id, limit=limit, before=before)
-        return {"items": items}
+
+        def _history() -> list[dict[str, str]]:
+            with get_read_conn() as read_conn:
+                return session_history(read_conn, session_id=session_id, limit=limit, before=before)
+
+        return {"items": await asyncio.to_thread(_history)}
 
     async def tool_session_send(args: dict[str, object]) -> dict[str, str]:
         raw_session_id = args.get("session_id")
@@ -223,25 +241,20 @@ def _build_registry(
             trace_id=trace_id,
             from_agent_id=actor_id,
         )
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
-                session_id,
-                "agent.delegated",
-                json.dumps(
-                    {
-                        "thread_id": session_id,
-                        "from_agent": actor_id,
-                        "to_agent": to_agent_id,
-                        "trace_id": trace_id,
-                        "created_at": now_iso(),
-                    }
-                ),
-                now_iso(),
+        insert_web_notification(
+            conn,
+            session_id,
+            "agent.delegated",
+            json.dumps(
+                {
+                    "thread_id": session_id,
+                    "from_agent": actor_id,
+                    "to_agent": to_agent_id,
+                    "trace_id": trace_id,
+                    "created_at": now_iso(),
+                }
             ),
+            now_iso(),
         )
         queue = "agent_priority" if priority == "high" else "agent_default"
         ok = get_task_runner().send_task(
@@ -297,8 +310,14 @@ def _build_registry(
         scope = str(args["scope"]) if isinstance(args.get("scope"), str) else actor_id
         raw_pinned_only = args.get("pinned_only")
         pinned_only = bool(raw_pinned_only) if raw_pinned_only is not None else False
-        items = skills.list_skills(conn, scope=scope, pinned_only=pinned_only, limit=100)
-        return {"skills": items}
+
+        def _list() -> list[dict[str, object]]:
+            with get_read_conn() as read_conn:
+                return skills.list_skills(
+                    read_conn, scope=scope, pinned_only=pinned_only, limit=100
+                )
+
+        return {"skills": await asyncio.to_thread(_list)}
 
     async def tool_skill_read(args: dict[str, object]) -> dict[str, Any]:
         raw_slug = args.get("slug")
@@ -306,8 +325,12 @@ def _build_registry(
         if not slug:
             return {"skill": None, "error": "slug is required"}
         scope = str(args["scope"]) if isinstance(args.get("scope"), str) else actor_id
-        item = skills.get(conn, slug=slug, scope=scope)
-        return {"skill": item}
+
+        def _read() -> dict[str, object] | None:
+            with get_read_conn() as read_conn:
+                return skills.get(read_conn, slug=slug, scope=scope)
+
+        return {"skill": await asyncio.to_thread(_read)}
 
     async def tool_skill_write(args: dict[str, object]) -> dict[str, Any]:
         raw_slug = args.get("slug")
@@ -346,6 +369,7 @@ def _build_registry(
                 "message": {"type": "string", "description": "Message to echo back"},
             },
         },
+        side_effect="read",
     )
     registry.register(
         "session_list",
@@ -358,6 +382,7 @@ def _build_registry(
                 "status": {"type": "string", "description": "Filter by status (open, closed)"},
             },
         },
+        side_effect="read",
     )
     registry.register(
         "session_history",
@@ -377,6 +402,7 @@ def _build_registry(
                 "before": {"type": "string", "description": "ISO timestamp cursor for pagination"},
             },
         },
+        side_effect="read",
     )
     registry.register(
         "session_send",
@@ -438,6 +464,7 @@ def _build_registry(
                 },
             },
         },
+        side_effect="read",
     )
     registry.register(
         "skill_read",
@@ -454,6 +481,7 @@ def _build_registry(
             },
             "required": ["slug"],
         },
+        side_effect="read",
     )
     registry.register(
         "skill_write",
@@ -507,6 +535,7 @@ def _build_registry(
             },
             "required": ["query"],
         },
+        side_effect="read",
     )
 
     # Load tools from plugins
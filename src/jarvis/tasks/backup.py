@@ -12,6 +12,7 @@ from pathlib import Path
 
 from jarvis.config import get_settings
 from jarvis.db.connection import connect, get_conn
+from jarvis.db.write_queue import flush_writes
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
 from jarvis.ids import new_id
@@ -221,6 +222,29 @@ def _upload_remote(gz_path: Path) -> tuple[bool, str]:
     return True, destination
 
 
+def _snapshot_database(snapshot_path: Path) -> None:
+    settings = get_settings()
+    if settings.db_engine == "postgres":
+        # Same file name and retention; the content is a pg_dump custom-format archive.
+        proc = subprocess.run(
+            ["pg_dump", "--format=custom", f"--file={snapshot_path}", settings.database_url],
+            capture_output=True,
+            text=True,
+            timeout=600,
+            check=False,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip() or "pg_dump failed")
+        return
+    source_conn = connect()
+    target_conn = sqlite3.connect(snapshot_path)
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+
 def create_backup() -> dict[str, object]:
     settings = get_settings()
     trace_id = new_id("trc")
@@ -230,13 +254,8 @@ def create_backup() -> dict[str, object]:
     stamp = datetime.now(UTC)
     snapshot_path = backup_dir / _snapshot_name(stamp)
 
-    source_conn = connect()
-    target_conn = sqlite3.connect(snapshot_path)
-    try:
-        source_conn.backup(target_conn)
-    finally:
-        target_conn.close()
-        source_conn.close()
+    flush_writes()
+    _snapshot_database(snapshot_path)
 
     gz_path = _compress(snapshot_path)
     keep_count, deleted_count = _prune_retention(
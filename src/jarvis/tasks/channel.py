@@ -9,6 +9,7 @@ import time
 import httpx
 
 from jarvis.channels.registry import get_channel
+from jarvis.channels.streaming import supports_drafts
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import get_channel_outbound, get_system_state
 from jarvis.events.models import EventInput
@@ -17,6 +18,8 @@ from jarvis.ids import new_id
 
 logger = logging.getLogger(__name__)
 
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
 
 def _emit(
     trace_id: str,
@@ -44,9 +47,14 @@ def _emit(
 
 
 def send_channel_message(
-    thread_id: str, message_id: str, channel_type: str
+    thread_id: str, message_id: str, channel_type: str, draft_id: str | None = None
 ) -> dict[str, str]:
-    """Generic outbound task — dispatches through the channel registry."""
+    """Generic outbound task — dispatches through the channel registry.
+
+    ``draft_id`` names a progressively edited preview of this reply; when the
+    adapter supports drafts it is replaced with the final text instead of
+    sending a second message.
+    """
     adapter = get_channel(channel_type)
     if adapter is None:
         if channel_type != "cli":
@@ -78,10 +86,26 @@ def send_channel_message(
 
     base_delays = [2.0, 8.0, 32.0]
     attempts = 0
+    use_draft = draft_id is not None and supports_drafts(adapter)
     for delay in base_delays:
         attempts += 1
         try:
-            status = asyncio.run(adapter.send_text(outbound["recipient"], outbound["text"]))
+            if use_draft:
+                status = asyncio.run(
+                    adapter.finalize_draft(outbound["recipient"], draft_id, outbound["text"])  # type: ignore[attr-defined]
+                )
+                if status >= 400 and status not in _RETRYABLE_STATUSES:
+                    # The preview was deleted or can no longer be edited; send a new message.
+                    logger.info(
+                        "Draft %s finalize failed with http %s; sending as a new message",
+                        draft_id, status,
+                    )
+                    use_draft = False
+                    status = asyncio.run(
+                        adapter.send_text(outbound["recipient"], outbound["text"])
+                    )
+            else:
+                status = asyncio.run(adapter.send_text(outbound["recipient"], outbound["text"]))
         except httpx.HTTPError as exc:
             if attempts >= len(base_delays):
                 _emit(
@@ -95,7 +119,7 @@ def send_channel_message(
             time.sleep(delay + jitter)
             continue
 
-        if status in {429, 500, 502, 503, 504}:
+        if status in _RETRYABLE_STATUSES:
             if attempts >= len(base_delays):
                 _emit(
                     trace_id, thread_id,
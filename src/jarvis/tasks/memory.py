@@ -2,6 +2,10 @@
 # ruff: noqa: E501
 
 import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from hashlib import sha256
 
@@ -9,7 +13,24 @@ from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import now_iso
 from jarvis.ids import new_id
+from jarvis.memory.ann import (
+    ANN_INDEX_NAMES,
+    ann_enabled,
+    ann_entries,
+    discard_ann_keys,
+    get_ann_index,
+    save_ann_indexes,
+)
+from jarvis.memory.job_progress import get_memory_job_progress
 from jarvis.memory.service import MemoryService
+from jarvis.memory.state_store import StateStore
+from jarvis.memory.vector_cache import get_thread_vector_cache
+
+EVENT_VECTOR_MAX_BATCHES = 20
+_event_vector_lock = threading.Lock()
+VECTOR_BACKFILL_NAMES = ("memory", "event", "state")
+VECTOR_BACKFILL_MAX_BATCHES = 10
+_vector_backfill_lock = threading.Lock()
 
 
 def index_event(
@@ -28,6 +49,146 @@ def index_event(
     return ids[0] if ids else ""
 
 
+def index_event_vectors() -> dict[str, int]:
+    """Drain ``pending_event_vectors`` in embedding batches; overlapping runs skip."""
+    if not _event_vector_lock.acquire(blocking=False):
+        return {"indexed": 0, "skipped": 1}
+    try:
+        settings = get_settings()
+        batch_size = max(1, int(settings.memory_embed_batch_size))
+        service = MemoryService()
+        indexed = 0
+        with get_conn() as conn:
+            for _ in range(EVENT_VECTOR_MAX_BATCHES):
+                consumed = service.index_pending_event_vectors(conn, limit=batch_size)
+                indexed += consumed
+                if consumed < batch_size:
+                    break
+        return {"indexed": indexed, "skipped": 0}
+    finally:
+        _event_vector_lock.release()
+
+
+def refresh_ann_indexes() -> dict[str, int]:
+    """Re-cluster ANN indexes that are unbuilt or stale, then persist dirty sidecars."""
+    if not ann_enabled():
+        return {"rebuilt": 0}
+    rebuilt = 0
+    with get_conn() as conn:
+        for name in ANN_INDEX_NAMES:
+            index = get_ann_index(name)
+            if index is None or not index.needs_rebuild():
+                continue
+            index.rebuild(ann_entries(conn, name))
+            rebuilt += 1
+    save_ann_indexes()
+    return {"rebuilt": rebuilt}
+
+
+def backfill_vector_indexes() -> dict[str, int]:
+    """Copy stored vectors missing from the sqlite-vec indexes, resuming from a saved cursor.
+
+    Each index walks its source table in rowid order and records its position in
+    ``vector_backfill_progress``. A pass that reaches the end is marked complete and
+    starts over after ``MEMORY_VEC_BACKFILL_RESCAN_SECONDS``.
+    """
+    if not _vector_backfill_lock.acquire(blocking=False):
+        return {"indexed": 0, "skipped": 1}
+    try:
+        settings = get_settings()
+        rescan_after = timedelta(seconds=max(0, int(settings.memory_vec_backfill_rescan_seconds)))
+        service = MemoryService()
+        store = StateStore()
+        indexed = 0
+        with get_conn() as conn:
+            if not service.ensure_vector_indexes(conn):
+                return {"indexed": 0, "skipped": 1}
+            state_ready = store.ensure_vector_indexes(conn)
+            for name in VECTOR_BACKFILL_NAMES:
+                if name == "state" and not state_ready:
+                    continue
+                indexed += _backfill_vector_index(conn, name, service, store, rescan_after)
+        return {"indexed": indexed, "skipped": 0}
+    finally:
+        _vector_backfill_lock.release()
+
+
+def _backfill_vector_index(
+    conn: sqlite3.Connection,
+    name: str,
+    service: MemoryService,
+    store: StateStore,
+    rescan_after: timedelta,
+) -> int:
+    progress = conn.execute(
+        "SELECT last_rowid, rows_scanned, rows_indexed, pass_started_at, pass_completed_at "
+        "FROM vector_backfill_progress WHERE name=?",
+        (name,),
+    ).fetchone()
+    cursor = 0
+    rows_scanned = 0
+    rows_indexed = 0
+    pass_started_at = now_iso()
+    if progress is not None:
+        completed_at = _parse_iso(progress["pass_completed_at"])
+        if completed_at is not None:
+            if datetime.now(UTC) - completed_at < rescan_after:
+                return 0
+        else:
+            cursor = int(progress["last_rowid"])
+            rows_scanned = int(progress["rows_scanned"])
+            rows_indexed = int(progress["rows_indexed"])
+            pass_started_at = str(progress["pass_started_at"] or pass_started_at)
+
+    indexed = 0
+    pass_completed_at: str | None = None
+    batch_size = store.BACKFILL_BATCH_SIZE if name == "state" else service.BACKFILL_BATCH_SIZE
+    for _ in range(VECTOR_BACKFILL_MAX_BATCHES):
+        if name == "state":
+            cursor, scanned, batch_indexed = store.backfill_vec_index(conn, after_rowid=cursor)
+        else:
+            cursor, scanned, batch_indexed = service.backfill_vec_index(
+                conn, name, after_rowid=cursor
+            )
+        rows_scanned += scanned
+        indexed += batch_indexed
+        if scanned < batch_size:
+            pass_completed_at = now_iso()
+            break
+    conn.execute(
+        (
+            "INSERT INTO vector_backfill_progress("
+            "name, last_rowid, rows_scanned, rows_indexed, pass_started_at, pass_completed_at, "
+            "updated_at"
+            ") VALUES(?,?,?,?,?,?,?) "
+            "ON CONFLICT(name) DO UPDATE SET last_rowid=excluded.last_rowid, "
+            "rows_scanned=excluded.rows_scanned, rows_indexed=excluded.rows_indexed, "
+            "pass_started_at=excluded.pass_started_at, "
+            "pass_completed_at=excluded.pass_completed_at, updated_at=excluded.updated_at"
+        ),
+        (
+            name,
+            cursor,
+            rows_scanned,
+            rows_indexed + indexed,
+            pass_started_at,
+            pass_completed_at,
+            now_iso(),
+        ),
+    )
+    return indexed
+
+
+def _parse_iso(value: object) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
 def compact_thread(thread_id: str) -> dict[str, str]:
     service = MemoryService()
     with get_conn() as conn:
@@ -60,6 +221,195 @@ def periodic_compaction() -> dict[str, int]:
     return {"compacted": compacted}
 
 
+_STATE_COLUMNS = (
+    "uid, thread_id, text, status, type_tag, topic_tags_json, refs_json, confidence, "
+    "replaced_by, supersession_evidence, conflict, pinned, source, created_at, last_seen_at, "
+    "updated_at, tier, importance_score, access_count, conflict_count, agent_id, last_accessed_at"
+)
+_MEMORY_INDEX_TABLES = ("memory_embeddings", "memory_vec", "memory_vec_index_map", "memory_fts")
+_STATE_RANGE = "(uid, thread_id) >= (?, ?) AND (uid, thread_id) <= (?, ?)"
+_STALE_SUPERSEDED = "pinned=0 AND status='superseded' AND last_seen_at<?"
+_DEMOTABLE = "pinned=0 AND status IN ('active','open') AND confidence!='low' AND last_seen_at<?"
+_ADAPTIVE_PRUNABLE = "pinned=0 AND importance_score<0.35 AND last_seen_at<?"
+# Tier target for a row; the two ``?`` are the working (14d) and episodic (60d) cutoffs.
+_TIER_TARGET = (
+    "CASE WHEN pinned=1 THEN 'procedural' "
+    "WHEN importance_score >= 0.75 OR access_count >= 10 THEN 'semantic_longterm' "
+    "WHEN last_seen_at >= ? THEN 'working' "
+    "WHEN last_seen_at >= ? THEN 'episodic' "
+    "ELSE 'semantic_longterm' END"
+)
+
+
+def _maintenance_batch_size() -> int:
+    return max(1, int(get_settings().memory_maintenance_batch_size))
+
+
+def _yield_between_batches() -> None:
+    """Give request-path writers a window on the write lock between batches."""
+    pause_ms = max(0, int(get_settings().memory_maintenance_yield_ms))
+    if pause_ms:
+        time.sleep(pause_ms / 1000.0)
+
+
+def _commit_batch(conn: sqlite3.Connection, job: str, apply: Callable[[], int]) -> int:
+    """Run ``apply`` in one short write transaction and record it as a batch of ``job``."""
+    started = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = apply()
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    get_memory_job_progress().batch(job, rows, (time.perf_counter() - started) * 1000.0)
+    return rows
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+        ).fetchone()
+        is not None
+    )
+
+
+def _delete_memory_rows(conn: sqlite3.Connection, ids: list[str]) -> int:
+    placeholders = ",".join("?" for _ in ids)
+    for table in _MEMORY_INDEX_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE memory_id IN ({placeholders})", tuple(ids))
+    return int(
+        conn.execute(f"DELETE FROM memory_items WHERE id IN ({placeholders})", tuple(ids)).rowcount
+        or 0
+    )
+
+
+def _prune_memory_retention(
+    conn: sqlite3.Connection, stale_before: str, *, archive: bool
+) -> int:
+    """Archive and delete memory older than ``stale_before`` in ``created_at`` order."""
+    settings = get_settings()
+    batch_size = _maintenance_batch_size()
+    pruned = 0
+    while True:
+        ids = [
+            str(row["id"])
+            for row in conn.execute(
+                "SELECT id FROM memory_items WHERE created_at<? ORDER BY created_at LIMIT ?",
+                (stale_before, batch_size),
+            ).fetchall()
+        ]
+        if not ids:
+            break
+
+        def apply(ids: list[str] = ids) -> int:
+            if archive:
+                placeholders = ",".join("?" for _ in ids)
+                conn.execute(
+                    (
+                        "INSERT OR IGNORE INTO memory_items_archive("
+                        "id, thread_id, text, metadata_json, created_at, archived_at, archive_reason"
+                        ") SELECT id, thread_id, text, metadata_json, created_at, ?, 'retention' "
+                        f"FROM memory_items WHERE id IN ({placeholders})"
+                    ),
+                    (now_iso(), *ids),
+                )
+            return _delete_memory_rows(conn, ids)
+
+        pruned += _commit_batch(conn, "retention", apply)
+        get_thread_vector_cache().discard(settings.app_db, ids)
+        discard_ann_keys("memory", ids)
+        if len(ids) < batch_size:
+            break
+        _yield_between_batches()
+    return pruned
+
+
+def _dedupe_memory(conn: sqlite3.Connection, duplicate_ids: list[str]) -> int:
+    settings = get_settings()
+    batch_size = _maintenance_batch_size()
+    deduped = 0
+    for start in range(0, len(duplicate_ids), batch_size):
+        ids = duplicate_ids[start : start + batch_size]
+        if start:
+            _yield_between_batches()
+        deduped += _commit_batch(conn, "dedup", lambda ids=ids: _delete_memory_rows(conn, ids))
+        get_thread_vector_cache().discard(settings.app_db, ids)
+        discard_ann_keys("memory", ids)
+    return deduped
+
+
+def _walk_state_items(
+    conn: sqlite3.Connection,
+    job: str,
+    predicate: str,
+    params: tuple[object, ...],
+    apply: Callable[[tuple[str, str, str, str]], int],
+) -> int:
+    """Apply a set-based statement to ``state_items`` one primary-key range at a time.
+
+    The walk pages through matching ``(uid, thread_id)`` keys in primary-key order, so
+    each batch reads at most ``MEMORY_MAINTENANCE_BATCH_SIZE`` matches past the cursor
+    and the whole pass touches every row once. ``apply`` receives the inclusive key
+    range and must re-check ``predicate`` inside its own statements.
+    """
+    batch_size = _maintenance_batch_size()
+    cursor = ("", "")
+    affected = 0
+    while True:
+        keys = conn.execute(
+            (
+                "SELECT uid, thread_id FROM state_items "
+                f"WHERE (uid, thread_id) > (?, ?) AND {predicate} "
+                "ORDER BY uid, thread_id LIMIT ?"
+            ),
+            (*cursor, *params, batch_size),
+        ).fetchall()
+        if not keys:
+            break
+        first = (str(keys[0]["uid"]), str(keys[0]["thread_id"]))
+        cursor = (str(keys[-1]["uid"]), str(keys[-1]["thread_id"]))
+        key_range = (*first, *cursor)
+        affected += _commit_batch(conn, job, lambda key_range=key_range: apply(key_range))
+        if len(keys) < batch_size:
+            break
+        _yield_between_batches()
+    return affected
+
+
+def _archive_state_items(
+    conn: sqlite3.Connection,
+    job: str,
+    predicate: str,
+    params: tuple[object, ...],
+    *,
+    reason: str,
+    archive: bool,
+) -> int:
+    """Copy matching ``state_items`` rows into ``state_items_archive`` and delete them."""
+
+    def apply(key_range: tuple[str, str, str, str]) -> int:
+        if archive:
+            conn.execute(
+                (
+                    f"INSERT INTO state_items_archive({_STATE_COLUMNS}, archived_at, archive_reason) "
+                    f"SELECT {_STATE_COLUMNS}, ?, ? FROM state_items "
+                    f"WHERE {_STATE_RANGE} AND {predicate}"
+                ),
+                (now_iso(), reason, *key_range, *params),
+            )
+        return int(
+            conn.execute(
+                f"DELETE FROM state_items WHERE {_STATE_RANGE} AND {predicate}",
+                (*key_range, *params),
+            ).rowcount
+            or 0
+        )
+
+    return _walk_state_items(conn, job, predicate, params, apply)
+
+
 def run_memory_maintenance() -> dict[str, object]:
     settings = get_settings()
     retention_days = max(1, int(settings.memory_retention_days))
@@ -76,157 +426,61 @@ def run_memory_maintenance() -> dict[str, object]:
         "deduped_memory_items": 0,
         "demoted_state_items": 0,
     }
+    progress = get_memory_job_progress()
 
     with get_conn() as conn:
-        has_archive = (
-            conn.execute(
-                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='memory_items_archive'"
-            ).fetchone()
-            is not None
-        )
-        has_state_archive = (
-            conn.execute(
-                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='state_items_archive'"
-            ).fetchone()
-            is not None
-        )
+        has_archive = _table_exists(conn, "memory_items_archive")
+        has_state_archive = _table_exists(conn, "state_items_archive")
         demotion_candidates_row = conn.execute(
-            (
-                "SELECT COUNT(*) AS n FROM state_items "
-                "WHERE pinned=0 AND status IN ('active','open') AND confidence!='low' "
-                "AND last_seen_at<?"
-            ),
+            f"SELECT COUNT(*) AS n FROM state_items WHERE {_DEMOTABLE}",
             (stale_before,),
         ).fetchone()
         demotion_candidates = int(demotion_candidates_row["n"]) if demotion_candidates_row else 0
 
         # Prune old memory items plus associated indexes.
-        old_memory = conn.execute(
-            "SELECT id, thread_id, text, metadata_json, created_at FROM memory_items WHERE created_at<?",
-            (stale_before,),
-        ).fetchall()
-        old_memory_ids = [str(row["id"]) for row in old_memory]
-        if old_memory_ids:
-            if has_archive:
-                archived_at = now_iso()
-                for row in old_memory:
-                    conn.execute(
-                        (
-                            "INSERT OR IGNORE INTO memory_items_archive("
-                            "id, thread_id, text, metadata_json, created_at, archived_at, archive_reason"
-                            ") VALUES(?,?,?,?,?,?,?)"
-                        ),
-                        (
-                            str(row["id"]),
-                            str(row["thread_id"]),
-                            str(row["text"]),
-                            str(row["metadata_json"]),
-                            str(row["created_at"]),
-                            archived_at,
-                            "retention",
-                        ),
-                    )
-            placeholders = ",".join("?" for _ in old_memory_ids)
-            conn.execute(
-                f"DELETE FROM memory_embeddings WHERE memory_id IN ({placeholders})",
-                tuple(old_memory_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_vec WHERE memory_id IN ({placeholders})",
-                tuple(old_memory_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_vec_index_map WHERE memory_id IN ({placeholders})",
-                tuple(old_memory_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_fts WHERE memory_id IN ({placeholders})",
-                tuple(old_memory_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_items WHERE id IN ({placeholders})",
-                tuple(old_memory_ids),
+        progress.start("retention")
+        try:
+            summary["pruned_memory_items"] = _prune_memory_retention(
+                conn, stale_before, archive=has_archive
             )
-            summary["pruned_memory_items"] = len(old_memory_ids)
+        finally:
+            progress.finish("retention")
 
         # Prune stale state entries that are unpinned and already superseded.
-        deleted_state = conn.execute(
-            (
-                "SELECT uid, thread_id, text, status, type_tag, topic_tags_json, refs_json, "
-                "confidence, replaced_by, supersession_evidence, conflict, pinned, source, "
-                "created_at, last_seen_at, updated_at, tier, importance_score, access_count, "
-                "conflict_count, agent_id, last_accessed_at "
-                "FROM state_items WHERE pinned=0 AND status='superseded' AND last_seen_at<?"
-            ),
-            (stale_before,),
-        ).fetchall()
-        if deleted_state:
-            if has_state_archive:
-                archived_at = now_iso()
-                for row in deleted_state:
+        progress.start("state_prune")
+        try:
+            summary["pruned_state_items"] = _archive_state_items(
+                conn,
+                "state_prune",
+                _STALE_SUPERSEDED,
+                (stale_before,),
+                reason="superseded_stale",
+                archive=has_state_archive,
+            )
+        finally:
+            progress.finish("state_prune")
+
+        # Demote stale active/open items by lowering confidence.
+        progress.start("demotion")
+        try:
+            summary["demoted_state_items"] = _walk_state_items(
+                conn,
+                "demotion",
+                _DEMOTABLE,
+                (stale_before,),
+                lambda key_range: int(
                     conn.execute(
                         (
-                            "INSERT INTO state_items_archive("
-                            "uid, thread_id, text, status, type_tag, topic_tags_json, refs_json, "
-                            "confidence, replaced_by, supersession_evidence, conflict, pinned, source, "
-                            "created_at, last_seen_at, updated_at, tier, importance_score, access_count, "
-                            "conflict_count, agent_id, last_accessed_at, archived_at, archive_reason"
-                            ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)"
-                        ),
-                        (
-                            str(row["uid"]),
-                            str(row["thread_id"]),
-                            str(row["text"]),
-                            str(row["status"]),
-                            str(row["type_tag"]),
-                            str(row["topic_tags_json"]),
-                            str(row["refs_json"]),
-                            str(row["confidence"]),
-                            str(row["replaced_by"]) if row["replaced_by"] is not None else None,
-                            (
-                                str(row["supersession_evidence"])
-                                if row["supersession_evidence"] is not None
-                                else None
-                            ),
-                            int(row["conflict"]),
-                            int(row["pinned"]),
-                            str(row["source"]),
-                            str(row["created_at"]),
-                            str(row["last_seen_at"]),
-                            str(row["updated_at"]),
-                            str(row["tier"]),
-                            float(row["importance_score"]),
-                            int(row["access_count"]),
-                            int(row["conflict_count"]),
-                            str(row["agent_id"]),
-                            (
-                                str(row["last_accessed_at"])
-                                if row["last_accessed_at"] is not None
-                                else None
-                            ),
-                            archived_at,
-                            "superseded_stale",
+                            "UPDATE state_items SET confidence='low', updated_at=? "
+                            f"WHERE {_STATE_RANGE} AND {_DEMOTABLE}"
                         ),
-                    )
-            conn.execute(
-                (
-                    "DELETE FROM state_items WHERE pinned=0 AND status='superseded' AND "
-                    "last_seen_at<?"
+                        (now_iso(), *key_range, stale_before),
+                    ).rowcount
+                    or 0
                 ),
-                (stale_before,),
             )
-        summary["pruned_state_items"] = len(deleted_state)
-
-        # Demote stale active/open items by lowering confidence.
-        demoted = conn.execute(
-            (
-                "UPDATE state_items SET confidence='low', updated_at=? "
-                "WHERE pinned=0 AND status IN ('active','open') AND confidence!='low' "
-                "AND last_seen_at<?"
-            ),
-            (now_iso(), stale_before),
-        ).rowcount
-        summary["demoted_state_items"] = int(demoted or 0)
+        finally:
+            progress.finish("demotion")
 
         # Remove duplicate memory rows by (thread_id, text), keeping newest.
         duplicates = conn.execute(
@@ -237,30 +491,13 @@ def run_memory_maintenance() -> dict[str, object]:
             "AND (m2.created_at>m1.created_at OR (m2.created_at=m1.created_at AND m2.id>m1.id))"
             ")"
         ).fetchall()
-        dup_ids = [str(row["id"]) for row in duplicates]
-        if dup_ids:
-            placeholders = ",".join("?" for _ in dup_ids)
-            conn.execute(
-                f"DELETE FROM memory_embeddings WHERE memory_id IN ({placeholders})",
-                tuple(dup_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_vec WHERE memory_id IN ({placeholders})",
-                tuple(dup_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_vec_index_map WHERE memory_id IN ({placeholders})",
-                tuple(dup_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_fts WHERE memory_id IN ({placeholders})",
-                tuple(dup_ids),
-            )
-            conn.execute(
-                f"DELETE FROM memory_items WHERE id IN ({placeholders})",
-                tuple(dup_ids),
+        progress.start("dedup")
+        try:
+            summary["deduped_memory_items"] = _dedupe_memory(
+                conn, [str(row["id"]) for row in duplicates]
             )
-            summary["deduped_memory_items"] = len(dup_ids)
+        finally:
+            progress.finish("dedup")
 
         conflict_row = conn.execute(
             "SELECT COUNT(*) AS n FROM state_items WHERE conflict=1"
@@ -269,8 +506,8 @@ def run_memory_maintenance() -> dict[str, object]:
         summary["archived"] = summary["pruned_memory_items"] + summary["pruned_state_items"]
         summary["deduped"] = summary["deduped_memory_items"]
         summary["scanned"] = (
-            len(old_memory)
-            + len(deleted_state)
+            summary["pruned_memory_items"]
+            + summary["pruned_state_items"]
             + len(duplicates)
             + demotion_candidates
         )
@@ -319,39 +556,31 @@ def migrate_tiers() -> dict[str, int]:
     settings = get_settings()
     if int(settings.memory_tiers_enabled) != 1:
         return {"moved": 0}
-    moved = 0
     now = datetime.now(UTC)
-    with get_conn() as conn:
-        rows = conn.execute(
-            
-                "SELECT uid, thread_id, tier, pinned, status, importance_score, last_seen_at, access_count "
-                "FROM state_items"
-            
-        ).fetchall()
-        for row in rows:
-            current = str(row["tier"])
-            pinned = int(row["pinned"]) == 1
-            last_seen = datetime.fromisoformat(str(row["last_seen_at"]))
-            age_days = (now - last_seen).total_seconds() / 86400.0
-            importance = float(row["importance_score"])
-            access_count = int(row["access_count"])
-            target = current
-            if pinned:
-                target = "procedural"
-            elif importance >= 0.75 or access_count >= 10:
-                target = "semantic_longterm"
-            elif age_days <= 14:
-                target = "working"
-            elif age_days <= 60:
-                target = "episodic"
-            else:
-                target = "semantic_longterm"
-            if target != current:
-                conn.execute(
-                    "UPDATE state_items SET tier=?, updated_at=? WHERE uid=? AND thread_id=?",
-                    (target, now_iso(), str(row["uid"]), str(row["thread_id"])),
-                )
-                moved += 1
+    cutoffs = ((now - timedelta(days=14)).isoformat(), (now - timedelta(days=60)).isoformat())
+    predicate = f"tier != {_TIER_TARGET}"
+    progress = get_memory_job_progress()
+    progress.start("tiers")
+    try:
+        with get_conn() as conn:
+            moved = _walk_state_items(
+                conn,
+                "tiers",
+                predicate,
+                cutoffs,
+                lambda key_range: int(
+                    conn.execute(
+                        (
+                            f"UPDATE state_items SET tier={_TIER_TARGET}, updated_at=? "
+                            f"WHERE {_STATE_RANGE} AND {predicate}"
+                        ),
+                        (*cutoffs, now_iso(), *key_range, *cutoffs),
+                    ).rowcount
+                    or 0
+                ),
+            )
+    finally:
+        progress.finish("tiers")
     return {"moved": moved}
 
 
@@ -359,68 +588,23 @@ def prune_adaptive() -> dict[str, int]:
     settings = get_settings()
     if int(settings.memory_importance_enabled) != 1:
         return {"archived": 0}
-    archived = 0
+    cutoff = (datetime.now(UTC) - timedelta(days=max(1, int(settings.memory_retention_days)))).isoformat()
+    progress = get_memory_job_progress()
     with get_conn() as conn:
-        cutoff = (datetime.now(UTC) - timedelta(days=max(1, int(settings.memory_retention_days)))).isoformat()
-        has_archive = (
-            conn.execute(
-                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='state_items_archive'"
-            ).fetchone()
-            is not None
-        )
-        if not has_archive:
+        if not _table_exists(conn, "state_items_archive"):
             return {"archived": 0}
-        rows = conn.execute(
-            (
-                "SELECT uid, thread_id, text, status, type_tag, topic_tags_json, refs_json, confidence, "
-                "replaced_by, supersession_evidence, conflict, pinned, source, created_at, last_seen_at, "
-                "updated_at, tier, importance_score, access_count, conflict_count, agent_id, last_accessed_at "
-                "FROM state_items WHERE pinned=0 AND importance_score<0.35 AND last_seen_at<?"
-            ),
-            (cutoff,),
-        ).fetchall()
-        for row in rows:
-            conn.execute(
-                (
-                    "INSERT INTO state_items_archive("
-                    "uid, thread_id, text, status, type_tag, topic_tags_json, refs_json, confidence, "
-                    "replaced_by, supersession_evidence, conflict, pinned, source, created_at, last_seen_at, "
-                    "updated_at, tier, importance_score, access_count, conflict_count, agent_id, "
-                    "last_accessed_at, archived_at, archive_reason"
-                    ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)"
-                ),
-                (
-                    str(row["uid"]),
-                    str(row["thread_id"]),
-                    str(row["text"]),
-                    str(row["status"]),
-                    str(row["type_tag"]),
-                    str(row["topic_tags_json"]),
-                    str(row["refs_json"]),
-                    str(row["confidence"]),
-                    str(row["replaced_by"]) if row["replaced_by"] is not None else None,
-                    str(row["supersession_evidence"]) if row["supersession_evidence"] is not None else None,
-                    int(row["conflict"]),
-                    int(row["pinned"]),
-                    str(row["source"]),
-                    str(row["created_at"]),
-                    str(row["last_seen_at"]),
-                    str(row["updated_at"]),
-                    str(row["tier"]),
-                    float(row["importance_score"]),
-                    int(row["access_count"]),
-                    int(row["conflict_count"]),
-                    str(row["agent_id"]),
-                    str(row["last_accessed_at"]) if row["last_accessed_at"] is not None else None,
-                    now_iso(),
-                    "adaptive_low_importance",
-                ),
-            )
-            conn.execute(
-                "DELETE FROM state_items WHERE uid=? AND thread_id=?",
-                (str(row["uid"]), str(row["thread_id"])),
+        progress.start("adaptive_prune")
+        try:
+            archived = _archive_state_items(
+                conn,
+                "adaptive_prune",
+                _ADAPTIVE_PRUNABLE,
+                (cutoff,),
+                reason="adaptive_low_importance",
+                archive=True,
             )
-            archived += 1
+        finally:
+            progress.finish("adaptive_prune")
     return {"archived": archived}
 
 
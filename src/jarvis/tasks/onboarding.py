@@ -6,7 +6,7 @@ import logging
 
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
-from jarvis.db.queries import insert_message, now_iso
+from jarvis.db.queries import insert_message, insert_web_notification, now_iso
 from jarvis.onboarding.service import maybe_handle_onboarding_message
 from jarvis.providers.factory import build_fallback_provider, build_primary_provider
 from jarvis.providers.router import ProviderRouter
@@ -17,44 +17,34 @@ logger = logging.getLogger(__name__)
 def onboarding_step(trace_id: str, thread_id: str, user_id: str, user_message: str) -> str | None:
     start_created_at = now_iso()
     with get_conn() as conn:
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
-                thread_id,
-                "agent.thinking",
-                json.dumps(
-                    {
-                        "thread_id": thread_id,
-                        "agent_id": "main",
-                        "trace_id": trace_id,
-                        "created_at": start_created_at,
-                    }
-                ),
-                start_created_at,
+        insert_web_notification(
+            conn,
+            thread_id,
+            "agent.thinking",
+            json.dumps(
+                {
+                    "thread_id": thread_id,
+                    "agent_id": "main",
+                    "trace_id": trace_id,
+                    "created_at": start_created_at,
+                }
             ),
+            start_created_at,
         )
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
-                thread_id,
-                "trace.model.run.start",
-                json.dumps(
-                    {
-                        "thread_id": thread_id,
-                        "trace_id": trace_id,
-                        "provider": "router",
-                        "phase": "onboarding",
-                        "created_at": start_created_at,
-                    }
-                ),
-                start_created_at,
+        insert_web_notification(
+            conn,
+            thread_id,
+            "trace.model.run.start",
+            json.dumps(
+                {
+                    "thread_id": thread_id,
+                    "trace_id": trace_id,
+                    "provider": "router",
+                    "phase": "onboarding",
+                    "created_at": start_created_at,
+                }
             ),
+            start_created_at,
         )
 
     settings = get_settings()
@@ -90,30 +80,26 @@ def onboarding_step(trace_id: str, thread_id: str, user_id: str, user_message: s
 
         if fallback_reason:
             fallback_created_at = now_iso()
-            conn.execute(
-                (
-                    "INSERT INTO web_notifications"
-                    "(thread_id, event_type, payload_json, created_at) "
-                    "VALUES(?,?,?,?)"
-                ),
-                (
-                    thread_id,
-                    "trace.model.fallback",
-                    json.dumps(
-                        {
-                            "thread_id": thread_id,
-                            "trace_id": trace_id,
-                            "error": fallback_reason,
-                            "created_at": fallback_created_at,
-                        }
-                    ),
-                    fallback_created_at,
+            insert_web_notification(
+                conn,
+                thread_id,
+                "trace.model.fallback",
+                json.dumps(
+                    {
+                        "thread_id": thread_id,
+                        "trace_id": trace_id,
+                        "error": fallback_reason,
+                        "created_at": fallback_created_at,
+                    }
                 ),
+                fallback_created_at,
             )
 
         message_id: str | None = None
         if assistant_reply is not None:
-            message_id = insert_message(conn, thread_id, "assistant", assistant_reply)
+            message_id = insert_message(
+                conn, thread_id, "assistant", assistant_reply, trace_id=trace_id
+            )
             try:
                 from jarvis.tasks import get_task_runner
 
@@ -137,59 +123,42 @@ def onboarding_step(trace_id: str, thread_id: str, user_id: str, user_message: s
                     "failed to enqueue onboarding assistant memory indexing",
                     exc_info=True,
                 )
-            conn.execute(
-                (
-                    "INSERT INTO web_notifications("
-                    "thread_id, event_type, payload_json, created_at"
-                    ") "
-                    "VALUES(?,?,?,?)"
-                ),
-                (
-                    thread_id,
-                    "message.new",
-                    json.dumps({"message_id": message_id, "role": "assistant"}),
-                    now_iso(),
-                ),
+            insert_web_notification(
+                conn,
+                thread_id,
+                "message.new",
+                json.dumps({"message_id": message_id, "role": "assistant"}),
+                now_iso(),
             )
 
         end_created_at = now_iso()
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
-                thread_id,
-                "trace.model.run.end",
-                json.dumps(
-                    {
-                        "thread_id": thread_id,
-                        "trace_id": trace_id,
-                        "provider": "router",
-                        "phase": "onboarding",
-                        "created_at": end_created_at,
-                    }
-                ),
-                end_created_at,
+        insert_web_notification(
+            conn,
+            thread_id,
+            "trace.model.run.end",
+            json.dumps(
+                {
+                    "thread_id": thread_id,
+                    "trace_id": trace_id,
+                    "provider": "router",
+                    "phase": "onboarding",
+                    "created_at": end_created_at,
+                }
             ),
+            end_created_at,
         )
-        conn.execute(
-            (
-                "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
-                "VALUES(?,?,?,?)"
-            ),
-            (
-                thread_id,
-                "agent.done",
-                json.dumps(
-                    {
-                        "thread_id": thread_id,
-                        "agent_id": "main",
-                        "trace_id": trace_id,
-                        "created_at": end_created_at,
-                    }
-                ),
-                end_created_at,
+        insert_web_notification(
+            conn,
+            thread_id,
+            "agent.done",
+            json.dumps(
+                {
+                    "thread_id": thread_id,
+                    "agent_id": "main",
+                    "trace_id": trace_id,
+                    "created_at": end_created_at,
+                }
             ),
+            end_created_at,
         )
         return message_id
@@ -7,7 +7,9 @@ from pathlib import Path
 
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
-from jarvis.db.queries import ensure_system_state
+from jarvis.db.profiler import get_query_profiler, snapshot_path
+from jarvis.db.queries import ensure_system_state, mark_system_state_changed
+from jarvis.events.archive import archive_cutoff, compact_events
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
 from jarvis.ids import new_id
@@ -52,6 +54,7 @@ def system_restart(trace_id: str) -> dict[str, str]:
         conn.execute(
             "UPDATE system_state SET restarting=1, updated_at=datetime('now') WHERE id='singleton'"
         )
+        mark_system_state_changed()
         try:
             row = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
             checkpoint = tuple(row) if row is not None else tuple()
@@ -116,6 +119,7 @@ def system_restart(trace_id: str) -> dict[str, str]:
         conn.execute(
             "UPDATE system_state SET restarting=0, updated_at=datetime('now') WHERE id='singleton'"
         )
+        mark_system_state_changed()
     _emit(trace_id, "system.restart.complete", {"status": "ready"})
     return {"status": "restarted"}
 
@@ -173,3 +177,30 @@ def db_vacuum() -> dict[str, str]:
         conn.execute("VACUUM")
     _emit(trace_id, "system.db_maintenance", {"action": "vacuum", "status": "ok"})
     return {"action": "vacuum", "status": "ok"}
+
+
+def db_profile_snapshot() -> dict[str, str]:
+    """Write the SQL profiler report where ``jarvis db profile`` can read it."""
+    path = get_query_profiler().write_snapshot(snapshot_path(get_settings().app_db))
+    return {"action": "profile_snapshot", "status": "ok", "path": str(path)}
+
+
+def events_archive() -> dict[str, object]:
+    """Move events past ``EVENTS_ARCHIVE_AFTER_DAYS`` into their monthly partitions."""
+    settings = get_settings()
+    days = int(settings.events_archive_after_days)
+    if days <= 0:
+        return {"action": "events_archive", "status": "disabled"}
+    with get_conn() as conn:
+        result = compact_events(
+            conn,
+            before=archive_cutoff(days),
+            batch_size=int(settings.events_archive_batch_size),
+        )
+    if result.get("archived"):
+        _emit(
+            new_id("trc"),
+            "system.db_maintenance",
+            {"action": "events_archive", "status": "ok", **result},
+        )
+    return {"action": "events_archive", "status": "ok", **result}
@@ -1,10 +1,13 @@
 """Tool registration helpers."""
 
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Literal
 
 ToolCallable = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+# "read" tools only observe state and may run alongside other reads in the same
+# model turn; "write" tools (the default) always run alone, in call order.
+ToolSideEffect = Literal["read", "write"]
 
 
 @dataclass(slots=True)
@@ -15,6 +18,9 @@ class ToolDef:
     parameters: dict[str, object] = field(
         default_factory=lambda: {"type": "object", "properties": {}}
     )
+    side_effect: ToolSideEffect = "write"
+    # Read tools sharing a serial class (e.g. one rate-limited backend) never overlap.
+    serial_class: str | None = None
 
 
 class ToolRegistry:
@@ -27,12 +33,17 @@ class ToolRegistry:
         description: str,
         handler: ToolCallable,
         parameters: dict[str, object] | None = None,
+        *,
+        side_effect: ToolSideEffect = "write",
+        serial_class: str | None = None,
     ) -> None:
         self._tools[name] = ToolDef(
             name=name,
             description=description,
             handler=handler,
             parameters=parameters or {"type": "object", "properties": {}},
+            side_effect=side_effect,
+            serial_class=serial_class,
         )
 
     def get(self, name: str) -> ToolDef | None:
@@ -47,3 +58,29 @@ class ToolRegistry:
             }
             for tool in self._tools.values()
         ]
+
+    def plan_batches(self, names: Sequence[str]) -> list[list[list[int]]]:
+        """Group one turn's tool calls into batches of concurrently runnable lanes.
+
+        Returns ``batches -> lanes -> call indices``. Batches run one after
+        another; the lanes of a batch run concurrently and each lane runs its
+        calls in order. Consecutive read calls share a batch, with calls of the
+        same ``serial_class`` chained on one lane. A write call, or any name
+        that is not registered, gets a batch of its own, so it never overlaps
+        another call and keeps its position relative to the calls around it.
+        """
+        batches: list[list[list[int]]] = []
+        lanes: dict[str, list[int]] = {}
+        for idx, name in enumerate(names):
+            tool = self.get(name)
+            if tool is None or tool.side_effect != "read":
+                if lanes:
+                    batches.append(list(lanes.values()))
+                    lanes = {}
+                batches.append([[idx]])
+                continue
+            lane_key = tool.serial_class if tool.serial_class is not None else f"#{idx}"
+            lanes.setdefault(lane_key, []).append(idx)
+        if lanes:
+            batches.append(list(lanes.values()))
+        return batches
@@ -5,6 +5,7 @@ import sqlite3
 from typing import Any
 
 from jarvis.db.queries import insert_message, now_iso
+from jarvis.db.write_queue import flush_writes
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
 from jarvis.ids import new_id
@@ -73,6 +74,8 @@ def session_history(
     conn: sqlite3.Connection, session_id: str, limit: int = 200, before: str | None = None
 ) -> list[dict[str, str]]:
     capped = max(1, min(limit, 500))
+    # The timeline view includes session events, which may still be queued.
+    flush_writes()
     if before:
         rows = conn.execute(
             (
@@ -142,6 +145,8 @@ def session_send(
         thread_id=session_id,
         role="agent",
         content=f"[{from_agent_id}->{to_agent_id}] {message}",
+        actor_id=from_agent_id,
+        trace_id=trace_id,
     )
     payload = {
         "session_id": session_id,
@@ -1,4 +1,6 @@
+import itertools
 import os
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -7,23 +9,97 @@ from jarvis.channels.registry import _reset as _reset_channels
 from jarvis.channels.registry import register_channel
 from jarvis.channels.whatsapp.adapter import WhatsAppAdapter
 from jarvis.config import get_settings
+from jarvis.db.connection import reset_connection_pool
 from jarvis.db.migrations.runner import run_migrations
+from jarvis.db.profiler import reset_query_profiler
+from jarvis.db.write_queue import reset_write_queue
+from jarvis.memory.embedder_runtime import reset_embedder_runtime
+from jarvis.memory.job_progress import reset_memory_job_progress
+from jarvis.memory.query_cache import reset_query_embedding_cache
+from jarvis.memory.vec_runtime import reset_vec_runtime
+from jarvis.orchestrator.environment import reset_environment_context
+from jarvis.orchestrator.prompt_cache import reset_prompt_cache_stats
+from jarvis.orchestrator.streaming import reset_stream_bus
+
+# Point at a PostgreSQL server (e.g. postgresql://postgres@localhost/postgres) to run
+# the suite against DB_ENGINE=postgres: each test gets a database cloned from a
+# migrated template.
+POSTGRES_ADMIN_URL = os.environ.get("JARVIS_TEST_DATABASE_URL", "").strip()
+_pg_database_ids = itertools.count()
+
+
+def _pg_admin_execute(sql: str) -> None:
+    import psycopg
+
+    with psycopg.connect(POSTGRES_ADMIN_URL, autocommit=True) as conn:
+        conn.execute(sql)
+
+
+def _pg_url(database: str) -> str:
+    from psycopg.conninfo import make_conninfo
+
+    return make_conninfo(POSTGRES_ADMIN_URL, dbname=database)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    engine_only = "sqlite_only" if POSTGRES_ADMIN_URL else "postgres_only"
+    skip = pytest.mark.skip(reason=f"{engine_only.split('_')[0]} engine only")
+    for item in items:
+        if engine_only in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def postgres_template() -> Iterator[str | None]:
+    if not POSTGRES_ADMIN_URL:
+        yield None
+        return
+    template = f"jarvis_test_template_{os.getpid()}"
+    _pg_admin_execute(f"DROP DATABASE IF EXISTS {template} WITH (FORCE)")
+    _pg_admin_execute(f"CREATE DATABASE {template}")
+    os.environ["DB_ENGINE"] = "postgres"
+    os.environ["DATABASE_URL"] = _pg_url(template)
+    get_settings.cache_clear()
+    run_migrations()
+    reset_connection_pool()
+    yield template
+    _pg_admin_execute(f"DROP DATABASE IF EXISTS {template} WITH (FORCE)")
 
 
 @pytest.fixture(autouse=True)
-def test_env(tmp_path: Path):
+def test_env(tmp_path: Path, postgres_template: str | None):
     db = tmp_path / "test.db"
     patch_dir = tmp_path / "patches"
     os.environ["APP_DB"] = str(db)
+    database = None
+    if postgres_template is not None:
+        database = f"{postgres_template}_{next(_pg_database_ids)}"
+        _pg_admin_execute(f"CREATE DATABASE {database} TEMPLATE {postgres_template}")
+        os.environ["DATABASE_URL"] = _pg_url(database)
     os.environ["SELFUPDATE_PATCH_DIR"] = str(patch_dir)
     os.environ["WHATSAPP_VERIFY_TOKEN"] = "test-token"
     os.environ["EVOLUTION_API_URL"] = ""
     os.environ["WHATSAPP_AUTO_CREATE_ON_STARTUP"] = "0"
     os.environ["MAINTENANCE_ENABLED"] = "0"
+    os.environ["DB_WRITE_BEHIND_ENABLED"] = "1"
     get_settings.cache_clear()
+    reset_write_queue()
+    reset_connection_pool()
+    reset_query_profiler()
+    reset_embedder_runtime()
+    reset_memory_job_progress()
+    reset_query_embedding_cache()
+    reset_vec_runtime()
+    reset_stream_bus()
+    reset_prompt_cache_stats()
+    reset_environment_context()
     run_migrations()
     _reset_channels()
     register_channel(WhatsAppAdapter())
     yield
+    reset_write_queue()
+    reset_connection_pool()
     get_settings.cache_clear()
     _reset_channels()
+    if database is not None:
+        _pg_admin_execute(f"DROP DATABASE IF EXISTS {database} WITH (FORCE)")
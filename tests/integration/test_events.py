@@ -1,8 +1,10 @@
 import json
 
 from jarvis.db.connection import get_conn
+from jarvis.db.write_queue import flush_writes
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
+from jarvis.tasks.memory import index_event_vectors
 
 
 def test_emit_event_with_trace() -> None:
@@ -22,18 +24,31 @@ def test_emit_event_with_trace() -> None:
                 payload_redacted_json=json.dumps({"text": "hello"}),
             ),
         )
+        flush_writes()
         row = conn.execute(
             "SELECT trace_id, event_type FROM events WHERE id=?",
             (event_id,),
         ).fetchone()
+        pending = conn.execute(
+            "SELECT event_id FROM pending_event_vectors WHERE event_id=?",
+            (event_id,),
+        ).fetchone()
+        vec_before = conn.execute("SELECT id FROM event_vec WHERE id=?", (event_id,)).fetchone()
+    result = index_event_vectors()
+    with get_conn() as conn:
         vec = conn.execute(
             "SELECT id FROM event_vec WHERE id=?",
             (event_id,),
         ).fetchone()
+        backlog = conn.execute("SELECT COUNT(*) AS n FROM pending_event_vectors").fetchone()
     assert row is not None
     assert row["trace_id"] == "trc_1"
     assert row["event_type"] == "unit.test"
+    assert pending is not None
+    assert vec_before is None
+    assert result["indexed"] >= 1
     assert vec is not None
+    assert backlog["n"] == 0
 
 
 def test_redact_payload_redacts_nested_sensitive_keys() -> None:
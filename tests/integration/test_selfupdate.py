@@ -5,6 +5,7 @@ from pathlib import Path
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import ensure_system_state, insert_system_fitness_snapshot, now_iso
+from jarvis.db.write_queue import flush_writes
 from jarvis.selfupdate.pipeline import write_context
 from jarvis.tasks.selfupdate import (
     self_update_apply,
@@ -389,6 +390,7 @@ def test_selfupdate_rollback_burst_emits_lockdown_event(tmp_path: Path) -> None:
     _ = self_update_rollback(first, "forced rollback 1")
     _ = self_update_rollback(second, "forced rollback 2")
 
+    flush_writes()
     with get_conn() as conn:
         rows = conn.execute(
             "SELECT event_type, payload_redacted_json FROM events "
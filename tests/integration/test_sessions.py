@@ -1,5 +1,6 @@
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import ensure_channel, ensure_open_thread, ensure_system_state, ensure_user
+from jarvis.db.write_queue import flush_writes
 from jarvis.tools.session import session_history, session_list, session_send
 
 
@@ -19,6 +20,7 @@ def test_session_send_and_history_roundtrip() -> None:
         )
         sessions = session_list(conn, agent_id="researcher")
         history = session_history(conn, session_id, limit=20)
+        flush_writes()
         delegate = conn.execute(
             "SELECT event_type FROM events WHERE id=?",
             (event_id,),
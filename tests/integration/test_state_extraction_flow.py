@@ -32,6 +32,9 @@ class _Memory:
     def embed_text(self, _text: str) -> list[float]:
         return [0.2, 0.8]
 
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_text(text) for text in texts]
+
 
 def test_state_extraction_flow_watermark_and_tiebreaker() -> None:
     with get_conn() as conn:
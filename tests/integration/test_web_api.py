@@ -10,6 +10,7 @@ from fastapi.testclient import TestClient
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import insert_message, now_iso
+from jarvis.events.archive import compact_events
 from jarvis.ids import new_id
 from jarvis.main import app
 
@@ -308,51 +309,9 @@ def test_web_messages_hide_non_main_assistant_history() -> None:
     thread_id = thread.json()["id"]
 
     with get_conn() as conn:
-        main_msg_id = insert_message(conn, thread_id, "assistant", "main response")
-        planner_msg_id = insert_message(conn, thread_id, "assistant", "planner internal response")
-        conn.execute(
-            (
-                "INSERT INTO events("
-                "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
-                "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
-                ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
-            ),
-            (
-                new_id("evt"),
-                new_id("trc"),
-                new_id("spn"),
-                None,
-                thread_id,
-                "agent.step.end",
-                "orchestrator",
-                "agent",
-                "main",
-                json.dumps({"message_id": main_msg_id}),
-                json.dumps({"message_id": main_msg_id}),
-                now_iso(),
-            ),
-        )
-        conn.execute(
-            (
-                "INSERT INTO events("
-                "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
-                "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
-                ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
-            ),
-            (
-                new_id("evt"),
-                new_id("trc"),
-                new_id("spn"),
-                None,
-                thread_id,
-                "agent.step.end",
-                "orchestrator",
-                "agent",
-                "planner",
-                json.dumps({"message_id": planner_msg_id}),
-                json.dumps({"message_id": planner_msg_id}),
-                now_iso(),
-            ),
+        insert_message(conn, thread_id, "assistant", "main response", actor_id="main")
+        insert_message(
+            conn, thread_id, "assistant", "planner internal response", actor_id="planner"
         )
 
     listing = client.get(f"/api/v1/threads/{thread_id}/messages", headers=headers)
@@ -413,6 +372,71 @@ def test_trace_endpoint_supports_redacted_and_raw_views() -> None:
     assert raw_items[0]["payload"]["password"] == "secret"
 
 
+@pytest.mark.sqlite_only
+def test_trace_and_event_search_include_archived_events() -> None:
+    os.environ["WEB_AUTH_SETUP_PASSWORD"] = "secret"
+    get_settings.cache_clear()
+
+    client = _managed_client()
+    token = _login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    thread_id = client.post("/api/v1/threads", headers=headers).json()["id"]
+    trace_id = new_id("trc")
+    old_id = new_id("evt")
+    new_event_id = new_id("evt")
+
+    with get_conn() as conn:
+        for event_id, created_at in (
+            (old_id, "2025-03-02T08:00:00+00:00"),
+            (new_event_id, now_iso()),
+        ):
+            conn.execute(
+                (
+                    "INSERT INTO events("
+                    "id, trace_id, span_id, parent_span_id, thread_id, event_type, component, "
+                    "actor_type, actor_id, payload_json, payload_redacted_json, created_at"
+                    ") VALUES(?,?,?,?,?,?,?,?,?,?,?,?)"
+                ),
+                (
+                    event_id,
+                    trace_id,
+                    new_id("spn"),
+                    None,
+                    thread_id,
+                    "archive.probe",
+                    "system",
+                    "system",
+                    "system",
+                    "{}",
+                    "{}",
+                    created_at,
+                ),
+            )
+        compact_events(conn, before="2025-04-01T00:00:00+00:00")
+
+    trace = client.get(f"/api/v1/traces/{trace_id}", headers=headers)
+    assert trace.status_code == 200
+    assert [item["id"] for item in trace.json()["items"]] == [old_id, new_event_id]
+
+    search = client.get("/api/v1/events?event_type=archive.probe&limit=1&offset=1", headers=headers)
+    assert search.status_code == 200
+    assert [item["id"] for item in search.json()["items"]] == [old_id]
+
+    event = client.get(f"/api/v1/events/{old_id}", headers=headers)
+    assert event.status_code == 200
+    assert event.json()["created_at"] == "2025-03-02T08:00:00+00:00"
+
+    export = client.get(
+        f"/api/v1/threads/{thread_id}/export?include_events=true", headers=headers
+    )
+    assert export.status_code == 200
+    exported = [json.loads(line) for line in export.text.splitlines()]
+    assert [item["id"] for item in exported if item["type"] == "event"] == [
+        old_id,
+        new_event_id,
+    ]
+
+
 def test_get_thread_onboarding_status() -> None:
     os.environ["WEB_AUTH_SETUP_PASSWORD"] = "secret"
     get_settings.cache_clear()
@@ -7,6 +7,7 @@ from jarvis.channels.whatsapp.media_security import MediaSecurityError
 from jarvis.channels.whatsapp.transcription import VoiceTranscriptionError
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
+from jarvis.db.write_queue import flush_writes
 from jarvis.main import app
 from jarvis.tasks.agent import agent_step
 from jarvis.tasks.channel import send_whatsapp_message
@@ -314,6 +315,7 @@ def test_webhook_to_outbound_flow_emits_events(monkeypatch) -> None:
     outbound_result = send_whatsapp_message(thread_id=thread_id, message_id=message_id)
     assert outbound_result["status"] == "sent"
 
+    flush_writes()
     with get_conn() as conn:
         outbound_events = conn.execute(
             (
@@ -446,6 +448,7 @@ def test_inbound_accepts_evolution_group_payload(monkeypatch) -> None:
     assert response.status_code == 200
     assert response.json()["accepted"] is True
 
+    flush_writes()
     with get_conn() as conn:
         event_row = conn.execute(
             "SELECT payload_redacted_json FROM events "
@@ -481,6 +484,7 @@ def test_inbound_batch_event_redacts_qr_and_pairing_fields_in_stored_logs(monkey
     response = client.post("/webhooks/whatsapp", json=payload)
     assert response.status_code == 200
 
+    flush_writes()
     with get_conn() as conn:
         row = conn.execute(
             "SELECT payload_json, payload_redacted_json FROM events "
@@ -531,6 +535,7 @@ def test_inbound_blocks_oversized_media_with_degraded_marker(monkeypatch) -> Non
     assert response.status_code == 202
     assert response.json() == {"accepted": True, "degraded": True}
 
+    flush_writes()
     with get_conn() as conn:
         row = conn.execute(
             "SELECT content FROM messages WHERE role='user' ORDER BY created_at DESC LIMIT 1"
@@ -587,6 +592,7 @@ def test_inbound_voice_note_transcription_failure_uses_marker(monkeypatch) -> No
     assert response.status_code == 202
     assert response.json() == {"accepted": True, "degraded": True}
 
+    flush_writes()
     with get_conn() as conn:
         row = conn.execute(
             "SELECT content FROM messages WHERE role='user' ORDER BY created_at DESC LIMIT 1"
@@ -672,6 +678,7 @@ def test_inbound_ignores_non_upsert_evolution_event() -> None:
         "event": "connection.update",
         "data": {"state": "open"},
     }
+    flush_writes()
     with get_conn() as conn:
         before_messages = int(conn.execute("SELECT COUNT(*) AS c FROM messages").fetchone()["c"])
         before_events = int(conn.execute("SELECT COUNT(*) AS c FROM events").fetchone()["c"])
@@ -681,6 +688,7 @@ def test_inbound_ignores_non_upsert_evolution_event() -> None:
     assert response.status_code == 200
     assert response.json() == {"accepted": True, "degraded": False, "ignored": True}
 
+    flush_writes()
     with get_conn() as conn:
         after_messages = int(conn.execute("SELECT COUNT(*) AS c FROM messages").fetchone()["c"])
         after_events = int(conn.execute("SELECT COUNT(*) AS c FROM events").fetchone()["c"])
@@ -1,5 +1,13 @@
 import logging
 
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import (
+    ensure_channel,
+    ensure_open_thread,
+    ensure_system_state,
+    ensure_user,
+    insert_message,
+)
 from jarvis.tasks.channel import send_channel_message
 
 
@@ -21,3 +29,74 @@ def test_send_channel_message_unknown_channel_logs_warning(monkeypatch, caplog)
 
     assert result["status"] == "skipped"
     assert "No adapter registered for channel_type=unknown_channel" in caplog.text
+
+
+def test_send_channel_message_finalizes_streamed_draft(monkeypatch) -> None:
+    calls: list[tuple[str, ...]] = []
+
+    class _DraftAdapter:
+        channel_type = "telegram"
+
+        async def send_text(self, recipient: str, text: str) -> int:
+            calls.append(("send", recipient, text))
+            return 200
+
+        async def start_draft(self, recipient: str, text: str) -> str | None:
+            return "41"
+
+        async def edit_draft(self, recipient: str, draft_id: str, text: str) -> int:
+            return 200
+
+        async def finalize_draft(self, recipient: str, draft_id: str, text: str) -> int:
+            calls.append(("finalize", recipient, draft_id, text))
+            return 200
+
+    monkeypatch.setattr("jarvis.tasks.channel.get_channel", lambda _channel_type: _DraftAdapter())
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "tg:42")
+        channel_id = ensure_channel(conn, user_id, "telegram")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        message_id = insert_message(conn, thread_id, "assistant", "final answer")
+
+    result = send_channel_message(thread_id, message_id, "telegram", draft_id="41")
+    assert result["status"] == "sent"
+    assert calls == [("finalize", "tg:42", "41", "final answer")]
+
+    calls.clear()
+    send_channel_message(thread_id, message_id, "telegram")
+    assert calls == [("send", "tg:42", "final answer")]
+
+
+def test_send_channel_message_sends_new_message_when_draft_is_gone(monkeypatch) -> None:
+    calls: list[str] = []
+
+    class _DraftAdapter:
+        channel_type = "telegram"
+
+        async def send_text(self, recipient: str, text: str) -> int:
+            calls.append("send")
+            return 200
+
+        async def start_draft(self, recipient: str, text: str) -> str | None:
+            return "41"
+
+        async def edit_draft(self, recipient: str, draft_id: str, text: str) -> int:
+            return 200
+
+        async def finalize_draft(self, recipient: str, draft_id: str, text: str) -> int:
+            calls.append("finalize")
+            return 400
+
+    monkeypatch.setattr("jarvis.tasks.channel.get_channel", lambda _channel_type: _DraftAdapter())
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "tg:43")
+        channel_id = ensure_channel(conn, user_id, "telegram")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        message_id = insert_message(conn, thread_id, "assistant", "final answer")
+
+    result = send_channel_message(thread_id, message_id, "telegram", draft_id="41")
+
+    assert result["status"] == "sent"
+    assert calls == ["finalize", "send"]
@@ -8,6 +8,7 @@ from click.testing import CliRunner
 from jarvis.cli.main import cli
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import insert_message
+from jarvis.orchestrator.streaming import get_stream_bus
 
 
 def _fake_agent_step(trace_id: str, thread_id: str, actor_id: str = "main") -> str:
@@ -75,6 +76,29 @@ def test_chat_interactive_loop(monkeypatch) -> None:
     assert "assistant > hello from main" in result.output
 
 
+def test_chat_streams_reply_as_frames_arrive(monkeypatch) -> None:
+    def _streaming_agent_step(trace_id: str, thread_id: str, actor_id: str = "main") -> str:
+        bus = get_stream_bus()
+        bus.publish(thread_id, {"type": "message.delta", "delta": "checking", "text": "checking"})
+        bus.publish(thread_id, {"type": "message.stream.end", "final": False})
+        bus.publish(thread_id, {"type": "message.delta", "delta": "hello ", "text": "hello "})
+        bus.publish("thr_other", {"type": "message.delta", "delta": "nope", "text": "nope"})
+        bus.publish(
+            thread_id, {"type": "message.delta", "delta": "from main", "text": "hello from main"}
+        )
+        bus.publish(thread_id, {"type": "message.stream.end", "final": True})
+        return _fake_agent_step(trace_id, thread_id, actor_id)
+
+    monkeypatch.setattr("jarvis.cli.chat.agent_step", _streaming_agent_step)
+    runner = CliRunner()
+    result = runner.invoke(cli, ["chat", "--user-id", "cli:test"], input="hello\n/quit\n")
+    assert result.exit_code == 0
+    assert "assistant > checking\n" in result.output
+    assert result.output.count("assistant > hello from main\n") == 1
+    assert "nope" not in result.output
+    assert not get_stream_bus().has_listeners()
+
+
 def test_ask_json_fail_fast_payload(monkeypatch) -> None:
     def _raise_send_and_wait(**_kwargs: object) -> object:
         raise click.ClickException("ConnectError: temporary failure in name resolution")
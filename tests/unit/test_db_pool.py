@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from jarvis.config import get_settings
+from jarvis.db.connection import (
+    get_conn,
+    get_connection_pool,
+    get_read_conn,
+    get_read_pool,
+    reset_connection_pool,
+)
+
+
+@pytest.mark.sqlite_only
+def test_get_conn_reuses_warm_pooled_connection() -> None:
+    with get_conn() as conn:
+        first = conn
+        conn.runtime_flags["probe"] = True
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+    with get_conn() as conn:
+        assert conn is first
+        assert conn.runtime_flags == {"probe": True}
+    assert cache_size == -get_settings().db_cache_size_kib
+    assert temp_store == 2
+    stats = get_connection_pool().stats()
+    assert stats["db_pool_created"] >= 1
+    assert stats["db_pool_in_use"] == 0
+    assert stats["db_pool_idle"] == stats["db_pool_open"]
+
+
+def test_nested_get_conn_uses_distinct_connections() -> None:
+    with get_conn() as outer:
+        with get_conn() as inner:
+            assert inner is not outer
+            assert get_connection_pool().stats()["db_pool_in_use"] == 2
+
+
+def test_failed_block_rolls_back_before_connection_returns() -> None:
+    try:
+        with get_conn() as conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO users(id, external_id, created_at) VALUES(?,?,?)",
+                ("usr_pool_rollback", "15550001111", "2026-01-01T00:00:00+00:00"),
+            )
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    with get_conn() as conn:
+        assert not conn.in_transaction
+        row = conn.execute("SELECT id FROM users WHERE id='usr_pool_rollback'").fetchone()
+    assert row is None
+
+
+def test_unhealthy_connection_is_replaced_on_checkout() -> None:
+    with get_conn() as conn:
+        broken = conn
+    broken.close()
+    with get_conn() as conn:
+        assert conn is not broken
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+    assert get_connection_pool().stats()["db_pool_discarded"] == 1
+
+
+def test_exhausted_pool_waits_then_overflows() -> None:
+    os.environ["DB_POOL_SIZE"] = "1"
+    os.environ["DB_POOL_TIMEOUT_SECONDS"] = "0.05"
+    get_settings.cache_clear()
+    reset_connection_pool()
+    try:
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold() -> None:
+            with get_conn():
+                held.set()
+                release.wait(5)
+
+        worker = threading.Thread(target=hold)
+        worker.start()
+        assert held.wait(5)
+        with get_conn() as conn:
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+        release.set()
+        worker.join(5)
+        stats = get_connection_pool().stats()
+        assert stats["db_pool_waits"] == 1
+        assert stats["db_pool_overflow"] == 1
+        assert stats["db_pool_open"] == 1
+    finally:
+        os.environ.pop("DB_POOL_SIZE", None)
+        os.environ.pop("DB_POOL_TIMEOUT_SECONDS", None)
+        get_settings.cache_clear()
+
+
+@pytest.mark.sqlite_only
+def test_read_lane_is_query_only_and_sees_committed_writes() -> None:
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT INTO users(id, external_id, created_at) VALUES(?,?,?)",
+            ("usr_pool_read", "15550002222", "2026-01-01T00:00:00+00:00"),
+        )
+    with get_read_conn() as conn:
+        row = conn.execute("SELECT id FROM users WHERE id='usr_pool_read'").fetchone()
+        assert row is not None
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == (
+            -get_settings().db_read_cache_size_kib
+        )
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM users WHERE id='usr_pool_read'")
+    stats = get_read_pool().stats()
+    assert stats["db_read_pool_checkouts"] == 1
+    assert stats["db_read_pool_in_use"] == 0
@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+from jarvis.db.connection import get_conn
+from jarvis.memory.service import MemoryService
+from jarvis.memory.vectors import pack_raw
+
+pytestmark = pytest.mark.postgres_only
+
+
+def test_rows_behave_like_sqlite_rows() -> None:
+    with get_conn() as conn:
+        row = conn.execute("SELECT 1 AS Total, 'x' AS label").fetchone()
+    assert row[0] == 1
+    assert row["total"] == 1
+    assert row["TOTAL"] == 1
+    assert dict(row) == {"total": 1, "label": "x"}
+    with pytest.raises(IndexError):
+        row["missing"]
+
+
+def test_insert_or_ignore_and_replace_map_to_upserts() -> None:
+    with get_conn() as conn:
+        for text in ("first", "second"):
+            conn.execute(
+                "INSERT OR IGNORE INTO users(id, external_id, created_at) VALUES(?,?,?)",
+                ("usr_pg_upsert", text, "2026-01-01T00:00:00+00:00"),
+            )
+        ignored = conn.execute("SELECT changes() AS n").fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO users(id, external_id, created_at) VALUES(?,?,?)",
+            ("usr_pg_upsert", "replaced", "2026-01-02T00:00:00+00:00"),
+        )
+        row = conn.execute(
+            "SELECT external_id, created_at FROM users WHERE id=?", ("usr_pg_upsert",)
+        ).fetchone()
+    assert int(ignored["n"]) == 0
+    assert row["external_id"] == "replaced"
+    assert row["created_at"] == "2026-01-02T00:00:00+00:00"
+
+
+def test_failed_statement_keeps_transaction_usable() -> None:
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "INSERT INTO users(id, external_id, created_at) VALUES(?,?,?)",
+            ("usr_pg_tx", "15550003333", "2026-01-01T00:00:00+00:00"),
+        )
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute(
+                "INSERT INTO users(id, external_id, created_at) VALUES(?,?,?)",
+                ("usr_pg_tx", "15550003333", "2026-01-01T00:00:00+00:00"),
+            )
+        cursor = conn.execute(
+            "INSERT INTO web_notifications(thread_id, event_type, payload_json, created_at) "
+            "VALUES(?,?,?,?)",
+            ("thr_pg_tx", "test.pg", "{}", "2026-01-01T00:00:00+00:00"),
+        )
+        conn.execute("COMMIT")
+        user = conn.execute("SELECT id FROM users WHERE id='usr_pg_tx'").fetchone()
+    assert user is not None
+    assert isinstance(cursor.lastrowid, int)
+
+
+def test_fts_match_and_bm25_use_tsvector() -> None:
+    with get_conn() as conn:
+        for memory_id, text in (
+            ("mem_pg_1", "deploy the api gateway tonight"),
+            ("mem_pg_2", "gateway gateway gateway timeout"),
+            ("mem_pg_3", "buy groceries"),
+        ):
+            conn.execute(
+                "INSERT INTO memory_fts(memory_id, thread_id, text) VALUES(?,?,?)",
+                (memory_id, "thr_pg_fts", text),
+            )
+        rows = conn.execute(
+            "SELECT memory_id FROM memory_fts mf "
+            "WHERE thread_id=? AND memory_fts MATCH ? ORDER BY bm25(memory_fts) LIMIT ?",
+            ("thr_pg_fts", MemoryService._fts_query("Gateway timeout"), 10),
+        ).fetchall()
+    assert [row["memory_id"] for row in rows] == ["mem_pg_2", "mem_pg_1"]
+
+
+def test_vec0_tables_map_to_pgvector_knn() -> None:
+    with get_conn() as conn:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS pg_knn_index USING vec0(embedding float[3])"
+        )
+        for rowid, vector in ((1, [1.0, 0.0, 0.0]), (2, [0.0, 1.0, 0.0]), (3, [0.9, 0.1, 0.0])):
+            conn.execute(
+                "INSERT OR REPLACE INTO pg_knn_index(rowid, embedding) VALUES(?, ?)",
+                (rowid, pack_raw(vector)),
+            )
+        rows = conn.execute(
+            "SELECT idx.rowid FROM pg_knn_index idx WHERE idx.embedding MATCH ? AND k = ?",
+            (pack_raw([1.0, 0.05, 0.0]), 2),
+        ).fetchall()
+    assert [int(row["rowid"]) for row in rows] == [1, 3]
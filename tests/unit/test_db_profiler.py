@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from jarvis.cli.main import cli
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn, reset_connection_pool
+from jarvis.db.profiler import fingerprint, get_query_profiler, reset_query_profiler
+from jarvis.tasks.system import db_profile_snapshot
+
+
+@pytest.fixture
+def profiling_enabled():
+    os.environ["DB_PROFILE_ENABLED"] = "1"
+    os.environ["DB_PROFILE_SLOW_MS"] = "100000"
+    get_settings.cache_clear()
+    reset_connection_pool()
+    reset_query_profiler()
+    yield
+    reset_connection_pool()
+    reset_query_profiler()
+    os.environ.pop("DB_PROFILE_ENABLED", None)
+    os.environ.pop("DB_PROFILE_SLOW_MS", None)
+    get_settings.cache_clear()
+
+
+def _statement(report: dict[str, object], prefix: str) -> dict[str, object]:
+    top = report["top"]
+    assert isinstance(top, list)
+    matches = [item for item in top if str(item["fingerprint"]).startswith(prefix)]
+    assert len(matches) == 1, [item["fingerprint"] for item in top]
+    return matches[0]
+
+
+def test_fingerprint_collapses_literals_and_lists() -> None:
+    assert fingerprint(
+        "SELECT * FROM t1  WHERE id IN (?, ?, ?) AND name='bob' AND n > 10;"
+    ) == "SELECT * FROM t1 WHERE id IN (?...) AND name=? AND n > ?"
+    assert fingerprint("INSERT INTO t(a, b) VALUES (?, ?), (?, ?), (?, ?)") == (
+        "INSERT INTO t(a, b) VALUES (?, ?), ..."
+    )
+
+
+def test_profiled_statements_report_latency_rows_and_plan(profiling_enabled) -> None:
+    with get_conn() as conn:
+        for index in range(3):
+            conn.execute(
+                "INSERT INTO users(id, external_id, created_at) VALUES(?,?,?)",
+                (f"usr_profile_{index}", f"1555000{index}", "2026-01-01T00:00:00+00:00"),
+            )
+        for _ in range(2):
+            rows = conn.execute(
+                "SELECT id FROM users WHERE id LIKE 'usr_profile_%' ORDER BY id"
+            ).fetchall()
+            assert len(rows) == 3
+        row = conn.execute("SELECT id FROM users WHERE id=?", ("usr_profile_1",)).fetchone()
+        assert row["id"] == "usr_profile_1"
+
+    report = get_query_profiler().report(limit=50)
+    insert = _statement(report, "INSERT INTO users")
+    assert insert["calls"] == 3
+    assert insert["rows"] == 3
+    scan = _statement(report, "SELECT id FROM users WHERE id LIKE ?")
+    assert scan["calls"] == 2
+    assert scan["rows"] == 6
+    assert sum(scan["histogram"].values()) == 2
+    assert scan["plan"] and not scan["plan"][0].startswith("unavailable")
+    assert not any(str(item["fingerprint"]).startswith("EXPLAIN") for item in report["top"])
+    assert report["slow_queries"] == []
+
+
+def test_slow_queries_are_logged_with_plan(profiling_enabled) -> None:
+    os.environ["DB_PROFILE_SLOW_MS"] = "0.000001"
+    get_settings.cache_clear()
+    reset_query_profiler()
+    with get_conn() as conn:
+        conn.execute("SELECT COUNT(*) AS n FROM events WHERE thread_id=?", ("thr_x",)).fetchone()
+    report = get_query_profiler().report()
+    slow = [
+        entry
+        for entry in report["slow_queries"]
+        if str(entry["fingerprint"]).startswith("SELECT COUNT(*) AS n FROM events")
+    ]
+    assert slow and slow[0]["plan"]
+
+
+def test_cli_reads_server_snapshot(profiling_enabled) -> None:
+    runner = CliRunner()
+    missing = runner.invoke(cli, ["db", "profile"])
+    assert missing.exit_code != 0
+    assert "DB_PROFILE_ENABLED=1" in missing.output
+
+    with get_conn() as conn:
+        conn.execute("SELECT COUNT(*) FROM threads").fetchone()
+    assert db_profile_snapshot()["status"] == "ok"
+
+    result = runner.invoke(cli, ["db", "profile", "--sort", "calls", "--limit", "5"])
+    assert result.exit_code == 0, result.output
+    assert "SELECT COUNT(*) FROM threads" in result.output
+    as_json = runner.invoke(cli, ["db", "profile", "--json", "--limit", "1"])
+    assert len(json.loads(as_json.output)["top"]) == 1
@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import insert_web_notification, now_iso
+from jarvis.db.write_queue import flush_writes, get_write_queue, reset_write_queue
+from jarvis.events.models import EventInput
+from jarvis.events.writer import emit_event
+
+
+@pytest.fixture
+def write_behind_enabled():
+    os.environ["DB_WRITE_BEHIND_ENABLED"] = "1"
+    os.environ["DB_WRITE_BATCH_MS"] = "5000"
+    get_settings.cache_clear()
+    reset_write_queue()
+    yield
+    reset_write_queue()
+    os.environ["DB_WRITE_BEHIND_ENABLED"] = "0"
+    os.environ.pop("DB_WRITE_BATCH_MS", None)
+    os.environ.pop("DB_WRITE_QUEUE_MAX", None)
+    get_settings.cache_clear()
+
+
+def _event(text: str) -> EventInput:
+    payload = f'{{"text": "{text}"}}'
+    return EventInput(
+        trace_id="trc_write_queue",
+        span_id="spn_write_queue",
+        parent_span_id=None,
+        thread_id=None,
+        event_type="test.write_queue",
+        component="test",
+        actor_type="system",
+        actor_id="test",
+        payload_json=payload,
+        payload_redacted_json=payload,
+    )
+
+
+def test_queued_events_commit_in_one_batch_after_flush(write_behind_enabled) -> None:
+    with get_conn() as conn:
+        event_ids = [emit_event(conn, _event(f"queued {index}")) for index in range(5)]
+        insert_web_notification(conn, "thr_write_queue", "test.write_queue", "{}", now_iso())
+        count = conn.execute(
+            "SELECT COUNT(*) AS n FROM events WHERE trace_id='trc_write_queue'"
+        ).fetchone()
+    assert int(count["n"]) == 0
+    assert get_write_queue().stats()["db_write_queue_depth"] == 21
+
+    assert flush_writes()
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT id FROM events WHERE trace_id='trc_write_queue' ORDER BY rowid"
+        ).fetchall()
+        text_rows = conn.execute(
+            "SELECT COUNT(*) AS n FROM event_text WHERE redacted_text LIKE 'queued %'"
+        ).fetchone()
+        notification = conn.execute(
+            "SELECT COUNT(*) AS n FROM web_notifications WHERE event_type='test.write_queue'"
+        ).fetchone()
+    assert [str(row["id"]) for row in rows] == event_ids
+    assert int(text_rows["n"]) == 5
+    assert int(notification["n"]) == 1
+    stats = get_write_queue().stats()
+    assert stats["db_write_batches"] == 1
+    assert stats["db_write_rows"] == 21
+    assert stats["db_write_queue_depth"] == 0
+
+
+def test_writes_inside_explicit_transaction_stay_inline(write_behind_enabled) -> None:
+    with get_conn() as conn:
+        conn.execute("BEGIN")
+        emit_event(conn, _event("rolled back"))
+        conn.execute("ROLLBACK")
+    assert flush_writes()
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*) AS n FROM events WHERE trace_id='trc_write_queue'"
+        ).fetchone()
+    assert int(row["n"]) == 0
+    assert get_write_queue().stats()["db_write_batches"] == 0
+
+
+def test_full_queue_falls_back_to_inline_writes(write_behind_enabled) -> None:
+    os.environ["DB_WRITE_QUEUE_MAX"] = "1"
+    get_settings.cache_clear()
+    reset_write_queue()
+    with get_conn() as conn:
+        insert_web_notification(conn, "thr_write_queue", "test.write_queue", "{}", now_iso())
+        insert_web_notification(conn, "thr_write_queue", "test.write_queue", "{}", now_iso())
+        row = conn.execute(
+            "SELECT COUNT(*) AS n FROM web_notifications WHERE event_type='test.write_queue'"
+        ).fetchone()
+    assert int(row["n"]) == 1
+    assert get_write_queue().stats()["db_write_inline"] == 1
+
+
+def test_failing_write_is_dropped_without_losing_its_batch(write_behind_enabled) -> None:
+    queue = get_write_queue()
+    assert queue.submit([("INSERT INTO missing_table(x) VALUES(?)", (1,))])
+    with get_conn() as conn:
+        insert_web_notification(conn, "thr_write_queue", "test.write_queue", "{}", now_iso())
+    assert flush_writes()
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*) AS n FROM web_notifications WHERE event_type='test.write_queue'"
+        ).fetchone()
+    assert int(row["n"]) == 1
+    assert queue.stats()["db_write_dropped"] == 1
@@ -0,0 +1,157 @@
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn, get_read_conn
+from jarvis.events import archive
+from jarvis.events.archive import (
+    ARCHIVE_SCHEMA,
+    compact_events,
+    drop_partition,
+    list_partitions,
+    partition_path,
+    partition_stats,
+    query_events,
+)
+
+pytestmark = pytest.mark.sqlite_only
+
+_EVENTS = (
+    ("evt_arc_jan", "trc_arc", "2026-01-15T10:00:00+00:00", "january note"),
+    ("evt_arc_feb", "trc_arc", "2026-02-03T10:00:00+00:00", "february note"),
+    ("evt_arc_live", "trc_arc", "2026-06-01T10:00:00+00:00", "june note"),
+    ("evt_recent", "trc_recent", "2026-06-02T10:00:00+00:00", "recent note"),
+)
+
+
+def _seed_events() -> None:
+    with get_conn() as conn:
+        for event_id, trace_id, created_at, text in _EVENTS:
+            payload = json.dumps({"text": text})
+            conn.execute(
+                "INSERT INTO events(id, trace_id, span_id, parent_span_id, thread_id, "
+                "event_type, component, actor_type, actor_id, payload_json, "
+                "payload_redacted_json, created_at) VALUES(?,?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    event_id,
+                    trace_id,
+                    "spn_arc",
+                    None,
+                    "thr_arc",
+                    "agent.thought",
+                    "orchestrator",
+                    "agent",
+                    "main",
+                    payload,
+                    payload,
+                    created_at,
+                ),
+            )
+            conn.execute(
+                "INSERT INTO event_text(event_id, thread_id, redacted_text, created_at) "
+                "VALUES(?,?,?,?)",
+                (event_id, "thr_arc", text, created_at),
+            )
+            conn.execute(
+                "INSERT INTO event_fts(event_id, thread_id, redacted_text) VALUES(?,?,?)",
+                (event_id, "thr_arc", text),
+            )
+            conn.execute(
+                "INSERT INTO pending_event_vectors(event_id, thread_id, created_at) "
+                "VALUES(?,?,?)",
+                (event_id, "thr_arc", created_at),
+            )
+
+
+def _compact() -> dict[str, object]:
+    with get_conn() as conn:
+        return compact_events(conn, before="2026-05-01T00:00:00+00:00", batch_size=1)
+
+
+def test_compaction_moves_old_events_into_monthly_partitions() -> None:
+    _seed_events()
+    result = _compact()
+    assert result == {"archived": 2, "partitions": ["2026-01", "2026-02"]}
+    assert [item.month for item in list_partitions()] == ["2026-02", "2026-01"]
+
+    with get_conn() as conn:
+        live = [row["id"] for row in conn.execute("SELECT id FROM events").fetchall()]
+        leftovers = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("event_text", "event_fts", "pending_event_vectors")
+        }
+    assert sorted(live) == ["evt_arc_live", "evt_recent"]
+    assert leftovers == {"event_text": 2, "event_fts": 2, "pending_event_vectors": 2}
+
+    january = partition_stats(list_partitions()[-1])
+    assert january["events"] == 1
+    assert january["oldest"] == "2026-01-15T10:00:00+00:00"
+    assert _compact() == {"archived": 0, "partitions": []}
+
+
+def test_query_events_unions_live_and_archived_partitions() -> None:
+    _seed_events()
+    _compact()
+    with get_read_conn() as conn:
+        trace = query_events(
+            conn,
+            "SELECT id FROM {events} WHERE trace_id=? ORDER BY created_at ASC",
+            ("trc_arc",),
+            oldest_first=True,
+        )
+        newest_two = query_events(
+            conn,
+            "SELECT id FROM {events} ORDER BY created_at DESC LIMIT ?",
+            limit=2,
+        )
+        attached = [row[1] for row in conn.execute("PRAGMA database_list").fetchall()]
+    assert [row["id"] for row in trace] == ["evt_arc_jan", "evt_arc_feb", "evt_arc_live"]
+    assert [row["id"] for row in newest_two] == ["evt_recent", "evt_arc_live"]
+    assert ARCHIVE_SCHEMA not in attached
+
+
+def test_contiguous_query_stops_at_the_first_partition_without_rows(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _seed_events()
+    _compact()
+    attached: list[str] = []
+    real_attached_partition = archive.attached_partition
+
+    @contextmanager
+    def _counting(conn: sqlite3.Connection, path: Path) -> Iterator[str]:
+        attached.append(path.name)
+        with real_attached_partition(conn, path) as schema:
+            yield schema
+
+    monkeypatch.setattr(archive, "attached_partition", _counting)
+    sql = "SELECT id FROM {events} WHERE trace_id=? ORDER BY created_at DESC LIMIT ?"
+    with get_read_conn() as conn:
+        recent = query_events(conn, sql, ("trc_recent",), limit=100, contiguous=True)
+        recent_partitions = list(attached)
+        attached.clear()
+        spanning = query_events(conn, sql, ("trc_arc",), limit=100, contiguous=True)
+
+    assert [row["id"] for row in recent] == ["evt_recent"]
+    # The live table matched, so only the newest partition is probed.
+    assert recent_partitions == [partition_path(get_settings().app_db, "2026-02").name]
+    assert [row["id"] for row in spanning] == ["evt_arc_live", "evt_arc_feb", "evt_arc_jan"]
+    assert len(attached) == 2
+
+
+def test_drop_partition_removes_its_file() -> None:
+    _seed_events()
+    _compact()
+    path = partition_path(get_settings().app_db, "2026-01")
+    assert path.exists()
+    assert drop_partition("2026-01") is True
+    assert not path.exists()
+    assert drop_partition("2026-01") is False
+    with pytest.raises(ValueError):
+        drop_partition("2026-13")
+    assert [item.month for item in list_partitions()] == ["2026-02"]
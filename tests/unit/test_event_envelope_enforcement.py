@@ -1,6 +1,7 @@
 import json
 
 from jarvis.db.connection import get_conn
+from jarvis.db.write_queue import flush_writes
 from jarvis.events.models import EventInput
 from jarvis.events.writer import emit_event, redact_payload
 
@@ -22,6 +23,7 @@ def test_emit_event_enforces_action_envelope_for_selfupdate_events() -> None:
                 payload_redacted_json=json.dumps({"status": "ok"}),
             ),
         )
+        flush_writes()
         row = conn.execute(
             "SELECT payload_redacted_json FROM events ORDER BY created_at DESC LIMIT 1"
         ).fetchone()
@@ -72,6 +74,7 @@ def test_emit_event_enforces_evolution_item_payload_contract() -> None:
                 payload_redacted_json=json.dumps({"item_id": "evo_1"}),
             ),
         )
+        flush_writes()
         row = conn.execute(
             "SELECT payload_json FROM events ORDER BY created_at DESC LIMIT 1"
         ).fetchone()
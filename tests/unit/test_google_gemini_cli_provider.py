@@ -88,6 +88,104 @@ async def test_generate_streams_text_and_tool_calls(tmp_path) -> None:
     assert result.reasoning_parts == [{"text": "plan first "}]
 
 
+@pytest.mark.asyncio
+async def test_generate_stream_yields_answer_text_before_final_response(tmp_path) -> None:
+    token_path = tmp_path / "token.json"
+    token_path.write_text(
+        json.dumps(
+            {
+                "access_token": "tok",
+                "expires_at_ms": 9_999_999_999_999,
+                "cloudaicompanion_project": "cap-proj",
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        data = "\n\n".join(
+            [
+                'data: {"candidates":[{"content":{"parts":[{"thought":true,"text":"plan"}]}}]}',
+                'data: {"candidates":[{"content":{"parts":[{"text":"hello "}]}}]}',
+                (
+                    'data: {"candidates":[{"content":{"parts":[{"text":"world"},'
+                    '{"functionCall":{"name":"lookup","args":{"q":"x"}}}]}}]}'
+                ),
+                "data: [DONE]",
+                "",
+            ]
+        )
+        return httpx.Response(200, text=data)
+
+    provider = GeminiCodeAssistProvider(
+        "gemini-test",
+        token_path=str(token_path),
+        transport=httpx.MockTransport(handler),
+    )
+    deltas = [
+        delta
+        async for delta in provider.generate_stream(
+            [{"role": "user", "content": "hi"}], tools=[{"name": "lookup"}]
+        )
+    ]
+    assert [delta.text for delta in deltas if delta.response is None] == ["hello ", "world"]
+    final = deltas[-1].response
+    assert final is not None
+    assert final.text == "hello world"
+    assert final.reasoning_text == "plan"
+    assert final.tool_calls == [{"name": "lookup", "arguments": {"q": "x"}}]
+
+
+@pytest.mark.asyncio
+async def test_generate_keys_session_on_prompt_prefix_and_reports_cache_usage(
+    tmp_path,
+) -> None:
+    token_path = tmp_path / "token.json"
+    token_path.write_text(
+        json.dumps(
+            {
+                "access_token": "tok",
+                "expires_at_ms": 9_999_999_999_999,
+                "cloudaicompanion_project": "cap-proj",
+            }
+        ),
+        encoding="utf-8",
+    )
+    session_ids: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content.decode("utf-8"))
+        session_ids.append(body["request"]["session_id"])
+        data = "\n\n".join(
+            [
+                (
+                    'data: {"response":{"candidates":[{"content":{"parts":[{"text":"hi"}]}}],'
+                    '"usageMetadata":{"promptTokenCount":1200,"cachedContentTokenCount":1024}}}'
+                ),
+                "data: [DONE]",
+                "",
+            ]
+        )
+        return httpx.Response(200, text=data)
+
+    provider = GeminiCodeAssistProvider(
+        "gemini-test",
+        token_path=str(token_path),
+        transport=httpx.MockTransport(handler),
+    )
+    messages = [
+        {"role": "system", "content": "You are concise.", "cache_key": "f" * 64},
+        {"role": "user", "content": "hi"},
+    ]
+    first = await provider.generate(messages)
+    await provider.generate(messages)
+    await provider.generate([{"role": "user", "content": "no prefix"}])
+
+    assert first.usage == {"prompt_tokens": 1200, "cached_tokens": 1024}
+    assert session_ids[0] == session_ids[1] == "s_" + "f" * 32
+    assert session_ids[2] != session_ids[0]
+
+
 @pytest.mark.asyncio
 async def test_generate_bootstraps_missing_project(
     tmp_path,
@@ -83,3 +83,11 @@ def test_metrics_include_memory_kpis() -> None:
     assert data["memory_avg_tokens_saved"] >= 42
     assert data["memory_reconciliation_rate"] > 0
     assert data["memory_hallucination_incidents"] >= 1
+    assert data["memory_vector_cache_max_bytes"] >= 0
+    assert "memory_vector_cache_hits" in data
+    assert data["embedder_ollama_healthy"] in {0, 1}
+    assert "memory_query_cache_hit_rate" in data
+    assert data["event_vector_backlog"] >= 0
+    assert data["db_pool_checkouts"] >= 1
+    assert data["db_read_pool_checkouts"] >= 1
+    assert data["db_write_queue_depth"] == 0
@@ -7,6 +7,7 @@ import pytest
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import create_approval, ensure_system_state, get_system_state
+from jarvis.db.write_queue import flush_writes
 from jarvis.tools.host import _DEFAULT_MAX_CAPTURE_BYTES as MAX_CAPTURE_BYTES
 from jarvis.tools.host import execute_host_command
 
@@ -134,6 +135,7 @@ def test_exec_host_failure_rate_emits_lockdown_triggered_event(tmp_path: Path) -
                 trace_id="trc_host_fail_lock_1",
                 caller_id="coder",
             )
+            flush_writes()
             row = conn.execute(
                 "SELECT payload_redacted_json FROM events "
                 "WHERE event_type='lockdown.triggered' "
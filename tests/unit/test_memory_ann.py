@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import ensure_channel, ensure_open_thread, ensure_system_state, ensure_user
+from jarvis.memory.ann import IVFIndex, get_ann_index, reset_ann_indexes, sidecar_path
+from jarvis.memory.service import MemoryService
+from jarvis.tasks.memory import refresh_ann_indexes
+
+np = pytest.importorskip("numpy")
+
+
+def _clustered(rows: int, dims: int, clusters: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dims))
+    labels = rng.integers(0, clusters, size=rows)
+    return centers[labels] + 0.1 * rng.normal(size=(rows, dims)), centers
+
+
+def test_ivf_index_trains_and_keeps_high_recall() -> None:
+    data, centers = _clustered(600, 16, 12)
+    index = IVFIndex(16, "m", nprobe=4, min_train_size=100, exact_tag_limit=0)
+    index.rebuild((f"k{idx}", "t", row.tolist()) for idx, row in enumerate(data))
+    assert index.ready
+    assert index.stats()["lists"] > 1
+    report = index.benchmark([center.tolist() for center in centers], 10)
+    assert report["recall_at_k"] >= 0.9
+    exact = index.search(data[3].tolist(), 1, exact=True)
+    assert exact[0][0] == "k3"
+    assert exact[0][1] == pytest.approx(1.0, abs=1e-4)
+
+
+def test_ivf_index_filters_by_tag_and_applies_upserts_and_removals() -> None:
+    index = IVFIndex(2, "m", min_train_size=1000)
+    index.rebuild([("a", "t1", [1.0, 0.0]), ("b", "t2", [1.0, 0.1])])
+    index.add("c", [0.9, 0.1], tag="t1")
+    assert [key for key, _ in index.search([1.0, 0.0], 5, tag="t1")] == ["a", "c"]
+    index.remove(["a"])
+    assert [key for key, _ in index.search([1.0, 0.0], 5, tag="t1")] == ["c"]
+    index.add("c", [0.0, 1.0], tag="t2")
+    assert index.search([1.0, 0.0], 5, tag="t1") == []
+    assert [key for key, _ in index.search([0.0, 1.0], 1)] == ["c"]
+
+
+def test_ivf_index_sidecar_round_trip(tmp_path) -> None:
+    data, _ = _clustered(300, 8, 6)
+    index = IVFIndex(8, "model-a", nprobe=3, min_train_size=50)
+    index.rebuild((f"k{idx}", f"t{idx % 3}", row.tolist()) for idx, row in enumerate(data))
+    index.remove(["k0"])
+    path = tmp_path / "idx.ann.npz"
+    index.save(path)
+    loaded = IVFIndex.load(path, dims=8, model="model-a", nprobe=3, min_train_size=50)
+    assert loaded is not None
+    assert len(loaded) == 299
+    query = data[5].tolist()
+    assert loaded.search(query, 5, tag="t2") == index.search(query, 5, tag="t2")
+    assert IVFIndex.load(path, dims=8, model="model-b") is None
+    assert IVFIndex.load(path, dims=4, model="model-a") is None
+
+
+def test_memory_search_uses_ann_index_when_enabled(monkeypatch) -> None:
+    os.environ["MEMORY_ANN_ENABLED"] = "1"
+    os.environ["MEMORY_EMBED_DIMS"] = "2"
+    get_settings.cache_clear()
+    try:
+        service = MemoryService()
+        vectors = {"alpha": [1.0, 0.0], "beta": [0.0, 1.0]}
+        monkeypatch.setattr(service, "_embed_text", lambda text: vectors[text.split()[0]])
+        with get_conn() as conn:
+            ensure_system_state(conn)
+            user_id = ensure_user(conn, "15555550720")
+            channel_id = ensure_channel(conn, user_id, "whatsapp")
+            thread_id = ensure_open_thread(conn, user_id, channel_id)
+            service.write(conn, thread_id, "alpha memory")
+            assert service._search_memory_vec_index(conn, thread_id, [1.0, 0.0], 1) == []
+        assert refresh_ann_indexes()["rebuilt"] == 3
+        with get_conn() as conn:
+            service.write(conn, thread_id, "beta memory")
+            found = service._search_memory_vec_index(conn, thread_id, [0.0, 1.0], 1)
+        index = get_ann_index("memory")
+        assert index is not None and len(index) == 2
+        assert [item["text"] for item in found] == ["beta memory"]
+        assert sidecar_path(get_settings().app_db, "memory").exists()
+    finally:
+        reset_ann_indexes()
+        os.environ.pop("MEMORY_ANN_ENABLED", None)
+        os.environ.pop("MEMORY_EMBED_DIMS", None)
+        get_settings.cache_clear()
+
+
+@pytest.mark.sqlite_only
+def test_sidecar_catches_up_with_appended_rows_and_rebuilds_after_deletes(monkeypatch) -> None:
+    os.environ["MEMORY_ANN_ENABLED"] = "1"
+    os.environ["MEMORY_EMBED_DIMS"] = "2"
+    get_settings.cache_clear()
+    try:
+        service = MemoryService()
+        vectors = {"alpha": [1.0, 0.0], "beta": [0.0, 1.0]}
+        monkeypatch.setattr(service, "_embed_text", lambda text: vectors[text.split()[0]])
+        with get_conn() as conn:
+            ensure_system_state(conn)
+            user_id = ensure_user(conn, "15555550721")
+            channel_id = ensure_channel(conn, user_id, "whatsapp")
+            thread_id = ensure_open_thread(conn, user_id, channel_id)
+            alpha_id = service.write(conn, thread_id, "alpha memory")
+        refresh_ann_indexes()
+        reset_ann_indexes()
+
+        # Another process writes while this one has no index loaded.
+        os.environ["MEMORY_ANN_ENABLED"] = "0"
+        get_settings.cache_clear()
+        with get_conn() as conn:
+            beta_id = service.write(conn, thread_id, "beta memory")
+        os.environ["MEMORY_ANN_ENABLED"] = "1"
+        get_settings.cache_clear()
+
+        index = get_ann_index("memory")
+        assert index is not None and index.ready
+        assert [key for key, _ in index.search([0.0, 1.0], 1, tag=thread_id)] == [beta_id]
+        reset_ann_indexes()
+
+        with get_conn() as conn:
+            conn.execute("DELETE FROM memory_embeddings WHERE memory_id=?", (alpha_id,))
+        index = get_ann_index("memory")
+        assert index is not None and not index.ready
+        assert index.needs_rebuild()
+    finally:
+        reset_ann_indexes()
+        os.environ.pop("MEMORY_ANN_ENABLED", None)
+        os.environ.pop("MEMORY_EMBED_DIMS", None)
+        get_settings.cache_clear()
@@ -15,4 +15,5 @@ def test_memory_factory_returns_default_service_interfaces() -> None:
     assert hasattr(store, "write")
     assert hasattr(retriever, "search")
     assert hasattr(embedder, "embed_text")
+    assert hasattr(embedder, "embed_batch")
     assert hasattr(compactor, "compact_thread")
@@ -1,5 +1,6 @@
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
+from jarvis.db.write_queue import flush_writes
 from jarvis.memory.policy import apply_memory_policy
 
 
@@ -23,6 +24,7 @@ def test_apply_memory_policy_masks_and_emits_redaction_event(monkeypatch) -> Non
         assert "[REDACTED_PHONE]" in text
         assert "a***e@example.com" in text
 
+        flush_writes()
         event_row = conn.execute(
             (
                 "SELECT event_type, payload_json FROM events "
@@ -64,6 +66,7 @@ def test_apply_memory_policy_denies_and_emits_denial_event(monkeypatch) -> None:
         assert decision == "deny"
         assert reason == "pii_detected"
 
+        flush_writes()
         event_row = conn.execute(
             (
                 "SELECT event_type, payload_json FROM events "
@@ -0,0 +1,42 @@
+import pytest
+
+from jarvis.memory import scoring
+from jarvis.memory.scoring import VectorMatrix, top_k_cosine
+from jarvis.memory.vectors import pack_vector, vector_view
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "numpy":
+        if not scoring.numpy_available():
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(scoring, "np", None)
+    return request.param
+
+
+def test_top_k_orders_by_cosine_and_normalizes_rows(engine) -> None:
+    vectors = [[0.0, 3.0], [2.0, 0.0], [1.0, 1.0]]
+    ranked = top_k_cosine([1.0, 0.0], vectors, 2)
+    assert [idx for idx, _ in ranked] == [1, 2]
+    assert ranked[0][1] == pytest.approx(1.0)
+    assert ranked[1][1] == pytest.approx(0.7071, abs=1e-3)
+
+
+def test_top_k_handles_k_larger_than_candidates_and_empty(engine) -> None:
+    assert top_k_cosine([1.0, 0.0], [], 5) == []
+    ranked = top_k_cosine([1.0, 0.0], [[0.0, 1.0], [1.0, 0.0]], 10)
+    assert [idx for idx, _ in ranked] == [1, 0]
+
+
+def test_zero_vectors_score_zero(engine) -> None:
+    ranked = top_k_cosine([1.0, 0.0], [[0.0, 0.0]], 1)
+    assert ranked == [(0, pytest.approx(0.0))]
+
+
+def test_matrix_accepts_packed_blob_views(engine) -> None:
+    views = [vector_view(pack_vector(vec, "m")) for vec in ([0.0, 1.0], [1.0, 0.0])]
+    matrix = VectorMatrix.build([view for view in views if view is not None], 2)
+    assert len(matrix) == 2
+    assert matrix.top_k([0.0, 5.0], 1)[0][0] == 0
+    assert matrix.scores([1.0, 0.0]) == [pytest.approx(0.0), pytest.approx(1.0)]
@@ -5,6 +5,7 @@ import pytest
 
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import ensure_channel, ensure_open_thread, ensure_system_state, ensure_user
+from jarvis.memory.query_cache import get_query_embedding_cache, reset_query_embedding_cache
 from jarvis.memory.service import MemoryService
 
 
@@ -151,6 +152,44 @@ def test_search_stitches_chunked_group_and_deduplicates_results() -> None:
     assert results[0]["text"] == "chunked-memory-text"
 
 
+@pytest.mark.sqlite_only
+def test_materialize_memory_hits_batches_groups_and_keeps_rank_order() -> None:
+    service = MemoryService()
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550137")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        chunk_ids = service.write_chunked(conn, thread_id, "abcdefghij", chunk_size=4)
+        plain_id = service.write(conn, thread_id, "plain memory")
+        row = conn.execute(
+            "SELECT chunk_group_id, chunk_index FROM memory_items WHERE id=?",
+            (chunk_ids[2],),
+        ).fetchone()
+        plan = " ".join(
+            str(item["detail"])
+            for item in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM memory_items "
+                "WHERE thread_id=? AND chunk_group_id IN (?) ORDER BY chunk_group_id, chunk_index",
+                (thread_id, row["chunk_group_id"]),
+            )
+        )
+        hits = service._materialize_memory_hits(
+            conn,
+            thread_id=thread_id,
+            memory_ids=[chunk_ids[2], plain_id, "mem_missing", chunk_ids[0]],
+            fallback_texts={"mem_missing": "fallback"},
+        )
+    assert row["chunk_index"] == 2
+    assert "idx_memory_items_chunk_group" in plan
+    assert hits[0] == (chunk_ids[0], "abcdefghij", hits[3][2])
+    assert hits[0][2]["chunk_index"] == 0
+    assert hits[1][:2] == (plain_id, "plain memory")
+    assert hits[2] == ("mem_missing", "fallback", {})
+    assert hits[3][:2] == (chunk_ids[0], "abcdefghij")
+
+
+@pytest.mark.sqlite_only
 def test_backfill_memory_vec_runtime_from_embeddings() -> None:
     service = MemoryService()
     with get_conn() as conn:
@@ -203,6 +242,7 @@ def test_backfill_memory_vec_runtime_from_embeddings() -> None:
     assert row["memory_id"] == "mem_a"
 
 
+@pytest.mark.sqlite_only
 def test_backfill_event_vec_runtime_from_legacy_table() -> None:
     service = MemoryService()
     with get_conn() as conn:
@@ -320,6 +360,119 @@ def test_get_failures_and_consistency_report() -> None:
     assert report["conflicted_items"] == 1
 
 
+def test_state_and_failure_fts_follow_writes_and_rank_by_bm25() -> None:
+    service = MemoryService()
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550999")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        for uid, text in (
+            ("d_pg", "Store sessions in postgres"),
+            ("d_redis", "Use redis for caching; redis cluster for queues"),
+            ("d_other", "Ship on fridays"),
+        ):
+            conn.execute(
+                (
+                    "INSERT INTO state_items("
+                    "uid, thread_id, text, type_tag, created_at, last_seen_at, updated_at"
+                    ") VALUES(?,?,?,'decision','2026-02-01','2026-02-01','2026-02-01')"
+                ),
+                (uid, thread_id, text),
+            )
+        conn.execute("UPDATE state_items SET text='Use sqlite' WHERE uid='d_pg'")
+        conn.execute("DELETE FROM state_items WHERE uid='d_other'")
+        conn.execute(
+            (
+                "INSERT INTO failure_capsules("
+                "id, trace_id, phase, error_summary, error_details_json, attempt, created_at"
+                ") VALUES(?,?,?,?,?,?,datetime('now'))"
+            ),
+            ("fcp_fts", "trc_fts", "test", "redis: connection refused (timeout)", "{}", 1),
+        )
+        indexed = {
+            str(row["uid"]): str(row["text"])
+            for row in conn.execute("SELECT uid, text FROM state_items_fts")
+        }
+        results = service.search_state(conn, thread_id, "redis?", k=5, min_score=0.0)
+        failures = service.get_failures(conn, similar_to="refused: redis", k=5)
+    assert indexed == {
+        "d_pg": "Use sqlite",
+        "d_redis": "Use redis for caching; redis cluster for queues",
+    }
+    assert [item["uid"] for item in results][0] == "d_redis"
+    assert [item["id"] for item in failures] == ["fcp_fts"]
+
+
+
+def _vm_steps(conn, sql: str, params: tuple[object, ...]) -> int:
+    steps = [0]
+
+    def _tick() -> int:
+        steps[0] += 1
+        return 0
+
+    conn.set_progress_handler(_tick, 100)
+    try:
+        conn.execute(sql, params)
+    finally:
+        conn.set_progress_handler(None, 0)
+    return steps[0]
+
+
+@pytest.mark.sqlite_only
+def test_state_and_failure_fts_triggers_do_not_scan_the_fts_table() -> None:
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550998")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+
+        def grow(start: int, stop: int) -> None:
+            conn.executemany(
+                (
+                    "INSERT INTO state_items("
+                    "uid, thread_id, text, type_tag, created_at, last_seen_at, updated_at"
+                    ") VALUES(?,?,?,'decision','2026-02-01','2026-02-01','2026-02-01')"
+                ),
+                [(f"s{idx}", thread_id, f"decision number {idx}") for idx in range(start, stop)],
+            )
+            conn.executemany(
+                (
+                    "INSERT INTO failure_capsules("
+                    "id, trace_id, phase, error_summary, error_details_json, attempt, created_at"
+                    ") VALUES(?,?,?,?,'{}',1,datetime('now'))"
+                ),
+                [(f"fcp_{idx}", "trc_fts", "test", f"error {idx}") for idx in range(start, stop)],
+            )
+
+        def costs(uid: str) -> list[int]:
+            return [
+                _vm_steps(
+                    conn,
+                    "UPDATE state_items SET text=? WHERE uid=? AND thread_id=?",
+                    ("rewritten", uid, thread_id),
+                ),
+                _vm_steps(
+                    conn,
+                    "DELETE FROM state_items WHERE uid=? AND thread_id=?",
+                    (uid, thread_id),
+                ),
+                _vm_steps(conn, "DELETE FROM failure_capsules WHERE id=?", (f"fcp_{uid[1:]}",)),
+            ]
+
+        grow(0, 100)
+        small = costs("s1")
+        grow(100, 5000)
+        large = costs("s2")
+        indexed = conn.execute(
+            "SELECT COUNT(*) FROM state_items_fts WHERE uid IN ('s1', 's2')"
+        ).fetchone()[0]
+
+    # A scan of the FTS table grows 50x here; a rowid lookup barely moves.
+    assert all(after <= 2 * before + 10 for before, after in zip(small, large, strict=True))
+    assert indexed == 0
+
 def test_graph_traverse_returns_edges() -> None:
     service = MemoryService()
     with get_conn() as conn:
@@ -344,3 +497,146 @@ def test_graph_traverse_returns_edges() -> None:
         graph = service.graph_traverse(conn, uid="d_a", depth=2)
     assert graph["root_uid"] == "d_a"
     assert len(graph["edges"]) >= 2
+
+
+def test_embed_batch_posts_multi_input_batches_in_order(monkeypatch) -> None:
+    from jarvis.memory import service as service_module
+
+    os.environ["MEMORY_EMBED_BATCH_SIZE"] = "2"
+    os.environ["MEMORY_EMBED_DIMS"] = "2"
+    service_module.get_settings.cache_clear()
+    posted: list[tuple[str, list[str]]] = []
+
+    class DummyResponse:
+        def __init__(self, texts: list[str]) -> None:
+            self._texts = texts
+
+        def raise_for_status(self) -> None:
+            return None
+
+        def json(self) -> dict[str, object]:
+            return {"embeddings": [[float(len(text)), 1.0] for text in self._texts]}
+
+    class DummyClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def close(self) -> None:
+            return None
+
+        def post(self, url: str, json: dict[str, object], **_kwargs) -> DummyResponse:
+            texts = [str(item) for item in json["input"]]  # type: ignore[union-attr]
+            posted.append((url, texts))
+            return DummyResponse(texts)
+
+    monkeypatch.setattr(service_module.httpx, "Client", DummyClient)
+    try:
+        vectors = MemoryService().embed_batch(["a", "bb", "ccc"])
+    finally:
+        os.environ.pop("MEMORY_EMBED_BATCH_SIZE", None)
+        os.environ.pop("MEMORY_EMBED_DIMS", None)
+        service_module.get_settings.cache_clear()
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+    assert sorted(texts for _, texts in posted) == [["a", "bb"], ["ccc"]]
+    assert all(url.endswith("/api/embed") for url, _ in posted)
+
+
+def test_embed_texts_cached_batches_misses_and_reuses_hits(monkeypatch) -> None:
+    service = MemoryService()
+    batches: list[list[str]] = []
+
+    def fake_batch(texts: list[str]) -> list[list[float]]:
+        batches.append(list(texts))
+        return [[float(len(text)), 0.0] for text in texts]
+
+    monkeypatch.setattr(service, "_embed_batch", fake_batch)
+    with get_conn() as conn:
+        first = service._embed_texts_cached(conn, ["one", "three", "one"])
+        reset_query_embedding_cache()
+        second = service._embed_texts_cached(conn, ["three", "four"])
+        hits = conn.execute(
+            "SELECT hit_count FROM embedding_cache ORDER BY hit_count DESC LIMIT 1"
+        ).fetchone()
+    assert batches == [["one", "three"], ["four"]]
+    assert first[0] == first[2] == [3.0, 0.0]
+    assert second[0][:2] == first[1] == [5.0, 0.0]
+    assert hits["hit_count"] == 1
+
+
+def test_embedder_runtime_skips_unreachable_ollama_until_retry(monkeypatch) -> None:
+    from jarvis.memory import embedder_runtime
+
+    calls: list[str] = []
+
+    class DownClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def close(self) -> None:
+            return None
+
+        def post(self, url: str, **_kwargs):
+            calls.append(url)
+            raise embedder_runtime.httpx.ConnectError("refused")
+
+    monkeypatch.setattr(embedder_runtime.httpx, "Client", DownClient)
+    service = MemoryService()
+    first = service.embed_text("offline text")
+    second = service.embed_text("offline text")
+    stats = embedder_runtime.get_embedder_runtime().stats()
+    assert first == second
+    assert len(calls) == 1
+    assert stats["embedder_ollama_healthy"] == 0
+    assert stats["embedder_ollama_errors"] == 1
+    assert stats["embedder_deterministic_calls"] == 2
+
+
+def test_embedder_runtime_loads_sentence_model_once(monkeypatch) -> None:
+    import sys
+    import types
+
+    from jarvis.memory.embedder_runtime import get_embedder_runtime
+
+    loads: list[str] = []
+
+    class FakeModel:
+        def __init__(self, name: str) -> None:
+            loads.append(name)
+
+        def encode(self, texts, normalize_embeddings=False):
+            return [[1.0, 2.0] for _ in texts]
+
+    fake_module = types.ModuleType("sentence_transformers")
+    fake_module.SentenceTransformer = FakeModel  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_module)
+    runtime = get_embedder_runtime()
+    monkeypatch.setattr(runtime, "available", lambda backend: backend != "ollama")
+    service = MemoryService()
+    vectors = [service.embed_text(text) for text in ("one", "two")]
+    vectors.extend(service.embed_batch(["three", "four"]))
+    assert loads == ["all-MiniLM-L6-v2"]
+    assert all(vector[:2] == [1.0, 2.0] for vector in vectors)
+    assert runtime.stats()["embedder_sentence_transformers_calls"] == 3
+
+
+def test_query_embedding_cache_shared_across_search_entry_points(monkeypatch) -> None:
+    service = MemoryService()
+    embedded: list[str] = []
+
+    def fake_embed(text: str) -> list[float]:
+        embedded.append(text)
+        return [1.0, 0.0]
+
+    monkeypatch.setattr(service, "_embed_text", fake_embed)
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550190")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        service.search(conn, thread_id, limit=2, query="what did we decide?")
+        service.search_events(conn, "what did  we decide?", limit=2)
+        service.search_state(conn, thread_id, " what did we decide? ")
+    stats = get_query_embedding_cache().stats()
+    assert embedded == ["what did we decide?"]
+    assert stats["memory_query_cache_hits"] == 2
+    assert stats["memory_query_cache_hit_rate"] > 0.5
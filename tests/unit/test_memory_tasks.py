@@ -1,5 +1,9 @@
 import json
+from datetime import UTC, datetime, timedelta
 
+import pytest
+
+from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import (
     create_thread,
@@ -8,9 +12,18 @@ from jarvis.db.queries import (
     now_iso,
     set_thread_agents,
 )
+from jarvis.db.write_queue import flush_writes
+from jarvis.memory import vec_runtime
+from jarvis.memory.job_progress import get_memory_job_progress
+from jarvis.memory.service import MemoryService
+from jarvis.memory.state_store import StateStore
+from jarvis.tasks import memory as memory_tasks
 from jarvis.tasks.memory import (
+    backfill_vector_indexes,
     evaluate_consistency,
     index_event,
+    migrate_tiers,
+    prune_adaptive,
     run_memory_maintenance,
     sync_failure_capsules,
 )
@@ -161,6 +174,7 @@ def test_sync_failure_capsules_malformed_details_and_summary_payload() -> None:
     assert result["deduped"] == 0
     assert result["scanned"] >= 1
 
+    flush_writes()
     with get_conn() as conn:
         state_row = conn.execute(
             "SELECT topic_tags_json FROM state_items WHERE source='failure_bridge' "
@@ -338,6 +352,7 @@ def test_index_event_denies_write_when_actor_scope_not_active() -> None:
     )
     assert memory_id == ""
 
+    flush_writes()
     with get_conn() as conn:
         row = conn.execute(
             "SELECT id FROM memory_items WHERE thread_id=? ORDER BY created_at DESC LIMIT 1",
@@ -354,3 +369,183 @@ def test_index_event_denies_write_when_actor_scope_not_active() -> None:
     assert audit is not None
     assert str(audit["decision"]) == "deny"
     assert str(audit["reason"]) == "agent_scope_denied"
+
+
+def _plain_vec_tables(self, conn, dims) -> None:
+    del self, dims
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS event_vec_index(rowid INTEGER PRIMARY KEY, embedding BLOB)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS event_vec_index_map("
+        "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "event_id TEXT UNIQUE NOT NULL, thread_id TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS memory_vec_index_map("
+        "vec_rowid INTEGER PRIMARY KEY AUTOINCREMENT, memory_id TEXT UNIQUE NOT NULL)"
+    )
+
+
+@pytest.mark.sqlite_only
+def test_backfill_vector_indexes_resumes_from_saved_cursor(monkeypatch) -> None:
+    monkeypatch.setattr(vec_runtime, "has_vec_module", lambda conn: True)
+    monkeypatch.setattr(MemoryService, "_create_vec_tables", _plain_vec_tables)
+    monkeypatch.setattr(StateStore, "_create_vec_tables", lambda self, conn, dims: None)
+    monkeypatch.setattr(StateStore, "backfill_vec_index", lambda self, conn, after_rowid: (0, 0, 0))
+    monkeypatch.setattr(MemoryService, "BACKFILL_BATCH_SIZE", 2)
+    monkeypatch.setattr(memory_tasks, "VECTOR_BACKFILL_MAX_BATCHES", 1)
+    with get_conn() as conn:
+        for idx in range(3):
+            conn.execute(
+                (
+                    "INSERT INTO event_vec(id, thread_id, vector_json, created_at) "
+                    "VALUES(?,?,?,datetime('now'))"
+                ),
+                (f"evt_backfill_{idx}", "thr_backfill", "[0.3, 0.7]"),
+            )
+
+    assert backfill_vector_indexes() == {"indexed": 2, "skipped": 0}
+    with get_conn() as conn:
+        first = conn.execute("SELECT * FROM vector_backfill_progress WHERE name='event'").fetchone()
+    assert first["last_rowid"] == 2
+    assert first["pass_completed_at"] is None
+
+    assert backfill_vector_indexes() == {"indexed": 1, "skipped": 0}
+    assert backfill_vector_indexes() == {"indexed": 0, "skipped": 0}
+    with get_conn() as conn:
+        done = conn.execute("SELECT * FROM vector_backfill_progress WHERE name='event'").fetchone()
+        mapped = conn.execute("SELECT COUNT(*) AS cnt FROM event_vec_index_map").fetchone()
+    assert done["rows_scanned"] == 3
+    assert done["rows_indexed"] == 3
+    assert done["pass_completed_at"] is not None
+    assert mapped["cnt"] == 3
+
+
+def _days_ago(days: int) -> str:
+    return (datetime.now(UTC) - timedelta(days=days)).isoformat()
+
+
+def _insert_state_item(
+    conn,
+    uid: str,
+    thread_id: str,
+    *,
+    last_seen_days: int,
+    pinned: int = 0,
+    importance: float = 0.5,
+    access_count: int = 0,
+) -> None:
+    seen = _days_ago(last_seen_days)
+    conn.execute(
+        (
+            "INSERT INTO state_items("
+            "uid, thread_id, text, status, type_tag, topic_tags_json, refs_json, confidence, "
+            "replaced_by, supersession_evidence, conflict, pinned, source, created_at, "
+            "last_seen_at, updated_at, tier, "
+            "importance_score, access_count, conflict_count, agent_id, last_accessed_at"
+            ") VALUES(?,?,?,'active','decision','[]','[]','medium',NULL,NULL,0,?,"
+            "'extraction',?,?,?,'working',?,?,0,'main',NULL)"
+        ),
+        (uid, thread_id, f"state {uid}", pinned, seen, seen, seen, importance, access_count),
+    )
+
+
+def test_memory_retention_prunes_in_batches_and_reports_progress(monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_MAINTENANCE_BATCH_SIZE", "2")
+    monkeypatch.setenv("MEMORY_MAINTENANCE_YIELD_MS", "0")
+    get_settings.cache_clear()
+    with get_conn() as conn:
+        user_id = ensure_user(conn, "15550010003")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = create_thread(conn, user_id, channel_id)
+        for idx in range(5):
+            conn.execute(
+                "INSERT INTO memory_items(id, thread_id, text, metadata_json, created_at) "
+                "VALUES(?,?,?,?,?)",
+                (f"mem_retention_{idx}", thread_id, f"old note {idx}", "{}", _days_ago(400 + idx)),
+            )
+        conn.execute(
+            "INSERT INTO memory_items(id, thread_id, text, metadata_json, created_at) "
+            "VALUES(?,?,?,?,?)",
+            ("mem_retention_fresh", thread_id, "fresh note", "{}", now_iso()),
+        )
+
+    result = run_memory_maintenance()
+    assert result["summary"]["pruned_memory_items"] == 5
+
+    with get_conn() as conn:
+        live = [
+            row["id"]
+            for row in conn.execute(
+                "SELECT id FROM memory_items WHERE thread_id=?", (thread_id,)
+            ).fetchall()
+        ]
+        archived = conn.execute(
+            "SELECT COUNT(*) AS n FROM memory_items_archive "
+            "WHERE thread_id=? AND archive_reason='retention'",
+            (thread_id,),
+        ).fetchone()
+    assert live == ["mem_retention_fresh"]
+    assert archived["n"] == 5
+
+    stats = get_memory_job_progress().stats()
+    assert stats["memory_job_retention_runs"] == 1
+    assert stats["memory_job_retention_batches"] == 3
+    assert stats["memory_job_retention_last_rows"] == 5
+    assert stats["memory_job_retention_running"] == 0
+
+
+def test_tier_migration_and_adaptive_prune_walk_state_items_in_batches(monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_MAINTENANCE_BATCH_SIZE", "2")
+    monkeypatch.setenv("MEMORY_MAINTENANCE_YIELD_MS", "0")
+    monkeypatch.setenv("MEMORY_TIERS_ENABLED", "1")
+    monkeypatch.setenv("MEMORY_IMPORTANCE_ENABLED", "1")
+    get_settings.cache_clear()
+    with get_conn() as conn:
+        user_id = ensure_user(conn, "15550010004")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = create_thread(conn, user_id, channel_id)
+        _insert_state_item(conn, "st_tier_pinned", thread_id, last_seen_days=1, pinned=1)
+        _insert_state_item(conn, "st_tier_important", thread_id, last_seen_days=1, importance=0.9)
+        _insert_state_item(conn, "st_tier_recent", thread_id, last_seen_days=1)
+        _insert_state_item(conn, "st_tier_episodic", thread_id, last_seen_days=30)
+        _insert_state_item(conn, "st_tier_old", thread_id, last_seen_days=100, access_count=3)
+        _insert_state_item(conn, "st_tier_stale", thread_id, last_seen_days=400, importance=0.1)
+
+    assert migrate_tiers() == {"moved": 5}
+    assert migrate_tiers() == {"moved": 0}
+    with get_conn() as conn:
+        tiers = {
+            str(row["uid"]): str(row["tier"])
+            for row in conn.execute(
+                "SELECT uid, tier FROM state_items WHERE thread_id=?", (thread_id,)
+            ).fetchall()
+        }
+    assert tiers == {
+        "st_tier_pinned": "procedural",
+        "st_tier_important": "semantic_longterm",
+        "st_tier_recent": "working",
+        "st_tier_episodic": "episodic",
+        "st_tier_old": "semantic_longterm",
+        "st_tier_stale": "semantic_longterm",
+    }
+
+    assert prune_adaptive() == {"archived": 1}
+    with get_conn() as conn:
+        remaining = conn.execute(
+            "SELECT COUNT(*) AS n FROM state_items WHERE thread_id=?", (thread_id,)
+        ).fetchone()
+        archived = conn.execute(
+            "SELECT uid, tier, archive_reason FROM state_items_archive WHERE thread_id=?",
+            (thread_id,),
+        ).fetchall()
+    assert remaining["n"] == 5
+    assert [(row["uid"], row["tier"], row["archive_reason"]) for row in archived] == [
+        ("st_tier_stale", "semantic_longterm", "adaptive_low_importance")
+    ]
+
+    stats = get_memory_job_progress().stats()
+    assert stats["memory_job_tiers_runs"] == 2
+    assert stats["memory_job_tiers_rows"] == 5
+    assert stats["memory_job_adaptive_prune_last_rows"] == 1
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn
+from jarvis.memory import vec_runtime
+from jarvis.memory.vec_runtime import get_vec_runtime
+
+
+def test_vec_runtime_probes_once_per_connection_and_sets_up_once(monkeypatch) -> None:
+    probes: list[int] = []
+    setups: list[int] = []
+
+    def fake_has_vec_module(conn) -> bool:
+        del conn
+        probes.append(1)
+        return True
+
+    monkeypatch.setattr(vec_runtime, "has_vec_module", fake_has_vec_module)
+    runtime = get_vec_runtime()
+    with get_conn() as conn:
+        for _ in range(3):
+            assert runtime.ensure(conn, "memory", lambda c, dims: setups.append(dims))
+    with get_conn() as conn:
+        assert runtime.ensure(conn, "memory", lambda c, dims: setups.append(dims))
+        assert runtime.ensure(conn, "state", lambda c, dims: setups.append(dims))
+    # The pooled connection is reused, so only the new "state" scope probes again.
+    assert len(probes) == 2
+    assert setups == [get_settings().memory_embed_dims] * 2
+    assert runtime.setup_runs == 2
+
+
+@pytest.mark.sqlite_only
+def test_vec_runtime_remembers_failed_extension_load() -> None:
+    os.environ["SQLITE_VEC_EXTENSION_PATH"] = "/nonexistent/vec0"
+    get_settings.cache_clear()
+    try:
+        runtime = get_vec_runtime()
+        with get_conn() as conn:
+            assert runtime.ensure(conn, "memory", lambda c, dims: None) is False
+        assert "/nonexistent/vec0" in runtime._failed_extensions
+        with get_conn() as conn:
+            assert runtime.ensure(conn, "memory", lambda c, dims: None) is False
+        assert runtime.setup_runs == 0
+    finally:
+        os.environ.pop("SQLITE_VEC_EXTENSION_PATH", None)
+        get_settings.cache_clear()
@@ -0,0 +1,77 @@
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import ensure_channel, ensure_open_thread, ensure_system_state, ensure_user
+from jarvis.memory.scoring import VectorMatrix
+from jarvis.memory.service import MemoryService
+from jarvis.memory.vector_cache import (
+    ThreadVectorCache,
+    ThreadVectors,
+    get_thread_vector_cache,
+    reset_thread_vector_cache,
+)
+
+
+def _entry(ids: list[str], vectors: list[list[float]]) -> ThreadVectors:
+    return ThreadVectors(
+        model="m",
+        ids=tuple(ids),
+        texts=tuple(f"text {mid}" for mid in ids),
+        matrix=VectorMatrix.build(vectors, 2),
+    )
+
+
+def test_cache_evicts_least_recently_used_thread_over_budget() -> None:
+    entry = _entry(["a"], [[1.0, 0.0]])
+    cache = ThreadVectorCache(max_bytes=entry.nbytes * 2)
+    cache.put("db", "t1", entry)
+    cache.put("db", "t2", _entry(["b"], [[0.0, 1.0]]))
+    assert cache.get("db", "t1", dims=2, model="m") is not None
+    cache.put("db", "t3", _entry(["c"], [[1.0, 1.0]]))
+    assert cache.get("db", "t2", dims=2, model="m") is None
+    assert cache.get("db", "t1", dims=2, model="m") is not None
+    stats = cache.stats()
+    assert stats["memory_vector_cache_evictions"] == 1
+    assert stats["memory_vector_cache_entries"] == 2
+    assert stats["memory_vector_cache_bytes"] <= stats["memory_vector_cache_max_bytes"]
+
+
+def test_cache_append_and_discard_keep_rows_aligned() -> None:
+    cache = ThreadVectorCache(max_bytes=1 << 20)
+    cache.put("db", "t1", _entry(["a", "b"], [[1.0, 0.0], [0.0, 1.0]]))
+    cache.append("db", "t1", memory_id="c", text="text c", vector=[1.0, 1.0], model="m")
+    cache.append("db", "t2", memory_id="d", text="text d", vector=[1.0, 1.0], model="m")
+    cache.discard("db", ["a"])
+    entry = cache.get("db", "t1", dims=2, model="m")
+    assert entry is not None
+    assert entry.ids == ("b", "c")
+    assert entry.texts == ("text b", "text c")
+    assert [entry.ids[idx] for idx, _ in entry.matrix.top_k([0.0, 1.0], 2)] == ["b", "c"]
+    assert cache.get("db", "t2", dims=2, model="m") is None
+    assert cache.get("db", "t1", dims=3, model="m") is None
+    assert cache.get("db", "t1", dims=2, model="other") is None
+
+
+def test_search_reuses_cached_thread_matrix_and_sees_new_writes(monkeypatch) -> None:
+    reset_thread_vector_cache()
+    service = MemoryService()
+    vectors = {"alpha": [1.0, 0.0], "beta": [0.0, 1.0]}
+    monkeypatch.setattr(service, "_embed_text", lambda text: vectors[text.split()[0]])
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550710")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        service.write(conn, thread_id, "alpha memory")
+        first = service._semantic_search(conn, thread_id, "alpha", limit=1)
+        service.write(conn, thread_id, "beta memory")
+        second = service._semantic_search(conn, thread_id, "beta", limit=1)
+    cache = get_thread_vector_cache()
+    stats = cache.stats()
+    reset_thread_vector_cache()
+    assert [item["text"] for item in first] == ["alpha memory"]
+    assert [item["text"] for item in second] == ["beta memory"]
+    assert stats["memory_vector_cache_misses"] == 1
+    assert stats["memory_vector_cache_hits"] == 1
+    settings = get_settings()
+    entry = cache.get(settings.app_db, thread_id, dims=2, model=settings.ollama_embed_model)
+    assert entry is not None and len(entry.ids) == 2
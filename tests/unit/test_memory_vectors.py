@@ -0,0 +1,98 @@
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import ensure_channel, ensure_open_thread, ensure_system_state, ensure_user
+from jarvis.memory.service import MemoryService
+from jarvis.memory.vectors import (
+    HEADER_SIZE,
+    decode_vector,
+    header_matches,
+    load_vector,
+    pack_raw,
+    pack_vector,
+    read_header,
+    vector_view,
+)
+
+
+def test_pack_vector_round_trips_float32_with_header() -> None:
+    blob = pack_vector([0.5, -1.25, 2.0], "nomic-embed-text")
+    assert len(blob) == HEADER_SIZE + 3 * 4
+    dims, _ = read_header(blob) or (0, 0)
+    assert dims == 3
+    assert decode_vector(blob) == [0.5, -1.25, 2.0]
+    assert pack_raw([0.5, -1.25, 2.0]) == blob[HEADER_SIZE:]
+
+
+def test_vector_view_is_zero_copy_over_payload() -> None:
+    blob = bytearray(pack_vector([1.0, 2.0], "m"))
+    view = vector_view(blob)
+    assert view is not None
+    blob[HEADER_SIZE:HEADER_SIZE + 4] = pack_raw([9.0])
+    assert view[0] == 9.0
+
+
+def test_header_rejects_mismatched_dims_and_model() -> None:
+    blob = pack_vector([1.0, 0.0], "model-a")
+    assert header_matches(blob, dims=2, model="model-a")
+    assert not header_matches(blob, dims=3, model="model-a")
+    assert not header_matches(blob, dims=2, model="model-b")
+    assert decode_vector(blob, model="model-b") is None
+    assert read_header(b"not a vector") is None
+
+
+def test_load_vector_falls_back_to_legacy_json() -> None:
+    vector, is_legacy = load_vector(None, "[0.25, 0.75]", dims=2)
+    assert vector == [0.25, 0.75]
+    assert is_legacy is True
+    vector, is_legacy = load_vector(b"", "[0.25, 0.75]", dims=3)
+    assert vector is None
+    vector, is_legacy = load_vector(pack_vector([1.0], "m"), "", model="m")
+    assert vector == [1.0]
+    assert is_legacy is False
+
+
+def test_write_stores_packed_blob_instead_of_json() -> None:
+    service = MemoryService()
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550700")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        memory_id = service.write(conn, thread_id, "packed memory")
+        row = conn.execute(
+            "SELECT vector_json, vector_blob FROM memory_embeddings WHERE memory_id=?",
+            (memory_id,),
+        ).fetchone()
+    assert row["vector_json"] == ""
+    assert read_header(row["vector_blob"]) is not None
+
+
+def test_search_upgrades_legacy_json_rows_on_read(monkeypatch) -> None:
+    service = MemoryService()
+    monkeypatch.setattr(service, "_embed_text", lambda text: [1.0, 0.0])
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550701")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        conn.execute(
+            (
+                "INSERT INTO memory_items(id, thread_id, text, metadata_json, created_at) "
+                "VALUES(?,?,?,?,datetime('now'))"
+            ),
+            ("mem_legacy", thread_id, "legacy memory", "{}"),
+        )
+        conn.execute(
+            (
+                "INSERT INTO memory_embeddings(memory_id, model, vector_json, created_at) "
+                "VALUES(?,?,?,datetime('now'))"
+            ),
+            ("mem_legacy", "nomic-embed-text", "[1.0, 0.0]"),
+        )
+        results = service._semantic_search(conn, thread_id, "legacy", limit=1)
+        row = conn.execute(
+            "SELECT vector_json, vector_blob FROM memory_embeddings WHERE memory_id=?",
+            ("mem_legacy",),
+        ).fetchone()
+    assert results == [{"id": "mem_legacy", "text": "legacy memory"}]
+    assert row["vector_json"] == ""
+    assert decode_vector(row["vector_blob"], dims=2) == [1.0, 0.0]
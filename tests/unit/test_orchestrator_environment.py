@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from jarvis.config import get_settings
+from jarvis.db.connection import get_conn
+from jarvis.db.queries import ensure_system_state, trigger_lockdown
+from jarvis.orchestrator.environment import EnvironmentContext
+
+
+@pytest.fixture()
+def registry_loads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    monkeypatch.setenv("ENVIRONMENT_REFRESH_SECONDS", "3600")
+    get_settings.cache_clear()
+    loads: list[Path] = []
+
+    def _fake_registry(root: Path) -> dict[str, object]:
+        loads.append(root)
+        return {child.name: object() for child in root.iterdir() if child.is_dir()}
+
+    monkeypatch.setattr("jarvis.orchestrator.environment.load_agent_registry", _fake_registry)
+    return loads
+
+
+def _make_agent(root: Path, agent_id: str) -> None:
+    (root / agent_id).mkdir(parents=True)
+    (root / agent_id / "identity.md").write_text("# agent\n")
+
+
+def test_environment_block_reloads_lockdown_without_rescanning_agents(
+    tmp_path: Path, registry_loads: list[Path]
+) -> None:
+    _make_agent(tmp_path, "main")
+    env = EnvironmentContext(agent_root=tmp_path)
+    with get_conn() as conn:
+        ensure_system_state(conn)
+
+    before = env.environment_block()
+    with get_conn() as conn:
+        trigger_lockdown(conn, "test")
+    after = env.environment_block()
+
+    assert "lockdown=off" in before
+    assert "lockdown=on" in after
+    assert "Available agents: main (coordinator)" in after
+    assert len(registry_loads) == 1
+    stats = env.stats()
+    assert stats["environment_snapshot_requests"] == 2
+    assert stats["environment_host_refreshes"] == 1
+    assert stats["environment_state_refreshes"] == 2
+
+
+def test_roster_refreshes_only_when_agent_root_changes(
+    tmp_path: Path, registry_loads: list[Path]
+) -> None:
+    _make_agent(tmp_path, "main")
+    env = EnvironmentContext(agent_root=tmp_path)
+
+    first = env.snapshot()
+    assert env.snapshot() is first
+    _make_agent(tmp_path, "coder")
+    second = env.snapshot()
+
+    assert first.roster_line == "main (coordinator)"
+    assert second.roster_line == "coder (code implementation), main (coordinator)"
+    assert len(registry_loads) == 2
+
+
+def test_repo_index_block_reparses_only_when_file_changes(tmp_path: Path) -> None:
+    index_path = tmp_path / ".jarvis" / "repo_index.json"
+    index_path.parent.mkdir()
+    index_path.write_text(json.dumps({"entrypoints": ["src/jarvis/main.py"]}))
+    env = EnvironmentContext(agent_root=tmp_path / "agents")
+
+    first = env.repo_index_block(tmp_path)
+    assert env.repo_index_block(tmp_path) == first
+    index_path.write_text(json.dumps({"entrypoints": ["src/jarvis/main.py", "src/jarvis/cli"]}))
+    second = env.repo_index_block(tmp_path)
+    index_path.unlink()
+
+    assert first == "[repo_index]\nentrypoints: src/jarvis/main.py"
+    assert second.endswith("src/jarvis/main.py, src/jarvis/cli")
+    assert env.repo_index_block(tmp_path) == ""
+    assert env.stats()["environment_repo_index_refreshes"] == 2
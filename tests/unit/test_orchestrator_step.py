@@ -1,9 +1,11 @@
 import asyncio
 import json
 import sqlite3
+import time
 from dataclasses import dataclass
 from typing import Any
 
+from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
 from jarvis.db.queries import (
     ensure_channel,
@@ -12,8 +14,10 @@ from jarvis.db.queries import (
     ensure_user,
     insert_message,
 )
+from jarvis.db.write_queue import flush_writes, reset_write_queue
 from jarvis.errors import ProviderError
 from jarvis.memory.skills import SkillsService
+from jarvis.orchestrator.prompt_cache import get_prompt_cache_stats
 from jarvis.orchestrator.step import (
     DEGRADED_RESPONSE,
     MAX_TOOL_ITERATIONS,
@@ -25,20 +29,22 @@ from jarvis.orchestrator.step import (
     run_agent_step,
 )
 from jarvis.providers.base import ModelResponse
+from jarvis.tools.registry import ToolRegistry
+
+
+async def _echo_handler(args: dict[str, Any]) -> dict[str, Any]:
+    return {"ok": True, "args": args}
 
 
 @dataclass
 class _FakeRuntime:
     execute_calls: int = 0
 
-    class _Registry:
-        @staticmethod
-        def schemas() -> list[dict[str, object]]:
-            return [{"name": "echo", "description": "echo"}]
-
     @property
-    def registry(self) -> _Registry:
-        return self._Registry()
+    def registry(self) -> ToolRegistry:
+        registry = ToolRegistry()
+        registry.register("echo", "echo", _echo_handler)
+        return registry
 
     async def execute(
         self,
@@ -196,6 +202,7 @@ def test_run_agent_step_model_path_with_tool_loop(monkeypatch) -> None:
         message_id = asyncio.run(
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_1")
         )
+        flush_writes()
         row = conn.execute("SELECT content FROM messages WHERE id=?", (message_id,)).fetchone()
         fallback_row = conn.execute(
             "SELECT COUNT(*) AS c FROM events WHERE trace_id=? AND event_type='model.fallback'",
@@ -212,6 +219,167 @@ def test_run_agent_step_model_path_with_tool_loop(monkeypatch) -> None:
     assert len(thought_rows) >= 2
 
 
+@dataclass
+class _RegistryRuntime:
+    registry: ToolRegistry
+    started: list[str]
+
+    async def execute(
+        self,
+        conn: sqlite3.Connection,
+        tool_name: str,
+        arguments: dict[str, Any],
+        caller_id: str,
+        trace_id: str,
+        thread_id: str | None = None,
+    ) -> dict[str, object]:
+        del conn, caller_id, trace_id, thread_id
+        self.started.append(tool_name)
+        tool = self.registry.get(tool_name)
+        assert tool is not None
+        return await tool.handler(arguments)
+
+
+def test_run_agent_step_runs_independent_read_tools_concurrently(monkeypatch) -> None:
+    monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
+    monkeypatch.setattr("jarvis.orchestrator.step._enqueue_memory_index", lambda **_kwargs: None)
+    active = {"now": 0, "peak": 0}
+
+    def _tool(label: str) -> Any:
+        async def _handler(args: dict[str, Any]) -> dict[str, Any]:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.2)
+            active["now"] -= 1
+            return {"tool": label, "args": args}
+
+        return _handler
+
+    registry = ToolRegistry()
+    registry.register("slow_search", "search", _tool("search"), side_effect="read")
+    registry.register("slow_history", "history", _tool("history"), side_effect="read")
+    registry.register("slow_write", "write", _tool("write"))
+    runtime = _RegistryRuntime(registry=registry, started=[])
+    router = _SequenceRouter(
+        [
+            (
+                ModelResponse(
+                    text="calling tools",
+                    tool_calls=[
+                        {"name": "slow_search", "arguments": {"q": 1}},
+                        {"name": "slow_history", "arguments": {"q": 2}},
+                        {"name": "slow_write", "arguments": {"q": 3}},
+                    ],
+                ),
+                "primary",
+            ),
+            (ModelResponse(text="final answer", tool_calls=[]), "primary"),
+        ]
+    )
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550140")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        insert_message(conn, thread_id, "user", "hello")
+        _ = asyncio.run(
+            run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_par")
+        )
+        flush_writes()
+        batch_row = conn.execute(
+            "SELECT payload_json FROM events WHERE trace_id=? AND event_type='tool.batch.end'",
+            ("trc_step_par",),
+        ).fetchone()
+
+    assert active["peak"] == 2
+    assert runtime.started[-1] == "slow_write"
+    tool_results = [
+        json.loads(message["content"].removeprefix("[tool_result] "))["result"]["tool"]
+        for message in router.messages_by_call[1]
+        if message["content"].startswith("[tool_result] ")
+    ]
+    assert tool_results == ["search", "history", "write"]
+    assert batch_row is not None
+    report = json.loads(str(batch_row["payload_json"]))
+    assert report["tool_count"] == 3
+    assert report["batches"] == 2
+    assert report["max_parallel"] == 2
+    assert report["wall_ms"] < report["tool_ms_total"]
+
+
+class _StreamingSequenceRouter(_SequenceRouter):
+    def __init__(self, responses: list[tuple[ModelResponse, str]], chunks: list[list[str]]):
+        super().__init__(responses)
+        self._chunks = chunks
+
+    async def generate_stream(
+        self,
+        messages: list[dict[str, str]],
+        sink: Any,
+        tools: list[dict[str, object]] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        priority: str = "normal",
+    ) -> tuple[ModelResponse, str, str | None]:
+        for chunk in self._chunks[min(self.calls, len(self._chunks) - 1)]:
+            await sink.text(chunk)
+        return await self.generate(messages, tools, temperature, max_tokens, priority)
+
+
+def test_run_agent_step_streams_answer_frames_per_iteration(monkeypatch) -> None:
+    monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
+    monkeypatch.setattr("jarvis.orchestrator.step._enqueue_memory_index", lambda **_kwargs: None)
+    monkeypatch.setenv("MODEL_STREAM_FLUSH_MS", "0")
+    get_settings.cache_clear()
+    router = _StreamingSequenceRouter(
+        [
+            (
+                ModelResponse(
+                    text="Checking", tool_calls=[{"name": "echo", "arguments": {}}]
+                ),
+                "primary",
+            ),
+            (ModelResponse(text="All done<|end|>", tool_calls=[]), "primary"),
+        ],
+        [["Checking"], ["All ", "done<|end|>"]],
+    )
+    frames: list[dict[str, object]] = []
+
+    async def _collect(frame: dict[str, object]) -> None:
+        frames.append(frame)
+
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550141")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        insert_message(conn, thread_id, "user", "hello")
+        message_id = asyncio.run(
+            run_agent_step(
+                conn,
+                router,
+                _FakeRuntime(),
+                thread_id=thread_id,
+                trace_id="trc_step_stream",
+                stream_fn=_collect,
+            )
+        )
+        stored = conn.execute("SELECT content FROM messages WHERE id=?", (message_id,)).fetchone()
+
+    assert [
+        (frame["type"], frame["iteration"], frame.get("delta", frame.get("final")))
+        for frame in frames
+    ] == [
+        ("message.delta", 0, "Checking"),
+        ("message.stream.end", 0, False),
+        ("message.delta", 1, "All "),
+        ("message.delta", 1, "done"),
+        ("message.stream.end", 1, True),
+    ]
+    assert [frame["seq"] for frame in frames] == [1, 2, 3, 4, 5]
+    assert stored["content"] == "All done"
+
+
 def test_run_agent_step_prefers_provider_reasoning_for_thought_payload(monkeypatch) -> None:
     monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
     router = _SequenceRouter(
@@ -243,6 +411,7 @@ def test_run_agent_step_prefers_provider_reasoning_for_thought_payload(monkeypat
                 trace_id="trc_step_reasoning",
             )
         )
+        flush_writes()
         thought_row = conn.execute(
             "SELECT payload_json FROM events WHERE trace_id=? AND event_type='agent.thought' "
             "ORDER BY created_at ASC LIMIT 1",
@@ -276,11 +445,12 @@ def test_run_agent_step_worker_ignores_command_short_path(monkeypatch) -> None:
             )
         )
         row = conn.execute(
-            "SELECT role, content FROM messages WHERE id=?",
+            "SELECT role, content, actor_id, trace_id FROM messages WHERE id=?",
             (message_id,),
         ).fetchone()
     assert row is not None and row["content"] == "worker reply"
     assert row["role"] == "agent"
+    assert (row["actor_id"], row["trace_id"]) == ("researcher", "trc_step_2")
     assert runtime.execute_calls == 0
 
 
@@ -374,7 +544,7 @@ def test_run_agent_step_includes_skills_and_environment_context(monkeypatch) ->
     monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
     monkeypatch.setattr(
         "jarvis.orchestrator.step._build_environment_context",
-        lambda _conn: "Current time: 2026-02-15T14:30:00+00:00",
+        lambda: "Current time: 2026-02-15T14:30:00+00:00",
     )
     captured: dict[str, object] = {}
 
@@ -390,14 +560,16 @@ def test_run_agent_step_includes_skills_and_environment_context(monkeypatch) ->
         prompt_mode: str = "full",
         available_tools: list[dict[str, str]] | None = None,
         skill_catalog: list[dict[str, object]] | None = None,
+        volatile_context: str = "",
     ) -> tuple[str, str, dict[str, object]]:
         del summary_short, summary_long, structured_state, tail, token_budget, max_memory_items
         captured["system_context"] = system_context
+        captured["volatile_context"] = volatile_context
         captured["memory_chunks"] = memory_chunks
         captured["prompt_mode"] = prompt_mode
         captured["available_tools"] = available_tools
         captured["skill_catalog"] = skill_catalog
-        return system_context, "prompt", {"sections": {}}
+        return system_context, "prompt", {"sections": {}, "prefix_sha256": "abc"}
 
     monkeypatch.setattr(
         "jarvis.orchestrator.step.build_prompt_with_report", _fake_build_prompt_with_report
@@ -432,8 +604,8 @@ def test_run_agent_step_includes_skills_and_environment_context(monkeypatch) ->
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_6")
         )
 
-    assert "[environment]" in str(captured["system_context"])
-    assert "Current time: 2026-02-15T14:30:00+00:00" in str(captured["system_context"])
+    assert "[environment]" not in str(captured["system_context"])
+    assert "Current time: 2026-02-15T14:30:00+00:00" in str(captured["volatile_context"])
     chunks = captured["memory_chunks"]
     assert isinstance(chunks, list)
     assert all("[skill:" not in str(item) for item in chunks)
@@ -463,6 +635,51 @@ def test_run_agent_step_sends_system_message(monkeypatch) -> None:
     assert first_call[1]["role"] == "user"
 
 
+def test_run_agent_step_keeps_system_prefix_stable_across_steps(monkeypatch) -> None:
+    monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
+    clock = iter(["10:00", "10:01"])
+    monkeypatch.setattr(
+        "jarvis.orchestrator.step._build_environment_context",
+        lambda: f"Current time: {next(clock)}",
+    )
+    usage = {"prompt_tokens": 1000, "cached_tokens": 800}
+    router = _SequenceRouter([(ModelResponse(text="done", tool_calls=[], usage=usage), "primary")])
+    runtime = _FakeRuntime()
+    notifications: list[tuple[str, dict[str, object]]] = []
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550140")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        for idx in range(2):
+            insert_message(conn, thread_id, "user", f"hello {idx}")
+            _ = asyncio.run(
+                run_agent_step(
+                    conn,
+                    router,
+                    runtime,
+                    thread_id=thread_id,
+                    trace_id=f"trc_step_prefix_{idx}",
+                    notify_fn=lambda kind, payload: notifications.append((kind, payload)),
+                )
+            )
+
+    # State extraction shares the router; keep only the agent prompts.
+    first, second = (call[0] for call in router.messages_by_call if "cache_key" in call[0])
+    assert first["cache_key"] == second["cache_key"]
+    assert first["content"].endswith("Current time: 10:00")
+    assert second["content"].endswith("Current time: 10:01")
+    builds = [payload for kind, payload in notifications if kind == "prompt.build"]
+    assert [payload["prefix_changed"] for payload in builds] == [False, False]
+    assert builds[0]["prefix_sha256"] == first["cache_key"]
+    run_end = next(payload for kind, payload in notifications if kind == "model.run.end")
+    assert run_end["cached_tokens"] == 800
+    stats = get_prompt_cache_stats().stats()
+    assert stats["prompt_cache_prefix_builds"] == 2
+    assert stats["prompt_cache_prefix_changes"] == 0
+    assert stats["prompt_cache_hit_ratio"] == 0.8
+
+
 def test_run_agent_step_emits_prompt_build_event(monkeypatch) -> None:
     monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
     router = _SequenceRouter([(ModelResponse(text="done", tool_calls=[]), "primary")])
@@ -476,6 +693,7 @@ def test_run_agent_step_emits_prompt_build_event(monkeypatch) -> None:
         _ = asyncio.run(
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_8")
         )
+        flush_writes()
         row = conn.execute(
             "SELECT payload_json FROM events WHERE trace_id=? AND event_type='prompt.build' "
             "ORDER BY created_at DESC LIMIT 1",
@@ -487,6 +705,96 @@ def test_run_agent_step_emits_prompt_build_event(monkeypatch) -> None:
     assert "prompt_mode" in payload
 
 
+def test_run_agent_step_reports_context_sources_and_omits_failed_ones(monkeypatch) -> None:
+    monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
+    monkeypatch.setenv("PROMPT_CONTEXT_SOURCE_TIMEOUT_SECONDS", "0.2")
+    get_settings.cache_clear()
+
+    def _slow_environment() -> str:
+        time.sleep(0.6)
+        return "Current time: never"
+
+    def _broken_repo_index() -> str:
+        raise OSError("repo index unreadable")
+
+    monkeypatch.setattr("jarvis.orchestrator.step._build_environment_context", _slow_environment)
+    monkeypatch.setattr("jarvis.orchestrator.step._repo_index_context", _broken_repo_index)
+    notifications: list[tuple[str, dict[str, object]]] = []
+    router = _SequenceRouter([(ModelResponse(text="done", tool_calls=[]), "primary")])
+    runtime = _FakeRuntime()
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550139")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        insert_message(conn, thread_id, "user", "hello")
+        _ = asyncio.run(
+            run_agent_step(
+                conn,
+                router,
+                runtime,
+                thread_id=thread_id,
+                trace_id="trc_step_ctx",
+                notify_fn=lambda kind, payload: notifications.append((kind, payload)),
+            )
+        )
+
+    system_message = router.messages_by_call[0][0]["content"]
+    assert "[environment]" not in system_message
+    assert "Current time: never" not in system_message
+    report = next(payload for kind, payload in notifications if kind == "prompt.build")
+    sources = report["context_sources"]
+    assert isinstance(sources, dict)
+    assert {"summary", "state", "memory", "kb", "skills", "agent"} <= set(sources)
+    assert sources["summary"]["status"] == "ok"
+    assert sources["environment"]["status"] == "timeout"
+    assert sources["repo_index"]["status"] == "error"
+    assert float(report["context_assembly_ms"]) >= float(sources["environment"]["ms"])
+
+
+
+def test_run_agent_step_retrieves_memory_on_read_lane_without_write_behind(monkeypatch) -> None:
+    monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
+    monkeypatch.setenv("DB_WRITE_BEHIND_ENABLED", "0")
+    get_settings.cache_clear()
+    reset_write_queue()
+    notifications: list[tuple[str, dict[str, object]]] = []
+    router = _SequenceRouter([(ModelResponse(text="done", tool_calls=[]), "primary")])
+    runtime = _FakeRuntime()
+    with get_conn() as conn:
+        ensure_system_state(conn)
+        user_id = ensure_user(conn, "15555550140")
+        channel_id = ensure_channel(conn, user_id, "whatsapp")
+        thread_id = ensure_open_thread(conn, user_id, channel_id)
+        conn.execute(
+            "INSERT INTO memory_items(id, thread_id, text, metadata_json, created_at) "
+            "VALUES(?,?,?,?,datetime('now'))",
+            ("mem_read_lane", thread_id, "the deploy key lives in vault", "{}"),
+        )
+        insert_message(conn, thread_id, "user", "hello")
+        _ = asyncio.run(
+            run_agent_step(
+                conn,
+                router,
+                runtime,
+                thread_id=thread_id,
+                trace_id="trc_step_read_lane",
+                notify_fn=lambda kind, payload: notifications.append((kind, payload)),
+            )
+        )
+        retrieve_events = conn.execute(
+            "SELECT payload_json FROM events WHERE thread_id=? AND event_type='memory.retrieve'",
+            (thread_id,),
+        ).fetchall()
+
+    report = next(payload for kind, payload in notifications if kind == "prompt.build")
+    sources = report["context_sources"]
+    assert isinstance(sources, dict)
+    assert sources["memory"]["status"] == "ok"
+    prompt = "\n".join(message["content"] for message in router.messages_by_call[0])
+    assert "the deploy key lives in vault" in prompt
+    assert [json.loads(row["payload_json"])["result_count"] for row in retrieve_events] == [1]
+
 def test_extract_embedded_tool_payload_strips_tool_json_suffix() -> None:
     text = (
         'I will inspect docs and propose a plan. '
@@ -539,6 +847,7 @@ def test_run_agent_step_rewrites_placeholder_to_degraded_response(monkeypatch) -
         message_id = asyncio.run(
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_10")
         )
+        flush_writes()
         row = conn.execute("SELECT content FROM messages WHERE id=?", (message_id,)).fetchone()
         evt = conn.execute(
             (
@@ -586,11 +895,6 @@ def test_run_agent_step_fallback_only_retry_recovers_response(monkeypatch) -> No
 def test_run_agent_step_tool_loop_exhaustion_runs_terminal_synthesis(monkeypatch) -> None:
     monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
     monkeypatch.setattr("jarvis.orchestrator.step._enqueue_memory_index", lambda **_kwargs: None)
-    monkeypatch.setattr("jarvis.events.writer.MemoryService.embed_text", lambda _self, _text: [0.0])
-    monkeypatch.setattr(
-        "jarvis.events.writer.MemoryService.upsert_event_vector",
-        lambda _self, _conn, _event_id, _thread_id, _vector: None,
-    )
     router = _ToolLoopThenSynthesisRouter("Recovered terminal synthesis answer.")
     runtime = _FakeRuntime()
     with get_conn() as conn:
@@ -602,6 +906,7 @@ def test_run_agent_step_tool_loop_exhaustion_runs_terminal_synthesis(monkeypatch
         message_id = asyncio.run(
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_13")
         )
+        flush_writes()
         row = conn.execute("SELECT content FROM messages WHERE id=?", (message_id,)).fetchone()
         evt = conn.execute(
             (
@@ -622,11 +927,6 @@ def test_run_agent_step_terminal_synthesis_provider_error_sets_specific_reason(
 ) -> None:
     monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
     monkeypatch.setattr("jarvis.orchestrator.step._enqueue_memory_index", lambda **_kwargs: None)
-    monkeypatch.setattr("jarvis.events.writer.MemoryService.embed_text", lambda _self, _text: [0.0])
-    monkeypatch.setattr(
-        "jarvis.events.writer.MemoryService.upsert_event_vector",
-        lambda _self, _conn, _event_id, _thread_id, _vector: None,
-    )
     router = _ToolLoopThenSynthesisErrorRouter()
     runtime = _FakeRuntime()
     with get_conn() as conn:
@@ -639,6 +939,7 @@ def test_run_agent_step_terminal_synthesis_provider_error_sets_specific_reason(
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_14")
         )
         row = conn.execute("SELECT content FROM messages WHERE id=?", (message_id,)).fetchone()
+        flush_writes()
         degraded_evt = conn.execute(
             (
                 "SELECT payload_json FROM events WHERE trace_id=? "
@@ -659,11 +960,6 @@ def test_run_agent_step_tool_loop_placeholder_uses_deterministic_terminal_messag
 ) -> None:
     monkeypatch.setattr("jarvis.orchestrator.step._update_heartbeat", lambda *_args: None)
     monkeypatch.setattr("jarvis.orchestrator.step._enqueue_memory_index", lambda **_kwargs: None)
-    monkeypatch.setattr("jarvis.events.writer.MemoryService.embed_text", lambda _self, _text: [0.0])
-    monkeypatch.setattr(
-        "jarvis.events.writer.MemoryService.upsert_event_vector",
-        lambda _self, _conn, _event_id, _thread_id, _vector: None,
-    )
     router = _ToolLoopThenSynthesisPlaceholderRouter()
     runtime = _FakeRuntime()
     with get_conn() as conn:
@@ -676,6 +972,7 @@ def test_run_agent_step_tool_loop_placeholder_uses_deterministic_terminal_messag
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_15")
         )
         row = conn.execute("SELECT content FROM messages WHERE id=?", (message_id,)).fetchone()
+        flush_writes()
         degraded_evt = conn.execute(
             (
                 "SELECT payload_json FROM events WHERE trace_id=? "
@@ -729,6 +1026,7 @@ def test_run_agent_step_provider_failure_writes_degraded_message_and_error_event
         message_id = asyncio.run(
             run_agent_step(conn, router, runtime, thread_id=thread_id, trace_id="trc_step_12")
         )
+        flush_writes()
         message_row = conn.execute(
             "SELECT content FROM messages WHERE id=?",
             (message_id,),
@@ -0,0 +1,134 @@
+import asyncio
+
+from jarvis.channels.streaming import DraftStreamer
+from jarvis.orchestrator.streaming import DeltaRelay, StreamBus
+
+
+def _run_relay(chunks: list[str], *, restart_after: int | None = None) -> list[dict[str, object]]:
+    frames: list[dict[str, object]] = []
+
+    async def _collect(frame: dict[str, object]) -> None:
+        frames.append(frame)
+
+    async def _drive() -> None:
+        relay = DeltaRelay(_collect, flush_interval_s=0.0)
+        relay.start(0)
+        for idx, chunk in enumerate(chunks):
+            if idx == restart_after:
+                await relay.restart()
+            await relay.text(chunk)
+        await relay.finish(final=True)
+
+    asyncio.run(_drive())
+    return frames
+
+
+def test_relay_holds_back_tool_payload_split_across_chunks() -> None:
+    frames = _run_relay(["Sure ", "{", '"tool_calls": [{"name": "echo"}]}'])
+    deltas = [frame["delta"] for frame in frames if frame["type"] == "message.delta"]
+    assert deltas == ["Sure "]
+    assert frames[-1] == {"type": "message.stream.end", "iteration": 0, "final": True, "seq": 2}
+
+
+def test_relay_releases_lone_brace_once_next_chunk_arrives() -> None:
+    frames = _run_relay(["set {", "x} to 1"])
+    assert [frame.get("text") for frame in frames if frame["type"] == "message.delta"] == [
+        "set ",
+        "set {x} to 1",
+    ]
+
+
+def test_relay_restart_resets_released_text() -> None:
+    frames = _run_relay(["stale", "fresh"], restart_after=1)
+    assert [(frame["type"], frame.get("text")) for frame in frames] == [
+        ("message.delta", "stale"),
+        ("message.stream.reset", None),
+        ("message.delta", "fresh"),
+        ("message.stream.end", None),
+    ]
+
+
+def test_relay_coalesces_deltas_within_flush_interval() -> None:
+    frames: list[dict[str, object]] = []
+
+    async def _collect(frame: dict[str, object]) -> None:
+        frames.append(frame)
+
+    async def _drive() -> None:
+        relay = DeltaRelay(_collect, flush_interval_s=60.0)
+        relay.start(2)
+        for chunk in ["a", "b", "c"]:
+            await relay.text(chunk)
+        await relay.finish(final=False)
+
+    asyncio.run(_drive())
+    assert frames[0] == {
+        "type": "message.delta",
+        "iteration": 2,
+        "delta": "abc",
+        "text": "abc",
+        "seq": 1,
+    }
+    assert frames[1]["final"] is False
+
+
+def test_stream_bus_isolates_failing_listeners() -> None:
+    bus = StreamBus()
+    seen: list[tuple[str, dict[str, object]]] = []
+
+    def _broken(_thread_id: str, _frame: dict[str, object]) -> None:
+        raise RuntimeError("closed loop")
+
+    remove = bus.add_listener(_broken)
+    bus.add_listener(lambda thread_id, frame: seen.append((thread_id, frame)))
+    bus.publish("thr_1", {"type": "message.delta"})
+    remove()
+
+    assert seen == [("thr_1", {"type": "message.delta"})]
+    assert bus.stats() == {
+        "stream_frames_published": 1,
+        "stream_listener_errors": 1,
+        "stream_listeners": 1,
+    }
+
+
+def test_draft_streamer_throttles_edits_and_stops_after_failure() -> None:
+    calls: list[tuple[str, str]] = []
+
+    class _Adapter:
+        edit_status = 200
+
+        async def start_draft(self, recipient: str, text: str) -> str | None:
+            calls.append(("start", text))
+            return "7"
+
+        async def edit_draft(self, recipient: str, draft_id: str, text: str) -> int:
+            calls.append(("edit", text))
+            return self.edit_status
+
+        async def finalize_draft(self, recipient: str, draft_id: str, text: str) -> int:
+            return 200
+
+    adapter = _Adapter()
+
+    async def _drive() -> DraftStreamer:
+        draft = DraftStreamer(adapter, "chat_1", min_interval_s=0.0)
+        await draft.publish({"type": "message.delta", "text": "Hel"})
+        await draft.publish({"type": "message.delta", "text": "Hello"})
+        await draft.publish({"type": "message.delta", "text": "Hello"})
+        adapter.edit_status = 429
+        await draft.publish({"type": "message.delta", "text": "Hello there"})
+        await draft.publish({"type": "message.delta", "text": "Hello there, friend"})
+        throttled = DraftStreamer(adapter, "chat_2", min_interval_s=60.0)
+        await throttled.publish({"type": "message.delta", "text": "one"})
+        await throttled.publish({"type": "message.delta", "text": "one two"})
+        return draft
+
+    draft = asyncio.run(_drive())
+    assert draft.draft_id == "7"
+    assert calls == [
+        ("start", "Hel"),
+        ("edit", "Hello"),
+        ("edit", "Hello there"),
+        ("start", "one"),
+    ]
@@ -107,3 +107,29 @@ def test_prompt_builder_falls_back_to_summary_long_when_state_empty() -> None:
     assert "[summary.long]" in user_part
     assert "[structured_state]" not in user_part
     assert report["used_summary_long_fallback"] is True
+
+
+def test_system_prefix_is_byte_stable_when_volatile_inputs_change() -> None:
+    def _build(volatile: str, skill: str) -> tuple[str, dict[str, object]]:
+        system_part, _user, report = build_prompt_with_report(
+            system_context="persona",
+            summary_short="short",
+            summary_long="long",
+            memory_chunks=[],
+            tail=["user: hi"],
+            token_budget=400,
+            available_tools=[{"name": "echo", "description": "Echo text"}],
+            skill_catalog=[{"slug": skill, "title": skill}],
+            volatile_context=volatile,
+        )
+        return system_part, report
+
+    first_system, first = _build("[environment]\nCurrent time: 10:00", "deploy")
+    second_system, second = _build("[environment]\nCurrent time: 10:01", "review")
+
+    assert first["prefix_sha256"] == second["prefix_sha256"]
+    prefix_chars = int(first["prefix_chars"])
+    assert first_system[:prefix_chars] == second_system[:prefix_chars]
+    assert first_system.endswith("Current time: 10:00")
+    assert "deploy" not in first_system[:prefix_chars]
+    assert first["volatile_chars"] == len("[environment]\nCurrent time: 10:00")
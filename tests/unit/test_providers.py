@@ -118,6 +118,93 @@ async def test_sglang_generate_parses_tool_calls(monkeypatch: pytest.MonkeyPatch
     assert healthy is True
 
 
+@pytest.mark.asyncio
+async def test_sglang_generate_stream_yields_text_and_assembles_tool_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("SGLANG_BASE_URL", "http://sglang.local/v1")
+    events = [
+        {"choices": [{"delta": {"reasoning_content": "look it up"}}]},
+        {"choices": [{"delta": {"content": "Search"}}]},
+        {"choices": [{"delta": {"content": "ing now"}}]},
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [
+                            {"index": 0, "function": {"name": "lookup", "arguments": '{"te'}}
+                        ]
+                    }
+                }
+            ]
+        },
+        {
+            "choices": [
+                {"delta": {"tool_calls": [{"index": 0, "function": {"arguments": 'rm":"abc"}'}}]}}
+            ]
+        },
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content.decode("utf-8"))
+        assert payload["stream"] is True
+        lines = [f"data: {json.dumps(event)}" for event in events] + ["data: [DONE]", ""]
+        return httpx.Response(200, text="\n\n".join(lines))
+
+    provider = SGLangProvider("sg-test", transport=httpx.MockTransport(handler))
+    deltas = [
+        delta
+        async for delta in provider.generate_stream(
+            [{"role": "user", "content": "run"}], tools=[{"name": "lookup"}]
+        )
+    ]
+    assert [delta.text for delta in deltas[:-1]] == ["Search", "ing now"]
+    final = deltas[-1].response
+    assert final is not None
+    assert final.text == "Searching now"
+    assert final.reasoning_text == "look it up"
+    assert final.tool_calls == [{"name": "lookup", "arguments": {"term": "abc"}}]
+
+
+@pytest.mark.asyncio
+async def test_sglang_reports_cached_prompt_tokens_and_strips_cache_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("SGLANG_BASE_URL", "http://sglang.local/v1")
+    bodies: list[dict[str, object]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content.decode("utf-8"))
+        bodies.append(payload)
+        usage = {"prompt_tokens": 900, "prompt_tokens_details": {"cached_tokens": 768}}
+        if payload.get("stream"):
+            lines = [
+                f"data: {json.dumps({'choices': [{'delta': {'content': 'ok'}}]})}",
+                f"data: {json.dumps({'choices': [], 'usage': usage})}",
+                "data: [DONE]",
+                "",
+            ]
+            return httpx.Response(200, text="\n\n".join(lines))
+        return httpx.Response(
+            200, json={"choices": [{"message": {"content": "ok"}}], "usage": usage}
+        )
+
+    provider = SGLangProvider("sg-test", transport=httpx.MockTransport(handler))
+    messages = [
+        {"role": "system", "content": "You are Jarvis.", "cache_key": "abc123"},
+        {"role": "user", "content": "hi"},
+    ]
+    response = await provider.generate(messages)
+    deltas = [delta async for delta in provider.generate_stream(messages)]
+
+    assert response.usage == {"prompt_tokens": 900, "cached_tokens": 768}
+    final = deltas[-1].response
+    assert final is not None
+    assert final.usage == {"prompt_tokens": 900, "cached_tokens": 768}
+    assert bodies[0]["messages"][0] == {"role": "system", "content": "You are Jarvis."}
+    assert bodies[1]["stream_options"] == {"include_usage": True}
+
+
 def test_provider_factory_supports_switching_primary_provider(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -0,0 +1,46 @@
+import pytest
+from click.testing import CliRunner
+
+from jarvis.cli.main import cli
+from jarvis.db.connection import get_conn
+from jarvis.db.plan_audit import HOT_QUERIES, HotQuery, audit_query_plans, check_plan
+
+pytestmark = pytest.mark.sqlite_only
+
+
+def test_hot_queries_use_indexes() -> None:
+    with get_conn() as conn:
+        findings = audit_query_plans(conn)
+    assert findings == [], "\n".join(
+        f"{item.query}: {item.problem} ({'; '.join(item.plan)})" for item in findings
+    )
+
+
+def test_hot_query_names_are_unique() -> None:
+    names = [query.name for query in HOT_QUERIES]
+    assert len(names) == len(set(names))
+
+
+def test_check_plan_flags_scans_and_sorts_unless_allowed() -> None:
+    query = HotQuery("probe", "SELECT 1")
+    plan = (
+        "SCAN m",
+        "SEARCH e USING INDEX idx_events_thread_created (thread_id=?)",
+        "SCAN memory_fts VIRTUAL TABLE INDEX 0:M1",
+        "SCAN events USING COVERING INDEX idx_events_created",
+        "USE TEMP B-TREE FOR ORDER BY",
+    )
+    assert [item.problem for item in check_plan(query, plan)] == ["full_scan", "temp_sort"]
+    relaxed = HotQuery("probe", "SELECT 1", allow_scan=("m",), allow_sort=True)
+    assert check_plan(relaxed, plan) == []
+
+
+def test_audit_detects_a_missing_index_and_cli_fails() -> None:
+    with get_conn() as conn:
+        conn.execute("DROP INDEX idx_messages_thread_created")
+        findings = audit_query_plans(conn)
+    assert "step_recent_messages" in {item.query for item in findings}
+
+    result = CliRunner().invoke(cli, ["db", "audit-plans"])
+    assert result.exit_code == 1
+    assert "step_recent_messages: full_scan" in result.output
@@ -1,7 +1,7 @@
 import pytest
 
 from jarvis.errors import ProviderError
-from jarvis.providers.base import ModelResponse
+from jarvis.providers.base import ModelDelta, ModelResponse
 from jarvis.providers.router import ProviderRouter
 
 
@@ -82,3 +82,58 @@ async def test_retryable_primary_error_retries_before_success() -> None:
     assert lane == "primary"
     assert primary_error is None
     assert primary.calls == 3
+
+
+class StreamingProvider:
+    def __init__(self, chunks: list[str], fail_after: int | None = None) -> None:
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    async def generate(self, messages, tools=None, temperature=0.7, max_tokens=4096):
+        return ModelResponse(text="".join(self.chunks), tool_calls=[])
+
+    async def generate_stream(self, messages, tools=None, temperature=0.7, max_tokens=4096):
+        for idx, chunk in enumerate(self.chunks):
+            if self.fail_after is not None and idx >= self.fail_after:
+                raise RuntimeError("stream dropped")
+            yield ModelDelta(text=chunk)
+        yield ModelDelta(response=ModelResponse(text="".join(self.chunks), tool_calls=[]))
+
+    async def health_check(self) -> bool:
+        return True
+
+
+class _RecordingSink:
+    def __init__(self) -> None:
+        self.events: list[str] = []
+
+    async def text(self, chunk: str) -> None:
+        self.events.append(chunk)
+
+    async def restart(self) -> None:
+        self.events.append("<restart>")
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_forwards_deltas_and_restarts_on_fallback() -> None:
+    sink = _RecordingSink()
+    router = ProviderRouter(
+        StreamingProvider(["par", "tial"], fail_after=1), StreamingProvider(["fall", "back"])
+    )
+    response, lane, primary_error = await router.generate_stream(
+        [{"role": "user", "content": "x"}], sink
+    )
+    assert response.text == "fallback"
+    assert lane == "fallback"
+    assert primary_error == "RuntimeError: stream dropped"
+    assert sink.events == ["par", "<restart>", "fall", "back"]
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_uses_generate_for_non_streaming_providers() -> None:
+    sink = _RecordingSink()
+    router = ProviderRouter(OkProvider(), OkProvider())
+    response, lane, _ = await router.generate_stream([{"role": "user", "content": "x"}], sink)
+    assert response.text == "ok"
+    assert lane == "primary"
+    assert sink.events == []
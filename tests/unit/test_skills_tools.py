@@ -1,6 +1,13 @@
 import asyncio
+import sqlite3
+import threading
+from typing import Any
+
+import pytest
 
 from jarvis.db.connection import get_conn
+from jarvis.memory.skills import SkillsService
+from jarvis.tasks import agent as agent_tasks
 from jarvis.tasks.agent import _build_registry
 
 
@@ -62,3 +69,49 @@ def test_skill_tools_registered_and_operational() -> None:
     assert any(item["scope"] == "coder" for item in list_result["skills"])
     assert len(pinned_result["skills"]) == 1
     assert pinned_result["skills"][0]["scope"] == "coder"
+
+
+def test_db_bound_read_tools_in_one_batch_overlap(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Each read waits for the other inside its DB call, so the pair only completes
+    # if both run at the same time on their own connections.
+    barrier = threading.Barrier(2, timeout=5)
+    seen_conns: list[sqlite3.Connection] = []
+    real_session_list = agent_tasks.session_list
+    real_list_skills = SkillsService.list_skills
+
+    def _session_list(conn: sqlite3.Connection, **kwargs: Any) -> list[dict[str, Any]]:
+        seen_conns.append(conn)
+        barrier.wait()
+        return real_session_list(conn, **kwargs)
+
+    def _list_skills(
+        self: SkillsService, conn: sqlite3.Connection, **kwargs: Any
+    ) -> list[dict[str, object]]:
+        seen_conns.append(conn)
+        barrier.wait()
+        return real_list_skills(self, conn, **kwargs)
+
+    monkeypatch.setattr(agent_tasks, "session_list", _session_list)
+    monkeypatch.setattr(SkillsService, "list_skills", _list_skills)
+
+    with get_conn() as conn:
+        registry = _build_registry(
+            conn, trace_id="trc_read_overlap", thread_id="thr_1", actor_id="main"
+        )
+        batches = registry.plan_batches(["session_list", "skill_list"])
+        assert batches == [[[0], [1]]]
+        session_tool = registry.get("session_list")
+        skill_tool = registry.get("skill_list")
+        assert session_tool is not None
+        assert skill_tool is not None
+
+        async def _batch() -> list[dict[str, Any]]:
+            return await asyncio.gather(session_tool.handler({}), skill_tool.handler({}))
+
+        sessions, skills = asyncio.run(_batch())
+
+    assert isinstance(sessions["sessions"], list)
+    assert isinstance(skills["skills"], list)
+    assert len(seen_conns) == 2
+    assert all(seen is not conn for seen in seen_conns)
+    assert seen_conns[0] is not seen_conns[1]
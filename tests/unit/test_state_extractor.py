@@ -29,6 +29,9 @@ class _Memory:
             return [0.0, 1.0]
         return [0.1, 0.1]
 
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_text(text) for text in texts]
+
 
 def _seed_thread(conn, external_id: str) -> str:
     ensure_system_state(conn)
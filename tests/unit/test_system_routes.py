@@ -6,6 +6,7 @@ from jarvis.agents import loader as agent_loader
 from jarvis.agents.types import AgentBundle
 from jarvis.config import get_settings
 from jarvis.db.connection import get_conn
+from jarvis.db.profiler import get_query_profiler
 from jarvis.db.queries import (
     create_thread,
     ensure_channel,
@@ -13,7 +14,9 @@ from jarvis.db.queries import (
     ensure_user,
     insert_message,
     now_iso,
+    system_state_generation,
 )
+from jarvis.events.archive import partition_path
 from jarvis.main import app
 
 
@@ -97,10 +100,15 @@ def test_reset_db() -> None:
             ("test-reset", now_iso()),
         )
         migration_count_before = _count(conn, "schema_migrations")
+    partition = partition_path(get_settings().app_db, "2024-01")
+    partition.write_bytes(b"")
+    generation_before = system_state_generation()
 
     response = client.post("/api/v1/system/reset-db", headers=_headers(token), json={})
     assert response.status_code == 200
     assert response.json() == {"ok": True}
+    assert not partition.exists()
+    assert system_state_generation() > generation_before
 
     with get_conn() as conn:
         assert _count(conn, "users") == 0
@@ -147,3 +155,28 @@ def test_reload_agents() -> None:
     assert response.json() == {"ok": True}
     assert agent_loader._agent_ids_cache is None
     assert agent_loader._bundle_cache == {}
+
+
+def test_db_profile_report_and_reset() -> None:
+    os.environ["WEB_AUTH_SETUP_PASSWORD"] = "secret"
+    get_settings.cache_clear()
+
+    client = TestClient(app)
+    token = _login(client)
+
+    get_query_profiler().record("SELECT ? FROM threads", "SELECT 1 FROM threads", 3.0, 1)
+    response = client.get(
+        "/api/v1/system/db-profile?limit=5&sort=calls", headers=_headers(token)
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["enabled"] is False
+    assert payload["top"][0]["fingerprint"] == "SELECT ? FROM threads"
+    assert payload["top"][0]["p50_ms"] == 3.0
+
+    bad = client.get("/api/v1/system/db-profile?sort=bogus", headers=_headers(token))
+    assert bad.status_code == 400
+
+    reset = client.post("/api/v1/system/db-profile/reset", headers=_headers(token), json={})
+    assert reset.json() == {"ok": True}
+    assert get_query_profiler().report()["statements"] == 0
@@ -1,6 +1,7 @@
 import pytest
 
 from jarvis.db.connection import get_conn
+from jarvis.db.write_queue import flush_writes
 from jarvis.errors import PolicyError
 from jarvis.tools.registry import ToolRegistry
 from jarvis.tools.runtime import ToolRuntime
@@ -19,6 +20,7 @@ async def test_tool_denied_by_default() -> None:
     with get_conn() as conn:
         with pytest.raises(PolicyError):
             await runtime.execute(conn, "echo", {"x": 1}, "main", "trc_1")
+        flush_writes()
         start_query = (
             "SELECT COUNT(*) AS c FROM events WHERE trace_id='trc_1' "
             "AND event_type='tool.call.start'"
@@ -95,6 +97,7 @@ async def test_session_tool_denied_for_worker() -> None:
                 "researcher",
                 "trc_3",
             )
+        flush_writes()
         start_query = (
             "SELECT COUNT(*) AS c FROM events WHERE trace_id='trc_3' "
             "AND event_type='tool.call.start'"
@@ -119,6 +122,7 @@ async def test_unknown_tool_emits_terminal_event() -> None:
     with get_conn() as conn:
         with pytest.raises(PolicyError, match="R3"):
             await runtime.execute(conn, "missing_tool", {}, "main", "trc_4")
+        flush_writes()
         row = conn.execute(
             "SELECT payload_redacted_json FROM events "
             "WHERE trace_id='trc_4' AND event_type='tool.call.end' "
@@ -126,3 +130,36 @@ async def test_unknown_tool_emits_terminal_event() -> None:
         ).fetchone()
         assert row is not None
         assert "unknown_tool" in str(row["payload_redacted_json"])
+
+
+def test_plan_batches_runs_reads_together_and_writes_alone() -> None:
+    registry = ToolRegistry()
+
+    async def handler(args):
+        return {"ok": True, "args": args}
+
+    registry.register("web_search", "Search", handler, side_effect="read")
+    registry.register("session_history", "History", handler, side_effect="read")
+    registry.register("kb_lookup", "Lookup", handler, side_effect="read", serial_class="kb")
+    registry.register("exec_host", "Shell", handler)
+
+    plan = registry.plan_batches(
+        [
+            "web_search",
+            "kb_lookup",
+            "session_history",
+            "kb_lookup",
+            "exec_host",
+            "exec_host",
+            "missing_tool",
+            "web_search",
+        ]
+    )
+    assert plan == [
+        [[0], [1, 3], [2]],
+        [[4]],
+        [[5]],
+        [[6]],
+        [[7]],
+    ]
+    assert registry.plan_batches([]) == []
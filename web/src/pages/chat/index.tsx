@@ -94,12 +94,14 @@ export default function ChatPage() {
   panelTraceIdRef.current = panelTraceId;
   const textareaRef = useRef<HTMLTextAreaElement>(null);
   const setThinking = useChatStore((s) => s.setThinking);
+  const setStreaming = useChatStore((s) => s.setStreaming);
   const setDelegation = useChatStore((s) => s.setDelegation);
   const setActiveTrace = useChatStore((s) => s.setActiveTrace);
   const setTraceEvents = useChatStore((s) => s.setTraceEvents);
   const appendTraceEvent = useChatStore((s) => s.appendTraceEvent);
   const clearTrace = useChatStore((s) => s.clearTrace);
   const thinking = useChatStore((s) => (threadId ? !!s.thinkingByThread[threadId] : false));
+  const streamingText = useChatStore((s) => (threadId ? s.streamingByThread[threadId] ?? "" : ""));
   const delegation = useChatStore((s) => (threadId ? s.delegationByThread[threadId] : ""));
   const activeTraceId = useChatStore((s) => (threadId ? s.activeTraceByThread[threadId] : ""));
   const traceEventsByTrace = useChatStore((s) => s.traceEvents);
@@ -217,9 +219,20 @@ export default function ChatPage() {
         queryClient.invalidateQueries({ queryKey: ["messages", threadId] });
         queryClient.invalidateQueries({ queryKey: ["threads"] });
       }
+      // Streamed previews of the reply; message.new carries the stored text.
+      if (type === "message.delta" && eventThreadId) {
+        setStreaming(eventThreadId, String(event.text ?? ""));
+      }
+      if (
+        eventThreadId &&
+        (type === "message.stream.reset" || (type === "message.stream.end" && !event.final))
+      ) {
+        setStreaming(eventThreadId, "");
+      }
       if (type === "agent.thinking" && eventThreadId) setThinking(eventThreadId, true);
       if (type === "agent.done" && eventThreadId) {
         setThinking(eventThreadId, false);
+        setStreaming(eventThreadId, "");
         clearTrace(eventThreadId);
       }
       if (type === "agent.delegated" && eventThreadId) {
@@ -248,7 +261,7 @@ export default function ChatPage() {
         }
       }
     },
-    [appendTraceEvent, clearTrace, queryClient, setDelegation, setThinking, threadId],
+    [appendTraceEvent, clearTrace, queryClient, setDelegation, setStreaming, setThinking, threadId],
   );
 
   const ws = useWebSocket(handleEvent);
@@ -372,7 +385,7 @@ export default function ChatPage() {
     const el = listRef.current;
     if (!el) return;
     el.scrollTop = el.scrollHeight;
-  }, [threadId, messageItems.length, thinking]);
+  }, [threadId, messageItems.length, thinking, streamingText]);
 
   // Auto-resize textarea
   useEffect(() => {
@@ -549,11 +562,15 @@ export default function ChatPage() {
                     <div className="mb-1 text-[11px] font-medium text-[var(--text-muted)]">
                       {typingAgentName}{delegation ? ` (${delegation})` : ""}
                     </div>
-                    <div className="flex gap-1">
-                      <span className="typing-dot h-2 w-2 rounded-full bg-[var(--text-muted)]" />
-                      <span className="typing-dot h-2 w-2 rounded-full bg-[var(--text-muted)]" />
-                      <span className="typing-dot h-2 w-2 rounded-full bg-[var(--text-muted)]" />
-                    </div>
+                    {streamingText ? (
+                      <div className="whitespace-pre-wrap text-sm">{streamingText}</div>
+                    ) : (
+                      <div className="flex gap-1">
+                        <span className="typing-dot h-2 w-2 rounded-full bg-[var(--text-muted)]" />
+                        <span className="typing-dot h-2 w-2 rounded-full bg-[var(--text-muted)]" />
+                        <span className="typing-dot h-2 w-2 rounded-full bg-[var(--text-muted)]" />
+                      </div>
+                    )}
                   </div>
                 </div>
               ) : null}
@@ -8,10 +8,12 @@ export interface TraceEvent {
 
 interface ChatStore {
   thinkingByThread: Record<string, boolean>;
+  streamingByThread: Record<string, string>;
   delegationByThread: Record<string, string>;
   activeTraceByThread: Record<string, string>;
   traceEvents: Record<string, TraceEvent[]>;
   setThinking: (threadId: string, value: boolean) => void;
+  setStreaming: (threadId: string, text: string) => void;
   setDelegation: (threadId: string, chain: string) => void;
   setActiveTrace: (threadId: string, traceId: string) => void;
   setTraceEvents: (traceId: string, events: TraceEvent[]) => void;
@@ -21,11 +23,14 @@ interface ChatStore {
 
 export const useChatStore = create<ChatStore>((set) => ({
   thinkingByThread: {},
+  streamingByThread: {},
   delegationByThread: {},
   activeTraceByThread: {},
   traceEvents: {},
   setThinking: (threadId, value) =>
     set((state) => ({ thinkingByThread: { ...state.thinkingByThread, [threadId]: value } })),
+  setStreaming: (threadId, text) =>
+    set((state) => ({ streamingByThread: { ...state.streamingByThread, [threadId]: text } })),
   setDelegation: (threadId, chain) =>
     set((state) => ({
       delegationByThread: { ...state.delegationByThread, [threadId]: chain },